@@ -10,13 +10,29 @@ Outputs:
   - PDF (zh): data/output/group/blm_niel_group_consolidated_cq4_2025_zh.pdf
   - PPTX: data/output/group/blm_niel_group_consolidated_cq4_2025.pptx
 
+The report is built in stages, each timed and reported at the end:
+seed, per-operator analysis, group summaries, Markdown, then the two PDFs
+and the PPTX rendered concurrently.  With more than one worker, analysis
+and rendering run on a WarmWorkerPool (src/web/services/warm_pool.py)
+that warms up while the markets are seeded; the workers read a seeded
+database file cloned from the all_markets image.
+
+PDFs are rendered chapter by chapter (src/output/pdf_chapters.py): each
+part and each operator section is cached by its content, so after a
+change only the chapters that changed are laid out again.
+
 Usage:
     python3 generate_niel_group_report.py
+    python3 generate_niel_group_report.py --workers 1   # everything in-process
 """
 from __future__ import annotations
 
+import argparse
+import os
 import sys
 import tempfile
+import time
+from contextlib import contextmanager
 from pathlib import Path
 
 _project_root = Path(__file__).resolve().parent
@@ -67,42 +83,145 @@ GROUPS = [
 ]
 
 
+# =========================================================================
+# Stage timing
+# =========================================================================
+
+class StageTimer:
+    """Wall time of each report stage, printed at the end."""
+
+    def __init__(self):
+        self.stages = []  # (name, seconds)
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float):
+        self.stages.append((name, seconds))
+
+    def report(self) -> str:
+        lines = ["  Stage timings:"]
+        for name, seconds in self.stages:
+            lines.append(f"    {name:<20s} {seconds:7.2f}s")
+        lines.append(f"    {'total (wall)':<20s} {time.perf_counter() - self._start:7.2f}s")
+        return "\n".join(lines)
+
+
+def _timed(fn, *args, **kwargs):
+    """``fn(*args, **kwargs)`` and its duration in seconds (module-level: runs on pool workers)."""
+    start = time.perf_counter()
+    return fn(*args, **kwargs), time.perf_counter() - start
+
+
+def start_pool(workers: int):
+    """WarmWorkerPool warming up in the background, or None for in-process runs."""
+    if workers <= 1:
+        return None
+    from src.web.services.warm_pool import WarmWorkerPool
+
+    pool = WarmWorkerPool(workers=workers)
+    pool.prestart(wait=False)
+    print(f"  Warm pool: {workers} workers")
+    return pool
+
+
 # =========================================================================
 # Step 1: Seed & Analyze
 # =========================================================================
 
-def seed_and_analyze():
-    """Seed all 22 markets and run Five Looks for 18 target operators."""
-    from src.database.seed_orchestrator import seed_all_markets
-    from src.blm.engine import BLMAnalysisEngine
+def seed_and_analyze(pool=None, timer: StageTimer = None):
+    """Seed all 22 markets and run Five Looks for 18 target operators.
+
+    With a ``pool``, the operators are analyzed on its workers against a
+    seeded database file they share.
+    """
+    from src.database.seed_image import seeded_database
     from src.web.services.group_summary import GroupSummaryGenerator
     from src.database.operator_directory import OPERATOR_GROUPS
-    from src.output.strategic_diagnosis import StrategicDiagnosisComputer
-    from src.models.market_configs import get_market_config
 
+    timer = timer or StageTimer()
     print("=" * 70)
     print("  Xavier Niel Consolidated Group Report Generator")
     print(f"  Operators: {len(ALL_OPERATORS)} across 3 groups")
     print(f"  Period:    {PERIOD}")
     print("=" * 70)
 
-    # Seed
-    print("\n[Phase 1] Seeding all 22 markets into in-memory SQLite...")
-    db = seed_all_markets(":memory:")
+    with tempfile.TemporaryDirectory(prefix="blm_niel_") as tmp_dir:
+        # Seed
+        if pool is None:
+            print("\n[Phase 1] Seeding all 22 markets into in-memory SQLite...")
+            db_path = ":memory:"
+        else:
+            print("\n[Phase 1] Seeding all 22 markets into a shared SQLite file...")
+            db_path = str(Path(tmp_dir) / "niel_group.db")
+        with timer.stage("seed"):
+            db = seeded_database("all_markets", db_path)
+
+        # Run Five Looks for each operator
+        print(f"\n[Phase 2] Running Five Looks for {len(ALL_OPERATORS)} operators...")
+        try:
+            with timer.stage("analysis"):
+                all_results, all_diagnoses = analyze_operators(db, ALL_OPERATORS, pool)
+        finally:
+            db.close()
+
+    # Group summaries
+    print(f"\n[Phase 3] Generating group summaries...")
+    with timer.stage("group summaries"):
+        gen = GroupSummaryGenerator()
+        group_summaries = {}
+        for group_id, group_name, operators in GROUPS:
+            group_results = {
+                mkt: all_results[op] for op, mkt, _, _ in operators if op in all_results
+            }
+            if group_results:
+                group_info = OPERATOR_GROUPS.get(group_id, {"group_id": group_id, "group_name": group_name})
+                group_summaries[group_id] = gen.generate(group_results, group_info)
+                print(f"  {group_name}: {len(group_results)} markets")
+
+    return all_results, all_diagnoses, group_summaries
+
+
+def analyze_operators(db, operators, pool=None):
+    """Five Looks and strategic diagnosis of each (operator_id, market_id, display, country).
+
+    On a ``pool``, every operator is submitted at once against ``db``'s
+    file; results are collected in ``operators`` order either way.
+
+    Returns ({operator_id: FiveLooksResult}, {operator_id: StrategicDiagnosis}).
+    """
+    from src.blm.engine import BLMAnalysisEngine
+    from src.blm.result_cache import get_result_cache
+    from src.models.market_configs import get_market_config
+    from src.output.strategic_diagnosis import StrategicDiagnosisComputer
+
+    futures = {}
+    if pool is not None:
+        from src.web.services.warm_pool import run_engine_job
+        futures = {
+            op_id: pool.submit(run_engine_job, db.db_path, op_id, market_id, PERIOD, 8)
+            for op_id, market_id, _, _ in operators
+        }
 
-    # Run Five Looks for each operator
-    print(f"\n[Phase 2] Running Five Looks for {len(ALL_OPERATORS)} operators...")
     all_results = {}  # operator_id -> FiveLooksResult
     all_diagnoses = {}  # operator_id -> StrategicDiagnosis
-
-    for i, (op_id, market_id, display, country) in enumerate(ALL_OPERATORS, 1):
-        print(f"  [{i:2d}/{len(ALL_OPERATORS)}] {display} ({country})...", end=" ", flush=True)
+    for i, (op_id, market_id, display, country) in enumerate(operators, 1):
+        print(f"  [{i:2d}/{len(operators)}] {display} ({country})...", end=" ", flush=True)
         try:
-            engine = BLMAnalysisEngine(
-                db=db, target_operator=op_id, market=market_id,
-                target_period=PERIOD, n_quarters=8,
-            )
-            result = engine.run_five_looks()
+            if pool is not None:
+                result = futures[op_id].result()
+            else:
+                engine = BLMAnalysisEngine(
+                    db=db, target_operator=op_id, market=market_id,
+                    target_period=PERIOD, n_quarters=8, cache=get_result_cache(),
+                )
+                result = engine.run_five_looks()
             all_results[op_id] = result
 
             config = get_market_config(market_id)
@@ -111,22 +230,7 @@ def seed_and_analyze():
             print("OK")
         except Exception as e:
             print(f"FAILED: {e}")
-
-    # Group summaries
-    print(f"\n[Phase 3] Generating group summaries...")
-    gen = GroupSummaryGenerator()
-    group_summaries = {}
-    for group_id, group_name, operators in GROUPS:
-        group_results = {
-            mkt: all_results[op] for op, mkt, _, _ in operators if op in all_results
-        }
-        if group_results:
-            group_info = OPERATOR_GROUPS.get(group_id, {"group_id": group_id, "group_name": group_name})
-            group_summaries[group_id] = gen.generate(group_results, group_info)
-            print(f"  {group_name}: {len(group_results)} markets")
-
-    db.close()
-    return all_results, all_diagnoses, group_summaries
+    return all_results, all_diagnoses
 
 
 # =========================================================================
@@ -512,16 +616,21 @@ def _md_table(headers, rows):
 # Step 3: Convert to PDF
 # =========================================================================
 
+# Heading of the Markdown table of contents, rebuilt with page numbers in PDFs
+_TOC_TITLE = "目录"
+
+
 def generate_pdf(md_content: str, output_path: Path, chinese: bool = True):
-    """Convert Markdown to PDF using weasyprint."""
+    """Convert Markdown to PDF using weasyprint, one cached chapter at a time.
+
+    Chapters are the report's parts (##) and operator sections (####); the
+    table of contents is rebuilt with the page each one starts on.
+    """
     import markdown
-    from weasyprint import HTML
+    from src.output.pdf_chapters import Chapter, ChapterPDFRenderer, split_markdown_chapters
 
-    # Convert MD to HTML
-    html_body = markdown.markdown(
-        md_content,
-        extensions=["tables", "toc", "fenced_code"],
-    )
+    def to_html(md: str) -> str:
+        return markdown.markdown(md, extensions=["tables", "toc", "fenced_code"])
 
     # CSS for professional styling
     font_family = "'Noto Sans CJK SC', 'Noto Sans', Arial, sans-serif" if chinese else "'Noto Sans', Arial, sans-serif"
@@ -530,11 +639,6 @@ def generate_pdf(md_content: str, output_path: Path, chinese: bool = True):
     @page {{
         size: A4;
         margin: 2cm 1.5cm;
-        @bottom-center {{
-            content: counter(page) " / " counter(pages);
-            font-size: 9pt;
-            color: #888;
-        }}
     }}
     body {{
         font-family: {font_family};
@@ -614,18 +718,31 @@ def generate_pdf(md_content: str, output_path: Path, chinese: bool = True):
     }}
     """
 
-    full_html = f"""<!DOCTYPE html>
-<html>
-<head>
-<meta charset="utf-8">
-<style>{css}</style>
-</head>
-<body>
-{html_body}
-</body>
-</html>"""
+    # Page numbers, stamped on the assembled document
+    footer_css = f"""
+    @page {{
+        size: A4;
+        margin: 2cm 1.5cm;
+        @bottom-center {{
+            content: counter(page) " / " counter(pages);
+            font-family: {font_family};
+            font-size: 9pt;
+            color: #888;
+        }}
+    }}
+    """
+
+    preamble, sections = split_markdown_chapters(md_content, levels=(2, 4))
+    chapters = [Chapter(title, level, to_html(md)) for title, level, md in sections
+                if title != _TOC_TITLE]
+
+    def front(toc) -> str:
+        # Operator sections are indented under their part
+        rows = [["\u3000\u3000" * (chapter.level > 2) + chapter.title, page]
+                for chapter, page in toc]
+        return to_html(f"{preamble}\n\n## {_TOC_TITLE}\n\n{_md_table(['章节', '页码'], rows)}\n")
 
-    HTML(string=full_html).write_pdf(str(output_path))
+    ChapterPDFRenderer(css, footer_css).render(chapters, output_path, front=front)
 
 
 # =========================================================================
@@ -1008,43 +1125,96 @@ def generate_ppt(all_results, all_diagnoses, group_summaries, output_path: Path)
 # Main
 # =========================================================================
 
-def main():
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+# =========================================================================
+# Step 5: Render PDFs and PPTX
+# =========================================================================
 
-    # Step 1: Seed & Analyze
-    all_results, all_diagnoses, group_summaries = seed_and_analyze()
+def render_outputs(md_content, all_results, all_diagnoses, group_summaries,
+                   pool=None, timer: StageTimer = None) -> dict:
+    """Render the Chinese and English PDFs and the PPTX deck.
 
-    print(f"\nAnalysis complete: {len(all_results)}/{len(ALL_OPERATORS)} operators")
+    On a ``pool`` the three renders run concurrently.  Each one succeeds or
+    fails on its own; a failure is reported and the others are kept.
 
-    # Step 2: Generate MD
-    print("\n[Phase 4] Generating consolidated Markdown report...")
-    md_content = generate_md(all_results, all_diagnoses, group_summaries)
-    md_path = OUTPUT_DIR / "blm_niel_group_consolidated_cq4_2025.md"
-    md_path.write_text(md_content, encoding="utf-8")
-    md_lines = md_content.count("\n") + 1
-    print(f"  MD: {md_path} ({md_lines} lines, {md_path.stat().st_size / 1024:.1f} KB)")
+    Returns {label: output path} of the artifacts written.
+    """
+    timer = timer or StageTimer()
+    jobs = [
+        ("PDF (zh)", OUTPUT_DIR / "blm_niel_group_consolidated_cq4_2025_zh.pdf",
+         generate_pdf, (md_content,), {"chinese": True}),
+        ("PDF", OUTPUT_DIR / "blm_niel_group_consolidated_cq4_2025.pdf",
+         generate_pdf, (md_content,), {"chinese": False}),
+        ("PPTX", OUTPUT_DIR / "blm_niel_group_consolidated_cq4_2025.pptx",
+         generate_ppt, (all_results, all_diagnoses, group_summaries), {}),
+    ]
 
-    # Step 3: Generate PDFs
-    print("\n[Phase 5] Generating PDF reports...")
-    try:
-        pdf_zh_path = OUTPUT_DIR / "blm_niel_group_consolidated_cq4_2025_zh.pdf"
-        generate_pdf(md_content, pdf_zh_path, chinese=True)
-        print(f"  PDF (zh): {pdf_zh_path} ({pdf_zh_path.stat().st_size / 1024:.1f} KB)")
+    with timer.stage("render"):
+        if pool is not None:
+            futures = [pool.submit(_timed, fn, *args, path, **kwargs)
+                       for _, path, fn, args, kwargs in jobs]
+            outcomes = [_outcome(f.result) for f in futures]
+        else:
+            outcomes = [_outcome(_timed, fn, *args, path, **kwargs)
+                        for _, path, fn, args, kwargs in jobs]
+
+    written = {}
+    for (label, path, *_), (value, seconds, error) in zip(jobs, outcomes):
+        if error is not None:
+            print(f"  {label} generation failed: {error}")
+            continue
+        timer.add(f"  {label}", seconds)
+        detail = f"{value} slides, " if label == "PPTX" else ""
+        print(f"  {label}: {path} ({detail}{path.stat().st_size / 1024:.1f} KB, {seconds:.1f}s)")
+        written[label] = path
+    return written
 
-        pdf_path = OUTPUT_DIR / "blm_niel_group_consolidated_cq4_2025.pdf"
-        generate_pdf(md_content, pdf_path, chinese=False)
-        print(f"  PDF: {pdf_path} ({pdf_path.stat().st_size / 1024:.1f} KB)")
-    except Exception as e:
-        print(f"  PDF generation failed: {e}")
 
-    # Step 4: Generate PPT
-    print("\n[Phase 6] Generating PowerPoint deck...")
+def _outcome(fn, *args, **kwargs):
+    """(value, seconds, None) of a ``_timed`` call, or (None, None, error)."""
     try:
-        pptx_path = OUTPUT_DIR / "blm_niel_group_consolidated_cq4_2025.pptx"
-        n_slides = generate_ppt(all_results, all_diagnoses, group_summaries, pptx_path)
-        print(f"  PPTX: {pptx_path} ({n_slides} slides, {pptx_path.stat().st_size / 1024:.1f} KB)")
+        value, seconds = fn(*args, **kwargs)
     except Exception as e:
-        print(f"  PPT generation failed: {e}")
+        return None, None, e
+    return value, seconds, None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Xavier Niel group consolidated report")
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1,
+        help="Worker processes for analysis and rendering (1: run in-process)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    timer = StageTimer()
+
+    # Workers warm up while the markets are seeded
+    pool = start_pool(args.workers)
+    try:
+        # Step 1: Seed & Analyze
+        all_results, all_diagnoses, group_summaries = seed_and_analyze(pool, timer)
+
+        print(f"\nAnalysis complete: {len(all_results)}/{len(ALL_OPERATORS)} operators")
+
+        # Step 2: Generate MD
+        print("\n[Phase 4] Generating consolidated Markdown report...")
+        with timer.stage("markdown"):
+            md_content = generate_md(all_results, all_diagnoses, group_summaries)
+            md_path = OUTPUT_DIR / "blm_niel_group_consolidated_cq4_2025.md"
+            md_path.write_text(md_content, encoding="utf-8")
+        md_lines = md_content.count("\n") + 1
+        print(f"  MD: {md_path} ({md_lines} lines, {md_path.stat().st_size / 1024:.1f} KB)")
+
+        # Step 3: Generate PDFs and PPT
+        print("\n[Phase 5] Rendering PDF reports and PowerPoint deck...")
+        render_outputs(md_content, all_results, all_diagnoses, group_summaries, pool, timer)
+    finally:
+        if pool is not None:
+            pool.shutdown()
 
     # Summary
     print(f"\n{'=' * 70}")
@@ -1054,6 +1224,7 @@ def main():
     outputs = list(OUTPUT_DIR.glob("blm_niel_group_*"))
     for f in sorted(outputs):
         print(f"    {f.name} ({f.stat().st_size / 1024:.1f} KB)")
+    print(timer.report())
     print(f"{'=' * 70}")
     return 0
 
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Memory benchmark for the analysis models of a 22-market group run.
+
+Seeds every market of seed_orchestrator.ALL_MARKETS into its own in-memory
+database, runs Five Looks for one operator per market and keeps all 22
+FiveLooksResult objects alive, as a group report does.  Reports the Python
+heap held by the results (tracemalloc), in total and per model instance,
+and the model instance counts.
+
+By default the run is repeated in two subprocesses, with slotted models
+(BLM_MODEL_SLOTS=1) and without (BLM_MODEL_SLOTS=0), and the two compared.
+
+Usage:
+    python3 scripts/benchmark_model_memory.py                 # slots vs no slots
+    python3 scripts/benchmark_model_memory.py --single        # current setting only
+    python3 scripts/benchmark_model_memory.py germany chile   # subset of markets
+"""
+
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import gc
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+# ── Setup ──
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def _seed_market(market: str):
+    """Fresh in-memory database holding one market."""
+    from src.database import seed_orchestrator as so
+    from src.database.db import TelecomDatabase
+
+    db = TelecomDatabase(":memory:")
+    db.init()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if market == "germany":
+            so._seed_germany_into(db)
+        elif market == "chile":
+            so._seed_chile_into(db)
+        elif market in so.LATAM_MARKETS:
+            so._seed_latam_market(db, market)
+        else:
+            so._seed_europe_market(db, market)
+    return db
+
+
+def _target_operator(db, market: str) -> str:
+    """Tigo where present (the group report's view), else the first operator."""
+    from src.database.seed_orchestrator import TIGO_OPERATORS
+
+    tigo = dict((m, op) for op, m in TIGO_OPERATORS).get(market)
+    operators = [op["operator_id"] for op in db.get_operators_in_market(market)]
+    return tigo if tigo in operators else operators[0]
+
+
+def _count_models(obj, counts: Counter, seen: set) -> None:
+    """Count src.models dataclass instances reachable from ``obj``."""
+    if id(obj) in seen:
+        return
+    seen.add(id(obj))
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        if type(obj).__module__.startswith("src.models"):
+            counts[type(obj).__name__] += 1
+        for f in dataclasses.fields(obj):
+            _count_models(getattr(obj, f.name, None), counts, seen)
+    elif isinstance(obj, dict):
+        for v in obj.values():
+            _count_models(v, counts, seen)
+    elif isinstance(obj, (list, tuple, set)):
+        for v in obj:
+            _count_models(v, counts, seen)
+    elif hasattr(obj, "_values") and isinstance(obj._values, list):
+        _count_models(obj._values, counts, seen)  # ProvenanceStore
+
+
+def run_single(markets: list[str]) -> dict:
+    """Run the group workload in this process; returns the measurements."""
+    from src.blm.engine import BLMAnalysisEngine
+    from src.models import SLOTS
+
+    results, failed = [], []
+    start = time.perf_counter()
+    tracemalloc.start()
+    held = 0
+    for market in markets:
+        try:
+            db = _seed_market(market)
+            operator = _target_operator(db, market)
+        except Exception as e:
+            print(f"  [!] Seeding {market} failed: {e}", file=sys.stderr)
+            failed.append(market)
+            continue
+
+        gc.collect()
+        before = tracemalloc.get_traced_memory()[0]
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                engine = BLMAnalysisEngine(db, operator, market)
+                results.append(engine.run_five_looks())
+        except Exception as e:
+            print(f"  [!] Analysis of {market} failed: {e}", file=sys.stderr)
+            failed.append(market)
+        finally:
+            engine = None
+            db.close()
+        gc.collect()
+        held += tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    counts: Counter = Counter()
+    seen: set = set()
+    for result in results:
+        _count_models(result, counts, seen)
+    return {
+        "slots": bool(SLOTS),
+        "markets": len(results),
+        "failed": failed,
+        "held_kb": round(held / 1024, 1),
+        "instances": sum(counts.values()),
+        "bytes_per_instance": round(held / max(1, sum(counts.values())), 1),
+        "by_model": dict(counts.most_common(8)),
+        "seconds": round(time.perf_counter() - start, 2),
+    }
+
+
+def _run_subprocess(markets: list[str], slots: bool) -> dict:
+    env = dict(os.environ, BLM_MODEL_SLOTS="1" if slots else "0")
+    proc = subprocess.run(
+        [sys.executable, __file__, "--single", "--json", *markets],
+        env=env, capture_output=True, text=True, cwd=PROJECT_ROOT,
+    )
+    sys.stderr.write(proc.stderr)
+    if proc.returncode != 0:
+        raise RuntimeError(f"benchmark subprocess exited {proc.returncode}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _print_report(m: dict) -> None:
+    label = "slotted" if m["slots"] else "__dict__"
+    print(f"  {label:<9} {m['markets']:>2} markets  {m['instances']:>6} model objects  "
+          f"{m['held_kb']:>10,.1f} KB held  {m['bytes_per_instance']:>7,.1f} B/object  "
+          f"({m['seconds']}s)")
+
+
+def main(argv: list[str]) -> int:
+    from src.database.seed_orchestrator import ALL_MARKETS
+
+    single = "--single" in argv
+    as_json = "--json" in argv
+    markets = [a for a in argv if not a.startswith("--")] or ALL_MARKETS
+
+    if single:
+        measured = run_single(markets)
+        if as_json:
+            print(json.dumps(measured))
+        else:
+            _print_report(measured)
+            print(f"  Largest model types: {measured['by_model']}")
+        return 0
+
+    print(f"Model memory, Five Looks results for {len(markets)} markets")
+    slotted = _run_subprocess(markets, slots=True)
+    plain = _run_subprocess(markets, slots=False)
+    _print_report(plain)
+    _print_report(slotted)
+    if plain["held_kb"]:
+        saved = 1 - slotted["held_kb"] / plain["held_kb"]
+        print(f"  Saved: {plain['held_kb'] - slotted['held_kb']:,.1f} KB ({saved:.0%}), "
+              f"{plain['bytes_per_instance'] - slotted['bytes_per_instance']:,.1f} B/object")
+    print(f"  Largest model types: {slotted['by_model']}")
+    if slotted["failed"]:
+        print(f"  [!] Skipped markets: {', '.join(slotted['failed'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
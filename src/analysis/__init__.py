@@ -1,5 +1,6 @@
 """Financial analysis module."""
 
 from src.analysis.financial import BudgetAnalyzer, AnalysisResult
+from src.analysis.streaming import StreamingBudgetAnalyzer
 
-__all__ = ["BudgetAnalyzer", "AnalysisResult"]
+__all__ = ["BudgetAnalyzer", "AnalysisResult", "StreamingBudgetAnalyzer"]
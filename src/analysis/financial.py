@@ -5,7 +5,7 @@ and comparative analysis across fiscal periods.
 """
 
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Callable, Optional
 
 import numpy as np
 import pandas as pd
@@ -34,6 +34,49 @@ class BudgetAnalyzer:
 
     def __init__(self, df: pd.DataFrame):
         self.df = df.copy()
+        self._shared: Optional[_SharedPass] = None
+
+    def _pass(self) -> "_SharedPass":
+        """The run_all() pass if one is active, else a fresh one."""
+        return self._shared if self._shared is not None else _SharedPass(self.df)
+
+    def run_all(
+        self,
+        amount_col: str = "amount",
+        budget_col: str = "budget",
+        actual_col: str = "actual",
+        category_col: Optional[str] = "category",
+        date_col: str = "date",
+        year_col: str = "fiscal_year",
+        state_col: str = "state",
+        freq: str = "YE",
+        threshold: float = 2.0,
+        progress: Optional[Callable[[str], None]] = None,
+    ) -> list:
+        """Run every analysis the columns allow, in one shared pass.
+
+        Results are identical to calling the analyses one by one, but each
+        group key column is factorized once, each (key, value, function)
+        aggregate and the parsed date column are computed once and reused
+        (summary statistics and category breakdown share their per-category
+        sums, for instance), and no analysis copies the frame.
+
+        Args:
+            progress: Called with a message before each analysis.
+
+        Returns:
+            List of AnalysisResult, in run_analyses() order.
+        """
+        self._shared = _SharedPass(self.df)
+        try:
+            return run_analyses(
+                self, list(self.df.columns),
+                amount_col=amount_col, budget_col=budget_col, actual_col=actual_col,
+                category_col=category_col, date_col=date_col, year_col=year_col,
+                state_col=state_col, freq=freq, threshold=threshold, progress=progress,
+            )
+        finally:
+            self._shared = None
 
     def summary_statistics(
         self,
@@ -52,9 +95,12 @@ class BudgetAnalyzer:
         if amount_col not in self.df.columns:
             raise ValueError(f"Column '{amount_col}' not found in data.")
 
+        shared = self._pass()
         if group_col and group_col in self.df.columns:
-            grouped = self.df.groupby(group_col)[amount_col]
-            details = grouped.agg(["count", "sum", "mean", "median", "std", "min", "max"])
+            details = shared.aggregate(
+                [group_col], self.df[amount_col],
+                ["count", "sum", "mean", "median", "std", "min", "max"],
+            )
             details = details.reset_index()
             summary = {
                 "total": float(self.df[amount_col].sum()),
@@ -63,7 +109,8 @@ class BudgetAnalyzer:
                 "smallest_group": details.loc[details["sum"].idxmin(), group_col],
             }
         else:
-            series = self.df[amount_col].dropna()
+            series = shared.derived(("non_null", amount_col),
+                                    lambda: self.df[amount_col].dropna())
             details = pd.DataFrame(
                 {
                     "metric": ["count", "total", "mean", "median", "std", "min", "max"],
@@ -110,40 +157,48 @@ class BudgetAnalyzer:
             if col not in self.df.columns:
                 raise ValueError(f"Column '{col}' not found in data.")
 
-        df = self.df.copy()
-        df["variance"] = df[actual_col] - df[budget_col]
-        df["variance_pct"] = (df["variance"] / df[budget_col].replace(0, np.nan)) * 100
-
-        if category_col and category_col in df.columns:
-            details = (
-                df.groupby(category_col)
-                .agg(
-                    total_budget=(budget_col, "sum"),
-                    total_actual=(actual_col, "sum"),
-                    total_variance=("variance", "sum"),
-                    avg_variance_pct=("variance_pct", "mean"),
-                )
-                .reset_index()
-            )
-        else:
-            details = df[[budget_col, actual_col, "variance", "variance_pct"]]
-
-        over_budget = df[df["variance"] > 0]
-        under_budget = df[df["variance"] < 0]
+        shared = self._pass()
+        budget, actual = self.df[budget_col], self.df[actual_col]
+        variance = shared.derived(
+            ("variance", budget_col, actual_col),
+            lambda: (actual - budget).rename("variance"),
+        )
+        variance_pct = shared.derived(
+            ("variance_pct", budget_col, actual_col),
+            lambda: ((variance / budget.replace(0, np.nan)) * 100).rename("variance_pct"),
+        )
 
+        if category_col and category_col in self.df.columns:
+            keys = [category_col]
+            details = pd.DataFrame({
+                "total_budget": shared.aggregate(keys, budget, ["sum"])["sum"],
+                "total_actual": shared.aggregate(keys, actual, ["sum"])["sum"],
+                "total_variance": shared.aggregate(keys, variance, ["sum"],
+                                                   label=("variance", budget_col, actual_col))["sum"],
+                "avg_variance_pct": shared.aggregate(keys, variance_pct, ["mean"],
+                                                     label=("variance_pct", budget_col, actual_col))["mean"],
+            }).reset_index()
+        else:
+            details = pd.DataFrame({
+                budget_col: budget,
+                actual_col: actual,
+                "variance": variance,
+                "variance_pct": variance_pct,
+            })
+
+        total_budget = budget.sum()
+        total_actual = actual.sum()
         summary = {
-            "total_budget": float(df[budget_col].sum()),
-            "total_actual": float(df[actual_col].sum()),
-            "total_variance": float(df["variance"].sum()),
+            "total_budget": float(total_budget),
+            "total_actual": float(total_actual),
+            "total_variance": float(variance.sum()),
             "overall_variance_pct": float(
-                (df[actual_col].sum() - df[budget_col].sum())
-                / df[budget_col].sum()
-                * 100
+                (total_actual - total_budget) / total_budget * 100
             )
-            if df[budget_col].sum() != 0
+            if total_budget != 0
             else 0.0,
-            "items_over_budget": int(len(over_budget)),
-            "items_under_budget": int(len(under_budget)),
+            "items_over_budget": int((variance > 0).sum()),
+            "items_under_budget": int((variance < 0).sum()),
         }
 
         return AnalysisResult(
@@ -172,47 +227,44 @@ class BudgetAnalyzer:
             if col not in self.df.columns:
                 raise ValueError(f"Column '{col}' not found in data.")
 
-        df = self.df.copy()
-        df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
-        df = df.dropna(subset=[date_col, amount_col])
-
-        df = df.set_index(date_col)
-        trend = df[amount_col].resample(freq).agg(["sum", "mean", "count"])
-        trend = trend.reset_index()
-        trend.columns = [date_col, "total", "average", "count"]
-
-        # Calculate period-over-period change
-        trend["change"] = trend["total"].diff()
-        trend["change_pct"] = trend["total"].pct_change() * 100
+        shared = self._pass()
+        dates = shared.derived(
+            ("dates", date_col),
+            lambda: pd.to_datetime(self.df[date_col], errors="coerce"),
+        )
+        amount = self.df[amount_col]
+        keep = dates.notna() & amount.notna()
+        bins = shared.period_bins(date_col, dates, freq) if keep.any() else None
 
-        # Linear trend
-        if len(trend) > 1:
-            x = np.arange(len(trend))
-            coeffs = np.polyfit(x, trend["total"].values, 1)
-            trend_direction = "increasing" if coeffs[0] > 0 else "decreasing"
-            slope = float(coeffs[0])
+        if bins is None:
+            amount = amount[keep].set_axis(pd.Index(dates[keep], name=date_col))
+            trend = amount.resample(freq).agg(["sum", "mean", "count"])
         else:
-            trend_direction = "insufficient_data"
-            slope = 0.0
-
-        summary = {
-            "periods": int(len(trend)),
-            "trend_direction": trend_direction,
-            "slope_per_period": slope,
-            "total_growth_pct": float(
-                (trend["total"].iloc[-1] - trend["total"].iloc[0])
-                / trend["total"].iloc[0]
-                * 100
+            # resample()'s bins and summation order (rows stably sorted by
+            # date), sorting the dense date codes instead of the timestamps
+            date_codes, stamp_periods = bins
+            kept = keep.to_numpy()
+            date_codes, amount = date_codes[kept], amount[keep]
+            if (np.diff(date_codes) < 0).any():
+                small = date_codes.astype(np.uint16) if len(stamp_periods) <= 1 << 16 else date_codes
+                order = np.argsort(small, kind="stable")
+                date_codes, amount = date_codes[order], amount.take(order)
+            ordinals = stamp_periods.asi8[date_codes]
+            first = ordinals.min()
+            grouped = amount.groupby(ordinals - first).agg(["sum", "mean", "count"])
+            n_periods = int(ordinals.max() - first) + 1
+            trend = (
+                grouped.reindex(np.arange(n_periods))
+                .fillna({"sum": 0, "count": 0})
+                .astype(grouped.dtypes.to_dict())
             )
-            if len(trend) > 1 and trend["total"].iloc[0] != 0
-            else 0.0,
-        }
-
-        return AnalysisResult(
-            name="trend_analysis",
-            summary=summary,
-            details=trend,
-        )
+            labels = pd.period_range(
+                start=pd.Period(ordinal=first, freq=stamp_periods.freq), periods=n_periods,
+            ).end_time.normalize().as_unit(dates.dt.unit)
+            trend.index = pd.Index(labels, name=date_col)
+        trend = trend.reset_index()
+        trend.columns = [date_col, "total", "average", "count"]
+        return _trend_result(trend)
 
     def detect_anomalies(
         self,
@@ -231,8 +283,8 @@ class BudgetAnalyzer:
         if amount_col not in self.df.columns:
             raise ValueError(f"Column '{amount_col}' not found in data.")
 
-        df = self.df.copy()
-        series = df[amount_col].dropna()
+        series = self._pass().derived(("non_null", amount_col),
+                                      lambda: self.df[amount_col].dropna())
 
         mean = series.mean()
         std = series.std()
@@ -244,15 +296,18 @@ class BudgetAnalyzer:
                 details=pd.DataFrame(),
             )
 
-        df["z_score"] = (df[amount_col] - mean) / std
-        df["is_anomaly"] = df["z_score"].abs() > threshold
+        z_score = (self.df[amount_col] - mean) / std
+        is_anomaly = z_score.abs() > threshold
 
-        anomalies = df[df["is_anomaly"]].copy()
+        anomalies = self.df[is_anomaly].copy()
+        anomalies["z_score"] = z_score[is_anomaly]
+        anomalies["is_anomaly"] = is_anomaly[is_anomaly]
 
+        n_records = len(self.df)
         summary = {
-            "total_records": int(len(df)),
+            "total_records": int(n_records),
             "anomalies_found": int(len(anomalies)),
-            "anomaly_rate": float(len(anomalies) / len(df) * 100) if len(df) > 0 else 0.0,
+            "anomaly_rate": float(len(anomalies) / n_records * 100) if n_records > 0 else 0.0,
             "threshold": threshold,
             "mean": float(mean),
             "std": float(std),
@@ -283,28 +338,12 @@ class BudgetAnalyzer:
                 raise ValueError(f"Column '{col}' not found in data.")
 
         breakdown = (
-            self.df.groupby(category_col)[amount_col]
-            .agg(["sum", "mean", "count"])
+            self._pass()
+            .aggregate([category_col], self.df[amount_col], ["sum", "mean", "count"])
             .reset_index()
         )
         breakdown.columns = [category_col, "total", "average", "count"]
-
-        total = breakdown["total"].sum()
-        breakdown["percentage"] = (breakdown["total"] / total * 100) if total != 0 else 0
-        breakdown = breakdown.sort_values("total", ascending=False)
-
-        summary = {
-            "total_categories": int(len(breakdown)),
-            "total_amount": float(total),
-            "top_category": breakdown.iloc[0][category_col] if len(breakdown) > 0 else None,
-            "top_category_pct": float(breakdown.iloc[0]["percentage"]) if len(breakdown) > 0 else 0.0,
-        }
-
-        return AnalysisResult(
-            name="category_breakdown",
-            summary=summary,
-            details=breakdown,
-        )
+        return _category_breakdown_result(breakdown, category_col)
 
     def year_over_year(
         self,
@@ -326,72 +365,30 @@ class BudgetAnalyzer:
             if col not in self.df.columns:
                 raise ValueError(f"Column '{col}' not found in data.")
 
-        df = self.df.copy()
+        shared = self._pass()
+        amount = self.df[amount_col]
 
-        if category_col and category_col in df.columns:
+        if category_col and category_col in self.df.columns:
             yearly = (
-                df.groupby([year_col, category_col])[amount_col]
-                .sum()
+                shared.aggregate([year_col, category_col], amount, ["sum"])["sum"]
+                .rename(amount_col)
                 .reset_index()
             )
-            pivot = yearly.pivot_table(
-                index=category_col, columns=year_col,
-                values=amount_col, fill_value=0,
-            )
-            years = sorted(pivot.columns)
-            yoy_details = pd.DataFrame({category_col: pivot.index})
-            for i in range(1, len(years)):
-                prev, curr = years[i - 1], years[i]
-                col_name = f"{prev}_to_{curr}_change_pct"
-                prev_vals = pivot[prev].replace(0, np.nan)
-                yoy_details[f"{prev}"] = pivot[prev].values
-                yoy_details[f"{curr}"] = pivot[curr].values
-                yoy_details[col_name] = (
-                    (pivot[curr] - pivot[prev]) / prev_vals * 100
-                ).values
-            details = yoy_details.reset_index(drop=True)
         else:
             yearly = (
-                df.groupby(year_col)[amount_col]
-                .agg(["sum", "mean", "count"])
+                shared.aggregate([year_col], amount, ["sum", "mean", "count"])
                 .reset_index()
             )
-            yearly.columns = [year_col, "total", "average", "count"]
-            yearly = yearly.sort_values(year_col)
-            yearly["yoy_change"] = yearly["total"].diff()
-            yearly["yoy_change_pct"] = yearly["total"].pct_change() * 100
-            details = yearly
-
-        # Ensure year column is numeric for sorting/display
-        if pd.api.types.is_datetime64_any_dtype(df[year_col]):
-            df[year_col] = df[year_col].dt.year
-
-        years_list = sorted(df[year_col].unique())
-        first_year_total = float(
-            df[df[year_col] == years_list[0]][amount_col].sum()
-        )
-        last_year_total = float(
-            df[df[year_col] == years_list[-1]][amount_col].sum()
-        )
-
-        summary = {
-            "years_covered": len(years_list),
-            "first_year": int(years_list[0]),
-            "last_year": int(years_list[-1]),
-            "first_year_total": first_year_total,
-            "last_year_total": last_year_total,
-            "cumulative_change_pct": float(
-                (last_year_total - first_year_total) / first_year_total * 100
-            )
-            if first_year_total != 0
-            else 0.0,
-        }
-
-        return AnalysisResult(
-            name="year_over_year",
-            summary=summary,
-            details=details,
-        )
+        year_totals = shared.year_totals(year_col, amount)
+        if not pd.api.types.is_datetime64_any_dtype(year_totals.index):
+            # The reported first/last year totals are summed over the rows of
+            # that year, as before; the grouped sums can differ in the last bit
+            ends = sorted(year_totals.index)
+            for year in {ends[0], ends[-1]}:
+                if pd.notna(year):
+                    year_totals[year] = amount[self.df[year_col] == year].sum()
+        return _year_over_year_result(yearly, year_totals, amount_col, year_col,
+                                      category_col if category_col in self.df.columns else None)
 
     def state_comparison(
         self,
@@ -412,28 +409,336 @@ class BudgetAnalyzer:
                 raise ValueError(f"Column '{col}' not found in data.")
 
         details = (
-            self.df.groupby(state_col)[amount_col]
-            .agg(["sum", "mean", "count", "std"])
+            self._pass()
+            .aggregate([state_col], self.df[amount_col], ["sum", "mean", "count", "std"])
             .reset_index()
         )
         details.columns = [state_col, "total", "average", "count", "std_dev"]
-        overall_total = details["total"].sum()
-        details["percentage"] = (
-            (details["total"] / overall_total * 100) if overall_total != 0 else 0
-        )
-        details = details.sort_values("total", ascending=False)
+        return _state_comparison_result(details, state_col)
+
+
+def run_analyses(
+    analyzer,
+    columns: list,
+    amount_col: str = "amount",
+    budget_col: str = "budget",
+    actual_col: str = "actual",
+    category_col: Optional[str] = "category",
+    date_col: str = "date",
+    year_col: str = "fiscal_year",
+    state_col: str = "state",
+    freq: str = "YE",
+    threshold: float = 2.0,
+    progress: Optional[Callable[[str], None]] = None,
+) -> list:
+    """Run every analysis whose columns are present, as ``analyze`` does.
+
+    Args:
+        analyzer: BudgetAnalyzer or StreamingBudgetAnalyzer.
+        columns: Column names of the data.
+        progress: Called with a message before each analysis.
+
+    Returns:
+        List of AnalysisResult.
+    """
+    steps = []
+    if amount_col in columns:
+        steps.append(("Running summary statistics...", lambda: analyzer.summary_statistics(
+            amount_col=amount_col, group_col=category_col)))
+    if budget_col in columns and actual_col in columns:
+        steps.append(("Running budget variance analysis...", lambda: analyzer.budget_variance(
+            budget_col=budget_col, actual_col=actual_col, category_col=category_col)))
+    if amount_col in columns and date_col in columns:
+        steps.append(("Running trend analysis...", lambda: analyzer.trend_analysis(
+            amount_col=amount_col, date_col=date_col, freq=freq)))
+    if amount_col in columns:
+        steps.append(("Running anomaly detection...", lambda: analyzer.detect_anomalies(
+            amount_col=amount_col, threshold=threshold)))
+    if amount_col in columns and category_col in columns:
+        steps.append(("Running category breakdown...", lambda: analyzer.category_breakdown(
+            amount_col=amount_col, category_col=category_col)))
+    if amount_col in columns and year_col in columns:
+        steps.append(("Running year-over-year analysis...", lambda: analyzer.year_over_year(
+            amount_col=amount_col, year_col=year_col, category_col=category_col)))
+    if amount_col in columns and state_col in columns:
+        steps.append(("Running state comparison...", lambda: analyzer.state_comparison(
+            amount_col=amount_col, state_col=state_col)))
+
+    results = []
+    for message, run in steps:
+        if progress:
+            progress(message)
+        results.append(run())
+    return results
+
+
+# ============================================================================
+# Shared grouping
+# ============================================================================
+
+class _GroupKey:
+    """One group key column, factorized once.
+
+    Grouping on the sorted codes (as a Categorical) gives the same groups,
+    in the same order, as grouping on the column itself, without hashing the
+    values again for every aggregation.  Categorical columns and values that
+    cannot be sorted are grouped as they are.
+    """
+
+    def __init__(self, values: pd.Series):
+        self.name = values.name
+        self.uniques = None
+        self.grouper = values
+        codes = None
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            try:
+                codes, uniques = pd.factorize(values, sort=True)
+            except TypeError:
+                pass
+        if codes is None:
+            self.has_missing = bool(values.isna().any())
+            return
+        self.has_missing = bool((codes < 0).any())
+        self.uniques = uniques
+        self.grouper = pd.Categorical.from_codes(codes, categories=np.arange(len(uniques)))
+
+    def labels(self, index: pd.Index) -> pd.Index:
+        """Group labels for an index of codes."""
+        if self.uniques is None:
+            return index
+        return pd.Index(self.uniques.take(np.asarray(index, dtype=np.intp)), name=self.name)
+
+
+class _SharedPass:
+    """Group keys, derived columns and aggregates shared between analyses.
+
+    Each aggregate is computed once per (group keys, value, function), so
+    analyses asking for the same statistic share it.  BudgetAnalyzer.run_all()
+    keeps one alive for all its analyses; standalone calls use a fresh one.
+    """
 
-        summary = {
-            "total_states": int(len(details)),
-            "total_amount": float(overall_total),
-            "highest_state": details.iloc[0][state_col] if len(details) > 0 else None,
-            "highest_amount": float(details.iloc[0]["total"]) if len(details) > 0 else 0.0,
-            "lowest_state": details.iloc[-1][state_col] if len(details) > 0 else None,
-            "lowest_amount": float(details.iloc[-1]["total"]) if len(details) > 0 else 0.0,
-        }
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._keys: dict = {}
+        self._groupbys: dict = {}
+        self._aggregates: dict = {}
+        self._derived: dict = {}
+
+    def derived(self, key, compute: Callable):
+        """Value computed once per pass (parsed dates, variances, ...)."""
+        if key not in self._derived:
+            self._derived[key] = compute()
+        return self._derived[key]
+
+    def key(self, col: str) -> _GroupKey:
+        if col not in self._keys:
+            self._keys[col] = _GroupKey(self.df[col])
+        return self._keys[col]
+
+    def aggregate(self, keys: list, values: pd.Series, funcs: list,
+                  label=None) -> pd.DataFrame:
+        """``values.groupby(keys).agg(funcs)``, indexed by the key labels.
 
-        return AnalysisResult(
-            name="state_comparison",
-            summary=summary,
-            details=details,
+        Args:
+            keys: Group key column names.
+            values: Series aligned with the frame.
+            funcs: GroupBy reduction names ("sum", "mean", "std", ...).
+            label: Cache label of ``values``; defaults to its name.
+        """
+        group_keys = [self.key(col) for col in keys]
+        cache_key = (tuple(keys), values.name if label is None else label)
+        if cache_key not in self._groupbys:
+            groupers = [k.grouper for k in group_keys]
+            self._groupbys[cache_key] = values.groupby(
+                groupers[0] if len(groupers) == 1 else groupers, observed=True)
+        grouped = self._groupbys[cache_key]
+
+        for func in funcs:
+            if (cache_key, func) not in self._aggregates:
+                self._aggregates[(cache_key, func)] = getattr(grouped, func)()
+        table = pd.DataFrame({func: self._aggregates[(cache_key, func)] for func in funcs})
+
+        if len(group_keys) == 1:
+            table.index = group_keys[0].labels(table.index)
+        else:
+            table.index = pd.MultiIndex.from_arrays(
+                [k.labels(table.index.get_level_values(i))
+                 for i, k in enumerate(group_keys)])
+        return table
+
+    def period_bins(self, date_col: str, dates: pd.Series, freq: str) -> Optional[tuple]:
+        """resample() bins of ``dates`` for single year/quarter/month-end ``freq``.
+
+        Returns:
+            (codes, periods): each row's code into the sorted distinct dates
+            (-1 for NaT) and the PeriodIndex of those dates, or None for
+            other frequencies and time zone aware dates, which are resampled.
+        """
+        offset = pd.tseries.frequencies.to_offset(freq)
+        if (not isinstance(offset, (pd.offsets.YearEnd, pd.offsets.QuarterEnd,
+                                    pd.offsets.MonthEnd))
+                or offset.n != 1
+                or not isinstance(dates.dtype, np.dtype)
+                or dates.dtype.kind != "M"):
+            return None
+        codes, stamps = self.derived(("date_codes", date_col),
+                                     lambda: pd.factorize(dates, sort=True))
+        return codes, self.derived(("periods", date_col, freq),
+                                   lambda: stamps.to_period(offset))
+
+    def year_totals(self, year_col: str, values: pd.Series) -> pd.Series:
+        """Sum of ``values`` per year, missing years included."""
+        key = self.key(year_col)
+        if key.has_missing:
+            return values.groupby(self.df[year_col], dropna=False).sum()
+        return self.aggregate([year_col], values, ["sum"])["sum"].rename(values.name)
+
+
+# ============================================================================
+# Result assembly from aggregated tables
+# ============================================================================
+# Shared by BudgetAnalyzer and the chunked StreamingBudgetAnalyzer
+# (src/analysis/streaming.py), which build the same aggregate tables from
+# partial aggregates.
+
+def _trend_result(trend: pd.DataFrame) -> AnalysisResult:
+    """trend_analysis result from per-period [date, total, average, count]."""
+    # Calculate period-over-period change
+    trend["change"] = trend["total"].diff()
+    trend["change_pct"] = trend["total"].pct_change() * 100
+
+    # Linear trend
+    if len(trend) > 1:
+        x = np.arange(len(trend))
+        coeffs = np.polyfit(x, trend["total"].values, 1)
+        trend_direction = "increasing" if coeffs[0] > 0 else "decreasing"
+        slope = float(coeffs[0])
+    else:
+        trend_direction = "insufficient_data"
+        slope = 0.0
+
+    summary = {
+        "periods": int(len(trend)),
+        "trend_direction": trend_direction,
+        "slope_per_period": slope,
+        "total_growth_pct": float(
+            (trend["total"].iloc[-1] - trend["total"].iloc[0])
+            / trend["total"].iloc[0]
+            * 100
+        )
+        if len(trend) > 1 and trend["total"].iloc[0] != 0
+        else 0.0,
+    }
+
+    return AnalysisResult(
+        name="trend_analysis",
+        summary=summary,
+        details=trend,
+    )
+
+
+def _category_breakdown_result(breakdown: pd.DataFrame,
+                               category_col: str) -> AnalysisResult:
+    """category_breakdown result from [category, total, average, count]."""
+    total = breakdown["total"].sum()
+    breakdown["percentage"] = (breakdown["total"] / total * 100) if total != 0 else 0
+    breakdown = breakdown.sort_values("total", ascending=False)
+
+    summary = {
+        "total_categories": int(len(breakdown)),
+        "total_amount": float(total),
+        "top_category": breakdown.iloc[0][category_col] if len(breakdown) > 0 else None,
+        "top_category_pct": float(breakdown.iloc[0]["percentage"]) if len(breakdown) > 0 else 0.0,
+    }
+
+    return AnalysisResult(
+        name="category_breakdown",
+        summary=summary,
+        details=breakdown,
+    )
+
+
+def _year_over_year_result(yearly: pd.DataFrame, year_totals: pd.Series,
+                           amount_col: str, year_col: str,
+                           category_col: Optional[str]) -> AnalysisResult:
+    """year_over_year result.
+
+    Args:
+        yearly: [year, category, amount sums] with ``category_col``, else
+            [year, sum, mean, count].
+        year_totals: Amount sum per year value over all rows.
+    """
+    if category_col:
+        pivot = yearly.pivot_table(
+            index=category_col, columns=year_col,
+            values=amount_col, fill_value=0,
+        )
+        years = sorted(pivot.columns)
+        yoy_details = pd.DataFrame({category_col: pivot.index})
+        for i in range(1, len(years)):
+            prev, curr = years[i - 1], years[i]
+            col_name = f"{prev}_to_{curr}_change_pct"
+            prev_vals = pivot[prev].replace(0, np.nan)
+            yoy_details[f"{prev}"] = pivot[prev].values
+            yoy_details[f"{curr}"] = pivot[curr].values
+            yoy_details[col_name] = (
+                (pivot[curr] - pivot[prev]) / prev_vals * 100
+            ).values
+        details = yoy_details.reset_index(drop=True)
+    else:
+        yearly.columns = [year_col, "total", "average", "count"]
+        yearly = yearly.sort_values(year_col)
+        yearly["yoy_change"] = yearly["total"].diff()
+        yearly["yoy_change_pct"] = yearly["total"].pct_change() * 100
+        details = yearly
+
+    # Ensure year values are numeric for sorting/display
+    if pd.api.types.is_datetime64_any_dtype(year_totals.index):
+        year_totals = year_totals.groupby(year_totals.index.year).sum()
+
+    years_list = sorted(year_totals.index)
+    first_year_total = float(year_totals[years_list[0]])
+    last_year_total = float(year_totals[years_list[-1]])
+
+    summary = {
+        "years_covered": len(years_list),
+        "first_year": int(years_list[0]),
+        "last_year": int(years_list[-1]),
+        "first_year_total": first_year_total,
+        "last_year_total": last_year_total,
+        "cumulative_change_pct": float(
+            (last_year_total - first_year_total) / first_year_total * 100
         )
+        if first_year_total != 0
+        else 0.0,
+    }
+
+    return AnalysisResult(
+        name="year_over_year",
+        summary=summary,
+        details=details,
+    )
+
+
+def _state_comparison_result(details: pd.DataFrame, state_col: str) -> AnalysisResult:
+    """state_comparison result from [state, total, average, count, std_dev]."""
+    overall_total = details["total"].sum()
+    details["percentage"] = (
+        (details["total"] / overall_total * 100) if overall_total != 0 else 0
+    )
+    details = details.sort_values("total", ascending=False)
+
+    summary = {
+        "total_states": int(len(details)),
+        "total_amount": float(overall_total),
+        "highest_state": details.iloc[0][state_col] if len(details) > 0 else None,
+        "highest_amount": float(details.iloc[0]["total"]) if len(details) > 0 else 0.0,
+        "lowest_state": details.iloc[-1][state_col] if len(details) > 0 else None,
+        "lowest_amount": float(details.iloc[-1]["total"]) if len(details) > 0 else 0.0,
+    }
+
+    return AnalysisResult(
+        name="state_comparison",
+        summary=summary,
+        details=details,
+    )
@@ -0,0 +1,503 @@
+"""Chunked (out-of-core) budget analysis.
+
+BudgetAnalyzer needs the whole ledger in one DataFrame.  The
+StreamingBudgetAnalyzer here reads it in chunks instead and keeps only
+mergeable partial aggregates, so memory is bounded by the number of groups
+(categories, states, years, trend periods), not rows:
+
+  - per group: count, sum, min, max, and mean/M2 merged with Chan's
+    parallel update, for the standard deviations;
+  - budget variance sums and over/under-budget counts;
+  - per-period trend totals.
+
+Its methods mirror BudgetAnalyzer's and return the same AnalysisResult
+summaries; the aggregate tables are finished by the same code
+(src/analysis/financial.py).  Differences:
+  - medians are not mergeable and are reported as NaN;
+  - budget_variance without a category column returns no per-row details;
+  - detect_anomalies() re-reads the data for a second pass, since the
+    z-scores need the global mean and standard deviation.
+
+Usage:
+    from src.analysis.streaming import StreamingBudgetAnalyzer
+
+    analyzer = StreamingBudgetAnalyzer(lambda: loader.iter_chunks(path))
+    analyzer.category_breakdown(amount_col="amount", category_col="category")
+"""
+
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.financial import (
+    AnalysisResult,
+    _category_breakdown_result,
+    _state_comparison_result,
+    _trend_result,
+    _year_over_year_result,
+    run_analyses,
+)
+
+_MOMENT_COLUMNS = ["count", "sum", "mean", "m2", "min", "max"]
+
+
+# ============================================================================
+# Mergeable moments
+# ============================================================================
+
+def group_moments(values: pd.Series, keys=None) -> pd.DataFrame:
+    """Partial aggregates of ``values`` per group of ``keys``.
+
+    Args:
+        values: Numeric series; NaN values are skipped.
+        keys: Series (or list of series) aligned with ``values``; rows with
+            a missing key are dropped.  None aggregates all rows under one
+            key (0).
+
+    Returns:
+        DataFrame indexed by group with columns count, sum, mean, m2 (sum
+        of squared deviations from the mean), min, max.
+    """
+    if keys is None:
+        keys = pd.Series(0, index=values.index)
+    grouped = values.groupby(keys)
+    moments = grouped.agg(["count", "sum", "mean", "min", "max"])
+    moments["m2"] = grouped.var(ddof=0) * moments["count"]
+    moments["mean"] = moments["mean"].fillna(0.0)
+    moments["m2"] = moments["m2"].fillna(0.0)
+    return moments[_MOMENT_COLUMNS]
+
+
+def merge_moments(a: Optional[pd.DataFrame], b: pd.DataFrame) -> pd.DataFrame:
+    """Combine two group_moments() tables (Chan et al. parallel update)."""
+    if a is None or a.empty:
+        return b.copy()
+    if b.empty:
+        return a
+    index = a.index.union(b.index)
+    a = a.reindex(index)
+    b = b.reindex(index)
+    na = a["count"].fillna(0).to_numpy(dtype=float)
+    nb = b["count"].fillna(0).to_numpy(dtype=float)
+    n = na + nb
+    mean_a = a["mean"].fillna(0).to_numpy(dtype=float)
+    mean_b = b["mean"].fillna(0).to_numpy(dtype=float)
+    delta = mean_b - mean_a
+    with np.errstate(invalid="ignore", divide="ignore"):
+        weight = np.where(n > 0, nb / n, 0.0)
+        cross = np.where(n > 0, delta * delta * na * nb / n, 0.0)
+    return pd.DataFrame({
+        "count": n.astype(np.int64),
+        "sum": a["sum"].fillna(0).to_numpy() + b["sum"].fillna(0).to_numpy(),
+        "mean": mean_a + delta * weight,
+        "m2": a["m2"].fillna(0).to_numpy() + b["m2"].fillna(0).to_numpy() + cross,
+        "min": np.fmin(a["min"].to_numpy(dtype=float), b["min"].to_numpy(dtype=float)),
+        "max": np.fmax(a["max"].to_numpy(dtype=float), b["max"].to_numpy(dtype=float)),
+    }, index=index)
+
+
+def _finish(moments: pd.DataFrame) -> pd.DataFrame:
+    """Add the pandas-style mean (NaN when empty) and sample std."""
+    out = moments.copy()
+    count = out["count"]
+    out["mean"] = (out["sum"] / count).where(count > 0)
+    out["std"] = np.sqrt(out["m2"] / (count - 1)).where(count > 1)
+    return out
+
+
+# ============================================================================
+# Streaming analyzer
+# ============================================================================
+
+class StreamingBudgetAnalyzer:
+    """BudgetAnalyzer over data read in chunks.
+
+    The grouping columns are fixed at construction; the first analysis
+    call makes one pass over ``chunk_source()`` accumulating everything.
+
+    Args:
+        chunk_source: Zero-argument callable returning a fresh iterable of
+            preprocessed chunks (called once, twice with detect_anomalies).
+        freq: Trend resampling frequency; must be an anchored one
+            ('YE', 'QE', 'ME', ...) so chunk periods line up.
+    """
+
+    def __init__(
+        self,
+        chunk_source: Callable[[], Iterable[pd.DataFrame]],
+        amount_col: str = "amount",
+        budget_col: str = "budget",
+        actual_col: str = "actual",
+        category_col: Optional[str] = "category",
+        date_col: str = "date",
+        year_col: str = "fiscal_year",
+        state_col: str = "state",
+        freq: str = "YE",
+    ):
+        self.chunk_source = chunk_source
+        self.amount_col = amount_col
+        self.budget_col = budget_col
+        self.actual_col = actual_col
+        self.category_col = category_col
+        self.date_col = date_col
+        self.year_col = year_col
+        self.state_col = state_col
+        self.freq = freq
+
+        self.columns: list[str] = []
+        self.n_records = 0
+        self.n_chunks = 0
+        self._loaded = False
+        self._amount = None          # moments over all rows
+        self._by_col: dict = {}      # group column -> amount moments
+        self._by_year = None
+        self._by_year_all = None     # year sums incl. rows without a year match
+        self._by_year_cat = None
+        self._trend = None
+        self._variance: dict = {}
+        self._variance_by_cat = None
+
+    # ------------------------------------------------------------------
+    # Accumulation
+    # ------------------------------------------------------------------
+
+    def load(self) -> "StreamingBudgetAnalyzer":
+        """Run the aggregation pass (once)."""
+        if not self._loaded:
+            for chunk in self.chunk_source():
+                self.consume(chunk)
+            self._loaded = True
+        return self
+
+    def consume(self, chunk: pd.DataFrame) -> None:
+        """Fold one preprocessed chunk into the partial aggregates."""
+        self.n_records += len(chunk)
+        self.n_chunks += 1
+        for col in chunk.columns:
+            if col not in self.columns:
+                self.columns.append(col)
+        amount = self._column(chunk, self.amount_col)
+
+        self._amount = merge_moments(self._amount, group_moments(amount))
+        for col in {self.category_col, self.state_col} - {None}:
+            if col in chunk.columns:
+                self._by_col[col] = merge_moments(
+                    self._by_col.get(col), group_moments(amount, chunk[col]))
+
+        if self.year_col in chunk.columns:
+            years = chunk[self.year_col]
+            self._by_year = merge_moments(self._by_year, group_moments(amount, years))
+            self._by_year_all = _add_series(
+                self._by_year_all, amount.groupby(years, dropna=False).sum())
+            if self.category_col in chunk.columns:
+                self._by_year_cat = _add_series(
+                    self._by_year_cat,
+                    amount.groupby([years, chunk[self.category_col]]).sum())
+
+        if self.date_col in chunk.columns:
+            self._consume_trend(chunk, amount)
+        if self.budget_col in chunk.columns and self.actual_col in chunk.columns:
+            self._consume_variance(chunk)
+
+    def _column(self, chunk: pd.DataFrame, col: str) -> pd.Series:
+        # preprocess() drops columns that are empty within a chunk
+        if col in chunk.columns:
+            return chunk[col]
+        return pd.Series(np.nan, index=chunk.index)
+
+    def _consume_trend(self, chunk: pd.DataFrame, amount: pd.Series) -> None:
+        dates = pd.to_datetime(chunk[self.date_col], errors="coerce")
+        valid = dates.notna() & amount.notna()
+        if not valid.any():
+            return
+        per_period = (
+            amount[valid].set_axis(dates[valid]).resample(self.freq).agg(["sum", "count"])
+        )
+        self._trend = (per_period if self._trend is None
+                       else self._trend.add(per_period, fill_value=0))
+
+    def _consume_variance(self, chunk: pd.DataFrame) -> None:
+        budget = chunk[self.budget_col]
+        actual = chunk[self.actual_col]
+        variance = actual - budget
+        variance_pct = (variance / budget.replace(0, np.nan)) * 100
+
+        totals = {
+            "budget": budget.sum(),
+            "actual": actual.sum(),
+            "variance": variance.sum(),
+            "over": int((variance > 0).sum()),
+            "under": int((variance < 0).sum()),
+        }
+        for key, value in totals.items():
+            self._variance[key] = self._variance.get(key, 0) + value
+
+        if self.category_col in chunk.columns:
+            frame = pd.DataFrame({
+                "total_budget": budget,
+                "total_actual": actual,
+                "total_variance": variance,
+                "pct_sum": variance_pct,
+                "pct_count": variance_pct.notna().astype(np.int64),
+            })
+            part = frame.groupby(chunk[self.category_col]).sum()
+            self._variance_by_cat = (part if self._variance_by_cat is None
+                                     else self._variance_by_cat.add(part, fill_value=0))
+
+    def _require(self, *cols) -> None:
+        self.load()
+        for col in cols:
+            if col not in self.columns:
+                raise ValueError(f"Column '{col}' not found in data.")
+
+    def _check_configured(self, **given) -> None:
+        for name, value in given.items():
+            configured = getattr(self, name)
+            if value != configured:
+                raise ValueError(
+                    f"{name}={value!r} was not aggregated; this analyzer was "
+                    f"built with {name}={configured!r}"
+                )
+
+    # ------------------------------------------------------------------
+    # Analyses (BudgetAnalyzer signatures)
+    # ------------------------------------------------------------------
+
+    def run_all(self, threshold: float = 2.0,
+                progress: Optional[Callable[[str], None]] = None,
+                **columns) -> list:
+        """Every analysis the data allows, as BudgetAnalyzer.run_all().
+
+        Column keyword arguments (amount_col=, freq=, ...) must match the
+        configured ones.
+        """
+        self._check_configured(**columns)
+        self.load()
+        return run_analyses(
+            self, self.columns,
+            amount_col=self.amount_col, budget_col=self.budget_col,
+            actual_col=self.actual_col, category_col=self.category_col,
+            date_col=self.date_col, year_col=self.year_col, state_col=self.state_col,
+            freq=self.freq, threshold=threshold, progress=progress,
+        )
+
+    def summary_statistics(self, amount_col: str = "amount",
+                           group_col: Optional[str] = None) -> AnalysisResult:
+        """Summary statistics; medians are NaN (see module docstring)."""
+        self._check_configured(amount_col=amount_col)
+        self._require(amount_col)
+        metadata = {"mode": "streaming", "omitted": ["median"]}
+
+        if group_col and group_col in self.columns:
+            if group_col not in self._by_col:
+                raise ValueError(f"group_col={group_col!r} was not aggregated")
+            stats = _finish(self._by_col[group_col])
+            details = pd.DataFrame({
+                "count": stats["count"],
+                "sum": stats["sum"],
+                "mean": stats["mean"],
+                "median": np.nan,
+                "std": stats["std"],
+                "min": stats["min"],
+                "max": stats["max"],
+            })
+            details.index.name = group_col
+            details = details.reset_index()
+            summary = {
+                "total": float(self._amount["sum"].sum()),
+                "groups": int(details.shape[0]),
+                "largest_group": details.loc[details["sum"].idxmax(), group_col],
+                "smallest_group": details.loc[details["sum"].idxmin(), group_col],
+            }
+        else:
+            stats = _finish(self._amount).iloc[0] if len(self._amount) else None
+            count = int(stats["count"]) if stats is not None else 0
+            total = float(stats["sum"]) if stats is not None else 0.0
+            mean = float(stats["mean"]) if count else np.nan
+            details = pd.DataFrame(
+                {
+                    "metric": ["count", "total", "mean", "median", "std", "min", "max"],
+                    "value": [
+                        count,
+                        total,
+                        mean,
+                        np.nan,
+                        stats["std"] if stats is not None else np.nan,
+                        stats["min"] if stats is not None else np.nan,
+                        stats["max"] if stats is not None else np.nan,
+                    ],
+                }
+            )
+            summary = {"total": total, "mean": mean, "count": count}
+
+        return AnalysisResult(
+            name="summary_statistics",
+            summary=summary,
+            details=details,
+            metadata=metadata,
+        )
+
+    def budget_variance(self, budget_col: str = "budget", actual_col: str = "actual",
+                        category_col: Optional[str] = None) -> AnalysisResult:
+        """Budget vs actual variance; per-row details need a category column."""
+        self._check_configured(budget_col=budget_col, actual_col=actual_col)
+        self._require(budget_col, actual_col)
+        totals = self._variance
+        metadata = {"mode": "streaming"}
+
+        if category_col and category_col in self.columns:
+            self._check_configured(category_col=category_col)
+            by_cat = self._variance_by_cat
+            details = pd.DataFrame({
+                "total_budget": by_cat["total_budget"],
+                "total_actual": by_cat["total_actual"],
+                "total_variance": by_cat["total_variance"],
+                "avg_variance_pct": (by_cat["pct_sum"] / by_cat["pct_count"])
+                .where(by_cat["pct_count"] > 0),
+            })
+            details.index.name = category_col
+            details = details.reset_index()
+        else:
+            details = pd.DataFrame(columns=[budget_col, actual_col, "variance", "variance_pct"])
+            metadata["omitted"] = ["details"]
+
+        summary = {
+            "total_budget": float(totals["budget"]),
+            "total_actual": float(totals["actual"]),
+            "total_variance": float(totals["variance"]),
+            "overall_variance_pct": float(
+                (totals["actual"] - totals["budget"]) / totals["budget"] * 100
+            )
+            if totals["budget"] != 0
+            else 0.0,
+            "items_over_budget": int(totals["over"]),
+            "items_under_budget": int(totals["under"]),
+        }
+
+        return AnalysisResult(
+            name="budget_variance",
+            summary=summary,
+            details=details,
+            metadata=metadata,
+        )
+
+    def trend_analysis(self, amount_col: str = "amount", date_col: str = "date",
+                       freq: str = "YE") -> AnalysisResult:
+        """Trend over time from the per-period partial totals."""
+        self._check_configured(amount_col=amount_col, date_col=date_col, freq=freq)
+        self._require(amount_col, date_col)
+
+        if self._trend is None:
+            trend = pd.DataFrame({date_col: pd.DatetimeIndex([]), "total": [],
+                                  "average": [], "count": []})
+        else:
+            # Periods without rows inside the range, as resample() gives
+            periods = self._trend.resample(freq).sum()
+            count = periods["count"].astype(np.int64)
+            trend = pd.DataFrame({
+                date_col: periods.index,
+                "total": periods["sum"].to_numpy(),
+                "average": (periods["sum"] / count).where(count > 0).to_numpy(),
+                "count": count.to_numpy(),
+            })
+        return _trend_result(trend)
+
+    def detect_anomalies(self, amount_col: str = "amount",
+                         threshold: float = 2.0) -> AnalysisResult:
+        """Z-score anomalies; a second pass over chunk_source() flags rows."""
+        self._check_configured(amount_col=amount_col)
+        self._require(amount_col)
+        stats = _finish(self._amount).iloc[0] if len(self._amount) else None
+        mean = stats["mean"] if stats is not None else np.nan
+        std = stats["std"] if stats is not None else np.nan
+
+        if std == 0 or np.isnan(std):
+            return AnalysisResult(
+                name="anomaly_detection",
+                summary={"anomalies_found": 0, "message": "No variance in data"},
+                details=pd.DataFrame(),
+            )
+
+        flagged = []
+        for chunk in self.chunk_source():
+            z_score = (self._column(chunk, amount_col) - mean) / std
+            is_anomaly = z_score.abs() > threshold
+            if is_anomaly.any():
+                rows = chunk[is_anomaly].copy()
+                rows["z_score"] = z_score[is_anomaly]
+                rows["is_anomaly"] = True
+                flagged.append(rows)
+        anomalies = pd.concat(flagged) if flagged else pd.DataFrame()
+
+        n = self.n_records
+        summary = {
+            "total_records": int(n),
+            "anomalies_found": int(len(anomalies)),
+            "anomaly_rate": float(len(anomalies) / n * 100) if n > 0 else 0.0,
+            "threshold": threshold,
+            "mean": float(mean),
+            "std": float(std),
+        }
+
+        return AnalysisResult(
+            name="anomaly_detection",
+            summary=summary,
+            details=anomalies,
+            metadata={"mode": "streaming"},
+        )
+
+    def category_breakdown(self, amount_col: str = "amount",
+                           category_col: str = "category") -> AnalysisResult:
+        self._check_configured(amount_col=amount_col, category_col=category_col)
+        self._require(amount_col, category_col)
+        stats = _finish(self._by_col[category_col])
+        breakdown = pd.DataFrame({
+            category_col: stats.index,
+            "total": stats["sum"].to_numpy(),
+            "average": stats["mean"].to_numpy(),
+            "count": stats["count"].to_numpy(),
+        })
+        return _category_breakdown_result(breakdown, category_col)
+
+    def year_over_year(self, amount_col: str = "amount", year_col: str = "fiscal_year",
+                       category_col: Optional[str] = None) -> AnalysisResult:
+        self._check_configured(amount_col=amount_col, year_col=year_col)
+        self._require(amount_col, year_col)
+
+        if category_col and category_col in self.columns:
+            self._check_configured(category_col=category_col)
+            yearly = self._by_year_cat.rename(amount_col).rename_axis(
+                [year_col, category_col]).reset_index()
+        else:
+            category_col = None
+            stats = _finish(self._by_year)
+            yearly = pd.DataFrame({
+                year_col: stats.index,
+                "sum": stats["sum"].to_numpy(),
+                "mean": stats["mean"].to_numpy(),
+                "count": stats["count"].to_numpy(),
+            })
+        return _year_over_year_result(yearly, self._by_year_all, amount_col,
+                                      year_col, category_col)
+
+    def state_comparison(self, amount_col: str = "amount",
+                         state_col: str = "state") -> AnalysisResult:
+        self._check_configured(amount_col=amount_col, state_col=state_col)
+        self._require(amount_col, state_col)
+        stats = _finish(self._by_col[state_col])
+        details = pd.DataFrame({
+            state_col: stats.index,
+            "total": stats["sum"].to_numpy(),
+            "average": stats["mean"].to_numpy(),
+            "count": stats["count"].to_numpy(),
+            "std_dev": stats["std"].to_numpy(),
+        })
+        return _state_comparison_result(details, state_col)
+
+
+def _add_series(total: Optional[pd.Series], part: pd.Series) -> pd.Series:
+    """Sum two partial group sums (index union, missing as 0)."""
+    if total is None:
+        return part
+    return total.add(part, fill_value=0)
@@ -1,7 +1,8 @@
 """Tariff deep-analysis module.
 
-Queries tariff data from the database and produces structured comparison
-data suitable for PPT chart/table generation.
+Reads tariff data through a TariffIndex (one query per market, parsed once)
+and produces structured comparison data suitable for PPT chart/table
+generation.
 
 Output dict sections:
   1. mobile_postpaid_comparison — cross-operator tier comparison
@@ -15,15 +16,18 @@ Output dict sections:
 
 from __future__ import annotations
 
-import re
 from typing import Optional
 
+from src.blm.market_sweep import shared
+from src.blm.tariff_index import TariffIndex, parse_data_gb
+
 
 def analyze_tariffs(
     db,
     market: str,
     target_operator: str,
     latest_snapshot: str = "H1_2026",
+    index: Optional[TariffIndex] = None,
 ) -> dict:
     """Run tariff analysis and return structured results dict.
 
@@ -32,31 +36,38 @@ def analyze_tariffs(
         market: Market identifier (e.g. "germany").
         target_operator: Protagonist operator_id.
         latest_snapshot: The snapshot period to use for current comparisons.
+        index: Prebuilt TariffIndex for ``market``; built from ``db`` if None.
+            Pass one in to reuse it across operators or snapshots.
 
     Returns:
         dict with 7 analysis sections.
     """
+    if index is None:
+        # Read-only once built, so a market sweep shares one instance
+        index = shared(db, ("tariff_index", market),
+                       lambda: TariffIndex.build(db, market), deep_copy=False)
+
     result = {}
 
     # 1. Mobile postpaid cross-operator comparison
     result["mobile_postpaid_comparison"] = _mobile_postpaid_comparison(
-        db, market, latest_snapshot
+        index, latest_snapshot
     )
 
     # 2. EUR/GB value ranking
-    result["value_per_gb"] = _value_per_gb(db, market, latest_snapshot)
+    result["value_per_gb"] = _value_per_gb(index, latest_snapshot)
 
     # 3. Price evolution per operator
-    result["price_evolution"] = _price_evolution(db, market)
+    result["price_evolution"] = _price_evolution(index)
 
     # 4. Fixed broadband comparison
-    result["fixed_comparison"] = _fixed_comparison(db, market, latest_snapshot)
+    result["fixed_comparison"] = _fixed_comparison(index, latest_snapshot)
 
     # 5. FMC bundle comparison
-    result["fmc_comparison"] = _fmc_comparison(db, market, latest_snapshot)
+    result["fmc_comparison"] = _fmc_comparison(index, latest_snapshot)
 
     # 6. 5G premium erosion
-    result["five_g_erosion"] = _five_g_erosion(db, market)
+    result["five_g_erosion"] = _five_g_erosion(index)
 
     # 7. Strategic insights
     result["strategic_insights"] = _strategic_insights(
@@ -70,23 +81,23 @@ def analyze_tariffs(
 # Section builders
 # =========================================================================
 
-def _mobile_postpaid_comparison(db, market: str, snapshot: str) -> list:
+def _mobile_postpaid_comparison(index: TariffIndex, snapshot: str) -> list:
     """Group mobile postpaid tariffs by tier with all operators."""
-    rows = db.get_tariff_comparison(market, "mobile_postpaid", snapshot)
+    rows = index.comparison("mobile_postpaid", snapshot)
     tiers_order = ["s", "m", "l", "xl"]
     tier_map: dict[str, list] = {t: [] for t in tiers_order}
 
     for row in rows:
-        tier = row.get("plan_tier", "")
+        tier = row.plan_tier
         if tier not in tier_map:
             continue
         tier_map[tier].append({
-            "operator_id": row["operator_id"],
-            "display_name": row.get("display_name", row["operator_id"]),
-            "plan_name": row["plan_name"],
-            "price": row.get("monthly_price"),
-            "data": row.get("data_allowance", ""),
-            "includes_5g": bool(row.get("includes_5g", 0)),
+            "operator_id": row.operator_id,
+            "display_name": row.display_name,
+            "plan_name": row.plan_name,
+            "price": row.monthly_price,
+            "data": row.data_allowance,
+            "includes_5g": row.includes_5g,
         })
 
     result = []
@@ -97,69 +108,40 @@ def _mobile_postpaid_comparison(db, market: str, snapshot: str) -> list:
     return result
 
 
-def _parse_data_gb(data_str) -> Optional[float]:
-    """Convert data_allowance string to numeric GB. Returns None for unlimited."""
-    if data_str is None:
-        return None
-    s = str(data_str).strip().lower()
-    if "unlim" in s:
-        return None
-    m = re.match(r"([\d.]+)\s*(gb|tb|mb)?", s)
-    if not m:
-        return None
-    val = float(m.group(1))
-    unit = (m.group(2) or "gb").lower()
-    if unit == "tb":
-        return val * 1024
-    if unit == "mb":
-        return val / 1024
-    return val
-
-
-def _value_per_gb(db, market: str, snapshot: str) -> list:
-    """Compute EUR/GB for all mobile postpaid plans and rank."""
-    rows = db.get_tariff_comparison(market, "mobile_postpaid", snapshot)
+# Kept for callers that parse a single allowance string
+_parse_data_gb = parse_data_gb
+
+
+def _value_per_gb(index: TariffIndex, snapshot: str) -> list:
+    """Rank all mobile postpaid plans by their precomputed EUR/GB."""
     entries = []
-    for row in rows:
-        price = row.get("monthly_price")
-        data_gb = _parse_data_gb(row.get("data_allowance"))
-        if price is None or data_gb is None or data_gb <= 0:
+    for row in index.comparison("mobile_postpaid", snapshot):
+        if row.eur_per_gb is None:
             continue
-        eur_per_gb = round(price / data_gb, 2)
         entries.append({
-            "operator": row.get("display_name", row["operator_id"]),
-            "plan": row["plan_name"],
-            "price": price,
-            "data_gb": data_gb,
-            "eur_per_gb": eur_per_gb,
+            "operator": row.display_name,
+            "plan": row.plan_name,
+            "price": row.monthly_price,
+            "data_gb": row.data_gb,
+            "eur_per_gb": row.eur_per_gb,
         })
     entries.sort(key=lambda x: x["eur_per_gb"])
     return entries
 
 
-def _price_evolution(db, market: str) -> dict:
+def _price_evolution(index: TariffIndex) -> dict:
     """Price history per operator across all snapshots for mobile postpaid."""
-    all_tariffs = db.get_tariffs(market=market, plan_type="mobile_postpaid")
-
     # Group by operator_id -> snapshot -> tier -> price
     op_data: dict[str, dict[str, dict]] = {}
-    for t in all_tariffs:
-        op = t["operator_id"]
-        snap = t["snapshot_period"]
-        tier = t.get("plan_tier", "")
-        price = t.get("monthly_price")
-        if op not in op_data:
-            op_data[op] = {}
-        if snap not in op_data[op]:
-            op_data[op][snap] = {}
-        op_data[op][snap][tier] = price
+    for t in index.history("mobile_postpaid"):
+        snaps = op_data.setdefault(t.operator_id, {})
+        snaps.setdefault(t.snapshot_period, {})[t.plan_tier] = t.monthly_price
 
     # Build sorted timeline per operator
     result = {}
     for op, snap_dict in op_data.items():
-        snapshots_sorted = sorted(snap_dict.keys())
         timeline = []
-        for snap in snapshots_sorted:
+        for snap in sorted(snap_dict.keys()):
             entry = {"snapshot": snap}
             entry.update(snap_dict[snap])
             timeline.append(entry)
@@ -167,61 +149,52 @@ def _price_evolution(db, market: str) -> dict:
     return result
 
 
-def _fixed_comparison(db, market: str, snapshot: str) -> dict:
+def _fixed_comparison(index: TariffIndex, snapshot: str) -> dict:
     """Compare fixed broadband tariffs across DSL, Cable, Fiber."""
     result = {}
     for plan_type in ("fixed_dsl", "fixed_cable", "fixed_fiber"):
-        rows = db.get_tariff_comparison(market, plan_type, snapshot)
-        entries = []
-        for row in rows:
-            entries.append({
-                "operator_id": row["operator_id"],
-                "display_name": row.get("display_name", row["operator_id"]),
-                "plan_name": row["plan_name"],
-                "price": row.get("monthly_price"),
-                "speed_mbps": row.get("speed_mbps"),
-                "tier": row.get("plan_tier", ""),
-            })
-        result[plan_type] = entries
+        result[plan_type] = [
+            {
+                "operator_id": row.operator_id,
+                "display_name": row.display_name,
+                "plan_name": row.plan_name,
+                "price": row.monthly_price,
+                "speed_mbps": row.speed_mbps,
+                "tier": row.plan_tier,
+            }
+            for row in index.comparison(plan_type, snapshot)
+        ]
     return result
 
 
-def _fmc_comparison(db, market: str, snapshot: str) -> list:
+def _fmc_comparison(index: TariffIndex, snapshot: str) -> list:
     """Compare FMC bundle tariffs."""
-    rows = db.get_tariff_comparison(market, "fmc_bundle", snapshot)
-    entries = []
-    for row in rows:
-        entries.append({
-            "operator_id": row["operator_id"],
-            "display_name": row.get("display_name", row["operator_id"]),
-            "plan_name": row["plan_name"],
-            "price": row.get("monthly_price"),
-            "tier": row.get("plan_tier", ""),
-        })
-    return entries
-
-
-def _five_g_erosion(db, market: str) -> list:
+    return [
+        {
+            "operator_id": row.operator_id,
+            "display_name": row.display_name,
+            "plan_name": row.plan_name,
+            "price": row.monthly_price,
+            "tier": row.plan_tier,
+        }
+        for row in index.comparison("fmc_bundle", snapshot)
+    ]
+
+
+def _five_g_erosion(index: TariffIndex) -> list:
     """Track 5G premium erosion across snapshots.
 
     For each snapshot, compute the average price of plans with vs without 5G
     in mobile postpaid, and the premium percentage.
     """
-    all_tariffs = db.get_tariffs(market=market, plan_type="mobile_postpaid")
-
     # Group by snapshot
     snap_data: dict[str, dict] = {}
-    for t in all_tariffs:
-        snap = t["snapshot_period"]
-        if snap not in snap_data:
-            snap_data[snap] = {"with_5g": [], "without_5g": []}
-        price = t.get("monthly_price")
-        if price is None:
+    for t in index.history("mobile_postpaid"):
+        d = snap_data.setdefault(t.snapshot_period,
+                                 {"with_5g": [], "without_5g": []})
+        if t.monthly_price is None:
             continue
-        if t.get("includes_5g"):
-            snap_data[snap]["with_5g"].append(price)
-        else:
-            snap_data[snap]["without_5g"].append(price)
+        d["with_5g" if t.includes_5g else "without_5g"].append(t.monthly_price)
 
     result = []
     for snap in sorted(snap_data.keys()):
@@ -0,0 +1,351 @@
+"""Rolling multi-period back-test of the Five Looks analysis.
+
+Tracking how the diagnosis for one operator changed over time means running
+the engine for every quarter of a range, e.g. CQ1_2023 .. CQ4_2025.  Done as
+separate runs, each one re-reads its overlapping ``n_quarters`` window and
+recomputes every trend statistic from scratch.
+
+``run_backtest()`` instead
+  - loads each time series once over the whole range (HistoryDatabase) and
+    serves every period's window as a slice of it; other reads and the
+    target-independent intermediates of src/blm/market_sweep.py are shared
+    between periods,
+  - slides RollingTrendStats one quarter at a time to report the target's
+    key trend statistics per period in O(1) per step,
+  - emits one FiveLooksResult per period plus a compact diff against the
+    previous period: changed key messages, health ratings and SPAN
+    quadrants.
+
+Usage:
+    from src.blm.backtest import run_backtest
+
+    bt = run_backtest(db, "vodafone_germany", "germany", "CQ1_2023", "CQ4_2025")
+    for step in bt.periods:
+        print(step.period, step.changes)
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+from src.blm.market_sweep import SweepDatabase
+from src.blm.trend_analyzer import compute_trend_slope, compute_volatility
+from src.database.period_utils import PeriodConverter
+
+_CONVERTER = PeriodConverter()
+
+# Target metrics tracked by RollingTrendStats: (timeseries, column)
+TREND_METRICS: tuple[tuple[str, str], ...] = (
+    ("financial", "total_revenue"),
+    ("financial", "service_revenue"),
+    ("financial", "ebitda"),
+    ("financial", "ebitda_margin_pct"),
+    ("subscriber", "mobile_total_k"),
+    ("subscriber", "broadband_total_k"),
+)
+
+# FiveLooksResult attributes carrying a key_message, in report order
+_KEY_MESSAGE_LOOKS = ("trends", "market_customer", "competition",
+                      "self_analysis", "swot", "opportunities")
+
+
+def period_range(start_cq: str, end_cq: str) -> list[str]:
+    """Calendar quarters from ``start_cq`` to ``end_cq`` inclusive."""
+    quarters = []
+    for n in range(1, 400):
+        quarters = _CONVERTER.generate_timeline(n_quarters=n, end_cq=end_cq)
+        if quarters[0] == start_cq:
+            return quarters
+    raise ValueError(f"{start_cq} is not before {end_cq}")
+
+
+# ============================================================================
+# History
+# ============================================================================
+
+class HistoryDatabase(SweepDatabase):
+    """Sweep proxy serving windowed time-series reads from a preloaded history.
+
+    The first read of a series (e.g. one operator's financials) loads every
+    quarter of ``timeline``; later reads for any window inside it are
+    filtered from that copy.  Windows reaching outside it, or without an
+    end quarter, go to the database.
+    """
+
+    def __init__(self, db, timeline: list[str]):
+        super().__init__(db)
+        self.timeline = timeline
+        self._covered = set(timeline)
+
+    def _window(self, name: str, scope: str, n_quarters: int,
+                end_cq: Optional[str]):
+        read = getattr(self._db, name)
+        window = set(_CONVERTER.generate_timeline(n_quarters, end_cq)) if end_cq else None
+        if window is None or not window <= self._covered:
+            return super().__getattr__(name)(scope, n_quarters=n_quarters,
+                                             end_cq=end_cq)
+
+        history = self.sweep_memo.get_or_compute(
+            ("history", name, scope),
+            lambda: read(scope, n_quarters=len(self.timeline),
+                         end_cq=self.timeline[-1]),
+            deep_copy=False,
+        )
+        if isinstance(history, dict):
+            sliced = {}
+            for op_id, rows in history.items():
+                kept = [dict(r) for r in rows if r["calendar_quarter"] in window]
+                if kept:
+                    sliced[op_id] = kept
+            return sliced
+        return [dict(r) for r in history if r["calendar_quarter"] in window]
+
+    def get_financial_timeseries(self, operator_id, n_quarters=8, end_cq=None):
+        return self._window("get_financial_timeseries", operator_id, n_quarters, end_cq)
+
+    def get_subscriber_timeseries(self, operator_id, n_quarters=8, end_cq=None):
+        return self._window("get_subscriber_timeseries", operator_id, n_quarters, end_cq)
+
+    def get_market_timeseries(self, market, n_quarters=8, end_cq=None):
+        return self._window("get_market_timeseries", market, n_quarters, end_cq)
+
+    def get_market_subscriber_timeseries(self, market, n_quarters=8, end_cq=None):
+        return self._window("get_market_subscriber_timeseries", market,
+                            n_quarters, end_cq)
+
+    def get_macro_data(self, country, n_quarters=8, end_cq=None):
+        return self._window("get_macro_data", country, n_quarters, end_cq)
+
+
+# ============================================================================
+# Rolling trend statistics
+# ============================================================================
+
+class RollingTrendStats:
+    """Mean, OLS slope and volatility over a sliding window of quarters.
+
+    Matches trend_analyzer.compute_trend_slope / compute_volatility on the
+    same window.  Each push() is O(1): the mean and M2 are updated
+    Welford-style and the slope from the running Σ(x·y).  Windows with a
+    missing quarter fall back to the trend_analyzer functions, which drop
+    the gaps.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self._values: deque = deque()
+        self._missing = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._sum_xy = 0.0
+
+    def push(self, value) -> None:
+        """Append the next quarter's value, dropping the oldest if full."""
+        if len(self._values) == self.window:
+            self._pop()
+        if value is None:
+            self._missing += 1
+        else:
+            value = float(value)
+            n = len(self._values) - self._missing + 1
+            delta = value - self._mean
+            self._mean += delta / n
+            self._m2 += delta * (value - self._mean)
+            self._sum_xy += (n - 1) * value
+        self._values.append(value)
+
+    def _pop(self) -> None:
+        oldest = self._values.popleft()
+        if oldest is None:
+            self._missing -= 1
+            return
+        n = len(self._values) - self._missing + 1
+        if n == 1:
+            self._mean = self._m2 = self._sum_xy = 0.0
+            return
+        # Every remaining value moves one position left
+        self._sum_xy -= self._mean * n - oldest
+        new_mean = (self._mean * n - oldest) / (n - 1)
+        self._m2 -= (oldest - self._mean) * (oldest - new_mean)
+        self._mean = new_mean
+
+    def stats(self) -> dict:
+        """{"n", "mean", "slope", "volatility"} for the current window."""
+        n = len(self._values) - self._missing
+        if self._missing:
+            clean = [v for v in self._values if v is not None]
+            return {
+                "n": n,
+                "mean": sum(clean) / n if n else None,
+                "slope": compute_trend_slope(clean),
+                "volatility": compute_volatility(clean),
+            }
+        if n < 2:
+            return {"n": n, "mean": self._mean if n else None,
+                    "slope": None, "volatility": None}
+        x_mean = (n - 1) / 2
+        s_xx = n * (n * n - 1) / 12
+        slope = (self._sum_xy - x_mean * self._mean * n) / s_xx
+        volatility = None
+        if self._mean != 0:
+            volatility = math.sqrt(max(self._m2, 0.0) / n) / abs(self._mean)
+        return {"n": n, "mean": self._mean, "slope": slope,
+                "volatility": volatility}
+
+
+# ============================================================================
+# Period-over-period diff
+# ============================================================================
+
+def _health_ratings(result) -> dict:
+    ratings = {}
+    if result.self_analysis is not None:
+        ratings[result.target_operator] = result.self_analysis.health_rating
+    if result.competition is not None:
+        for comp_id, dive in result.competition.competitor_analyses.items():
+            health = dive.financial_health or {}
+            for key in ("revenue_trend", "margin_trend"):
+                if key in health:
+                    ratings[f"{comp_id}.{key}"] = health[key]
+    return ratings
+
+
+def _span_quadrants(result) -> dict:
+    if result.opportunities is None:
+        return {}
+    return {pos.opportunity_name: pos.quadrant
+            for pos in result.opportunities.span_positions}
+
+
+def _changed(before: dict, after: dict) -> dict:
+    return {key: [before.get(key), after.get(key)]
+            for key in sorted(before.keys() | after.keys(), key=str)
+            if before.get(key) != after.get(key)}
+
+
+def diff_results(previous, current) -> dict:
+    """Compact diff between two periods' results.
+
+    Returns:
+        {"key_messages": {look: [before, after]},
+         "health_ratings": {subject: [before, after]},
+         "span_quadrants": {opportunity: [before, after]}}
+        with only the entries that changed.  None stands for absent.
+    """
+    def messages(result):
+        return {look: getattr(getattr(result, look), "key_message", "")
+                for look in _KEY_MESSAGE_LOOKS
+                if getattr(result, look) is not None}
+
+    return {
+        "key_messages": _changed(messages(previous), messages(current)),
+        "health_ratings": _changed(_health_ratings(previous),
+                                   _health_ratings(current)),
+        "span_quadrants": _changed(_span_quadrants(previous),
+                                   _span_quadrants(current)),
+    }
+
+
+# ============================================================================
+# Back-test
+# ============================================================================
+
+@dataclass
+class BacktestPeriod:
+    """One period of a back-test."""
+
+    period: str
+    result: object  # FiveLooksResult
+    trend_stats: dict = field(default_factory=dict)  # {metric: stats}
+    changes: Optional[dict] = None  # diff_results() vs previous period
+
+
+@dataclass
+class BacktestResult:
+    """Output of run_backtest(), oldest period first."""
+
+    target_operator: str
+    market: str
+    n_quarters: int
+    periods: list[BacktestPeriod] = field(default_factory=list)
+
+    def by_period(self) -> dict:
+        return {step.period: step for step in self.periods}
+
+
+def run_backtest(
+    db,
+    target_operator: str,
+    market: str,
+    start_period: str,
+    end_period: str,
+    n_quarters: int = 8,
+    **engine_kwargs,
+) -> BacktestResult:
+    """Run Five Looks for every quarter from ``start_period`` to ``end_period``.
+
+    Args:
+        db: Initialized TelecomDatabase.
+        target_operator: Operator ID.
+        market: Market identifier.
+        start_period: First analysis quarter, e.g. "CQ1_2023".
+        end_period: Last analysis quarter, e.g. "CQ4_2025".
+        n_quarters: Historical window of each period's run.
+        **engine_kwargs: Passed to BLMAnalysisEngine (parallel, ...).
+
+    Returns:
+        BacktestResult with one BacktestPeriod per quarter.  Periods whose
+        run fails are reported and left out; the next diff is then taken
+        against the last successful period.
+    """
+    from src.blm.engine import BLMAnalysisEngine
+
+    periods = period_range(start_period, end_period)
+    timeline = period_range(
+        _CONVERTER.generate_timeline(n_quarters, start_period)[0], end_period)
+    history_db = HistoryDatabase(db, timeline)
+
+    rows = {
+        "financial": history_db.get_financial_timeseries(
+            target_operator, n_quarters=len(timeline), end_cq=end_period),
+        "subscriber": history_db.get_subscriber_timeseries(
+            target_operator, n_quarters=len(timeline), end_cq=end_period),
+    }
+    by_quarter = {kind: {r["calendar_quarter"]: r for r in series}
+                  for kind, series in rows.items()}
+    rolling = {col: RollingTrendStats(n_quarters) for _, col in TREND_METRICS}
+
+    backtest = BacktestResult(target_operator, market, n_quarters)
+    previous = None
+    wanted = set(periods)
+    for quarter in timeline:
+        for kind, col in TREND_METRICS:
+            rolling[col].push(by_quarter[kind].get(quarter, {}).get(col))
+        if quarter not in wanted:
+            continue
+
+        try:
+            engine = BLMAnalysisEngine(
+                db=history_db,
+                target_operator=target_operator,
+                market=market,
+                target_period=quarter,
+                n_quarters=n_quarters,
+                **engine_kwargs,
+            )
+            result = engine.run_five_looks()
+        except Exception as e:
+            print(f"  [!] Back-test run failed for {quarter}: {e}")
+            continue
+
+        backtest.periods.append(BacktestPeriod(
+            period=quarter,
+            result=result,
+            trend_stats={col: rolling[col].stats() for _, col in TREND_METRICS},
+            changes=diff_results(previous, result) if previous else None,
+        ))
+        previous = result
+    return backtest
@@ -15,11 +15,26 @@ Usage:
     db = TelecomDatabase("data/telecom.db")
     engine = BLMAnalysisEngine(db, target_operator="vodafone_germany", market="germany")
     result = engine.run_five_looks()
+
+Looks 1-4 and the tariff analysis read the database but never each other's
+output; only SWOT and Opportunities consume earlier results.  With
+``parallel=True`` (file-backed databases only) the engine runs the
+independent stages concurrently and joins for SWOT/Opportunities.  Each stage
+records into its own ProvenanceStore; the stores are merged in serial stage
+order, so the result is identical to a serial run.
+
+With ``incremental=True`` each stage's output is stored in the database with
+the tables it read; a re-run reuses every stage whose inputs are unchanged
+(see src/blm/incremental.py).
 """
 
 from __future__ import annotations
 
+import json
+import pickle
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
+from datetime import date
 from typing import Optional
 
 from src.models.market_configs import get_market_config
@@ -45,10 +60,36 @@ class FiveLooksResult:
     provenance: ProvenanceStore = field(default_factory=ProvenanceStore)
 
 
+# Stage -> stages whose results it consumes.  Listed in serial execution
+# order, which is also the order per-stage provenance is merged in.
+_LOOKS = ("trends", "market_customer", "competition", "self_analysis")
+STAGE_DEPENDENCIES: dict[str, tuple[str, ...]] = {
+    "trends": (),
+    "market_customer": (),
+    "competition": (),
+    "tariff_analysis": (),
+    "self_analysis": (),
+    "swot": _LOOKS,
+    "opportunities": _LOOKS + ("swot",),
+}
+
+
 class BLMAnalysisEngine:
     """Orchestrates the Five Looks + SWOT analysis pipeline.
 
     Sequence: Trends -> Market/Customer -> Competition -> Self -> SWOT -> Opportunities
+
+    Args:
+        parallel: Run independent stages on a thread pool. Ignored (serial)
+            when the database cannot serve concurrent readers, e.g. :memory:.
+        max_workers: Thread pool size for parallel mode.
+        cache: Optional ResultCache; runs whose input fingerprint is already
+            stored return the stored FiveLooksResult without recomputing.
+        incremental: Store per-stage outputs in the database and recompute
+            only the stages whose input tables changed since the last run.
+            Runs serially.
+        as_of: Date the intelligence event windows end on. Defaults to
+            today; pin it for reproducible (and cache-stable) runs.
     """
 
     def __init__(
@@ -58,43 +99,182 @@ class BLMAnalysisEngine:
         market: str,
         target_period: Optional[str] = None,
         n_quarters: int = 8,
+        parallel: bool = False,
+        max_workers: int = 5,
+        cache=None,
+        incremental: bool = False,
+        as_of: Optional[date] = None,
     ):
         self.db = db
         self.target_operator = target_operator
         self.market = market
         self.target_period = target_period
         self.n_quarters = n_quarters
+        self.parallel = parallel
+        self.max_workers = max(1, max_workers)
+        self.cache = cache
+        self.incremental = incremental
+        self.as_of = as_of
+        self.stage_stats: dict[str, list[str]] = {"reused": [], "recomputed": []}
         self.provenance = ProvenanceStore()
         self.market_config = get_market_config(market)
 
     def run_five_looks(self) -> FiveLooksResult:
         """Execute the complete five looks analysis pipeline."""
-        trends = self.look_at_trends()
-        market_customer = self.look_at_market_customer()
-        competition = self.look_at_competition()
-        tariff_analysis = self._analyze_tariffs()
-        self_analysis = self.look_at_self()
-        swot = self.synthesize_swot(trends, market_customer, competition, self_analysis)
-        opportunities = self.look_at_opportunities(
-            trends, market_customer, competition, self_analysis, swot
-        )
+        fingerprint = None
+        if self.cache is not None:
+            from src.blm.result_cache import run_fingerprint
+
+            fingerprint = run_fingerprint(
+                self.db, self.market, self.target_operator,
+                self.target_period, self.n_quarters, as_of=self.as_of,
+            )
+            cached = self.cache.get(fingerprint)
+            if cached is not None:
+                self.provenance = cached.provenance
+                return cached
+
+        if self.incremental:
+            results = self._run_stages_incremental()
+        elif self.parallel and getattr(self.db, "supports_concurrent_reads", False):
+            results = self._run_stages_parallel()
+        else:
+            results = self._run_stages_serial()
         self._wire_provenance()
 
-        return FiveLooksResult(
+        result = FiveLooksResult(
             target_operator=self.target_operator,
             market=self.market,
             analysis_period=self.target_period or self._determine_latest_period(),
-            trends=trends,
-            market_customer=market_customer,
-            competition=competition,
-            self_analysis=self_analysis,
-            swot=swot,
-            opportunities=opportunities,
-            tariff_analysis=tariff_analysis,
+            trends=results["trends"],
+            market_customer=results["market_customer"],
+            competition=results["competition"],
+            self_analysis=results["self_analysis"],
+            swot=results["swot"],
+            opportunities=results["opportunities"],
+            tariff_analysis=results["tariff_analysis"],
             provenance=self.provenance,
         )
+        if fingerprint is not None:
+            self.cache.put(fingerprint, result, self.target_period, self.n_quarters)
+        return result
+
+    # ------------------------------------------------------------------
+    # Stage execution
+    # ------------------------------------------------------------------
+
+    def _run_stage(self, name: str, results: dict, provenance: ProvenanceStore):
+        """Run one stage given the results of its dependencies."""
+        if name == "trends":
+            return self.look_at_trends(provenance=provenance)
+        if name == "market_customer":
+            return self.look_at_market_customer(provenance=provenance)
+        if name == "competition":
+            return self.look_at_competition(provenance=provenance)
+        if name == "tariff_analysis":
+            return self._analyze_tariffs()
+        if name == "self_analysis":
+            return self.look_at_self(provenance=provenance)
+        looks = [results[dep] for dep in _LOOKS]
+        if name == "swot":
+            return self.synthesize_swot(*looks, provenance=provenance)
+        if name == "opportunities":
+            return self.look_at_opportunities(
+                *looks, results["swot"], provenance=provenance
+            )
+        raise ValueError(f"Unknown stage: {name}")
+
+    def _run_stages_serial(self) -> dict:
+        results = {}
+        for name in STAGE_DEPENDENCIES:
+            results[name] = self._run_stage(name, results, self.provenance)
+        return results
 
-    def look_at_trends(self):
+    def _run_stages_incremental(self) -> dict:
+        """Reuse stored stage outputs whose inputs are unchanged; run the rest.
+
+        Stage outputs are pickled before _wire_provenance touches them, so a
+        reused stage contributes exactly what a fresh run would.
+        """
+        from src.blm.incremental import RecordingDatabase, stage_key
+
+        run = (self.market, self.target_operator, self.target_period or "",
+               self.n_quarters)
+        stored = self.db.get_stage_outputs(*run)
+        versions = self.db.get_change_versions(self.market)
+        results, keys, stores = {}, {}, {}
+        self.stage_stats = {"reused": [], "recomputed": []}
+
+        for name, deps in STAGE_DEPENDENCIES.items():
+            upstream = [keys[dep] for dep in deps]
+            prior = stored.get(name)
+            if prior is not None:
+                manifest = json.loads(prior["manifest"])
+                if stage_key(name, run, manifest, versions, upstream, self.as_of) == prior["stage_key"]:
+                    try:
+                        results[name], stores[name] = pickle.loads(prior["payload"])
+                    except Exception as e:
+                        print(f"  [!] Stored {name} output unreadable, recomputing: {e}")
+                    else:
+                        keys[name] = prior["stage_key"]
+                        self.stage_stats["reused"].append(name)
+                        continue
+
+            stores[name] = ProvenanceStore()
+            recorder, real_db = RecordingDatabase(self.db), self.db
+            self.db = recorder
+            try:
+                results[name] = self._run_stage(name, results, stores[name])
+            finally:
+                self.db = real_db
+            manifest = recorder.manifest()
+            keys[name] = stage_key(name, run, manifest, versions, upstream, self.as_of)
+            self.db.upsert_stage_output(
+                *run, name, keys[name], manifest,
+                pickle.dumps((results[name], stores[name]),
+                             protocol=pickle.HIGHEST_PROTOCOL),
+            )
+            self.stage_stats["recomputed"].append(name)
+
+        for name in STAGE_DEPENDENCIES:
+            self.provenance.merge(stores[name])
+        return results
+
+    def _run_stages_parallel(self) -> dict:
+        """Run stages on a thread pool as soon as their dependencies finish.
+
+        Every stage records into a private ProvenanceStore; after the join
+        the stores are merged into self.provenance in serial stage order.
+        """
+        results: dict = {}
+        stores = {name: ProvenanceStore() for name in STAGE_DEPENDENCIES}
+        pending = dict(STAGE_DEPENDENCIES)
+        running = {}
+
+        def call(name, inputs):
+            try:
+                return self._run_stage(name, inputs, stores[name])
+            finally:
+                self.db.release_thread_connection()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix="blm-look") as pool:
+            while pending or running:
+                for name, deps in list(pending.items()):
+                    if all(dep in results for dep in deps):
+                        del pending[name]
+                        inputs = {dep: results[dep] for dep in deps}
+                        running[pool.submit(call, name, inputs)] = name
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    # Re-raises the stage's exception, as a serial run would
+                    results[running.pop(future)] = future.result()
+
+        for name in STAGE_DEPENDENCIES:
+            self.provenance.merge(stores[name])
+        return results
+
+    def look_at_trends(self, provenance: Optional[ProvenanceStore] = None):
         """01 Look at Trends - PEST Framework.
 
         Input tables: macro_environment, intelligence_events
@@ -108,11 +288,12 @@ class BLMAnalysisEngine:
             target_operator=self.target_operator,
             target_period=self.target_period,
             n_quarters=self.n_quarters,
-            provenance=self.provenance,
+            provenance=provenance or self.provenance,
             market_config=self.market_config,
+            as_of=self.as_of,
         )
 
-    def look_at_market_customer(self):
+    def look_at_market_customer(self, provenance: Optional[ProvenanceStore] = None):
         """02 Look at Market/Customer - Market changes + $APPEALS.
 
         Input tables: financial_quarterly, subscriber_quarterly, tariffs, intelligence_events
@@ -126,11 +307,12 @@ class BLMAnalysisEngine:
             target_operator=self.target_operator,
             target_period=self.target_period,
             n_quarters=self.n_quarters,
-            provenance=self.provenance,
+            provenance=provenance or self.provenance,
             market_config=self.market_config,
+            as_of=self.as_of,
         )
 
-    def look_at_competition(self):
+    def look_at_competition(self, provenance: Optional[ProvenanceStore] = None):
         """03 Look at Competition - Porter's Five Forces.
 
         Input tables: all tables for all operators in the market
@@ -145,10 +327,11 @@ class BLMAnalysisEngine:
             target_period=self.target_period,
             n_quarters=self.n_quarters,
             market_config=self.market_config,
-            provenance=self.provenance,
+            provenance=provenance or self.provenance,
+            as_of=self.as_of,
         )
 
-    def look_at_self(self):
+    def look_at_self(self, provenance: Optional[ProvenanceStore] = None):
         """04 Look at Self - BMC + Capability Assessment.
 
         Input tables: target operator's full data + competitor data for comparison
@@ -162,11 +345,13 @@ class BLMAnalysisEngine:
             target_operator=self.target_operator,
             target_period=self.target_period,
             n_quarters=self.n_quarters,
-            provenance=self.provenance,
+            provenance=provenance or self.provenance,
             market_config=self.market_config,
+            as_of=self.as_of,
         )
 
-    def synthesize_swot(self, trends, market_customer, competition, self_analysis):
+    def synthesize_swot(self, trends, market_customer, competition, self_analysis,
+                        provenance: Optional[ProvenanceStore] = None):
         """SWOT Synthesis - Bridge between Look 4 and Look 5.
 
         Extracts:
@@ -182,11 +367,12 @@ class BLMAnalysisEngine:
             market_customer=market_customer,
             competition=competition,
             self_analysis=self_analysis,
-            provenance=self.provenance,
+            provenance=provenance or self.provenance,
         )
 
     def look_at_opportunities(
-        self, trends, market_customer, competition, self_analysis, swot
+        self, trends, market_customer, competition, self_analysis, swot,
+        provenance: Optional[ProvenanceStore] = None,
     ):
         """05 Look at Opportunities - SPAN Matrix.
 
@@ -203,7 +389,7 @@ class BLMAnalysisEngine:
             swot=swot,
             db=self.db,
             target_operator=self.target_operator,
-            provenance=self.provenance,
+            provenance=provenance or self.provenance,
         )
 
     def _analyze_tariffs(self):
@@ -231,7 +417,7 @@ class BLMAnalysisEngine:
         # 1. Intelligence events
         try:
             events = self.db.get_intelligence_events(
-                market=self.market, days_back=730
+                market=self.market, days_back=730, as_of=self.as_of,
             )
             for ev in events:
                 url = ev.get("source_url", "")
@@ -273,13 +459,14 @@ class BLMAnalysisEngine:
         # when we have corroborating real sources in the market
         n_sourced = len(seen_urls)
         if n_sourced > 0:
+            seed_source = SourceReference(
+                source_type=SourceType.DATABASE_SEED,
+                document_name="telecom.db",
+                confidence=Confidence.MEDIUM if n_sourced >= 3 else Confidence.LOW,
+            )
             for tv in self.provenance._values:
                 if tv.primary_source is None:
-                    tv.primary_source = SourceReference(
-                        source_type=SourceType.DATABASE_SEED,
-                        document_name="telecom.db",
-                        confidence=Confidence.MEDIUM if n_sourced >= 3 else Confidence.LOW,
-                    )
+                    tv.primary_source = seed_source
 
         # Track the provenance summary itself
         self.provenance.track(
@@ -0,0 +1,134 @@
+"""Incremental Five Looks re-runs.
+
+While a stage runs, RecordingDatabase notes which tables (and which
+operators, countries or markets within them) it reads. That dependency
+manifest is stored with the stage's pickled output in
+``engine_stage_outputs``. A stage's key hashes together:
+  - the manifest and the current ``data_changes`` versions of every
+    (table, scope) pair in it (bumped by the upsert_* methods);
+  - the keys of its upstream stages (STAGE_DEPENDENCIES);
+  - the run parameters and the engine code version;
+  - today's date, for stages that read intelligence_events (windows are
+    relative to today).
+
+On a re-run, a stage whose key still matches the stored one reuses the stored
+output; otherwise it is recomputed, and so is everything downstream of it.
+Loading one tariff snapshot therefore recomputes the tariff analysis and
+whichever Looks actually read tariffs, plus SWOT and Opportunities.
+
+Writes that bypass upsert_* must call TelecomDatabase.mark_changed().
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+from datetime import date
+from typing import Optional
+
+from src.blm.result_cache import MARKET_TABLE_SCOPES, engine_code_version
+
+
+# Bump to invalidate stored stage outputs (e.g. pickle layout changes)
+STAGE_FORMAT_VERSION = 1
+
+# Scope meaning "every row of the table in this market"
+ALL_SCOPES = "*"
+
+# TelecomDatabase read method -> (tables read, argument naming the scope;
+# None or a None-valued argument means market-wide)
+QUERY_TABLES: dict[str, tuple[tuple[str, ...], Optional[str]]] = {
+    "get_financial_timeseries": (("financial_quarterly",), "operator_id"),
+    "get_subscriber_timeseries": (("subscriber_quarterly",), "operator_id"),
+    "get_market_comparison": (
+        ("operators", "financial_quarterly", "subscriber_quarterly"), None),
+    "get_market_timeseries": (("operators", "financial_quarterly"), None),
+    "get_market_subscriber_timeseries": (("operators", "subscriber_quarterly"), None),
+    "get_macro_data": (("macro_environment",), "country"),
+    "get_network_data": (("network_infrastructure",), "operator_id"),
+    "get_competitive_scores": (("operators", "competitive_scores"), None),
+    "get_intelligence_events": (("intelligence_events",), None),
+    "search_intelligence_events": (("intelligence_events",), None),
+    "get_operators_in_market": (("operators",), None),
+    "get_executives": (("executives",), "operator_id"),
+    "get_earnings_highlights": (("earnings_call_highlights",), "operator_id"),
+    "get_tariffs": (("operators", "tariffs"), "operator_id"),
+    "get_tariff_comparison": (("operators", "tariffs"), None),
+}
+
+
+class RecordingDatabase:
+    """TelecomDatabase proxy that records the dependency manifest of a stage.
+
+    Reads through unmapped query methods or the raw connection are recorded
+    as market-wide reads of every table, so they can only cause extra
+    recomputation, never a stale reuse.
+    """
+
+    def __init__(self, db):
+        self._db = db
+        self._reads: dict[str, set[str]] = {}
+
+    def _record(self, tables, scope):
+        for table in tables:
+            self._reads.setdefault(table, set()).add(scope or ALL_SCOPES)
+
+    def __getattr__(self, name):
+        attr = getattr(self._db, name)
+        if name in QUERY_TABLES:
+            tables, scope_arg = QUERY_TABLES[name]
+            signature = inspect.signature(attr)
+
+            def recorded(*args, **kwargs):
+                scope = None
+                if scope_arg is not None:
+                    bound = signature.bind(*args, **kwargs)
+                    scope = bound.arguments.get(scope_arg)
+                self._record(tables, scope)
+                return attr(*args, **kwargs)
+
+            return recorded
+        if name == "conn" or name.startswith("get_"):
+            self._record(MARKET_TABLE_SCOPES, None)
+        return attr
+
+    def manifest(self) -> dict[str, list[str]]:
+        """{table: sorted scopes read}, or [ALL_SCOPES] for market-wide reads."""
+        return {
+            table: [ALL_SCOPES] if ALL_SCOPES in scopes else sorted(scopes)
+            for table, scopes in sorted(self._reads.items())
+        }
+
+
+def _manifest_state(manifest: dict, versions: dict) -> list:
+    """Current change versions of everything a manifest covers."""
+    state = []
+    for table, scopes in sorted(manifest.items()):
+        if scopes == [ALL_SCOPES]:
+            entries = sorted((scope, v) for (t, scope), v in versions.items()
+                             if t == table)
+        else:
+            entries = [(scope, versions.get((table, scope), 0)) for scope in scopes]
+        state.append([table, entries])
+    return state
+
+
+def stage_key(stage: str, run: tuple, manifest: dict, versions: dict,
+              upstream_keys: list, as_of: Optional[date] = None) -> str:
+    """Key identifying one stage's inputs.
+
+    Args:
+        stage: Stage name (STAGE_DEPENDENCIES key).
+        run: (market, target_operator, target_period, n_quarters).
+        manifest: Tables/scopes the stage read.
+        versions: TelecomDatabase.get_change_versions(market).
+        upstream_keys: Keys of the stage's dependencies, in order.
+    """
+    parts = [f"v{STAGE_FORMAT_VERSION}", engine_code_version(), stage,
+             *[str(p) for p in run]]
+    if "intelligence_events" in manifest:
+        parts.append((as_of or date.today()).isoformat())
+    parts.append(json.dumps(_manifest_state(manifest, versions)))
+    parts.extend(upstream_keys)
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
@@ -17,6 +17,7 @@ from __future__ import annotations
 
 from typing import Optional
 
+from src.blm.market_sweep import shared
 from src.blm.trend_analyzer import compute_trend_metrics
 from src.database.db import TelecomDatabase
 from src.database.period_utils import PeriodConverter
@@ -46,6 +47,16 @@ def _fmt_rev(val_m: float, currency: str = "") -> str:
         return f"{prefix}{val_m:,.1f}M"
 
 
+# Intelligence event window of the Look (days before as_of / today)
+_INTEL_DAYS_BACK = 730
+
+# Title keywords (case-insensitive substrings) marking M&A and partnership events
+MA_KEYWORDS = frozenset({"acqui", "merger", "joint venture", "jv ", "divest",
+                         "sale of", "sells ", "buys ", "partnership", "stake"})
+PARTNER_KEYWORDS = frozenset({"partner", "alliance", "consortium", "joint venture",
+                              "jv ", "collaboration", "agreement with", "deal with"})
+
+
 # ============================================================================
 # Dedup helpers
 # ============================================================================
@@ -106,6 +117,7 @@ def analyze_competition(
     n_quarters: int = 8,
     market_config=None,
     provenance=None,
+    as_of=None,
 ) -> CompetitionInsight:
     """Run the complete Look 3: Competition analysis.
 
@@ -117,6 +129,7 @@ def analyze_competition(
                        Defaults to the latest available quarter.
         n_quarters: Number of quarters for time-series analysis.
         provenance: Optional provenance tracker (reserved for future use).
+        as_of: Date intelligence event windows end on; None for today.
 
     Returns:
         CompetitionInsight with five forces, competitor deep dives,
@@ -144,7 +157,8 @@ def analyze_competition(
     scores_by_operator = _group_scores_by_operator(comp_scores)
 
     # Gather intelligence events (use large window to capture available data)
-    intel_events = _safe_intelligence_events(db, market=market, days_back=730)
+    intel_events = _safe_intelligence_events(
+        db, market=market, days_back=_INTEL_DAYS_BACK, as_of=as_of)
     intel_events = _dedup_intel_events(intel_events)
 
     # Build Porter's Five Forces
@@ -165,12 +179,16 @@ def analyze_competition(
             scores_by_operator.get(comp_id, {}),
             intel_events,
             all_scores_by_operator=scores_by_operator,
+            market=market, as_of=as_of,
         )
         competitor_analyses[comp_id] = deep_dive
 
     # Build comparison table (includes target operator)
-    comparison_table = _build_comparison_table(
-        db, all_operators, target_period, n_quarters, scores_by_operator,
+    comparison_table = shared(
+        db, ("comparison_table", market, target_period, n_quarters),
+        lambda: _build_comparison_table(
+            db, all_operators, target_period, n_quarters, scores_by_operator,
+        ),
     )
 
     # Determine overall competition intensity
@@ -741,16 +759,18 @@ def _derive_growth_strategy(financial_health: dict, subscriber_health: dict,
     return "; ".join(parts)
 
 
-def _derive_ma_activity(intel_events: list, comp_id: str) -> list[str]:
-    """Extract M&A events from intelligence events for a competitor."""
-    ma_keywords = {"acqui", "merger", "joint venture", "jv ", "divest",
-                   "sale of", "sells ", "buys ", "partnership", "stake"}
+def _derive_ma_activity(intel_events: list, comp_id: str,
+                        matched_ids: Optional[set] = None) -> list[str]:
+    """Extract M&A events from intelligence events for a competitor.
+
+    ``matched_ids`` are the ids of events whose title matched MA_KEYWORDS
+    in SQLite (see _keyword_event_ids); without them titles are scanned here.
+    """
     results = []
     for ev in intel_events:
         if ev.get("operator_id") != comp_id:
             continue
-        title = (ev.get("title") or "").lower()
-        if any(kw in title for kw in ma_keywords):
+        if _title_matches(ev, MA_KEYWORDS, matched_ids):
             results.append(ev.get("title", ""))
     return results
 
@@ -910,18 +930,16 @@ def _derive_supply_chain_status(network_status: dict) -> str:
 
 
 def _derive_ecosystem_partners(intel_events: list, comp_id: str,
-                                network_status: dict) -> list[str]:
+                                network_status: dict,
+                                matched_ids: Optional[set] = None) -> list[str]:
     """Extract ecosystem partners from intel events and network vendor info."""
-    keywords = {"partner", "alliance", "consortium", "joint venture",
-                "jv ", "collaboration", "agreement with", "deal with"}
     results = []
     seen = set()
 
     for ev in intel_events:
         if ev.get("operator_id") != comp_id:
             continue
-        title = (ev.get("title") or "").lower()
-        if any(kw in title for kw in keywords):
+        if _title_matches(ev, PARTNER_KEYWORDS, matched_ids):
             item = ev.get("title", "")
             if item and item.lower() not in seen:
                 seen.add(item.lower())
@@ -1052,9 +1070,35 @@ def _derive_talent_culture(db, comp_id: str, comp_scores: dict) -> str:
 def _build_competitor_deep_dive(
     db, comp_id, comp_op, target_operator,
     target_period, n_quarters, comp_scores, intel_events,
-    all_scores_by_operator=None,
+    all_scores_by_operator=None, market=None, as_of=None,
+):
+    """Build a CompetitorDeepDive for a single competitor.
+
+    Only the implications depend on the target operator; the rest of the
+    profile is built once per market sweep (see src/blm/market_sweep.py).
+    """
+    deep_dive = shared(
+        db, ("competitor_profile", comp_id, target_period, n_quarters),
+        lambda: _build_competitor_profile(
+            db, comp_id, comp_op, target_period, n_quarters,
+            comp_scores, intel_events, all_scores_by_operator,
+            market=market, as_of=as_of,
+        ),
+    )
+    deep_dive.implications = _derive_implications(
+        target_operator, comp_id, deep_dive.operator,
+        deep_dive.financial_health, deep_dive.subscriber_health,
+        deep_dive.network_status, deep_dive.strengths, deep_dive.weaknesses,
+        deep_dive.likely_future_actions,
+    )
+    return deep_dive
+
+
+def _build_competitor_profile(
+    db, comp_id, comp_op, target_period, n_quarters, comp_scores,
+    intel_events, all_scores_by_operator=None, market=None, as_of=None,
 ):
-    """Build a CompetitorDeepDive for a single competitor."""
+    """Target-independent part of a CompetitorDeepDive (no implications)."""
 
     display_name = comp_op.get("display_name", comp_id)
 
@@ -1082,18 +1126,14 @@ def _build_competitor_deep_dive(
         comp_op, comp_scores, display_name,
     )
 
-    # Implications for the target operator
-    implications = _derive_implications(
-        target_operator, comp_id, display_name,
-        financial_health, subscriber_health, network_status,
-        strengths, weaknesses, likely_future_actions,
-    )
-
     # Derived skeleton fields
     growth_strategy = _derive_growth_strategy(
         financial_health, subscriber_health, comp_scores,
     )
-    ma_activity = _derive_ma_activity(intel_events, comp_id)
+    ma_activity = _derive_ma_activity(
+        intel_events, comp_id,
+        _keyword_event_ids(db, market, comp_id, MA_KEYWORDS, as_of),
+    )
     problems = _derive_problems(weaknesses, financial_health, subscriber_health)
     product_portfolio = _derive_product_portfolio(comp_scores, subscriber_health)
     business_model = _derive_business_model(financial_health, subscriber_health)
@@ -1106,6 +1146,7 @@ def _build_competitor_deep_dive(
     supply_chain_status = _derive_supply_chain_status(network_status)
     ecosystem_partners = _derive_ecosystem_partners(
         intel_events, comp_id, network_status,
+        _keyword_event_ids(db, market, comp_id, PARTNER_KEYWORDS, as_of),
     )
     core_control_points = _derive_core_control_points(
         comp_scores, network_status, subscriber_health,
@@ -1122,7 +1163,7 @@ def _build_competitor_deep_dive(
         strengths=strengths,
         weaknesses=weaknesses,
         likely_future_actions=likely_future_actions,
-        implications=implications,
+        implications=[],
         growth_strategy=growth_strategy,
         ma_activity=ma_activity,
         problems=problems,
@@ -1731,14 +1772,40 @@ def _group_scores_by_operator(comp_scores):
     return raw
 
 
-def _safe_intelligence_events(db, market=None, days_back=730):
+def _safe_intelligence_events(db, market=None, days_back=_INTEL_DAYS_BACK,
+                              as_of=None):
     """Safely retrieve intelligence events, returning empty list on failure."""
     try:
-        return db.get_intelligence_events(market=market, days_back=days_back)
+        return db.get_intelligence_events(market=market, days_back=days_back,
+                                          as_of=as_of)
     except Exception:
         return []
 
 
+def _keyword_event_ids(db, market, comp_id, keywords, as_of=None) -> Optional[set]:
+    """Ids of a competitor's events whose title contains any keyword.
+
+    Matching runs in SQLite (FTS index) over the same window as
+    _safe_intelligence_events.  None when the database cannot search, in
+    which case callers scan the titles themselves.
+    """
+    search = getattr(db, "search_intelligence_events", None)
+    if search is None:
+        return None
+    try:
+        return set(search(market=market, operator_id=comp_id, keywords=keywords,
+                          days_back=_INTEL_DAYS_BACK, as_of=as_of, ids_only=True))
+    except Exception:
+        return None
+
+
+def _title_matches(ev: dict, keywords, matched_ids: Optional[set]) -> bool:
+    if matched_ids is not None and "id" in ev:
+        return ev["id"] in matched_ids
+    title = (ev.get("title") or "").lower()
+    return any(kw in title for kw in keywords)
+
+
 def _empty_insight(message):
     """Return a valid but empty CompetitionInsight."""
     return CompetitionInsight(
@@ -383,7 +383,8 @@ def _build_market_snapshot(db, market: str, latest_cq: str,
 def _detect_market_changes(db, market: str, target_operator: str,
                             latest_cq: str, n_quarters: int,
                             provenance=None,
-                            market_config: MarketConfig = None) -> list[MarketChange]:
+                            market_config: MarketConfig = None,
+                            as_of=None) -> list[MarketChange]:
     """Detect significant market changes by comparing quarters."""
     currency = market_config.currency if market_config else "USD"
     changes = []
@@ -563,7 +564,8 @@ def _detect_market_changes(db, market: str, target_operator: str,
 
     # --- Intelligence events (deduplicated) ---
     try:
-        raw_events = db.get_intelligence_events(market=market, days_back=365)
+        raw_events = db.get_intelligence_events(market=market, days_back=365,
+                                                as_of=as_of)
         seen_titles = set()
         events = []
         for e in raw_events:
@@ -1101,6 +1103,7 @@ def analyze_market_customer(
     n_quarters: int = 8,
     provenance=None,
     market_config: MarketConfig = None,
+    as_of=None,
 ) -> MarketCustomerInsight:
     """Perform Look 2: Market/Customer analysis.
 
@@ -1115,6 +1118,7 @@ def analyze_market_customer(
                        If None, uses the latest available quarter.
         n_quarters: Number of quarters for trend analysis (default 8)
         provenance: Optional ProvenanceStore for data tracking
+        as_of: Date intelligence event windows end on; None for today
 
     Returns:
         MarketCustomerInsight with complete market/customer analysis
@@ -1128,7 +1132,7 @@ def analyze_market_customer(
     # 2. Detect market changes
     changes = _detect_market_changes(
         db, market, target_operator, latest_cq, n_quarters, provenance,
-        market_config=market_config,
+        market_config=market_config, as_of=as_of,
     )
 
     # 3. Separate opportunities and threats
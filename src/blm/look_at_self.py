@@ -10,7 +10,8 @@ from __future__ import annotations
 
 from typing import Optional
 
-from src.blm.share_analyzer import compute_share_analysis
+from src.blm.market_sweep import shared
+from src.blm.share_analyzer import compute_all_share_analyses, compute_share_matrices
 from src.blm.trend_analyzer import compute_trend_metrics
 from src.database.db import TelecomDatabase
 from src.models.market_config import MarketConfig
@@ -59,6 +60,9 @@ SEGMENT_DEFINITIONS = [
 VALID_HEALTH_STATUSES = {"strong", "stable", "weakening", "critical"}
 VALID_HEALTH_RATINGS = {"healthy", "stable", "concerning", "critical"}
 
+# Share metrics always reported in share_trends (even when empty)
+_CORE_SHARE_METRICS = ("revenue", "mobile_subscribers", "broadband_subscribers")
+
 
 # ============================================================================
 # Helper Functions
@@ -2113,6 +2117,7 @@ def analyze_self(
     n_quarters: int = 8,
     provenance=None,
     market_config: MarketConfig = None,
+    as_of=None,
 ) -> SelfInsight:
     """Analyze the target operator's internal state and capabilities.
 
@@ -2128,6 +2133,7 @@ def analyze_self(
             If None, uses the latest available.
         n_quarters: Number of quarters for timeseries (default 8).
         provenance: Optional provenance tracker (reserved for future use).
+        as_of: Date intelligence event windows end on; None for today.
 
     Returns:
         SelfInsight dataclass with complete self-analysis results.
@@ -2218,7 +2224,7 @@ def analyze_self(
     intelligence_events = []
     try:
         intelligence_events = db.get_intelligence_events(
-            market=market, operator_id=target_operator,
+            market=market, operator_id=target_operator, as_of=as_of,
         )
     except Exception:
         pass
@@ -2312,16 +2318,26 @@ def analyze_self(
     # Derive quarter list from market timeseries
     share_quarters = sorted({r.get("calendar_quarter", "") for r in market_ts} - {""})
 
-    for metric in ("revenue", "mobile_subscribers", "broadband_subscribers"):
-        sa = compute_share_analysis(
-            market_ts=market_ts,
-            sub_data_by_op=sub_data_by_op,
-            quarters=share_quarters,
-            target_operator_id=target_operator,
-            metric_type=metric,
-            display_names=display_names,
-        )
-        if sa.operator_series:
+    # All share metrics from one matrix pass; the secondary ones (fiber,
+    # TV, B2B, segment revenue) are only kept when the market reports them
+    matrices = shared(
+        db, ("share_matrices", market, end_cq, n_quarters),
+        lambda: compute_share_matrices(market_ts, sub_data_by_op, share_quarters),
+    ) if share_quarters else None
+    analyses = compute_all_share_analyses(
+        market_ts=market_ts,
+        sub_data_by_op=sub_data_by_op,
+        quarters=share_quarters,
+        target_operator_id=target_operator,
+        display_names=display_names,
+        matrices=matrices,
+    )
+    for metric, sa in analyses.items():
+        if not sa.operator_series:
+            continue
+        if metric in _CORE_SHARE_METRICS or any(
+            s.latest_share_pct is not None for s in sa.operator_series
+        ):
             share_trends[metric] = sa
 
     # Backward-compat: flat keys for consumers that read simple values
@@ -35,6 +35,7 @@ def analyze_trends(
     n_quarters: int = 8,
     provenance=None,
     market_config=None,
+    as_of=None,
 ) -> TrendAnalysis:
     """Run the complete Look 1: Trends analysis.
 
@@ -45,6 +46,7 @@ def analyze_trends(
         target_period: Optional end calendar quarter, e.g. "CQ4_2025".
         n_quarters: Number of quarters of historical data to analyse.
         provenance: Optional ProvenanceStore for data-point tracking.
+        as_of: Date intelligence event windows end on; None for today.
 
     Returns:
         A fully populated TrendAnalysis dataclass.
@@ -56,7 +58,7 @@ def analyze_trends(
     # 1. Gather raw data from the database
     # ------------------------------------------------------------------
     macro_data = db.get_macro_data(country, n_quarters=n_quarters, end_cq=target_period)
-    intelligence_events = _get_intelligence_safe(db, market)
+    intelligence_events = _get_intelligence_safe(db, market, as_of)
     operators = db.get_operators_in_market(market)
     market_ts = db.get_market_timeseries(market, n_quarters=n_quarters, end_cq=target_period)
 
@@ -133,10 +135,10 @@ def _resolve_country(db, market: str) -> str:
 # Safe intelligence event retrieval
 # ---------------------------------------------------------------------------
 
-def _get_intelligence_safe(db, market: str) -> list:
+def _get_intelligence_safe(db, market: str, as_of=None) -> list:
     """Retrieve intelligence events, deduplicated by title."""
     try:
-        raw = db.get_intelligence_events(market=market, days_back=730)
+        raw = db.get_intelligence_events(market=market, days_back=730, as_of=as_of)
         # Deduplicate by title (database may contain duplicate inserts)
         seen = set()
         unique = []
@@ -0,0 +1,142 @@
+"""Market-wide sweep: every operator of a market as target_operator.
+
+Running BLMAnalysisEngine once per operator repeats most of the work: the
+same market snapshot, competitive scores, intelligence events, tariff index,
+share matrices and competitor profiles are fetched and rebuilt N times,
+although none of them depends on who the target is.
+
+``run_market_sweep()`` runs all N engines against one SweepDatabase, which
+  - memoizes every TelecomDatabase read for the duration of the sweep, and
+  - holds a memo for target-independent intermediate results; analyzers opt
+    in through ``shared(db, key, compute)``.
+
+Each engine then only computes its own target's perspective (implications,
+target shares, SWOT, opportunities). Results are identical to N separate
+runs: memoized values are deep-copied on every hit, so no run can observe
+another's mutations.
+
+Usage:
+    from src.blm.market_sweep import run_market_sweep
+
+    results = run_market_sweep(db, "germany", target_period="CQ4_2025")
+    results["vodafone_germany"]  # FiveLooksResult
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+from typing import Callable, Optional
+
+
+def shared(db, key: tuple, compute: Callable, deep_copy: bool = True):
+    """Compute a target-independent value once per sweep.
+
+    Outside a sweep (``db`` is not a SweepDatabase) this is just ``compute()``.
+
+    Args:
+        db: The database handed to the analyzer.
+        key: Identifies the value within the market, e.g.
+            ("competitor_profile", comp_id, period, n_quarters).
+        compute: Zero-argument callable producing the value.
+        deep_copy: Return a private copy on each use. Only pass False for
+            values nobody mutates (e.g. a TariffIndex).
+    """
+    memo = getattr(db, "sweep_memo", None)
+    if not isinstance(memo, SweepMemo):
+        return compute()
+    return memo.get_or_compute(key, compute, deep_copy)
+
+
+class SweepMemo:
+    """Thread-safe key -> value memo (values computed outside the lock)."""
+
+    def __init__(self):
+        self._values: dict = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key, compute: Callable, deep_copy: bool = True):
+        with self._lock:
+            found = key in self._values
+            value = self._values.get(key)
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if not found:
+            value = compute()
+            with self._lock:
+                value = self._values.setdefault(key, value)
+        return copy.deepcopy(value) if deep_copy else value
+
+
+class SweepDatabase:
+    """TelecomDatabase proxy whose get_* reads are memoized for one sweep.
+
+    Everything else (conn, upserts, thread connections) goes straight to
+    the wrapped database.
+    """
+
+    def __init__(self, db):
+        self._db = db
+        self.sweep_memo = SweepMemo()
+
+    def __getattr__(self, name):
+        attr = getattr(self._db, name)
+        if not name.startswith("get_") or not callable(attr):
+            return attr
+
+        def memoized(*args, **kwargs):
+            key = ("db", name, args, tuple(sorted(kwargs.items())))
+            return self.sweep_memo.get_or_compute(
+                key, lambda: attr(*args, **kwargs))
+
+        return memoized
+
+
+def run_market_sweep(
+    db,
+    market: str,
+    target_period: Optional[str] = None,
+    n_quarters: int = 8,
+    operators: Optional[list[str]] = None,
+    **engine_kwargs,
+) -> dict:
+    """Run Five Looks once per operator of ``market``, sharing market-level work.
+
+    Args:
+        db: Initialized TelecomDatabase.
+        market: Market identifier.
+        target_period: Calendar quarter, or None for the latest.
+        n_quarters: Historical range.
+        operators: Operator IDs to analyse; defaults to every operator in
+            the market.
+        **engine_kwargs: Passed to BLMAnalysisEngine (parallel, cache, ...).
+
+    Returns:
+        {operator_id: FiveLooksResult}, in market operator order. Operators
+        whose run fails are reported and left out.
+    """
+    from src.blm.engine import BLMAnalysisEngine
+
+    sweep_db = SweepDatabase(db)
+    if operators is None:
+        operators = [op["operator_id"] for op in sweep_db.get_operators_in_market(market)]
+
+    results = {}
+    for operator_id in operators:
+        try:
+            engine = BLMAnalysisEngine(
+                db=sweep_db,
+                target_operator=operator_id,
+                market=market,
+                target_period=target_period,
+                n_quarters=n_quarters,
+                **engine_kwargs,
+            )
+            results[operator_id] = engine.run_five_looks()
+        except Exception as e:
+            print(f"  [!] Sweep run failed for {operator_id}: {e}")
+    return results
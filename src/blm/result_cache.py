@@ -0,0 +1,225 @@
+"""Input-fingerprint cache for BLMAnalysisEngine results.
+
+A Five Looks run is a pure function of
+  - the database rows it can read for the market,
+  - the run parameters (operator, period, n_quarters),
+  - today's date (intelligence event windows are relative to today),
+  - the engine code.
+
+``run_fingerprint()`` hashes each of those: one content hash per source
+table, scoped to the market (its operators' rows, its events, its
+countries' macro data), plus a hash of the engine source files.  A cache hit
+returns the pickled FiveLooksResult stored for that fingerprint.
+
+Editing data in one market changes only that market's table hashes, so
+only its cached results stop matching; every other market keeps hitting.
+Stored results for a run whose fingerprint moved on are replaced on the
+next put().
+
+Used by the web runner, market audits and group runs when
+BLM_RESULT_CACHE_DB is set (see get_result_cache()).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+
+# Bump to invalidate every stored entry (e.g. pickle layout changes)
+CACHE_FORMAT_VERSION = 1
+
+_MARKET_OPERATORS = "SELECT operator_id FROM operators WHERE market = ?"
+
+# table -> (WHERE clause scoping rows to one market, number of market params)
+MARKET_TABLE_SCOPES: dict[str, tuple[str, int]] = {
+    "operators": ("market = ?", 1),
+    "financial_quarterly": (f"operator_id IN ({_MARKET_OPERATORS})", 1),
+    "subscriber_quarterly": (f"operator_id IN ({_MARKET_OPERATORS})", 1),
+    "network_infrastructure": (f"operator_id IN ({_MARKET_OPERATORS})", 1),
+    "tariffs": (f"operator_id IN ({_MARKET_OPERATORS})", 1),
+    "competitive_scores": (f"operator_id IN ({_MARKET_OPERATORS})", 1),
+    "intelligence_events": (f"market = ? OR operator_id IN ({_MARKET_OPERATORS})", 2),
+    "executives": (f"operator_id IN ({_MARKET_OPERATORS})", 1),
+    "macro_environment": (
+        "country IN (SELECT country FROM operators WHERE market = ?) "
+        "OR lower(country) = lower(?)", 2),
+    "earnings_call_highlights": (f"operator_id IN ({_MARKET_OPERATORS})", 1),
+}
+
+# Bookkeeping columns that do not reach the analysis
+_IGNORED_COLUMNS = {"id", "collected_at", "created_at"}
+
+# Source trees whose code determines a result
+_ENGINE_SOURCES = ("src/blm", "src/models", "src/database")
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+@lru_cache(maxsize=1)
+def engine_code_version() -> str:
+    """Hash of every engine, model and data-layer source file."""
+    digest = hashlib.sha256()
+    for base in _ENGINE_SOURCES:
+        for path in sorted((_PROJECT_ROOT / base).rglob("*")):
+            if path.suffix not in (".py", ".sql") or "_legacy" in path.parts:
+                continue
+            digest.update(str(path.relative_to(_PROJECT_ROOT)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def table_fingerprint(conn, table: str, market: str) -> str:
+    """Content hash of the rows of ``table`` an engine run for ``market`` can read.
+
+    Rows are hashed in rowid order (ties in the analysis fall back to it).
+    """
+    where, n_params = MARKET_TABLE_SCOPES[table]
+    columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")
+               if row[1] not in _IGNORED_COLUMNS]
+    cursor = conn.execute(
+        f"SELECT {', '.join(columns)} FROM {table} WHERE {where} ORDER BY rowid",
+        [market] * n_params,
+    )
+    digest = hashlib.sha256(",".join(columns).encode())
+    for row in cursor:
+        digest.update(repr(tuple(row)).encode())
+    return digest.hexdigest()[:16]
+
+
+def table_fingerprints(db, market: str) -> dict[str, str]:
+    """{table: content hash} for every table an engine run reads."""
+    return {table: table_fingerprint(db.conn, table, market)
+            for table in MARKET_TABLE_SCOPES}
+
+
+def run_fingerprint(db, market: str, target_operator: str,
+                    target_period: Optional[str], n_quarters: int,
+                    as_of: Optional[date] = None) -> str:
+    """Cache key for one engine run over the current contents of ``db``."""
+    parts = [
+        f"v{CACHE_FORMAT_VERSION}",
+        engine_code_version(),
+        market, target_operator, str(target_period), str(n_quarters),
+        (as_of or date.today()).isoformat(),
+    ]
+    for table, digest in table_fingerprints(db, market).items():
+        parts.append(f"{table}={digest}")
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+
+_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS engine_result_cache (
+    fingerprint TEXT PRIMARY KEY,
+    market TEXT NOT NULL,
+    target_operator TEXT NOT NULL,
+    target_period TEXT,
+    n_quarters INTEGER NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_result_cache_run
+    ON engine_result_cache(market, target_operator, target_period, n_quarters);
+"""
+
+
+class ResultCache:
+    """SQLite store of pickled FiveLooksResult objects keyed by fingerprint.
+
+    Safe to share between threads; a single connection is used under a lock.
+
+    Args:
+        db_path: Path to the cache database. Use ":memory:" for testing.
+    """
+
+    def __init__(self, db_path: str = "data/cache/engine_results.db"):
+        self.db_path = db_path
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(_CACHE_SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+    def get(self, fingerprint: str):
+        """Stored FiveLooksResult for ``fingerprint``, or None."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT payload FROM engine_result_cache WHERE fingerprint = ?",
+                [fingerprint],
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        try:
+            result = pickle.loads(row[0])
+        except Exception as e:
+            print(f"  [!] Discarding unreadable cached result: {e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    def put(self, fingerprint: str, result, target_period: Optional[str],
+            n_quarters: int) -> None:
+        """Store ``result``, replacing older entries for the same run."""
+        payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock, self.conn:
+            self.conn.execute(
+                "DELETE FROM engine_result_cache WHERE market = ? "
+                "AND target_operator = ? AND target_period IS ? AND n_quarters = ?",
+                [result.market, result.target_operator, target_period, n_quarters],
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO engine_result_cache "
+                "(fingerprint, market, target_operator, target_period, "
+                " n_quarters, created_at, payload) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [fingerprint, result.market, result.target_operator,
+                 target_period, n_quarters,
+                 datetime.now(timezone.utc).isoformat(), payload],
+            )
+
+    def invalidate(self, market: Optional[str] = None) -> int:
+        """Drop stored results for ``market`` (all markets if None)."""
+        with self._lock, self.conn:
+            if market is None:
+                cursor = self.conn.execute("DELETE FROM engine_result_cache")
+            else:
+                cursor = self.conn.execute(
+                    "DELETE FROM engine_result_cache WHERE market = ?", [market])
+        return cursor.rowcount
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM engine_result_cache").fetchone()[0]
+
+
+_cache: Optional[ResultCache] = None
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Process-wide result cache, or None if disabled.
+
+    Enabled by BLM_RESULT_CACHE_DB=<path to cache database>.
+    """
+    global _cache
+    path = os.getenv("BLM_RESULT_CACHE_DB")
+    if not path:
+        return None
+    if _cache is None or _cache.db_path != path:
+        _cache = ResultCache(path)
+    return _cache
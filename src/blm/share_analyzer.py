@@ -3,8 +3,13 @@
 Computes market share history across operators, share movement metrics
 (gain/loss velocity, rank changes), and HHI concentration trends.
 
+Shares, ranks and HHI are computed on an operators × quarters numpy matrix
+(one matrix per metric, stacked so every metric is computed in one pass).
+``compute_market_concentration_batch`` stacks several markets as well, so
+group dashboards get concentration trends without a full Five Looks run.
+
 Design constraints:
-  - No numpy/scipy — stdlib `math` only
+  - numpy only — no scipy/pandas
   - All functions handle empty, single-value, all-zeros, and None-filled arrays
   - Pure functions — no side effects, no DB access
 """
@@ -14,6 +19,29 @@ import math
 from dataclasses import dataclass, field, asdict
 from typing import Optional
 
+import numpy as np
+
+
+# Share metrics computed from financial_quarterly rows (market timeseries)
+REVENUE_SHARE_FIELDS = {
+    "revenue": "total_revenue",
+    "mobile_revenue": "mobile_service_revenue",
+    "fixed_revenue": "fixed_service_revenue",
+    "b2b_revenue": "b2b_revenue",
+    "tv_revenue": "tv_revenue",
+}
+
+# Share metrics computed from subscriber_quarterly rows
+SUBSCRIBER_SHARE_FIELDS = {
+    "mobile_subscribers": "mobile_total_k",
+    "broadband_subscribers": "broadband_total_k",
+    "fiber_subscribers": "broadband_fiber_k",
+    "tv_subscribers": "tv_total_k",
+    "b2b_customers": "b2b_customers_k",
+}
+
+ALL_SHARE_METRICS = tuple(REVENUE_SHARE_FIELDS) + tuple(SUBSCRIBER_SHARE_FIELDS)
+
 
 # ============================================================================
 # Data models
@@ -92,6 +120,36 @@ class ShareAnalysis:
         return d
 
 
+@dataclass
+class ShareMatrix:
+    """Operators × quarters share matrix for one metric.
+
+    ``shares`` is NaN where an operator has no positive value in a quarter;
+    ``ranks`` treats those as 0% (1 = largest share).
+    """
+    metric_type: str = ""
+    operator_ids: list[str] = field(default_factory=list)
+    quarters: list[str] = field(default_factory=list)
+    shares: np.ndarray = field(default_factory=lambda: np.empty((0, 0)))
+    ranks: np.ndarray = field(default_factory=lambda: np.empty((0, 0), dtype=int))
+    hhi: np.ndarray = field(default_factory=lambda: np.empty(0))
+
+    def share_dict(self) -> dict[str, dict[str, Optional[float]]]:
+        """{operator_id: {quarter: share_pct or None}}."""
+        return {
+            op: {cq: (None if math.isnan(v) else float(v))
+                 for cq, v in zip(self.quarters, row)}
+            for op, row in zip(self.operator_ids, self.shares)
+        }
+
+    def rank_dict(self) -> dict[str, dict[str, int]]:
+        """{operator_id: {quarter: rank}}."""
+        return {
+            op: {cq: int(r) for cq, r in zip(self.quarters, row)}
+            for op, row in zip(self.operator_ids, self.ranks)
+        }
+
+
 # ============================================================================
 # Internal helpers
 # ============================================================================
@@ -122,147 +180,144 @@ def _classify_direction(change_pp: Optional[float]) -> str:
 # Pure functions
 # ============================================================================
 
-def _extract_revenue_shares(
+def _rows_by_operator(
     market_ts: list[dict],
     quarters: list[str],
-) -> dict[str, dict[str, Optional[float]]]:
-    """Compute revenue share % per operator per quarter.
-
-    Returns: {operator_id: {quarter: share_pct}} where share_pct is 0-100.
-    """
-    # Group rows by quarter
-    by_quarter: dict[str, list[dict]] = {}
+) -> dict[str, list[dict]]:
+    """Group market timeseries rows by operator (first-appearance order),
+    keeping only rows inside ``quarters``."""
+    wanted = set(quarters)
+    by_op: dict[str, list[dict]] = {}
     for row in market_ts:
-        cq = row.get("calendar_quarter", "")
-        if cq in quarters:
-            by_quarter.setdefault(cq, []).append(row)
+        op = row.get("operator_id", "")
+        if op and row.get("calendar_quarter", "") in wanted:
+            by_op.setdefault(op, []).append(row)
+    return by_op
 
-    # All operators across all quarters
-    all_ops: set[str] = set()
-    for rows in by_quarter.values():
+
+def _value_tensor(
+    rows_by_op: dict[str, list[dict]],
+    quarters: list[str],
+    field_names: list[str],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Fill a metrics × operators × quarters array in one pass over the rows.
+
+    Cells hold the positive value of each field, NaN otherwise; when an
+    operator has several rows for a quarter, the last one's.  Also returns
+    the per-quarter sum of the positive values of every row, duplicates
+    included (metrics × 1 × quarters).
+    """
+    q_index = {cq: j for j, cq in enumerate(quarters)}
+    values = np.full((len(field_names), len(rows_by_op), len(quarters)), np.nan)
+    row_metric, row_quarter, row_value = [], [], []
+    for i, rows in enumerate(rows_by_op.values()):
         for row in rows:
-            op = row.get("operator_id", "")
-            if op:
-                all_ops.add(op)
+            j = q_index.get(row.get("calendar_quarter", ""))
+            if j is None:
+                continue
+            for m, field_name in enumerate(field_names):
+                val = _safe_float(row.get(field_name))
+                if val is not None and val > 0:
+                    values[m, i, j] = val
+                    row_metric.append(m)
+                    row_quarter.append(j)
+                    row_value.append(val)
+    row_totals = np.zeros((len(field_names), 1, len(quarters)))
+    np.add.at(row_totals, (row_metric, 0, row_quarter), row_value)
+    return values, row_totals
+
+
+def _share_tensor(values: np.ndarray, totals: Optional[np.ndarray] = None) -> np.ndarray:
+    """Share % along the operator axis (-2). NaN where the value is missing.
+
+    ``totals`` defaults to the sum of ``values`` over the operators.
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if totals is None:
+            totals = np.nansum(values, axis=-2, keepdims=True)
+        return (values / totals) * 100.0
 
-    result: dict[str, dict[str, Optional[float]]] = {op: {} for op in all_ops}
 
-    for cq in quarters:
-        rows = by_quarter.get(cq, [])
-        total = 0.0
-        op_revs: dict[str, float] = {}
-        for row in rows:
-            op = row.get("operator_id", "")
-            rev = _safe_float(row.get("total_revenue"))
-            if op and rev is not None and rev > 0:
-                op_revs[op] = rev
-                total += rev
-
-        for op in all_ops:
-            if total > 0 and op in op_revs:
-                result[op][cq] = (op_revs[op] / total) * 100.0
-            else:
-                result[op][cq] = None
+def _rank_tensor(shares: np.ndarray) -> np.ndarray:
+    """Rank operators per quarter (1 = largest); missing shares count as 0.
 
-    return result
+    Stable sort, so ties keep operator order.
+    """
+    filled = np.nan_to_num(shares, nan=0.0)
+    order = np.argsort(-filled, axis=-2, kind="stable")
+    ranks = np.empty(order.shape, dtype=int)
+    positions = np.arange(1, shares.shape[-2] + 1)[:, None]
+    np.put_along_axis(ranks, order, np.broadcast_to(positions, order.shape), axis=-2)
+    return ranks
 
 
-def _extract_subscriber_shares(
-    sub_data_by_op: dict[str, list[dict]],
-    quarters: list[str],
-    field_name: str,
-) -> dict[str, dict[str, Optional[float]]]:
-    """Compute subscriber share % per operator per quarter.
+def _hhi_tensor(shares: np.ndarray) -> np.ndarray:
+    """HHI per quarter: sum of squared share % over the operator axis."""
+    return np.nansum(shares * shares, axis=-2)
 
-    Args:
-        sub_data_by_op: {operator_id: [subscriber rows]}
-        quarters: ordered list of CQ labels
-        field_name: e.g. "mobile_total_k" or "broadband_total_k"
 
-    Returns: {operator_id: {quarter: share_pct}}
+def _share_matrices(
+    rows_by_op: dict[str, list[dict]],
+    quarters: list[str],
+    metric_fields: dict[str, str],
+    total_every_row: bool = False,
+) -> dict[str, ShareMatrix]:
+    """Build ShareMatrix objects for several metrics from the same rows.
+
+    With ``total_every_row``, the market total of a quarter counts every
+    row, including an operator's duplicate rows (revenue shares); otherwise
+    only the value kept for each operator (subscriber shares).
     """
-    all_ops = set(sub_data_by_op.keys())
-    if not all_ops:
+    if not metric_fields:
         return {}
-
-    # Build per-op per-quarter value lookup
-    op_q_val: dict[str, dict[str, float]] = {op: {} for op in all_ops}
-    for op, rows in sub_data_by_op.items():
-        for row in rows:
-            cq = row.get("calendar_quarter", "")
-            val = _safe_float(row.get(field_name))
-            if cq and val is not None and val > 0:
-                op_q_val[op][cq] = val
-
-    result: dict[str, dict[str, Optional[float]]] = {op: {} for op in all_ops}
-
-    for cq in quarters:
-        total = sum(op_q_val[op].get(cq, 0) for op in all_ops)
-        for op in all_ops:
-            v = op_q_val[op].get(cq)
-            if total > 0 and v is not None and v > 0:
-                result[op][cq] = (v / total) * 100.0
-            else:
-                result[op][cq] = None
-
-    return result
+    values, row_totals = _value_tensor(rows_by_op, quarters, list(metric_fields.values()))
+    shares = _share_tensor(values, row_totals if total_every_row else None)
+    ranks = _rank_tensor(shares)
+    hhi = _hhi_tensor(shares)
+    op_ids = list(rows_by_op)
+    return {
+        metric: ShareMatrix(
+            metric_type=metric,
+            operator_ids=op_ids,
+            quarters=list(quarters),
+            shares=shares[m],
+            ranks=ranks[m],
+            hhi=hhi[m],
+        )
+        for m, metric in enumerate(metric_fields)
+    }
 
 
-def _build_operator_series(
-    op_id: str,
-    display_name: str,
-    shares_by_quarter: dict[str, Optional[float]],
+def compute_share_matrices(
+    market_ts: list[dict],
+    sub_data_by_op: dict[str, list[dict]],
     quarters: list[str],
-    ranks_by_quarter: dict[str, int],
-) -> OperatorShareSeries:
-    """Build an OperatorShareSeries from per-quarter share data."""
-    share_list = [shares_by_quarter.get(cq) for cq in quarters]
-    valid = [(i, v) for i, v in enumerate(share_list) if v is not None]
-
-    latest = valid[-1][1] if valid else None
-    change_pp = None
-    avg_change = None
-    if len(valid) >= 2:
-        change_pp = valid[-1][1] - valid[0][1]
-        n_gaps = valid[-1][0] - valid[0][0]
-        avg_change = change_pp / n_gaps if n_gaps > 0 else 0.0
-
-    # Ranks
-    rank_latest = ranks_by_quarter.get(quarters[-1]) if quarters else None
-    rank_earliest = ranks_by_quarter.get(quarters[0]) if quarters else None
-    rank_change = None
-    if rank_latest is not None and rank_earliest is not None:
-        # Positive means improved (rank went down numerically = better)
-        rank_change = rank_earliest - rank_latest
-
-    return OperatorShareSeries(
-        operator_id=op_id,
-        display_name=display_name,
-        share_pct=[v if v is not None else 0.0 for v in share_list],
-        quarters=list(quarters),
-        latest_share_pct=round(latest, 2) if latest is not None else None,
-        share_change_pp=round(change_pp, 2) if change_pp is not None else None,
-        avg_quarterly_change_pp=round(avg_change, 2) if avg_change is not None else None,
-        direction=_classify_direction(change_pp),
-        rank_latest=rank_latest,
-        rank_change=rank_change,
-    )
-
+    metrics: tuple[str, ...] = ALL_SHARE_METRICS,
+) -> dict[str, ShareMatrix]:
+    """Share, rank and HHI matrices for every requested metric in one pass.
 
-def _compute_hhi(shares_by_quarter: dict[str, list[float]]) -> list[float]:
-    """Compute HHI per quarter. shares_by_quarter: {quarter: [share_pct per op]}.
+    Args:
+        market_ts: Financial timeseries rows (all operators, all quarters).
+        sub_data_by_op: {operator_id: subscriber rows}.
+        quarters: Ordered list of CQ labels.
+        metrics: Metric keys from REVENUE_SHARE_FIELDS / SUBSCRIBER_SHARE_FIELDS.
 
-    HHI = sum(share_i^2), range 0-10000 for pct inputs.
+    Returns:
+        {metric: ShareMatrix}; unknown metrics are skipped.
     """
-    result = []
-    for cq, shares in shares_by_quarter.items():
-        valid = [s for s in shares if s is not None and s > 0]
-        if valid:
-            hhi = sum(s * s for s in valid)
-            result.append(round(hhi, 2))
-        else:
-            result.append(0.0)
-    return result
+    revenue_fields = {m: REVENUE_SHARE_FIELDS[m] for m in metrics
+                      if m in REVENUE_SHARE_FIELDS}
+    subscriber_fields = {m: SUBSCRIBER_SHARE_FIELDS[m] for m in metrics
+                         if m in SUBSCRIBER_SHARE_FIELDS}
+
+    matrices = {}
+    if revenue_fields:
+        matrices.update(_share_matrices(
+            _rows_by_operator(market_ts, quarters), quarters, revenue_fields,
+            total_every_row=True))
+    if subscriber_fields:
+        matrices.update(_share_matrices(sub_data_by_op, quarters, subscriber_fields))
+    return {m: matrices[m] for m in metrics if m in matrices}
 
 
 def _classify_hhi(hhi: float) -> str:
@@ -282,22 +337,14 @@ def _compute_ranks(
 
     Returns: {operator_id: {quarter: rank}} where rank 1 = highest share.
     """
-    result: dict[str, dict[str, int]] = {op: {} for op in shares_data}
-
-    for cq in quarters:
-        # Collect (op, share) pairs, treating None as 0
-        items = []
-        for op in shares_data:
-            v = shares_data[op].get(cq)
-            items.append((op, v if v is not None else 0.0))
-
-        # Sort by share descending
-        items.sort(key=lambda x: -x[1])
-
-        for rank, (op, _) in enumerate(items, start=1):
-            result[op][cq] = rank
-
-    return result
+    shares = np.array(
+        [[np.nan if shares_data[op].get(cq) is None else shares_data[op][cq]
+          for cq in quarters] for op in shares_data],
+        dtype=float,
+    ).reshape(len(shares_data), len(quarters))
+    matrix = ShareMatrix(operator_ids=list(shares_data), quarters=list(quarters),
+                         ranks=_rank_tensor(shares))
+    return matrix.rank_dict()
 
 
 def _identify_share_movements(
@@ -359,87 +406,62 @@ def _generate_key_message(
     return "; ".join(parts) + "."
 
 
-# ============================================================================
-# Orchestrator
-# ============================================================================
-
-def compute_share_analysis(
-    market_ts: list[dict],
-    sub_data_by_op: dict[str, list[dict]],
-    quarters: list[str],
-    target_operator_id: str,
-    metric_type: str = "revenue",
-    display_names: Optional[dict[str, str]] = None,
-) -> ShareAnalysis:
-    """Compute complete share analysis for one metric type.
-
-    Args:
-        market_ts: Financial timeseries rows (all operators, all quarters).
-            Only needed when metric_type="revenue".
-        sub_data_by_op: {operator_id: subscriber rows}. Only needed for
-            metric_type="mobile_subscribers" or "broadband_subscribers".
-        quarters: Ordered list of CQ labels (e.g. ["CQ1_2024", ..., "CQ4_2025"]).
-        target_operator_id: The target operator to highlight.
-        metric_type: One of "revenue", "mobile_subscribers", "broadband_subscribers".
-        display_names: Optional {operator_id: display_name} map.
-
-    Returns:
-        ShareAnalysis with all computed metrics.
-    """
-    if not quarters:
-        return ShareAnalysis(metric_type=metric_type, target_operator_id=target_operator_id)
-
-    display_names = display_names or {}
-
-    # 1. Extract share percentages
-    if metric_type == "revenue":
-        shares_data = _extract_revenue_shares(market_ts, quarters)
-    elif metric_type == "mobile_subscribers":
-        shares_data = _extract_subscriber_shares(sub_data_by_op, quarters, "mobile_total_k")
-    elif metric_type == "broadband_subscribers":
-        shares_data = _extract_subscriber_shares(sub_data_by_op, quarters, "broadband_total_k")
-    else:
-        return ShareAnalysis(metric_type=metric_type, target_operator_id=target_operator_id)
-
-    if not shares_data:
-        return ShareAnalysis(
-            metric_type=metric_type,
-            quarters=quarters,
-            target_operator_id=target_operator_id,
-        )
-
-    # 2. Compute ranks
-    ranks = _compute_ranks(shares_data, quarters)
+def _series_from_matrix(
+    matrix: ShareMatrix,
+    display_names: dict[str, str],
+) -> list[OperatorShareSeries]:
+    """Build one OperatorShareSeries per matrix row (vectorized movements)."""
+    shares = matrix.shares
+    n_ops, n_q = shares.shape
+    if n_ops == 0 or n_q == 0:
+        return []
+
+    valid = ~np.isnan(shares)
+    n_valid = valid.sum(axis=1)
+    first = valid.argmax(axis=1)
+    last = n_q - 1 - valid[:, ::-1].argmax(axis=1)
+    rows = np.arange(n_ops)
+    first_share = shares[rows, first]
+    last_share = shares[rows, last]
+    change = last_share - first_share
+    gaps = last - first
 
-    # 3. Build operator series
     series_list = []
-    for op_id, q_shares in shares_data.items():
-        name = display_names.get(op_id, op_id.replace("_", " ").title())
-        series = _build_operator_series(op_id, name, q_shares, quarters, ranks.get(op_id, {}))
-        series_list.append(series)
-
-    # Sort by latest share descending
-    series_list.sort(key=lambda s: -(s.latest_share_pct or 0))
-
-    # 4. HHI concentration
-    shares_by_q: dict[str, list[float]] = {}
-    for cq in quarters:
-        vals = []
-        for op_id in shares_data:
-            v = shares_data[op_id].get(cq)
-            if v is not None:
-                vals.append(v)
-        shares_by_q[cq] = vals
-
-    hhi_trend = _compute_hhi(shares_by_q)
+    for i, op_id in enumerate(matrix.operator_ids):
+        latest = float(last_share[i]) if n_valid[i] >= 1 else None
+        change_pp = avg_change = None
+        if n_valid[i] >= 2:
+            change_pp = float(change[i])
+            avg_change = change_pp / int(gaps[i])
+        rank_latest = int(matrix.ranks[i, -1])
+        rank_earliest = int(matrix.ranks[i, 0])
+
+        series_list.append(OperatorShareSeries(
+            operator_id=op_id,
+            display_name=display_names.get(op_id, op_id.replace("_", " ").title()),
+            share_pct=[0.0 if math.isnan(v) else float(v) for v in shares[i]],
+            quarters=list(matrix.quarters),
+            latest_share_pct=round(latest, 2) if latest is not None else None,
+            share_change_pp=round(change_pp, 2) if change_pp is not None else None,
+            avg_quarterly_change_pp=round(avg_change, 2) if avg_change is not None else None,
+            direction=_classify_direction(change_pp),
+            rank_latest=rank_latest,
+            # Positive means improved (rank went down numerically = better)
+            rank_change=rank_earliest - rank_latest,
+        ))
+    return series_list
+
+
+def _build_concentration(
+    hhi_trend: list[float],
+    latest_shares: list[float],
+) -> MarketConcentration:
+    """MarketConcentration from an HHI trend and the latest operator shares."""
     latest_hhi = hhi_trend[-1] if hhi_trend else 0.0
 
     # CR3
-    latest_shares = sorted(
-        [s.latest_share_pct for s in series_list if s.latest_share_pct is not None],
-        reverse=True,
-    )
-    cr3 = sum(latest_shares[:3]) if len(latest_shares) >= 3 else sum(latest_shares)
+    ranked = sorted(latest_shares, reverse=True)
+    cr3 = sum(ranked[:3])
 
     # HHI direction
     hhi_direction = "stable"
@@ -450,7 +472,7 @@ def compute_share_analysis(
         elif hhi_change < -50:
             hhi_direction = "fragmenting"
 
-    concentration = MarketConcentration(
+    return MarketConcentration(
         hhi=round(latest_hhi, 2),
         hhi_label=_classify_hhi(latest_hhi),
         cr3=round(cr3, 2),
@@ -458,7 +480,30 @@ def compute_share_analysis(
         hhi_direction=hhi_direction,
     )
 
-    # 5. Identify target, leader, movers
+
+def _analysis_from_matrix(
+    matrix: ShareMatrix,
+    target_operator_id: str,
+    display_names: dict[str, str],
+) -> ShareAnalysis:
+    """Assemble a ShareAnalysis (series, concentration, movers) from a matrix."""
+    if not matrix.operator_ids:
+        return ShareAnalysis(
+            metric_type=matrix.metric_type,
+            quarters=matrix.quarters,
+            target_operator_id=target_operator_id,
+        )
+
+    series_list = _series_from_matrix(matrix, display_names)
+
+    # Sort by latest share descending
+    series_list.sort(key=lambda s: -(s.latest_share_pct or 0))
+
+    concentration = _build_concentration(
+        [round(float(h), 2) for h in matrix.hhi],
+        [s.latest_share_pct for s in series_list if s.latest_share_pct is not None],
+    )
+
     target_series = None
     for s in series_list:
         if s.operator_id == target_operator_id:
@@ -468,12 +513,9 @@ def compute_share_analysis(
     share_leader = series_list[0].operator_id if series_list else None
     biggest_gainer, biggest_loser = _identify_share_movements(series_list)
 
-    # 6. Key message
-    key_msg = _generate_key_message(target_series, concentration, metric_type)
-
     return ShareAnalysis(
-        metric_type=metric_type,
-        quarters=quarters,
+        metric_type=matrix.metric_type,
+        quarters=matrix.quarters,
         operator_series=series_list,
         concentration=concentration,
         target_operator_id=target_operator_id,
@@ -481,5 +523,141 @@ def compute_share_analysis(
         share_leader_id=share_leader,
         biggest_gainer_id=biggest_gainer,
         biggest_loser_id=biggest_loser,
-        key_message=key_msg,
+        key_message=_generate_key_message(target_series, concentration,
+                                          matrix.metric_type),
     )
+
+
+# ============================================================================
+# Orchestrator
+# ============================================================================
+
+def compute_share_analysis(
+    market_ts: list[dict],
+    sub_data_by_op: dict[str, list[dict]],
+    quarters: list[str],
+    target_operator_id: str,
+    metric_type: str = "revenue",
+    display_names: Optional[dict[str, str]] = None,
+) -> ShareAnalysis:
+    """Compute complete share analysis for one metric type.
+
+    Args:
+        market_ts: Financial timeseries rows (all operators, all quarters).
+            Only needed for revenue metrics.
+        sub_data_by_op: {operator_id: subscriber rows}. Only needed for
+            subscriber metrics.
+        quarters: Ordered list of CQ labels (e.g. ["CQ1_2024", ..., "CQ4_2025"]).
+        target_operator_id: The target operator to highlight.
+        metric_type: A key of REVENUE_SHARE_FIELDS or SUBSCRIBER_SHARE_FIELDS,
+            e.g. "revenue", "mobile_subscribers", "broadband_subscribers".
+        display_names: Optional {operator_id: display_name} map.
+
+    Returns:
+        ShareAnalysis with all computed metrics.
+    """
+    if metric_type not in ALL_SHARE_METRICS:
+        return ShareAnalysis(metric_type=metric_type, target_operator_id=target_operator_id)
+    return compute_all_share_analyses(
+        market_ts, sub_data_by_op, quarters, target_operator_id,
+        metrics=(metric_type,), display_names=display_names,
+    )[metric_type]
+
+
+def compute_all_share_analyses(
+    market_ts: list[dict],
+    sub_data_by_op: dict[str, list[dict]],
+    quarters: list[str],
+    target_operator_id: str,
+    metrics: tuple[str, ...] = ALL_SHARE_METRICS,
+    display_names: Optional[dict[str, str]] = None,
+    matrices: Optional[dict[str, ShareMatrix]] = None,
+) -> dict[str, ShareAnalysis]:
+    """Compute ShareAnalysis for several metrics from one matrix pass.
+
+    Args:
+        matrices: compute_share_matrices() output for the same inputs.
+            The matrices do not depend on the target, so callers analysing
+            several targets in one market can compute them once.
+
+    Returns:
+        {metric: ShareAnalysis} for every known metric in ``metrics``.
+    """
+    metrics = tuple(m for m in metrics if m in ALL_SHARE_METRICS)
+    if not quarters:
+        return {m: ShareAnalysis(metric_type=m, target_operator_id=target_operator_id)
+                for m in metrics}
+
+    display_names = display_names or {}
+    if matrices is None:
+        matrices = compute_share_matrices(market_ts, sub_data_by_op, quarters, metrics)
+    else:
+        matrices = {m: matrices[m] for m in metrics if m in matrices}
+    return {
+        metric: _analysis_from_matrix(matrix, target_operator_id, display_names)
+        for metric, matrix in matrices.items()
+    }
+
+
+def compute_market_concentration_batch(
+    market_inputs: dict[str, tuple[list[dict], dict[str, list[dict]]]],
+    quarters: list[str],
+    metrics: tuple[str, ...] = ALL_SHARE_METRICS,
+) -> dict[str, dict[str, MarketConcentration]]:
+    """HHI/CR3 concentration trends for many markets at once.
+
+    Markets are padded to a common operator count and stacked into a
+    markets × metrics × operators × quarters array, so shares and HHI for
+    every market and metric come out of one set of array operations.
+
+    Args:
+        market_inputs: {market: (market_ts, sub_data_by_op)} — the same
+            inputs compute_share_analysis takes for that market.
+        quarters: Ordered CQ labels shared by all markets.
+        metrics: Metric keys to compute.
+
+    Returns:
+        {market: {metric: MarketConcentration}}
+    """
+    metrics = tuple(m for m in metrics if m in ALL_SHARE_METRICS)
+    if not market_inputs or not quarters or not metrics:
+        return {market: {} for market in market_inputs}
+
+    field_names = [REVENUE_SHARE_FIELDS.get(m) or SUBSCRIBER_SHARE_FIELDS[m]
+                   for m in metrics]
+    is_revenue = np.array([m in REVENUE_SHARE_FIELDS for m in metrics])
+
+    per_market = []
+    for market_ts, sub_data_by_op in market_inputs.values():
+        rev, rev_totals = _value_tensor(_rows_by_operator(market_ts, quarters),
+                                        quarters, field_names)
+        sub, _ = _value_tensor(sub_data_by_op, quarters, field_names)
+        per_market.append((rev, rev_totals, sub))
+
+    n_ops = max(max(rev.shape[1], sub.shape[1]) for rev, _, sub in per_market)
+    values = np.full((len(per_market), len(metrics), n_ops, len(quarters)), np.nan)
+    totals = np.empty((len(per_market), len(metrics), 1, len(quarters)))
+    for k, (rev, rev_totals, sub) in enumerate(per_market):
+        values[k, is_revenue, :rev.shape[1]] = rev[is_revenue]
+        values[k, ~is_revenue, :sub.shape[1]] = sub[~is_revenue]
+        # Revenue totals count every row (see _share_matrices)
+        totals[k, is_revenue] = rev_totals[is_revenue]
+        totals[k, ~is_revenue] = np.nansum(sub[~is_revenue], axis=-2, keepdims=True)
+
+    shares = _share_tensor(values, totals)
+    hhi = _hhi_tensor(shares)
+
+    # Latest available share per operator (operators without data drop out)
+    valid = ~np.isnan(shares)
+    last = len(quarters) - 1 - valid[..., ::-1].argmax(axis=-1)
+    latest = np.take_along_axis(shares, last[..., None], axis=-1)[..., 0]
+
+    result: dict[str, dict[str, MarketConcentration]] = {}
+    for k, market in enumerate(market_inputs):
+        result[market] = {}
+        for m, metric in enumerate(metrics):
+            latest_shares = [round(float(v), 2) for v in latest[k, m] if not math.isnan(v)]
+            result[market][metric] = _build_concentration(
+                [round(float(h), 2) for h in hhi[k, m]], latest_shares,
+            )
+    return result
@@ -0,0 +1,137 @@
+"""Precomputed tariff index for one market.
+
+analyze_tariffs used to issue a get_tariff_comparison query per section and
+plan type, re-read the full mobile postpaid history twice, and re-parse every
+``data_allowance`` string with a regex. TariffIndex loads the market's
+tariffs once (one query, all plan types and snapshots), parses each plan into
+typed fields — data GB, EUR/GB, tier, 5G flag — and serves every section
+from in-memory lookups.
+
+Row order matches the SQL it replaces:
+  - comparison(plan_type, snapshot) ≙ TelecomDatabase.get_tariff_comparison
+  - history(plan_type)              ≙ TelecomDatabase.get_tariffs(market, plan_type)
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+
+_DATA_RE = re.compile(r"([\d.]+)\s*(gb|tb|mb)?")
+
+
+@lru_cache(maxsize=4096)
+def parse_data_gb(data_str) -> Optional[float]:
+    """Convert data_allowance string to numeric GB. Returns None for unlimited.
+
+    Cached: tariff datasets repeat the same few dozen allowance strings.
+    """
+    if data_str is None:
+        return None
+    s = str(data_str).strip().lower()
+    if "unlim" in s:
+        return None
+    m = _DATA_RE.match(s)
+    if not m:
+        return None
+    val = float(m.group(1))
+    unit = (m.group(2) or "gb").lower()
+    if unit == "tb":
+        return val * 1024
+    if unit == "mb":
+        return val / 1024
+    return val
+
+
+@dataclass
+class IndexedTariff:
+    """One tariff row with parsed, typed analytics columns."""
+    tariff_id: Optional[int]
+    operator_id: str
+    display_name: str
+    plan_name: str
+    plan_type: str
+    plan_tier: Optional[str]
+    snapshot_period: str
+    monthly_price: Optional[float]
+    data_allowance: Optional[str]
+    speed_mbps: Optional[float]
+    includes_5g: bool
+    data_gb: Optional[float]        # None = unlimited / unparseable
+    eur_per_gb: Optional[float]     # None unless price and data_gb > 0
+
+    @classmethod
+    def from_row(cls, row: dict) -> "IndexedTariff":
+        price = row.get("monthly_price")
+        data_gb = parse_data_gb(row.get("data_allowance"))
+        eur_per_gb = None
+        if price is not None and data_gb is not None and data_gb > 0:
+            eur_per_gb = round(price / data_gb, 2)
+        return cls(
+            tariff_id=row.get("id"),
+            operator_id=row["operator_id"],
+            display_name=row.get("display_name", row["operator_id"]),
+            plan_name=row["plan_name"],
+            plan_type=row.get("plan_type"),
+            plan_tier=row.get("plan_tier"),
+            snapshot_period=row.get("snapshot_period"),
+            monthly_price=price,
+            data_allowance=row.get("data_allowance"),
+            speed_mbps=row.get("speed_mbps"),
+            includes_5g=bool(row.get("includes_5g", 0)),
+            data_gb=data_gb,
+            eur_per_gb=eur_per_gb,
+        )
+
+
+def _nulls_first(value):
+    """SQLite ORDER BY ... ASC sort key: NULL sorts before any value."""
+    return (value is not None, value if value is not None else 0)
+
+
+class TariffIndex:
+    """All tariffs of one market, parsed once and grouped for lookup.
+
+    Args:
+        market: Market identifier.
+        tariffs: IndexedTariff rows in get_tariffs() order.
+    """
+
+    def __init__(self, market: str, tariffs: list[IndexedTariff]):
+        self.market = market
+        self.tariffs = tariffs
+
+        self._history: dict[str, list[IndexedTariff]] = {}
+        grouped: dict[tuple[str, str], list[IndexedTariff]] = {}
+        for t in tariffs:
+            self._history.setdefault(t.plan_type, []).append(t)
+            grouped.setdefault((t.plan_type, t.snapshot_period), []).append(t)
+
+        self._comparison = {
+            # Ties fall back to insertion order, as the SQL index scan does
+            key: sorted(rows, key=lambda t: (_nulls_first(t.plan_tier),
+                                             _nulls_first(t.monthly_price),
+                                             _nulls_first(t.tariff_id)))
+            for key, rows in grouped.items()
+        }
+
+    @classmethod
+    def build(cls, db, market: str) -> "TariffIndex":
+        """Load every tariff of ``market`` with a single query."""
+        rows = db.get_tariffs(market=market)
+        return cls(market, [IndexedTariff.from_row(r) for r in rows])
+
+    @property
+    def snapshots(self) -> list[str]:
+        return sorted({t.snapshot_period for t in self.tariffs})
+
+    def comparison(self, plan_type: str, snapshot: str) -> list[IndexedTariff]:
+        """Cross-operator rows for one plan type and snapshot, by tier then price."""
+        return self._comparison.get((plan_type, snapshot), [])
+
+    def history(self, plan_type: str) -> list[IndexedTariff]:
+        """All snapshots of one plan type."""
+        return self._history.get(plan_type, [])
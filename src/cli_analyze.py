@@ -7,6 +7,9 @@ Usage:
     # Group analysis
     python3 -m src.cli_analyze group --group-id millicom --period CQ4_2025
 
+    # Run engine + outputs on pre-warmed worker processes
+    python3 -m src.cli_analyze group --group-id millicom --pool-workers 4
+
     # List jobs
     python3 -m src.cli_analyze list
 
@@ -53,6 +56,16 @@ def _get_service():
     return SupabaseDataService(client)
 
 
+def _open_pool(args):
+    """Start a warm worker pool if --pool-workers was given."""
+    if not args.pool_workers:
+        return None
+    from src.web.services.warm_pool import WarmWorkerPool
+    print(f"Starting warm worker pool ({args.pool_workers} workers)...")
+    return WarmWorkerPool(workers=args.pool_workers,
+                          max_jobs_per_worker=args.max_jobs_per_worker)
+
+
 def cmd_single(args):
     """Run a single-market analysis."""
     svc = _get_service()
@@ -88,8 +101,13 @@ def cmd_single(args):
     print(f"\nJob #{job_id} created. Starting execution...\n")
 
     # Run synchronously
-    runner = AnalysisRunnerService(svc)
-    result = runner.run_single(job_id)
+    pool = _open_pool(args)
+    try:
+        runner = AnalysisRunnerService(svc, pool=pool)
+        result = runner.run_single(job_id)
+    finally:
+        if pool:
+            pool.shutdown()
 
     print(f"\n{'=' * 60}")
     print(f"  Result: {result['status'].upper()}")
@@ -145,8 +163,13 @@ def cmd_group(args):
     print(f"\nJob #{job_id} created. Starting execution...\n")
 
     # Run synchronously
-    runner = AnalysisRunnerService(svc)
-    result = runner.run_group(job_id)
+    pool = _open_pool(args)
+    try:
+        runner = AnalysisRunnerService(svc, pool=pool)
+        result = runner.run_group(job_id)
+    finally:
+        if pool:
+            pool.shutdown()
 
     print(f"\n{'=' * 60}")
     print(f"  Result: {result['status'].upper()}")
@@ -383,6 +406,15 @@ def cmd_feedback(args):
         return 1
 
 
+def _add_pool_arguments(p):
+    from src.web.services.warm_pool import DEFAULT_MAX_JOBS_PER_WORKER
+    p.add_argument("--pool-workers", type=int, default=0,
+                   help="Run engine + outputs on N pre-warmed worker processes (default: off)")
+    p.add_argument("--max-jobs-per-worker", type=int, default=DEFAULT_MAX_JOBS_PER_WORKER,
+                   help=f"Recycle a pool worker after this many jobs "
+                        f"(default: {DEFAULT_MAX_JOBS_PER_WORKER}, 0 = never)")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="BLM Analysis CLI — Execute analysis jobs"
@@ -395,6 +427,7 @@ def main():
     p_single.add_argument("--operator", required=True, help="Operator ID (e.g., vodafone_germany)")
     p_single.add_argument("--period", default="CQ4_2025", help="Analysis period (default: CQ4_2025)")
     p_single.add_argument("--n-quarters", type=int, default=8, help="Historical range in quarters (default: 8)")
+    _add_pool_arguments(p_single)
 
     # group
     p_group = sub.add_parser("group", help="Run group analysis across markets")
@@ -402,6 +435,7 @@ def main():
     p_group.add_argument("--period", default="CQ4_2025", help="Analysis period")
     p_group.add_argument("--n-quarters", type=int, default=8, help="Historical range")
     p_group.add_argument("--markets", default="", help="Comma-separated market IDs (default: all)")
+    _add_pool_arguments(p_group)
 
     # list
     p_list = sub.add_parser("list", help="List analysis jobs")
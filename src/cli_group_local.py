@@ -8,6 +8,7 @@ Usage:
     python3 -m src.cli_group_local --markets guatemala,honduras
     python3 -m src.cli_group_local --output-dir data/output/group
     python3 -m src.cli_group_local --with-md                   # also generate per-market MD
+    python3 -m src.cli_group_local --workers 4                 # markets in parallel on a warm pool
 """
 
 from __future__ import annotations
@@ -47,9 +48,19 @@ def main():
         "--with-md", action="store_true",
         help="Also generate per-market MD strategic reports",
     )
+    parser.add_argument(
+        "--workers", type=int, default=0,
+        help="Analyze markets in parallel on N pre-warmed worker processes "
+             "(default: sequential, in-process)",
+    )
+    parser.add_argument(
+        "--max-jobs-per-worker", type=int, default=None,
+        help="Recycle a pool worker after this many markets (default: 50, 0 = never)",
+    )
     args = parser.parse_args()
 
-    from src.database.seed_orchestrator import seed_all_markets, TIGO_OPERATORS
+    from src.database.seed_orchestrator import TIGO_OPERATORS
+    from src.database.seed_image import seeded_database
     from src.database.operator_directory import OPERATOR_GROUPS
 
     # Determine which Tigo markets to analyze
@@ -74,28 +85,33 @@ def main():
     print("\nPhase 1: Seeding all markets into local SQLite...")
     tmp_dir = tempfile.mkdtemp(prefix="blm_group_")
     db_path = str(Path(tmp_dir) / "group_analysis.db")
-    db = seed_all_markets(db_path)
+    db = seeded_database("all_markets", db_path)
 
     # 2. Run Five Looks for each Tigo operator
     print("\nPhase 2: Running Five Looks analysis for each Tigo operator...")
     from src.blm.engine import BLMAnalysisEngine
+    from src.blm.result_cache import get_result_cache
 
-    market_results = {}
-    for operator_id, market_id in tigo_ops:
-        print(f"\n  [{len(market_results)+1}/{len(tigo_ops)}] {operator_id} in {market_id}...")
-        try:
-            engine = BLMAnalysisEngine(
-                db=db,
-                target_operator=operator_id,
-                market=market_id,
-                target_period=args.period,
-                n_quarters=args.n_quarters,
-            )
-            result = engine.run_five_looks()
-            market_results[market_id] = result
-            print(f"    OK — {result.analysis_period}")
-        except Exception as e:
-            print(f"    FAILED — {type(e).__name__}: {e}")
+    if args.workers > 0:
+        market_results = _run_on_pool(tigo_ops, db_path, args)
+    else:
+        market_results = {}
+        for operator_id, market_id in tigo_ops:
+            print(f"\n  [{len(market_results)+1}/{len(tigo_ops)}] {operator_id} in {market_id}...")
+            try:
+                engine = BLMAnalysisEngine(
+                    db=db,
+                    target_operator=operator_id,
+                    market=market_id,
+                    target_period=args.period,
+                    n_quarters=args.n_quarters,
+                    cache=get_result_cache(),
+                )
+                result = engine.run_five_looks()
+                market_results[market_id] = result
+                print(f"    OK — {result.analysis_period}")
+            except Exception as e:
+                print(f"    FAILED — {type(e).__name__}: {e}")
 
     if not market_results:
         print("\nERROR: No markets completed successfully")
@@ -167,6 +183,39 @@ def main():
     return 0
 
 
+def _run_on_pool(tigo_ops: list, db_path: str, args) -> dict:
+    """Run Five Looks for every operator concurrently on a warm worker pool.
+
+    Returns {market_id: FiveLooksResult} in ``tigo_ops`` order.
+    """
+    from src.web.services.warm_pool import (
+        DEFAULT_MAX_JOBS_PER_WORKER, WarmWorkerPool, run_engine_job,
+    )
+
+    max_jobs = args.max_jobs_per_worker
+    if max_jobs is None:
+        max_jobs = DEFAULT_MAX_JOBS_PER_WORKER
+    print(f"  Warm pool: {args.workers} workers (recycle after {max_jobs or 'never'})")
+
+    market_results = {}
+    with WarmWorkerPool(workers=args.workers, max_jobs_per_worker=max_jobs) as pool:
+        futures = [
+            (operator_id, market_id,
+             pool.submit(run_engine_job, db_path, operator_id, market_id,
+                         args.period, args.n_quarters))
+            for operator_id, market_id in tigo_ops
+        ]
+        for i, (operator_id, market_id, future) in enumerate(futures, 1):
+            print(f"\n  [{i}/{len(tigo_ops)}] {operator_id} in {market_id}...")
+            try:
+                result = future.result()
+                market_results[market_id] = result
+                print(f"    OK — {result.analysis_period}")
+            except Exception as e:
+                print(f"    FAILED — {type(e).__name__}: {e}")
+    return market_results
+
+
 def _format_group_txt(summary: dict, period: str) -> str:
     """Format group summary as plain text."""
     lines = []
@@ -1,12 +1,14 @@
 """CLI to seed all 12 markets locally and push to Supabase.
 
 Seeds into a temp SQLite DB via seed_orchestrator, then pushes each market
-to Supabase using BLMCloudSync.
+to Supabase using BLMCloudSync.  Only rows changed since the last push to
+the same Supabase project are sent (see src/database/supabase_sync.py).
 
 Usage:
     python3 -m src.cli_push_all                     # seed + push all 12 markets
     python3 -m src.cli_push_all --markets guatemala  # push single market
     python3 -m src.cli_push_all --dry-run            # seed only, verify counts
+    python3 -m src.cli_push_all --full               # push every row, changed or not
     python3 -m src.cli_push_all --status             # check Supabase row counts
 """
 
@@ -34,6 +36,10 @@ def main():
         "--dry-run", action="store_true",
         help="Seed locally only, print counts without pushing to Supabase",
     )
+    parser.add_argument(
+        "--full", action="store_true",
+        help="Push every row, not only those changed since the last push",
+    )
     parser.add_argument(
         "--status", action="store_true",
         help="Show current Supabase row counts and exit",
@@ -44,7 +50,8 @@ def main():
     if args.status:
         return cmd_status()
 
-    from src.database.seed_orchestrator import seed_all_markets, ALL_MARKETS
+    from src.database.seed_orchestrator import ALL_MARKETS
+    from src.database.seed_image import seeded_database
 
     # Determine markets
     if args.markets:
@@ -67,7 +74,7 @@ def main():
     print("\nPhase 1: Seeding all markets into local SQLite...")
     tmp_dir = tempfile.mkdtemp(prefix="blm_push_")
     db_path = str(Path(tmp_dir) / "push_all.db")
-    db = seed_all_markets(db_path)
+    db = seeded_database("all_markets", db_path)
 
     # 2. Print local counts
     print("\nLocal database counts:")
@@ -88,7 +95,7 @@ def main():
 
     for market in markets:
         print(f"\n--- Pushing {market} ---")
-        report = syncer.push_all(market)
+        report = syncer.push_all(market, full=args.full)
         rows = sum(report.tables.values())
         total_rows += rows
         total_errors += len(report.errors)
@@ -99,7 +106,7 @@ def main():
     print("\n--- Pushing group tables ---")
     for table in ("operator_groups", "group_subsidiaries"):
         try:
-            n = syncer.push_table(table)
+            n = syncer.push_table(table, full=args.full)
             print(f"  {table}: {n} rows pushed")
             total_rows += n
         except Exception as e:
@@ -1,14 +1,35 @@
 """Data loading and parsing module for BLM financial reports.
 
 Supports loading financial data from CSV, Excel, and PDF formats.
+
+Long PDFs are extracted in contiguous page ranges across a process pool,
+each worker opening the file itself; large directories are loaded one file
+per worker.  Both give the same DataFrames as a serial run.  With a
+PageTableCache, pages whose content is unchanged since an earlier run are
+not extracted again.
 """
 
+import hashlib
+import json
 import os
+import re
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
+import numpy as np
 import pandas as pd
 
+# Extract PDFs of at least this many pages in parallel
+PDF_PARALLEL_MIN_PAGES = 8
+
+# Load directories in parallel from this many bytes of input
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+
+# Bump when extracted page tables change shape; keys PageTableCache entries
+PAGE_CACHE_FORMAT = 1
+
+
 def _import_pdfplumber():
     try:
         import pdfplumber
@@ -19,6 +40,16 @@ def _import_pdfplumber():
         return None
 
 
+def _import_pyarrow_parquet():
+    try:
+        import pyarrow.parquet
+        return pyarrow.parquet
+    except ImportError:
+        return None
+    except Exception:
+        return None
+
+
 def _import_tabula():
     try:
         import tabula
@@ -29,15 +60,122 @@ def _import_tabula():
         return None
 
 
+def _process_pool(workers: int):
+    """Spawn-based pool: safe whatever threads the caller has running."""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    return ProcessPoolExecutor(max_workers=workers,
+                               mp_context=multiprocessing.get_context("spawn"))
+
+
+class PageTableCache:
+    """Tables extracted from PDF pages, keyed by page content.
+
+    A page's key hashes its content streams, fonts and form XObjects, so a
+    page keeps its entry when other pages of the document change or the
+    file is regenerated with identical pages.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[list]:
+        try:
+            with open(self._path(key)) as f:
+                tables = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return tables
+
+    def put(self, key: str, tables: list) -> None:
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".tmp{os.getpid()}")
+            with open(tmp, "w") as f:
+                json.dump(tables, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"  [!] Could not write PDF page cache: {e}")
+
+
+def _page_key(page, version: str) -> str:
+    """Content key of a pdfplumber page (see PageTableCache)."""
+    from pdfminer.pdftypes import PDFStream, resolve1
+
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f"{PAGE_CACHE_FORMAT}|{version}|{page.bbox}|{page.page_obj.rotate}".encode())
+    for stream in page.page_obj.contents or []:
+        stream = resolve1(stream)
+        if isinstance(stream, PDFStream):
+            digest.update(stream.get_data())
+
+    resources = resolve1(page.page_obj.resources) or {}
+    for name, font in sorted((resolve1(resources.get("Font")) or {}).items()):
+        font = resolve1(font) or {}
+        digest.update(f"|font:{name}:{font.get('BaseFont')}:{resolve1(font.get('Encoding'))}".encode())
+        to_unicode = resolve1(font.get("ToUnicode"))
+        if isinstance(to_unicode, PDFStream):
+            digest.update(to_unicode.get_data())
+    for name, xobject in sorted((resolve1(resources.get("XObject")) or {}).items()):
+        xobject = resolve1(xobject)
+        subtype = getattr(resolve1(xobject.get("Subtype")), "name", None) \
+            if isinstance(xobject, PDFStream) else None
+        if subtype == "Form":
+            digest.update(f"|form:{name}".encode())
+            digest.update(xobject.get_data())
+    return digest.hexdigest()
+
+
+def _extract_page_tables(path: str, page_numbers: list) -> dict:
+    """{page number: page.extract_tables()} for some pages of a PDF.
+
+    Runs in pool workers, which open the file themselves.
+    """
+    _pdfplumber = _import_pdfplumber()
+    tables = {}
+    with _pdfplumber.open(path) as pdf:
+        for number in page_numbers:
+            page = pdf.pages[number]
+            tables[number] = page.extract_tables()
+            page.close()
+    return tables
+
+
+def _load_one(data_dir: str, filepath: str, page_cache_dir: Optional[str]) -> pd.DataFrame:
+    """DataLoader.load() in a load_directory() pool worker."""
+    page_cache = PageTableCache(page_cache_dir) if page_cache_dir else None
+    return DataLoader(data_dir, max_workers=1, page_cache=page_cache).load(filepath)
+
+
 class DataLoader:
-    """Load and parse BLM financial report data from various file formats."""
+    """Load and parse BLM financial report data from various file formats.
+
+    Args:
+        data_dir: Directory relative paths are resolved against.
+        max_workers: Processes for PDF pages and load_directory(); defaults
+            to 1, loading serially.  The pool is spawn-based: scripts that
+            pass more than 1 need an ``if __name__ == "__main__":`` guard.
+        page_cache: Optional PageTableCache for PDF pages.
+    """
 
-    SUPPORTED_EXTENSIONS = {".csv", ".xlsx", ".xls", ".pdf"}
+    SUPPORTED_EXTENSIONS = {".csv", ".xlsx", ".xls", ".pdf", ".parquet"}
 
-    def __init__(self, data_dir: Optional[str] = None):
+    def __init__(self, data_dir: Optional[str] = None, max_workers: Optional[int] = None,
+                 page_cache: Optional[PageTableCache] = None):
         if data_dir is None:
             data_dir = os.path.join(os.path.dirname(__file__), "..", "..", "data", "raw")
         self.data_dir = Path(data_dir).resolve()
+        self.max_workers = max(1, max_workers or 1)
+        self.page_cache = page_cache
 
     def load(self, filepath: str) -> pd.DataFrame:
         """Load a financial report file and return a DataFrame.
@@ -52,6 +190,49 @@ class DataLoader:
             ValueError: If file format is not supported.
             FileNotFoundError: If file does not exist.
         """
+        path = self._resolve(filepath)
+        loader_map = {
+            ".csv": self._load_csv,
+            ".xlsx": self._load_excel,
+            ".xls": self._load_excel,
+            ".pdf": self._load_pdf,
+            ".parquet": self._load_parquet,
+        }
+        return loader_map[path.suffix.lower()](path)
+
+    def iter_chunks(self, filepath: str, chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+        """Load a file in batches of at most ``chunksize`` rows.
+
+        CSV and Parquet files are streamed; other formats are loaded whole
+        and yielded as one chunk.  Row labels run on across chunks, as in
+        ``load()``.
+
+        Raises:
+            ValueError: If file format is not supported.
+            FileNotFoundError: If file does not exist.
+        """
+        path = self._resolve(filepath)
+        ext = path.suffix.lower()
+        if ext == ".csv":
+            for chunk in pd.read_csv(path, chunksize=chunksize):
+                yield self._standardize_columns(chunk)
+        elif ext == ".parquet":
+            _pq = _import_pyarrow_parquet()
+            if _pq is None:
+                raise ImportError(
+                    "Parquet files require 'pyarrow'. Install it: pip install pyarrow"
+                )
+            offset = 0
+            for batch in _pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+                chunk = batch.to_pandas()
+                chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+                offset += len(chunk)
+                yield self._standardize_columns(chunk)
+        else:
+            yield self.load(str(path))
+
+    def _resolve(self, filepath: str) -> Path:
+        """Absolute path of a supported, existing file."""
         path = Path(filepath)
         if not path.is_absolute():
             path = self.data_dir / path
@@ -66,14 +247,7 @@ class DataLoader:
                 f"Unsupported file format: {ext}. "
                 f"Supported formats: {', '.join(sorted(self.SUPPORTED_EXTENSIONS))}"
             )
-
-        loader_map = {
-            ".csv": self._load_csv,
-            ".xlsx": self._load_excel,
-            ".xls": self._load_excel,
-            ".pdf": self._load_pdf,
-        }
-        return loader_map[ext](path)
+        return path
 
     def load_directory(self, directory: Optional[str] = None, pattern: str = "*") -> dict[str, pd.DataFrame]:
         """Load all supported files from a directory.
@@ -86,13 +260,35 @@ class DataLoader:
             Dict mapping filenames to DataFrames.
         """
         target_dir = Path(directory) if directory else self.data_dir
-        results = {}
-        for ext in self.SUPPORTED_EXTENSIONS:
-            for filepath in target_dir.glob(f"{pattern}{ext}"):
+        filepaths = [filepath
+                     for ext in self.SUPPORTED_EXTENSIONS
+                     for filepath in target_dir.glob(f"{pattern}{ext}")]
+        workers = min(self.max_workers, len(filepaths))
+        if workers > 1 and sum(p.stat().st_size for p in filepaths) >= PARALLEL_MIN_BYTES:
+            cache_dir = str(self.page_cache.cache_dir) if self.page_cache is not None else None
+            with _process_pool(workers) as pool:
+                futures = [pool.submit(_load_one, str(self.data_dir), str(p), cache_dir)
+                           for p in filepaths]
+            outcomes = []
+            for future in futures:
                 try:
-                    results[filepath.name] = self.load(str(filepath))
+                    outcomes.append(future.result())
                 except Exception as e:
-                    print(f"Warning: Failed to load {filepath.name}: {e}")
+                    outcomes.append(e)
+        else:
+            outcomes = []
+            for filepath in filepaths:
+                try:
+                    outcomes.append(self.load(str(filepath)))
+                except Exception as e:
+                    outcomes.append(e)
+
+        results = {}
+        for filepath, outcome in zip(filepaths, outcomes):
+            if isinstance(outcome, Exception):
+                print(f"Warning: Failed to load {filepath.name}: {outcome}")
+            else:
+                results[filepath.name] = outcome
         return results
 
     def _load_csv(self, path: Path) -> pd.DataFrame:
@@ -105,6 +301,11 @@ class DataLoader:
         df = pd.read_excel(path, engine="openpyxl")
         return self._standardize_columns(df)
 
+    def _load_parquet(self, path: Path) -> pd.DataFrame:
+        """Load a Parquet file."""
+        df = pd.read_parquet(path)
+        return self._standardize_columns(df)
+
     def _load_pdf(self, path: Path) -> pd.DataFrame:
         """Extract tabular data from a PDF file."""
         _pdfplumber = _import_pdfplumber()
@@ -119,20 +320,61 @@ class DataLoader:
         )
 
     def _load_pdf_pdfplumber(self, path: Path, _pdfplumber) -> pd.DataFrame:
-        """Extract tables from PDF using pdfplumber."""
-        all_tables = []
+        """Extract tables from PDF using pdfplumber.
+
+        Pages found in the page cache are reused; the others are extracted
+        in contiguous ranges across the process pool when there are enough
+        of them.  Tables are combined in page order either way.
+        """
+        keys = None
         with _pdfplumber.open(path) as pdf:
-            for page in pdf.pages:
-                tables = page.extract_tables()
-                for table in tables:
-                    if table and len(table) > 1:
-                        df = pd.DataFrame(table[1:], columns=table[0])
-                        all_tables.append(df)
+            n_pages = len(pdf.pages)
+            if self.page_cache is not None:
+                version = getattr(_pdfplumber, "__version__", "")
+                keys = [_page_key(page, version) for page in pdf.pages]
+
+        page_tables = {}
+        if keys is not None:
+            for number, key in enumerate(keys):
+                tables = self.page_cache.get(key)
+                if tables is not None:
+                    page_tables[number] = tables
+        missing = [n for n in range(n_pages) if n not in page_tables]
+        extracted = self._extract_pages(path, missing)
+        page_tables.update(extracted)
+        if keys is not None:
+            for number, tables in extracted.items():
+                self.page_cache.put(keys[number], tables)
+
+        all_tables = []
+        for number in range(n_pages):
+            for table in page_tables[number]:
+                if table and len(table) > 1:
+                    df = pd.DataFrame(table[1:], columns=table[0])
+                    all_tables.append(df)
         if not all_tables:
             raise ValueError(f"No tables found in PDF: {path}")
         combined = pd.concat(all_tables, ignore_index=True)
         return self._standardize_columns(combined)
 
+    def _extract_pages(self, path: Path, page_numbers: list) -> dict:
+        """{page number: tables}, sharded across processes for long runs."""
+        workers = min(self.max_workers, len(page_numbers) // (PDF_PARALLEL_MIN_PAGES // 2))
+        if workers <= 1 or len(page_numbers) < PDF_PARALLEL_MIN_PAGES:
+            return _extract_page_tables(str(path), page_numbers) if page_numbers else {}
+
+        size, extra = divmod(len(page_numbers), workers)
+        shards, start = [], 0
+        for i in range(workers):
+            end = start + size + (1 if i < extra else 0)
+            shards.append(page_numbers[start:end])
+            start = end
+        tables = {}
+        with _process_pool(workers) as pool:
+            for result in pool.map(_extract_page_tables, [str(path)] * workers, shards):
+                tables.update(result)
+        return tables
+
     def _load_pdf_tabula(self, path: Path, _tabula) -> pd.DataFrame:
         """Extract tables from PDF using tabula."""
         dfs = _tabula.read_pdf(str(path), pages="all", multiple_tables=True)
@@ -153,8 +395,47 @@ class DataLoader:
         return df
 
 
+_NEGATIVE_AMOUNT = re.compile(r"\(([^)]+)\)")  # (100) -> -100
+_BLANK_STRINGS = ["nan", "None", ""]
+
+
+def _clean_amount(text: str) -> str:
+    """One currency string as FinancialDataPreprocessor._parse_currency_series cleans it.
+
+    str.split() splits on the same whitespace as the regex there.
+    """
+    text = "".join(text.replace("$", "").replace(",", "").split())
+    if "(" in text:
+        text = _NEGATIVE_AMOUNT.sub(r"-\1", text)
+    return text
+
+
+def _with_values(strings: pd.Series, values) -> pd.Series:
+    """``strings`` with its values replaced, keeping dtype, index and name."""
+    return pd.Series(pd.array(values, dtype=strings.dtype), index=strings.index, name=strings.name)
+
+
 class FinancialDataPreprocessor:
-    """Preprocess and clean BLM financial data."""
+    """Preprocess and clean BLM financial data.
+
+    Each column takes the cheapest path giving the same values as parsing
+    it as text: int64, float64 and datetime columns are kept as they are,
+    text with few distinct values is cleaned once per value, and numeric
+    text goes straight to pd.to_numeric, only the values it rejects
+    ("$1,234", "(100)") being cleaned first.  A sample of the column picks
+    the path; the result does not depend on it.
+
+    After preprocess() or preprocess_chunks(), ``timings`` maps each column
+    to the seconds spent per step and ``detected`` to the path it took.
+    With ``report_timings`` (default: BLM_PREPROCESS_TIMINGS=1) both are
+    printed as timing_report().
+    """
+
+    # Bump whenever preprocess() output changes; keys ParseCache entries
+    VERSION = 2
+
+    # Values sampled per column to choose its parsing path
+    SAMPLE_SIZE = 1000
 
     CURRENCY_COLUMNS_PATTERNS = [
         "amount", "budget", "revenue", "expense", "cost",
@@ -167,6 +448,13 @@ class FinancialDataPreprocessor:
         "fiscal_year", "fy",
     ]
 
+    def __init__(self, report_timings: Optional[bool] = None):
+        if report_timings is None:
+            report_timings = os.getenv("BLM_PREPROCESS_TIMINGS", "0") == "1"
+        self.report_timings = report_timings
+        self.timings: dict[str, dict[str, float]] = {}
+        self.detected: dict[str, str] = {}
+
     def preprocess(self, df: pd.DataFrame) -> pd.DataFrame:
         """Apply standard preprocessing to financial data.
 
@@ -175,26 +463,143 @@ class FinancialDataPreprocessor:
         - Parse date columns
         - Strip whitespace from string columns
         """
+        self.timings, self.detected = {}, {}
+        df = self._preprocess(df)
+        if self.report_timings:
+            print(self.timing_report())
+        return df
+
+    def cache_token(self) -> str:
+        """Identifies this preprocessing for caches of its output."""
+        return "|".join([
+            type(self).__qualname__, str(self.VERSION), pd.__version__,
+            ",".join(self.CURRENCY_COLUMNS_PATTERNS),
+            ",".join(self.DATE_COLUMN_PATTERNS),
+        ])
+
+    def preprocess_chunks(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """Apply preprocess() to each chunk of a file read in batches.
+
+        Rows are relabelled 0..n-1 across the chunks, as preprocess() does
+        for the whole file.  Timings add up over the chunks.
+        """
+        self.timings, self.detected = {}, {}
+        offset = 0
+        for chunk in chunks:
+            df = self._preprocess(chunk)
+            df.index = pd.RangeIndex(offset, offset + len(df))
+            offset += len(df)
+            yield df
+        if self.report_timings:
+            print(self.timing_report())
+
+    def timing_report(self) -> str:
+        """Seconds per column of the last run, slowest first."""
+        totals = {col: sum(steps.values()) for col, steps in self.timings.items()}
+        lines = [f"  Preprocessing: {sum(totals.values()):.3f}s"]
+        for col in sorted(totals, key=totals.get, reverse=True):
+            steps = ", ".join(f"{step} {secs:.3f}s" for step, secs in self.timings[col].items())
+            lines.append(
+                f"    {col:<24} {totals[col]:8.3f}s  {self.detected.get(col, ''):<18} {steps}"
+            )
+        return "\n".join(lines)
+
+    def _preprocess(self, df: pd.DataFrame) -> pd.DataFrame:
         df = df.dropna(how="all").dropna(axis=1, how="all")
         df = self._clean_string_columns(df)
         df = self._parse_currency_columns(df)
         df = self._parse_date_columns(df)
         return df.reset_index(drop=True)
 
+    def _record(self, col: str, step: str, start: float) -> None:
+        steps = self.timings.setdefault(col, {})
+        steps[step] = steps.get(step, 0.0) + time.perf_counter() - start
+
+    def _sample(self, series: pd.Series) -> pd.Series:
+        """Up to SAMPLE_SIZE non-missing values spread over ``series``."""
+        n = len(series)
+        positions = np.linspace(0, n - 1, min(n, self.SAMPLE_SIZE)).astype(np.intp)
+        sample = series.iloc[np.unique(positions)]
+        return sample[sample.notna()]
+
     def _clean_string_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """Strip whitespace from string columns."""
         for col in df.select_dtypes(include=["object", "string"]).columns:
-            df[col] = df[col].astype(str).str.strip()
-            df[col] = df[col].replace({"nan": None, "None": None, "": None})
+            start = time.perf_counter()
+            df[col] = self._clean_strings(df[col], col)
+            self._record(col, "clean", start)
         return df
 
+    def _clean_strings(self, series: pd.Series, col: str) -> pd.Series:
+        """Stripped text of ``series``; "nan", "None" and "" become None.
+
+        As with Series.replace(), the column turns to object dtype if any
+        value became None, missing values staying NaN.
+        """
+        strings = series.astype(str)
+        sample = self._sample(strings)
+        if sample.nunique() > len(sample) // 2:
+            self.detected[col] = "text"
+            stripped = strings.str.strip()
+            blank = stripped.isin(_BLANK_STRINGS).to_numpy()
+            if not blank.any():
+                return stripped
+            values = stripped.to_numpy(dtype=object)
+            values[blank] = None
+            return pd.Series(values, index=strings.index, name=strings.name, dtype=object)
+
+        self.detected[col] = "categorical text"
+        codes, uniques = pd.factorize(strings)
+        cleaned = uniques.str.strip()
+        values = cleaned.to_numpy(dtype=object)
+        blank = cleaned.isin(_BLANK_STRINGS)
+        values[blank] = None
+        # Code -1 (missing) picks the trailing NaN
+        values = np.append(values, np.nan).take(codes)
+        if not blank.any():
+            return _with_values(strings, values)
+        return pd.Series(values, index=strings.index, name=strings.name, dtype=object)
+
     def _parse_currency_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """Convert currency-formatted strings to numeric values."""
         for col in df.columns:
             if any(pattern in col for pattern in self.CURRENCY_COLUMNS_PATTERNS):
-                df[col] = self._parse_currency_series(df[col])
+                start = time.perf_counter()
+                df[col] = self._parse_currency(df[col], col)
+                self._record(col, "currency", start)
         return df
 
+    def _parse_currency(self, series: pd.Series, col: str) -> pd.Series:
+        if series.dtype == np.int64 or series.dtype == np.float64:
+            # Already parsed (e.g. by read_csv); printing and re-reading
+            # the values would only risk the last digit of odd floats
+            self.detected[col] = "numeric"
+            return series
+
+        strings = series.astype(str)
+        # pandas 2.x gives object dtype here unless future.infer_string is on
+        if getattr(strings.dtype, "storage", None) == "pyarrow":
+            # The regex replacements run as Arrow compute kernels
+            self.detected[col] = "currency text"
+            return self._parse_currency_series(strings)
+
+        sample = self._sample(strings)
+        if len(sample) and pd.to_numeric(sample, errors="coerce").notna().mean() >= 0.5:
+            self.detected[col] = "numeric text"
+            parsed = pd.to_numeric(strings, errors="coerce")
+            rejected = (parsed.isna() & strings.notna()).to_numpy()
+            if not rejected.any():
+                return parsed
+            values = strings.to_numpy(dtype=object)
+            values[rejected] = [_clean_amount(v) for v in values[rejected]]
+            return pd.to_numeric(_with_values(strings, values), errors="coerce")
+
+        self.detected[col] = "currency text"
+        values = strings.to_numpy(dtype=object)
+        present = strings.notna().to_numpy()
+        values[present] = [_clean_amount(v) for v in values[present]]
+        return pd.to_numeric(_with_values(strings, values), errors="coerce")
+
     @staticmethod
     def _parse_currency_series(series: pd.Series) -> pd.Series:
         """Parse a series of currency strings to numeric."""
@@ -209,14 +614,22 @@ class FinancialDataPreprocessor:
         """Attempt to parse date-like columns.
 
         Skips columns that are already numeric (e.g., fiscal_year=2019)
-        to avoid misinterpreting integers as timestamps.
+        to avoid misinterpreting integers as timestamps.  Columns already
+        of datetime dtype are kept as they are.  pd.to_datetime infers the
+        format from the first value and parses each distinct value once.
         """
         for col in df.columns:
             if any(pattern in col for pattern in self.DATE_COLUMN_PATTERNS):
                 if pd.api.types.is_numeric_dtype(df[col]):
                     continue
-                try:
-                    df[col] = pd.to_datetime(df[col], errors="coerce")
-                except (ValueError, TypeError):
-                    pass
+                start = time.perf_counter()
+                if pd.api.types.is_datetime64_any_dtype(df[col]):
+                    self.detected[col] = "datetime"
+                else:
+                    try:
+                        df[col] = pd.to_datetime(df[col], errors="coerce")
+                        self.detected[col] = "date text"
+                    except (ValueError, TypeError):
+                        pass
+                self._record(col, "date", start)
         return df
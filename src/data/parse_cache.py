@@ -0,0 +1,300 @@
+"""Columnar cache of preprocessed data files.
+
+DataLoader.load() re-parses a CSV, Excel or PDF file on every run, and
+FinancialDataPreprocessor then re-applies its currency and date parsing.
+ParseCache keeps the preprocessed DataFrame of each file on disk, one file
+per column, and rebuilds it on later loads without parsing anything:
+
+  - numeric, boolean and datetime columns: one .npy file each,
+    memory-mapped copy-on-write on load (pages are read as the analyses
+    touch them; edits stay private to the process);
+  - text columns: int32 codes (.npy, memory-mapped) plus the distinct
+    values (JSON);
+  - anything else (mixed objects, other extension dtypes): pickled.
+
+An entry is keyed by the resolved file path and the preprocessor's
+cache_token().  It is reused while the file's size and mtime are unchanged;
+if the mtime changed (touched, copied, checked out again) but the size did
+not, the content hash decides.
+
+default_parse_cache() also gives its loader a PageTableCache
+(src/data/loader.py) in the pdf_pages subdirectory, so a PDF that changed
+in a few pages only has those pages extracted again.
+
+Environment:
+    BLM_PARSE_CACHE=0       disable the cache
+    BLM_PARSE_CACHE_DIR     cache directory (default data/processed/parse_cache)
+
+Usage:
+    from src.data.parse_cache import ParseCache
+
+    df = ParseCache().load("data/raw/ledger.xlsx")
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.data.loader import DataLoader, FinancialDataPreprocessor, PageTableCache
+
+# Bump when the on-disk layout changes
+PARSE_CACHE_FORMAT = 1
+
+DEFAULT_CACHE_DIR = (
+    Path(__file__).resolve().parent.parent.parent / "data" / "processed" / "parse_cache"
+)
+
+_META = "meta.json"
+
+# PageTableCache of the default cache, for PDFs that changed in part
+PAGE_CACHE_SUBDIR = "pdf_pages"
+
+
+def default_parse_cache(workers: int = 1) -> Optional["ParseCache"]:
+    """ParseCache configured from the environment, or None if disabled.
+
+    ``workers`` is the DataLoader's max_workers.
+    """
+    if os.getenv("BLM_PARSE_CACHE", "1") == "0":
+        return None
+    cache_dir = Path(os.getenv("BLM_PARSE_CACHE_DIR") or DEFAULT_CACHE_DIR)
+    loader = DataLoader(max_workers=workers,
+                        page_cache=PageTableCache(str(cache_dir / PAGE_CACHE_SUBDIR)))
+    return ParseCache(str(cache_dir), loader=loader)
+
+
+def file_digest(path: Path) -> str:
+    """BLAKE2b hex digest of a file's content."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """Preprocessed DataFrames of data files, stored column by column."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        loader: Optional[DataLoader] = None,
+        preprocessor: Optional[FinancialDataPreprocessor] = None,
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.loader = loader or DataLoader()
+        self.preprocessor = preprocessor or FinancialDataPreprocessor()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, filepath: str) -> pd.DataFrame:
+        """Preprocessed DataFrame of ``filepath``, from the cache if valid.
+
+        Raises:
+            ValueError: If file format is not supported.
+            FileNotFoundError: If file does not exist.
+        """
+        path = self.loader._resolve(filepath)
+        entry = self.entry_dir(path)
+        stat = path.stat()
+
+        meta = self._valid_meta(entry, path, stat)
+        if meta is not None:
+            try:
+                df = _read_frame(entry, meta)
+            except (OSError, ValueError, KeyError, pickle.UnpicklingError) as e:
+                print(f"  [!] Parse cache entry for {path.name} unreadable, re-parsing: {e}")
+            else:
+                self.hits += 1
+                return df
+
+        self.misses += 1
+        content_hash = file_digest(path)
+        df = self.preprocessor.preprocess(self.loader.load(str(path)))
+        try:
+            self._store(entry, df, {
+                "source": str(path),
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "content_hash": content_hash,
+            })
+        except OSError as e:
+            print(f"  [!] Could not write parse cache for {path.name}: {e}")
+        return df
+
+    def entry_dir(self, path: Path) -> Path:
+        """Cache directory of a resolved file path."""
+        name = hashlib.sha256(str(path).encode()).hexdigest()[:24]
+        return self.cache_dir / name
+
+    def clear(self) -> int:
+        """Remove every entry; returns the number removed.
+
+        The PDF page cache is kept: it is keyed by page content, not file.
+        """
+        if not self.cache_dir.exists():
+            return 0
+        entries = [p for p in self.cache_dir.iterdir()
+                   if p.is_dir() and p.name != PAGE_CACHE_SUBDIR]
+        for entry in entries:
+            shutil.rmtree(entry, ignore_errors=True)
+        return len(entries)
+
+    # ------------------------------------------------------------------
+    # Entries
+    # ------------------------------------------------------------------
+
+    def _token(self) -> str:
+        return f"{type(self.loader).__qualname__}|{self.preprocessor.cache_token()}"
+
+    def _valid_meta(self, entry: Path, path: Path, stat) -> Optional[dict]:
+        """Entry metadata if the entry still matches the file, else None."""
+        try:
+            with open(entry / _META) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (meta.get("format") != PARSE_CACHE_FORMAT
+                or meta.get("token") != self._token()
+                or meta.get("source") != str(path)
+                or meta.get("size") != stat.st_size):
+            return None
+        if meta.get("mtime_ns") == stat.st_mtime_ns:
+            return meta
+        if meta.get("content_hash") != file_digest(path):
+            return None
+        # Same content under a new mtime: remember it to skip hashing next time
+        meta["mtime_ns"] = stat.st_mtime_ns
+        try:
+            _write_json(entry / _META, meta)
+        except OSError:
+            pass
+        return meta
+
+    def _store(self, entry: Path, df: pd.DataFrame, source: dict) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        staging = entry.with_name(f"{entry.name}.tmp{os.getpid()}")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir()
+        try:
+            meta = {
+                "format": PARSE_CACHE_FORMAT,
+                "token": self._token(),
+                **source,
+                "n_rows": len(df),
+                "columns": [_write_column(df.iloc[:, i], staging, i)
+                            for i in range(df.shape[1])],
+            }
+            if not _is_default_index(df.index):
+                with open(staging / "index.pkl", "wb") as f:
+                    pickle.dump(df.index, f, protocol=pickle.HIGHEST_PROTOCOL)
+                meta["index"] = "index.pkl"
+            _write_json(staging / _META, meta)
+
+            if entry.exists():
+                shutil.rmtree(entry)
+            os.replace(staging, entry)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+
+# ============================================================================
+# Column files
+# ============================================================================
+
+def _write_json(path: Path, data) -> None:
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _is_default_index(index: pd.Index) -> bool:
+    return (isinstance(index, pd.RangeIndex) and index.start == 0
+            and index.step == 1 and index.name is None)
+
+
+def _text_missing(series: pd.Series) -> Optional[str]:
+    """How a text column marks missing values, or None if it is not text.
+
+    Returns "dtype" for pandas string dtypes, "none" for object columns of
+    str and None.
+    """
+    if isinstance(series.dtype, pd.StringDtype):
+        return "dtype"
+    if series.dtype != object:
+        return None
+    values = series.to_numpy()
+    present = pd.notna(values)
+    if any(v is not None for v in values[~present]):
+        return None  # NaN/NaT markers would not round-trip
+    if not all(isinstance(v, str) for v in values[present]):
+        return None
+    return "none"
+
+
+def _write_column(series: pd.Series, directory: Path, i: int) -> dict:
+    """Write one column; returns its metadata."""
+    name = series.name
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "biufcmM":
+        np.save(directory / f"{i}.npy", series.to_numpy(), allow_pickle=False)
+        return {"name": name, "kind": "array", "file": f"{i}.npy"}
+
+    missing = _text_missing(series)
+    if missing is not None:
+        codes, uniques = pd.factorize(series)
+        np.save(directory / f"{i}.npy", codes.astype(np.int32), allow_pickle=False)
+        with open(directory / f"{i}.json", "w") as f:
+            json.dump([str(v) for v in uniques], f)
+        meta = {"name": name, "kind": "text", "file": f"{i}.npy",
+                "values": f"{i}.json", "missing": missing}
+        if missing == "dtype":
+            meta["storage"] = dtype.storage
+            meta["na"] = "nan" if dtype.na_value is np.nan else "NA"
+        return meta
+
+    with open(directory / f"{i}.pkl", "wb") as f:
+        pickle.dump(series, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return {"name": name, "kind": "pickle", "file": f"{i}.pkl"}
+
+
+def _read_column(directory: Path, meta: dict):
+    kind = meta["kind"]
+    if kind == "array":
+        # Copy-on-write map: in-place edits of the frame never reach the file
+        return np.asarray(np.load(directory / meta["file"], mmap_mode="c", allow_pickle=False))
+    if kind == "text":
+        codes = np.load(directory / meta["file"], mmap_mode="r", allow_pickle=False)
+        with open(directory / meta["values"]) as f:
+            uniques = json.load(f)
+        # Code -1 (missing) picks the trailing None
+        values = np.array(uniques + [None], dtype=object).take(codes)
+        if meta["missing"] == "none":
+            return pd.Series(values, dtype=object, copy=False)
+        na_value = np.nan if meta["na"] == "nan" else pd.NA
+        return pd.array(values, dtype=pd.StringDtype(meta["storage"], na_value=na_value))
+    with open(directory / meta["file"], "rb") as f:
+        return pickle.load(f).reset_index(drop=True)
+
+
+def _read_frame(directory: Path, meta: dict) -> pd.DataFrame:
+    columns = meta["columns"]
+    if not columns:
+        return pd.DataFrame(index=pd.RangeIndex(meta["n_rows"]))
+    data = {i: _read_column(directory, col) for i, col in enumerate(columns)}
+    df = pd.DataFrame(data, copy=False)
+    df.columns = pd.Index([col["name"] for col in columns])
+    if "index" in meta:
+        with open(directory / meta["index"], "rb") as f:
+            df.index = pickle.load(f)
+    elif len(df) != meta["n_rows"]:
+        raise ValueError(f"expected {meta['n_rows']} rows, found {len(df)}")
+    return df
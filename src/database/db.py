@@ -3,10 +3,29 @@
 All upsert methods auto-compute calendar_quarter via PeriodConverter.
 Query methods return list[dict] for easy DataFrame conversion.
 Supports :memory: databases for testing.
+
+File-backed databases may be read from several threads: the thread that
+called init() uses the writer connection, every other thread transparently
+gets its own read-only connection to the same file (WAL allows concurrent
+readers). :memory: databases are single-threaded.
+
+Pooled mode (``pool_size=N``) bounds and reuses those read connections:
+
+    with TelecomDatabase("data/telecom.db", pool_size=4) as db:
+        with db.reader() as conn:       # one of <= 4 query_only connections
+            conn.execute("SELECT ...")
+        with db.writer() as conn:       # the single writer, from any thread
+            conn.execute("INSERT ...")  # committed on exit
+
+Every pooled connection is tuned with ``cache_size`` / ``mmap_size``.
 """
 
 import json
+import shutil
 import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
 from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Optional
@@ -14,42 +33,320 @@ from typing import Optional
 from src.database.period_utils import PeriodConverter, get_converter
 
 
+# Readers for one parallel engine run (five independent stages)
+DEFAULT_POOL_SIZE = 5
+
+# Pooled-mode tuning, per connection
+DEFAULT_CACHE_SIZE_KIB = 64 * 1024          # 64 MiB page cache
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024       # 256 MiB memory-mapped reads
+
+# Full-text index over intelligence event titles and descriptions.  The
+# trigram tokenizer (SQLite >= 3.34) makes MATCH a case-insensitive
+# substring test, the semantics the Looks' keyword filters always had.
+# External content: the triggers keep it in step with the base table.
+INTELLIGENCE_FTS_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS intelligence_events_fts USING fts5(
+    title, description,
+    content='intelligence_events', content_rowid='id',
+    tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS intelligence_events_fts_ai
+AFTER INSERT ON intelligence_events BEGIN
+    INSERT INTO intelligence_events_fts(rowid, title, description)
+    VALUES (new.id, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS intelligence_events_fts_ad
+AFTER DELETE ON intelligence_events BEGIN
+    INSERT INTO intelligence_events_fts(intelligence_events_fts, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS intelligence_events_fts_au
+AFTER UPDATE OF title, description ON intelligence_events BEGIN
+    INSERT INTO intelligence_events_fts(intelligence_events_fts, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
+    INSERT INTO intelligence_events_fts(rowid, title, description)
+    VALUES (new.id, new.title, new.description);
+END;
+"""
+
+# Shortest keyword the trigram index can match; shorter ones use instr()
+_FTS_MIN_KEYWORD = 3
+
+# linux/fs.h FICLONE = _IOW(0x94, 9, int): share the source file's extents
+_FICLONE = 0x40049409
+
+
+def clone_file(source, target) -> None:
+    """Copy ``source`` to the new file ``target``.
+
+    A copy-on-write clone on filesystems that support it (btrfs, XFS), a
+    plain copy elsewhere.  Raises FileExistsError if ``target`` exists.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        fcntl = None
+    with open(source, "rb") as src, open(target, "xb") as dst:
+        if fcntl is not None:
+            try:
+                fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+                return
+            except OSError:
+                pass
+        shutil.copyfileobj(src, dst, 1 << 20)
+
+
+class _ThreadReader:
+    """A thread's read connection; ``release`` gives it back to the database."""
+
+    __slots__ = ("conn", "release", "__weakref__")
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.release = None
+
+
 class TelecomDatabase:
     """SQLite database for telecom operator financial and operational data.
 
     Args:
         db_path: Path to SQLite database file. Use ":memory:" for testing.
+        pool_size: 0 keeps a single writer connection, with per-thread
+            readers opened and closed on demand. N > 0 enables pooled mode:
+            at most N read-only connections, reused across threads and
+            tasks, and a writer that any thread may use through writer().
+        cache_size_kib: Page cache per pooled connection.
+        mmap_size: Memory-mapped I/O limit per pooled connection, in bytes.
     """
 
-    def __init__(self, db_path: str = "data/telecom.db"):
+    def __init__(self, db_path: str = "data/telecom.db", pool_size: int = 0,
+                 cache_size_kib: int = DEFAULT_CACHE_SIZE_KIB,
+                 mmap_size: int = DEFAULT_MMAP_SIZE):
         self.db_path = db_path
-        self.conn = None
+        self.pool_size = max(0, pool_size)
+        self.cache_size_kib = cache_size_kib
+        self.mmap_size = mmap_size
+        self._conn = None
+        self._owner_thread = None
+        self.has_event_fts = False
+        self._local = threading.local()
+        self._readers: list = []        # every open read connection
+        self._idle: list = []           # pooled readers not checked out
+        self._readers_lock = threading.Lock()
+        self._reader_slots = (threading.BoundedSemaphore(self.pool_size)
+                              if self.pool_size else None)
+        self._write_lock = threading.RLock()
+
+    @property
+    def conn(self):
+        """Connection for the calling thread.
+
+        The thread that opened the database gets the writer connection;
+        other threads get a per-thread read-only connection, given back
+        when the thread ends (or on release_thread_connection()).  Writes
+        go through writer(), which serializes them in pooled mode.
+        """
+        if (self._conn is None or self.db_path == ":memory:"
+                or threading.get_ident() == self._owner_thread):
+            return self._conn
+        held = getattr(self._local, "reader", None)
+        if held is None:
+            held = _ThreadReader(self._checkout_reader())
+            # Runs when the thread's locals are dropped at thread exit
+            held.release = weakref.finalize(held, self._checkin_reader, held.conn)
+            self._local.reader = held
+        return held.conn
+
+    @conn.setter
+    def conn(self, value):
+        self._conn = value
+        self._owner_thread = threading.get_ident() if value is not None else None
+
+    @property
+    def pooled(self) -> bool:
+        return self.pool_size > 0 and self.db_path != ":memory:"
+
+    @property
+    def supports_concurrent_reads(self) -> bool:
+        """True when other threads can read through per-thread connections."""
+        return self._conn is not None and self.db_path != ":memory:"
+
+    def _tune(self, conn):
+        if self.pooled:
+            conn.execute(f"PRAGMA cache_size = -{int(self.cache_size_kib)}")
+            conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+
+    def _checkout_reader(self):
+        """Take an idle pooled reader or open a new one (blocks when N are out)."""
+        if self._reader_slots is not None:
+            self._reader_slots.acquire()
+        with self._readers_lock:
+            if self._idle:
+                return self._idle.pop()
+        try:
+            # check_same_thread=False: pooled readers move between threads,
+            # and close() runs on the owner thread
+            reader = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            reader.row_factory = sqlite3.Row
+            reader.execute("PRAGMA query_only = ON")
+            self._tune(reader)
+        except Exception:
+            if self._reader_slots is not None:
+                self._reader_slots.release()
+            raise
+        with self._readers_lock:
+            self._readers.append(reader)
+        return reader
+
+    def _checkin_reader(self, reader):
+        """Return a reader to the pool, or close it when not pooled."""
+        with self._readers_lock:
+            is_open = reader in self._readers
+            if is_open and self._reader_slots is not None:
+                self._idle.append(reader)
+            elif is_open:
+                self._readers.remove(reader)
+        if self._reader_slots is None or not is_open:
+            reader.close()
+        if self._reader_slots is not None:
+            self._reader_slots.release()
+
+    def release_thread_connection(self):
+        """Give back the calling thread's read connection, if it has one."""
+        held = getattr(self._local, "reader", None)
+        if held is None:
+            return
+        self._local.reader = None
+        held.release()
+
+    @contextmanager
+    def reader(self):
+        """Check out a read-only connection for the duration of the block.
+
+        :memory: databases yield the single shared connection.
+        """
+        if self._conn is None:
+            raise RuntimeError("Database not initialized; call init() first")
+        if self.db_path == ":memory:":
+            yield self._conn
+            return
+        reader = self._checkout_reader()
+        try:
+            yield reader
+        finally:
+            self._checkin_reader(reader)
+
+    @contextmanager
+    def writer(self):
+        """Exclusive use of the writer connection.
+
+        Commits when the block exits normally, rolls back on error. In
+        pooled mode any thread may write this way.
+        """
+        if self._conn is None:
+            raise RuntimeError("Database not initialized; call init() first")
+        with self._write_lock:
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.rollback()
+                raise
+            self._conn.commit()
 
     def init(self):
         """Initialize database: create connection and run schema."""
+        self._connect()
+        return self._apply_schema()
+
+    def init_from_image(self, image_path: str):
+        """Initialize with a copy of the database file ``image_path``.
+
+        A file-backed database must not exist yet: the image is copied to
+        it, as a copy-on-write clone where the filesystem supports it.
+        :memory: databases receive the image through the SQLite backup
+        API.  The schema is then applied as init() does.
+        """
+        if self.db_path != ":memory:":
+            db_file = Path(self.db_path)
+            db_file.parent.mkdir(parents=True, exist_ok=True)
+            # A leftover WAL would be replayed into the copy
+            for suffix in ("-wal", "-shm", "-journal"):
+                Path(f"{db_file}{suffix}").unlink(missing_ok=True)
+            clone_file(image_path, db_file)
+            self._connect()
+        else:
+            self._connect()
+            image = sqlite3.connect(f"{Path(image_path).resolve().as_uri()}?mode=ro", uri=True)
+            try:
+                image.backup(self.conn)
+            finally:
+                image.close()
+        return self._apply_schema()
+
+    def _connect(self):
         if self.db_path == ":memory:":
             self.conn = sqlite3.connect(":memory:")
         else:
             db_file = Path(self.db_path)
             db_file.parent.mkdir(parents=True, exist_ok=True)
-            self.conn = sqlite3.connect(str(db_file))
+            self.conn = sqlite3.connect(str(db_file),
+                                        check_same_thread=not self.pooled)
 
         self.conn.row_factory = sqlite3.Row
         self.conn.execute("PRAGMA foreign_keys = ON")
         self.conn.execute("PRAGMA journal_mode = WAL")
+        self._tune(self.conn)
 
-        # Run schema
+    def _apply_schema(self):
         schema_path = Path(__file__).parent / "schema.sql"
         with open(schema_path, "r") as f:
             schema_sql = f.read()
         self.conn.executescript(schema_sql)
+        self._init_event_search()
         self.conn.commit()
         return self
 
+    def analyze(self):
+        """Refresh the query planner statistics (sqlite_stat1).
+
+        Run after bulk loads; the planner relies on them to choose between
+        the market-level and operator-level indexes.
+        """
+        with self.writer() as conn:
+            conn.execute("ANALYZE")
+
+    def _init_event_search(self):
+        """Create the intelligence event FTS index, if SQLite supports it."""
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'intelligence_events_fts'"
+        ).fetchone()
+        try:
+            self.conn.executescript(INTELLIGENCE_FTS_SQL)
+        except sqlite3.OperationalError:
+            # No FTS5 / trigram tokenizer: keyword search falls back to instr()
+            self.has_event_fts = False
+            return
+        self.has_event_fts = True
+        if not exists:
+            # Index events stored before the FTS table existed
+            self.conn.execute(
+                "INSERT INTO intelligence_events_fts(intelligence_events_fts) "
+                "VALUES ('rebuild')")
+
     def close(self):
-        """Close the database connection."""
-        if self.conn:
-            self.conn.close()
+        """Close the database connection (and any read connections)."""
+        with self._readers_lock:
+            readers, self._readers, self._idle = self._readers, [], []
+        for reader in readers:
+            reader.close()
+        if self._conn:
+            if self.db_path != ":memory:":
+                # Refreshes statistics the session's queries found stale
+                try:
+                    self._conn.execute("PRAGMA optimize")
+                except sqlite3.Error:
+                    pass
+            self._conn.close()
             self.conn = None
 
     def __enter__(self):
@@ -93,8 +390,9 @@ class TelecomDatabase:
             VALUES ({placeholders})
             ON CONFLICT(operator_id) DO UPDATE SET {updates}
         """
-        self.conn.execute(sql, list(fields.values()))
-        self.conn.commit()
+        with self.writer() as conn:
+            conn.execute(sql, list(fields.values()))
+            self._mark_changed("operators", operator_id)
 
     def upsert_financial(self, operator_id: str, period: str, data: dict):
         """Insert or update a quarterly financial record.
@@ -154,8 +452,9 @@ class TelecomDatabase:
             VALUES ({placeholders})
             ON CONFLICT(operator_id, calendar_quarter) DO UPDATE SET {updates}
         """
-        self.conn.execute(sql, list(fields.values()))
-        self.conn.commit()
+        with self.writer() as conn:
+            conn.execute(sql, list(fields.values()))
+            self._mark_changed("financial_quarterly", operator_id)
 
     def upsert_subscriber(self, operator_id: str, period: str, data: dict):
         """Insert or update a quarterly subscriber record.
@@ -207,8 +506,9 @@ class TelecomDatabase:
             VALUES ({placeholders})
             ON CONFLICT(operator_id, calendar_quarter) DO UPDATE SET {updates}
         """
-        self.conn.execute(sql, list(fields.values()))
-        self.conn.commit()
+        with self.writer() as conn:
+            conn.execute(sql, list(fields.values()))
+            self._mark_changed("subscriber_quarterly", operator_id)
 
     def upsert_network(self, operator_id: str, calendar_quarter: str, data: dict):
         """Insert or update network infrastructure data."""
@@ -247,8 +547,9 @@ class TelecomDatabase:
             VALUES ({placeholders})
             ON CONFLICT(operator_id, calendar_quarter) DO UPDATE SET {updates}
         """
-        self.conn.execute(sql, list(fields.values()))
-        self.conn.commit()
+        with self.writer() as conn:
+            conn.execute(sql, list(fields.values()))
+            self._mark_changed("network_infrastructure", operator_id)
 
     def upsert_competitive_scores(self, operator_id: str,
                                    calendar_quarter: str,
@@ -261,16 +562,17 @@ class TelecomDatabase:
             scores_dict: Maps dimension name to score (1-100),
                          e.g., {"Network Coverage": 80, "Brand Strength": 82}
         """
-        for dimension, score in scores_dict.items():
-            sql = """
-                INSERT INTO competitive_scores
-                    (operator_id, calendar_quarter, dimension, score)
-                VALUES (?, ?, ?, ?)
-                ON CONFLICT(operator_id, calendar_quarter, dimension)
-                DO UPDATE SET score = excluded.score
-            """
-            self.conn.execute(sql, [operator_id, calendar_quarter, dimension, score])
-        self.conn.commit()
+        with self.writer() as conn:
+            for dimension, score in scores_dict.items():
+                sql = """
+                    INSERT INTO competitive_scores
+                        (operator_id, calendar_quarter, dimension, score)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(operator_id, calendar_quarter, dimension)
+                    DO UPDATE SET score = excluded.score
+                """
+                conn.execute(sql, [operator_id, calendar_quarter, dimension, score])
+            self._mark_changed("competitive_scores", operator_id)
 
     def upsert_intelligence(self, event_data: dict):
         """Insert an intelligence event."""
@@ -294,8 +596,9 @@ class TelecomDatabase:
             INSERT INTO intelligence_events ({columns})
             VALUES ({placeholders})
         """
-        self.conn.execute(sql, list(fields.values()))
-        self.conn.commit()
+        with self.writer() as conn:
+            conn.execute(sql, list(fields.values()))
+            self._mark_changed("intelligence_events", fields["market"] or fields["operator_id"])
 
     def upsert_macro(self, country: str, calendar_quarter: str, data: dict):
         """Insert or update macro environment data."""
@@ -329,8 +632,9 @@ class TelecomDatabase:
             VALUES ({placeholders})
             ON CONFLICT(country, calendar_quarter) DO UPDATE SET {updates}
         """
-        self.conn.execute(sql, list(fields.values()))
-        self.conn.commit()
+        with self.writer() as conn:
+            conn.execute(sql, list(fields.values()))
+            self._mark_changed("macro_environment", country)
 
     def upsert_executive(self, operator_id: str, data: dict):
         """Insert or update an executive record."""
@@ -357,8 +661,9 @@ class TelecomDatabase:
             VALUES ({placeholders})
             ON CONFLICT(operator_id, name, title) DO UPDATE SET {updates}
         """
-        self.conn.execute(sql, list(fields.values()))
-        self.conn.commit()
+        with self.writer() as conn:
+            conn.execute(sql, list(fields.values()))
+            self._mark_changed("executives", operator_id)
 
     def upsert_tariff(self, operator_id: str, plan_name: str,
                        plan_type: str, snapshot_period: str, data: dict):
@@ -401,8 +706,9 @@ class TelecomDatabase:
             ON CONFLICT(operator_id, plan_name, plan_type, snapshot_period)
             DO UPDATE SET {updates}
         """
-        self.conn.execute(sql, list(fields.values()))
-        self.conn.commit()
+        with self.writer() as conn:
+            conn.execute(sql, list(fields.values()))
+            self._mark_changed("tariffs", operator_id)
 
     def upsert_earnings_highlight(self, operator_id: str,
                                    calendar_quarter: str, data: dict):
@@ -425,8 +731,9 @@ class TelecomDatabase:
             INSERT INTO earnings_call_highlights ({columns})
             VALUES ({placeholders})
         """
-        self.conn.execute(sql, list(fields.values()))
-        self.conn.commit()
+        with self.writer() as conn:
+            conn.execute(sql, list(fields.values()))
+            self._mark_changed("earnings_call_highlights", operator_id)
 
     # =========================================================================
     # User Feedback
@@ -462,8 +769,8 @@ class TelecomDatabase:
             ON CONFLICT(analysis_job_id, operator_id, look_category, finding_ref)
             DO UPDATE SET {updates}
         """
-        self.conn.execute(sql, list(fields.values()))
-        self.conn.commit()
+        with self.writer() as conn:
+            conn.execute(sql, list(fields.values()))
 
     def get_feedback(self, analysis_job_id: Optional[int] = None,
                      operator_id: Optional[str] = None,
@@ -494,13 +801,148 @@ class TelecomDatabase:
     def clear_feedback(self, analysis_job_id: int,
                        operator_id: str) -> int:
         """Delete all feedback for a given job + operator. Returns deleted count."""
-        cursor = self.conn.execute(
-            "DELETE FROM user_feedback WHERE analysis_job_id = ? AND operator_id = ?",
-            [analysis_job_id, operator_id],
-        )
-        self.conn.commit()
+        with self.writer() as conn:
+            cursor = conn.execute(
+                "DELETE FROM user_feedback WHERE analysis_job_id = ? AND operator_id = ?",
+                [analysis_job_id, operator_id],
+            )
+        return cursor.rowcount
+
+    # =========================================================================
+    # Analysis Job Checkpoints
+    # =========================================================================
+
+    def upsert_job_checkpoint(self, checkpoint: dict):
+        """Insert or update a per-market checkpoint for a group analysis job.
+
+        Conflict on (analysis_job_id, market).
+        """
+        fields = {
+            "analysis_job_id": checkpoint["analysis_job_id"],
+            "market": checkpoint["market"],
+            "operator_id": checkpoint.get("operator_id"),
+            "analysis_period": checkpoint.get("analysis_period"),
+            "result_snapshot": checkpoint.get("result_snapshot"),
+            "outputs": checkpoint.get("outputs", "[]"),
+            "completed_at": checkpoint.get(
+                "completed_at", datetime.utcnow().isoformat()
+            ),
+        }
+
+        columns = ", ".join(fields.keys())
+        placeholders = ", ".join(["?"] * len(fields))
+        updates = ", ".join([
+            f"{k} = excluded.{k}" for k in fields.keys()
+            if k not in ("analysis_job_id", "market")
+        ])
+
+        sql = f"""
+            INSERT INTO analysis_job_checkpoints ({columns})
+            VALUES ({placeholders})
+            ON CONFLICT(analysis_job_id, market) DO UPDATE SET {updates}
+        """
+        with self.writer() as conn:
+            conn.execute(sql, list(fields.values()))
+
+    def get_job_checkpoints(self, analysis_job_id: int) -> list:
+        """Get all market checkpoints recorded for an analysis job."""
+        sql = """
+            SELECT * FROM analysis_job_checkpoints
+            WHERE analysis_job_id = ?
+            ORDER BY completed_at ASC
+        """
+        rows = self.conn.execute(sql, [analysis_job_id]).fetchall()
+        return self._rows_to_dicts(rows)
+
+    def clear_job_checkpoints(self, analysis_job_id: int) -> int:
+        """Delete all checkpoints for a job. Returns deleted count."""
+        with self.writer() as conn:
+            cursor = conn.execute(
+                "DELETE FROM analysis_job_checkpoints WHERE analysis_job_id = ?",
+                [analysis_job_id],
+            )
         return cursor.rowcount
 
+    # =========================================================================
+    # Change Tracking
+    # =========================================================================
+
+    def _mark_changed(self, table: str, scope: Optional[str]):
+        """Bump the change version of ``table`` for one scope (no commit)."""
+        if not scope:
+            return
+        self._conn.execute(
+            """
+            INSERT INTO data_changes (table_name, scope) VALUES (?, ?)
+            ON CONFLICT(table_name, scope) DO UPDATE SET
+                version = version + 1, changed_at = CURRENT_TIMESTAMP
+            """,
+            [table, scope],
+        )
+
+    def mark_changed(self, table: str, scopes):
+        """Record changes made outside the upsert_* methods (bulk loads).
+
+        Runs inside the caller's transaction; the caller commits.
+        """
+        for scope in sorted({s for s in scopes if s}):
+            self._mark_changed(table, scope)
+
+    def get_change_versions(self, market: str) -> dict:
+        """Change versions of every (table, scope) belonging to a market.
+
+        Scopes are the market itself, its operators and their countries.
+        Returns {(table_name, scope): version}.
+        """
+        sql = """
+            SELECT table_name, scope, version FROM data_changes
+            WHERE scope = ?
+               OR scope IN (SELECT operator_id FROM operators WHERE market = ?)
+               OR scope IN (SELECT country FROM operators WHERE market = ?)
+        """
+        rows = self.conn.execute(sql, [market, market, market]).fetchall()
+        return {(r["table_name"], r["scope"]): r["version"] for r in rows}
+
+    # =========================================================================
+    # Engine Stage Outputs
+    # =========================================================================
+
+    def upsert_stage_output(self, market: str, target_operator: str,
+                            target_period: Optional[str], n_quarters: int,
+                            stage: str, stage_key: str, manifest: dict,
+                            payload: bytes):
+        """Store one engine stage's output for incremental re-runs."""
+        sql = """
+            INSERT INTO engine_stage_outputs
+                (market, target_operator, target_period, n_quarters, stage,
+                 stage_key, manifest, payload, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(market, target_operator, target_period, n_quarters, stage)
+            DO UPDATE SET stage_key = excluded.stage_key,
+                          manifest = excluded.manifest,
+                          payload = excluded.payload,
+                          created_at = excluded.created_at
+        """
+        with self.writer() as conn:
+            conn.execute(sql, [
+                market, target_operator, target_period or "", n_quarters, stage,
+                stage_key, json.dumps(manifest, sort_keys=True), payload,
+                datetime.utcnow().isoformat(),
+            ])
+
+    def get_stage_outputs(self, market: str, target_operator: str,
+                          target_period: Optional[str], n_quarters: int) -> dict:
+        """Stored stage outputs of one engine run. Returns {stage: row dict}."""
+        sql = """
+            SELECT * FROM engine_stage_outputs
+            WHERE market = ? AND target_operator = ?
+              AND target_period = ? AND n_quarters = ?
+        """
+        rows = self.conn.execute(
+            sql, [market, target_operator, target_period or "", n_quarters]
+        ).fetchall()
+        return {r["stage"]: dict(r) for r in rows}
+
     # =========================================================================
     # Query Methods
     # =========================================================================
@@ -633,6 +1075,36 @@ class TelecomDatabase:
         rows = self.conn.execute(sql, [market] + timeline).fetchall()
         return self._rows_to_dicts(rows)
 
+    def get_market_subscriber_timeseries(self, market: str,
+                                          n_quarters: int = 8,
+                                          end_cq: Optional[str] = None) -> dict:
+        """Get all operators' subscriber data across quarters for a market.
+
+        Returns {operator_id: [rows]} — the ``sub_data_by_op`` shape used by
+        share_analyzer — from a single query.
+        """
+        converter = PeriodConverter()
+        timeline = converter.generate_timeline(
+            n_quarters=n_quarters, end_cq=end_cq
+        )
+
+        placeholders = ", ".join(["?"] * len(timeline))
+        sql = f"""
+            SELECT s.*
+            FROM operators o
+            JOIN subscriber_quarterly s
+                ON o.operator_id = s.operator_id
+            WHERE o.market = ?
+              AND o.is_active = 1
+              AND s.calendar_quarter IN ({placeholders})
+            ORDER BY o.operator_type, o.display_name, s.period_start ASC
+        """
+        rows = self.conn.execute(sql, [market] + timeline).fetchall()
+        by_op: dict = {}
+        for row in self._rows_to_dicts(rows):
+            by_op.setdefault(row["operator_id"], []).append(row)
+        return by_op
+
     def get_macro_data(self, country: str,
                         n_quarters: int = 8,
                         end_cq: Optional[str] = None) -> list:
@@ -706,11 +1178,15 @@ class TelecomDatabase:
     def get_intelligence_events(self, market: Optional[str] = None,
                                  operator_id: Optional[str] = None,
                                  category: Optional[str] = None,
-                                 days_back: int = 180) -> list:
-        """Get intelligence events with optional filters."""
-        cutoff = (date.today() - timedelta(days=days_back)).isoformat()
-        conditions = ["event_date >= ?"]
-        params = [cutoff]
+                                 days_back: int = 180,
+                                 as_of: Optional[date] = None) -> list:
+        """Get intelligence events with optional filters.
+
+        The window is the ``days_back`` days up to and including ``as_of``.
+        Without ``as_of`` it starts ``days_back`` days before today and has
+        no upper bound.
+        """
+        conditions, params = self._event_window(days_back, as_of)
 
         if market:
             conditions.append("market = ?")
@@ -731,6 +1207,90 @@ class TelecomDatabase:
         rows = self.conn.execute(sql, params).fetchall()
         return self._rows_to_dicts(rows)
 
+    @staticmethod
+    def _event_window(days_back: int, as_of: Optional[date]):
+        """WHERE conditions and params for an intelligence event date window."""
+        cutoff = ((as_of or date.today()) - timedelta(days=days_back)).isoformat()
+        if as_of is None:
+            return ["event_date >= ?"], [cutoff]
+        return ["event_date >= ?", "event_date <= ?"], [cutoff, as_of.isoformat()]
+
+    def search_intelligence_events(self, market: Optional[str] = None,
+                                   operator_id: Optional[str] = None,
+                                   categories=None,
+                                   keywords=None,
+                                   columns=("title",),
+                                   days_back: int = 180,
+                                   as_of: Optional[date] = None,
+                                   ids_only: bool = False) -> list:
+        """Intelligence events matching categories and/or keywords.
+
+        Keyword matching runs in SQLite: an event matches when any keyword
+        occurs, case-insensitively, as a substring of any of ``columns``
+        (title, description) -- the FTS index when available.  Results are
+        ordered by event_date DESC, id, so a fixed ``as_of`` gives
+        reproducible output.
+
+        Args:
+            categories: Iterable of categories; None for all.
+            keywords: Iterable of substrings; None for no keyword filter.
+            columns: Text columns searched for keywords.
+            ids_only: Return event ids only (answered from the indexes).
+
+        Returns:
+            list of event dicts, or of ids with ``ids_only``.
+        """
+        conditions, params = self._event_window(days_back, as_of)
+        if market:
+            conditions.append("market = ?")
+            params.append(market)
+        if operator_id:
+            conditions.append("operator_id = ?")
+            params.append(operator_id)
+        if categories is not None:
+            categories = sorted(set(categories))
+            conditions.append(
+                f"category IN ({', '.join(['?'] * len(categories))})")
+            params.extend(categories)
+        if keywords is not None:
+            clause, keyword_params = self._keyword_clause(keywords, columns)
+            conditions.append(clause)
+            params.extend(keyword_params)
+
+        select = "id" if ids_only else "*"
+        sql = f"""
+            SELECT {select} FROM intelligence_events
+            WHERE {" AND ".join(conditions)}
+            ORDER BY event_date DESC, id
+        """
+        rows = self.conn.execute(sql, params).fetchall()
+        if ids_only:
+            return [row[0] for row in rows]
+        return self._rows_to_dicts(rows)
+
+    def _keyword_clause(self, keywords, columns) -> tuple:
+        """SQL condition matching any keyword in any of ``columns``."""
+        columns = [c for c in columns if c in ("title", "description")]
+        keywords = sorted({k.lower() for k in keywords if k})
+        if not keywords or not columns:
+            return "0", []
+
+        indexed = [k for k in keywords if len(k) >= _FTS_MIN_KEYWORD]
+        short = keywords if not self.has_event_fts else [
+            k for k in keywords if len(k) < _FTS_MIN_KEYWORD]
+        parts, params = [], []
+        if self.has_event_fts and indexed:
+            phrases = " OR ".join('"' + k.replace('"', '""') + '"' for k in indexed)
+            parts.append(
+                "id IN (SELECT rowid FROM intelligence_events_fts "
+                "WHERE intelligence_events_fts MATCH ?)")
+            params.append(f"{{{' '.join(columns)}}} : ({phrases})")
+        for k in short:
+            for column in columns:
+                parts.append(f"instr(lower({column}), ?) > 0")
+                params.append(k)
+        return "(" + " OR ".join(parts) + ")", params
+
     def get_operators_in_market(self, market: str) -> list:
         """Get all active operators in a market."""
         sql = """
@@ -0,0 +1,439 @@
+"""EXPLAIN QUERY PLAN audit of the TelecomDatabase query methods.
+
+Runs every read method in AUDITED_METHODS against a database, records the
+SQL statements it issues and asks SQLite how it executes each of them.
+Full table scans and temporary B-trees (sorts or DISTINCTs the indexes do
+not deliver) are flagged.  With ``--timings`` each method is also timed,
+without the newer indexes and statistics ("before") and with them
+("after").
+
+``--synthetic N`` runs on a generated dataset instead: every seedable market,
+plus N-1 copies of each under new market and operator ids, so that the
+operator-keyed tables hold N times the seeded rows.
+
+Usage:
+    python -m src.database.query_audit                         # data/telecom.db
+    python -m src.database.query_audit --db-path custom.db
+    python -m src.database.query_audit --synthetic 10 --timings
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+# Ensure project root is on path
+_project_root = Path(__file__).resolve().parent.parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from src.database.db import TelecomDatabase
+
+# Indexes added for the audited queries (schema.sql); dropped for the
+# "before" timings
+AUDIT_INDEXES = (
+    "idx_operators_market",
+    "idx_operators_market_id",
+    "idx_financial_operator_period",
+    "idx_subscriber_operator_period",
+    "idx_executives_operator",
+    "idx_earnings_operator_cq_type",
+)
+
+# Indexes the audit indexes superseded (schema.sql drops them); recreated
+# for the "before" timings
+SUPERSEDED_INDEXES = {
+    "idx_competitive_operator_cq":
+        "CREATE INDEX idx_competitive_operator_cq ON competitive_scores(operator_id, calendar_quarter)",
+    "idx_earnings_operator_cq":
+        "CREATE INDEX idx_earnings_operator_cq ON earnings_call_highlights(operator_id, calendar_quarter)",
+}
+
+# Sorts no index can deliver, by method: the ORDER BY mixes columns of
+# joined tables, a computed order or mixed directions.  Reported, not flagged.
+ACCEPTED_SORTS = {
+    "get_market_comparison": "ranks operators by revenue",
+    "get_market_timeseries": "quarter, then revenue, across operators",
+    "get_market_subscriber_timeseries": "quarters within the operator order",
+    "get_competitive_scores": "dimensions within each operator",
+    "search_intelligence_events": "event_date DESC, id tie-break",
+    "get_tariffs": "operator rows of a market, then plan columns",
+    "get_tariff_comparison": "tier and price across operators",
+}
+
+# Tables copied per operator by build_synthetic_db()
+_OPERATOR_TABLES = (
+    "financial_quarterly", "subscriber_quarterly", "network_infrastructure",
+    "tariffs", "competitive_scores", "intelligence_events", "executives",
+    "earnings_call_highlights",
+)
+
+_SCAN = re.compile(r"^SCAN (\w+)")
+_TEMP_BTREE = re.compile(r"USE TEMP B-TREE FOR (.+)")
+
+
+# ============================================================================
+# Audited methods
+# ============================================================================
+
+# method name -> builds (args, kwargs) from the sample values of _sample()
+AUDITED_METHODS: dict[str, Callable[[dict], tuple]] = {
+    "get_financial_timeseries": lambda s: ((s["operator_id"],), {"end_cq": s["quarter"]}),
+    "get_subscriber_timeseries": lambda s: ((s["operator_id"],), {"end_cq": s["quarter"]}),
+    "get_market_comparison": lambda s: ((s["market"], s["quarter"]), {}),
+    "get_market_timeseries": lambda s: ((s["market"],), {"end_cq": s["quarter"]}),
+    "get_market_subscriber_timeseries": lambda s: ((s["market"],), {"end_cq": s["quarter"]}),
+    "get_macro_data": lambda s: ((s["country"],), {"end_cq": s["quarter"]}),
+    "get_network_data": lambda s: ((s["operator_id"],), {}),
+    "get_competitive_scores": lambda s: ((s["market"], s["quarter"]), {}),
+    "get_intelligence_events": lambda s: ((), {"market": s["market"], "days_back": 3650}),
+    "search_intelligence_events": lambda s: ((), {"market": s["market"], "days_back": 3650,
+                                                   "keywords": ["5g", "merger"]}),
+    "get_operators_in_market": lambda s: ((s["market"],), {}),
+    "get_executives": lambda s: ((s["operator_id"],), {}),
+    "get_earnings_highlights": lambda s: ((s["operator_id"],), {}),
+    "get_tariffs": lambda s: ((), {"market": s["market"]}),
+    "get_tariff_comparison": lambda s: ((s["market"], s["plan_type"], s["snapshot"]), {}),
+}
+
+
+@dataclass
+class StatementPlan:
+    """Query plan of one SQL statement."""
+
+    sql: str
+    plan: list[str] = field(default_factory=list)  # EXPLAIN QUERY PLAN details
+    scans: list[str] = field(default_factory=list)  # tables read in full
+    temp_btrees: list[str] = field(default_factory=list)  # e.g. "ORDER BY"
+
+
+@dataclass
+class MethodAudit:
+    """Audit of one TelecomDatabase query method."""
+
+    method: str
+    statements: list[StatementPlan] = field(default_factory=list)
+    before_ms: Optional[float] = None
+    after_ms: Optional[float] = None
+
+    @property
+    def flagged(self) -> bool:
+        """Full scans, or temp B-trees not in ACCEPTED_SORTS."""
+        accepted = self.method in ACCEPTED_SORTS
+        return any(s.scans or (s.temp_btrees and not accepted)
+                   for s in self.statements)
+
+
+class _StatementRecorder:
+    """sqlite3.Connection stand-in that records (sql, params) of execute()."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.statements: list[tuple] = []
+
+    def execute(self, sql, params=()):
+        self.statements.append((sql, params))
+        return self._conn.execute(sql, params)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def _sample(db: TelecomDatabase) -> dict:
+    """Arguments for the audited methods: the market with most operators."""
+    conn = db.conn
+    row = conn.execute("""
+        SELECT market, country, COUNT(*) AS n FROM operators
+        WHERE is_active = 1 GROUP BY market ORDER BY n DESC, market LIMIT 1
+    """).fetchone()
+    if row is None:
+        raise ValueError("no operators in database")
+    market, country = row["market"], row["country"]
+    operator_id = conn.execute(
+        "SELECT operator_id FROM operators WHERE market = ? ORDER BY operator_id LIMIT 1",
+        [market]).fetchone()[0]
+    quarter = conn.execute(
+        "SELECT MAX(calendar_quarter) FROM financial_quarterly WHERE operator_id = ?",
+        [operator_id]).fetchone()[0]
+    tariff = conn.execute("""
+        SELECT t.plan_type, t.snapshot_period FROM tariffs t
+        JOIN operators o ON t.operator_id = o.operator_id
+        WHERE o.market = ? ORDER BY t.snapshot_period DESC LIMIT 1
+    """, [market]).fetchone()
+    return {
+        "market": market,
+        "country": country,
+        "operator_id": operator_id,
+        "quarter": quarter,
+        "plan_type": tariff[0] if tariff else "mobile_postpaid",
+        "snapshot": tariff[1] if tariff else "",
+    }
+
+
+def explain(conn, sql: str, params=()) -> StatementPlan:
+    """EXPLAIN QUERY PLAN one statement and flag scans and temp B-trees."""
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    result = StatementPlan(sql=" ".join(sql.split()))
+    for row in rows:
+        detail = row[3]
+        result.plan.append(detail)
+        scan = _SCAN.match(detail)
+        # Virtual (FTS) tables report their own access as a scan
+        if scan and "VIRTUAL TABLE" not in detail:
+            result.scans.append(scan.group(1))
+        temp = _TEMP_BTREE.search(detail)
+        if temp:
+            result.temp_btrees.append(temp.group(1))
+    return result
+
+
+def audit_queries(db: TelecomDatabase, sample: Optional[dict] = None,
+                  methods=None) -> list[MethodAudit]:
+    """EXPLAIN every statement issued by the audited query methods.
+
+    Args:
+        db: Initialized TelecomDatabase (used on its writer connection).
+        sample: Method arguments as built by _sample(); derived from the
+            data when None.
+        methods: Method names to audit; defaults to AUDITED_METHODS.
+
+    Returns:
+        One MethodAudit per method, in AUDITED_METHODS order.
+    """
+    sample = sample or _sample(db)
+    audits = []
+    for name in methods or AUDITED_METHODS:
+        args, kwargs = AUDITED_METHODS[name](sample)
+        real = db.conn
+        recorder = _StatementRecorder(real)
+        db.conn = recorder
+        try:
+            getattr(db, name)(*args, **kwargs)
+        finally:
+            db.conn = real
+        audits.append(MethodAudit(
+            method=name,
+            statements=[explain(real, sql, params)
+                        for sql, params in recorder.statements],
+        ))
+    return audits
+
+
+def time_queries(db: TelecomDatabase, sample: dict, methods=None,
+                 repeat: int = 20) -> dict[str, float]:
+    """Best-of-three mean milliseconds per call of each audited method."""
+    timings = {}
+    for name in methods or AUDITED_METHODS:
+        args, kwargs = AUDITED_METHODS[name](sample)
+        call = getattr(db, name)
+        call(*args, **kwargs)  # warm the page cache
+        best = None
+        for _ in range(3):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                call(*args, **kwargs)
+            elapsed = (time.perf_counter() - start) / repeat * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        timings[name] = best
+    return timings
+
+
+def drop_audit_indexes(db: TelecomDatabase) -> None:
+    """Schema and statistics as before the audit ("before" state).
+
+    Drops AUDIT_INDEXES and the planner statistics, and recreates the
+    SUPERSEDED_INDEXES.
+    """
+    with db.writer() as conn:
+        for name in AUDIT_INDEXES:
+            conn.execute(f"DROP INDEX IF EXISTS {name}")
+        for name, create in SUPERSEDED_INDEXES.items():
+            conn.execute(f"DROP INDEX IF EXISTS {name}")
+            conn.execute(create)
+        has_stats = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone()
+        if has_stats:
+            conn.execute("DELETE FROM sqlite_stat1")
+        conn.execute("ANALYZE sqlite_schema")  # reload the (empty) statistics
+
+
+def restore_audit_indexes(db: TelecomDatabase) -> None:
+    """Recreate the schema indexes and refresh the statistics."""
+    schema_path = Path(__file__).parent / "schema.sql"
+    db.conn.executescript(schema_path.read_text())
+    db.analyze()
+
+
+def audit_with_timings(db: TelecomDatabase, repeat: int = 20) -> list[MethodAudit]:
+    """audit_queries() plus before/after timings of every method.
+
+    Drops AUDIT_INDEXES and the statistics, times the methods, then
+    restores both, re-times and audits.  Leaves the database indexed and
+    analyzed.
+    """
+    sample = _sample(db)
+    drop_audit_indexes(db)
+    before = time_queries(db, sample, repeat=repeat)
+    restore_audit_indexes(db)
+    after = time_queries(db, sample, repeat=repeat)
+    audits = audit_queries(db, sample)
+    for audit in audits:
+        audit.before_ms = before[audit.method]
+        audit.after_ms = after[audit.method]
+    return audits
+
+
+# ============================================================================
+# Synthetic data
+# ============================================================================
+
+def _seed_market_into(db: TelecomDatabase, market: str) -> None:
+    from src.database import seed_orchestrator as so
+
+    if market == "germany":
+        so._seed_germany_into(db)
+    elif market == "chile":
+        so._seed_chile_into(db)
+    elif market in so.LATAM_MARKETS:
+        so._seed_latam_market(db, market)
+    else:
+        so._seed_europe_market(db, market)
+
+
+def _copy_rows(conn, table: str, suffix: str, market_ids: list[str]) -> None:
+    """Copy ``table``'s rows of the given operators to their suffixed ids."""
+    columns = [r[1] for r in conn.execute(f"PRAGMA table_info({table})")
+               if r[1] != "id"]
+    select = []
+    for col in columns:
+        if col == "operator_id":
+            select.append(f"operator_id || '{suffix}'")
+        elif col == "market":
+            select.append(f"market || '{suffix}'")
+        else:
+            select.append(col)
+    placeholders = ", ".join(["?"] * len(market_ids))
+    conn.execute(f"""
+        INSERT INTO {table} ({', '.join(columns)})
+        SELECT {', '.join(select)} FROM {table}
+        WHERE operator_id IN (
+            SELECT operator_id FROM operators WHERE market IN ({placeholders}))
+    """, market_ids)
+
+
+def build_synthetic_db(scale: int = 10, markets=None,
+                       db_path: str = ":memory:") -> TelecomDatabase:
+    """Seed ``markets`` and replicate them to ``scale`` times the rows.
+
+    Copy k (1 <= k < scale) of market M is market "M_xk", whose operators
+    are the originals with "_xk" appended.  Macro data stays per country.
+    Markets that fail to seed are reported and skipped.
+
+    Returns:
+        Initialized, analyzed TelecomDatabase.
+    """
+    from src.database.seed_orchestrator import ALL_MARKETS
+
+    db = TelecomDatabase(db_path)
+    db.init()
+    seeded = []
+    for market in markets or ALL_MARKETS:
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                _seed_market_into(db, market)
+            seeded.append(market)
+        except Exception as e:
+            db.conn.rollback()
+            print(f"  [!] Seeding {market} failed: {e}")
+
+    with db.writer() as conn:
+        for k in range(1, scale):
+            suffix = f"_x{k}"
+            _copy_rows(conn, "operators", suffix, seeded)
+            for table in _OPERATOR_TABLES:
+                _copy_rows(conn, table, suffix, seeded)
+    db.analyze()
+    return db
+
+
+# ============================================================================
+# Report
+# ============================================================================
+
+def format_audit(audits: list[MethodAudit], verbose: bool = False) -> str:
+    """Human-readable audit report."""
+    lines = []
+    timed = any(a.before_ms is not None for a in audits)
+    for audit in audits:
+        status = "[!]" if audit.flagged else "ok "
+        line = f"  {status} {audit.method:<34}"
+        if timed:
+            line += f" {audit.before_ms:8.3f} ms -> {audit.after_ms:8.3f} ms"
+            if audit.after_ms:
+                line += f"  ({audit.before_ms / audit.after_ms:4.1f}x)"
+        lines.append(line)
+        for stmt in audit.statements:
+            for table in stmt.scans:
+                lines.append(f"        full scan of {table}")
+            for use in stmt.temp_btrees:
+                note = ACCEPTED_SORTS.get(audit.method)
+                lines.append(f"        temp B-tree for {use}"
+                             + (f" (accepted: {note})" if note else ""))
+            if verbose:
+                lines.extend(f"        | {detail}" for detail in stmt.plan)
+    flagged = sum(a.flagged for a in audits)
+    lines.append(f"\n  {len(audits)} query methods audited, {flagged} flagged")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="EXPLAIN QUERY PLAN audit of the TelecomDatabase queries"
+    )
+    parser.add_argument(
+        "--db-path", default="data/telecom.db",
+        help="Path to SQLite database (default: data/telecom.db)"
+    )
+    parser.add_argument(
+        "--synthetic", type=int, metavar="N", default=0,
+        help="Audit a generated dataset of N times the seeded rows instead"
+    )
+    parser.add_argument(
+        "--timings", action="store_true",
+        help="Time every method without and with the audit indexes"
+    )
+    parser.add_argument(
+        "--verbose", "-v", action="store_true",
+        help="Print the full query plans"
+    )
+    args = parser.parse_args()
+
+    if args.synthetic:
+        print(f"Building synthetic dataset ({args.synthetic}x)...")
+        db = build_synthetic_db(scale=args.synthetic)
+    else:
+        if not Path(args.db_path).exists():
+            print(f"  [!] Database not found: {args.db_path}")
+            return 1
+        db = TelecomDatabase(args.db_path)
+        db.init()
+
+    try:
+        n_ops = db.conn.execute("SELECT COUNT(*) FROM operators").fetchone()[0]
+        print(f"Query plan audit ({n_ops} operators)\n")
+        audits = audit_with_timings(db) if args.timings else audit_queries(db)
+        print(format_audit(audits, verbose=args.verbose))
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
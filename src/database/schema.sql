@@ -254,17 +254,66 @@ CREATE TABLE IF NOT EXISTS user_feedback (
     UNIQUE(analysis_job_id, operator_id, look_category, finding_ref)
 );
 
+CREATE TABLE IF NOT EXISTS analysis_job_checkpoints (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    analysis_job_id INTEGER NOT NULL,
+    market TEXT NOT NULL,
+    operator_id TEXT,
+    analysis_period TEXT,
+    result_snapshot TEXT,  -- JSON: BLMJsonExporter structure of the FiveLooksResult
+    outputs TEXT,          -- JSON: list of uploaded output records
+    completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(analysis_job_id, market)
+);
+
+-- Change tracking: one row per (table, scope), bumped by every upsert_*.
+-- scope = operator_id; market for intelligence_events; country for macro_environment
+CREATE TABLE IF NOT EXISTS data_changes (
+    table_name TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1,
+    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (table_name, scope)
+);
+
+-- Per-stage engine outputs reused by incremental re-runs
+CREATE TABLE IF NOT EXISTS engine_stage_outputs (
+    market TEXT NOT NULL,
+    target_operator TEXT NOT NULL,
+    target_period TEXT NOT NULL,  -- '' = latest available quarter
+    n_quarters INTEGER NOT NULL,
+    stage TEXT NOT NULL,
+    stage_key TEXT NOT NULL,
+    manifest TEXT NOT NULL,       -- JSON: {table: [scopes read] | ["*"]}
+    payload BLOB NOT NULL,        -- pickled (stage output, ProvenanceStore)
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (market, target_operator, target_period, n_quarters, stage)
+);
+
 -- Indexes for common queries
 CREATE INDEX IF NOT EXISTS idx_financial_operator_cq ON financial_quarterly(operator_id, calendar_quarter);
 CREATE INDEX IF NOT EXISTS idx_subscriber_operator_cq ON subscriber_quarterly(operator_id, calendar_quarter);
 CREATE INDEX IF NOT EXISTS idx_network_operator_cq ON network_infrastructure(operator_id, calendar_quarter);
-CREATE INDEX IF NOT EXISTS idx_competitive_operator_cq ON competitive_scores(operator_id, calendar_quarter);
 CREATE INDEX IF NOT EXISTS idx_intelligence_market ON intelligence_events(market, event_date);
 CREATE INDEX IF NOT EXISTS idx_intelligence_operator ON intelligence_events(operator_id, event_date);
+CREATE INDEX IF NOT EXISTS idx_intelligence_market_category ON intelligence_events(market, category, event_date);
 CREATE INDEX IF NOT EXISTS idx_macro_country_cq ON macro_environment(country, calendar_quarter);
-CREATE INDEX IF NOT EXISTS idx_earnings_operator_cq ON earnings_call_highlights(operator_id, calendar_quarter);
 CREATE INDEX IF NOT EXISTS idx_provenance_entity ON data_provenance(entity_type, entity_id);
 CREATE INDEX IF NOT EXISTS idx_provenance_job ON data_provenance(analysis_job_id);
 CREATE INDEX IF NOT EXISTS idx_tariff_operator_period ON tariffs(operator_id, snapshot_period);
 CREATE INDEX IF NOT EXISTS idx_tariff_type_period ON tariffs(plan_type, snapshot_period);
 CREATE INDEX IF NOT EXISTS idx_feedback_job ON user_feedback(analysis_job_id, operator_id);
+CREATE INDEX IF NOT EXISTS idx_checkpoint_job ON analysis_job_checkpoints(analysis_job_id);
+
+-- Market-level access and sort orders of the TelecomDatabase query methods
+-- (python -m src.database.query_audit)
+CREATE INDEX IF NOT EXISTS idx_operators_market ON operators(market, is_active, operator_type, display_name);
+CREATE INDEX IF NOT EXISTS idx_operators_market_id ON operators(market, operator_id);
+CREATE INDEX IF NOT EXISTS idx_financial_operator_period ON financial_quarterly(operator_id, period_start, calendar_quarter);
+CREATE INDEX IF NOT EXISTS idx_subscriber_operator_period ON subscriber_quarterly(operator_id, period_start, calendar_quarter);
+CREATE INDEX IF NOT EXISTS idx_executives_operator ON executives(operator_id, is_current, start_date);
+CREATE INDEX IF NOT EXISTS idx_earnings_operator_cq_type ON earnings_call_highlights(operator_id, calendar_quarter DESC, highlight_type, segment);
+-- Superseded: prefixes of UNIQUE(operator_id, calendar_quarter, dimension)
+-- and idx_earnings_operator_cq_type, which also deliver the sort orders
+DROP INDEX IF EXISTS idx_competitive_operator_cq;
+DROP INDEX IF EXISTS idx_earnings_operator_cq;
@@ -395,6 +395,7 @@ def seed_all(db_path: str = "data/telecom.db"):
     from src.database.seed_tariffs import seed_tariffs
     seed_tariffs(db)
 
+    db.analyze()
     print("Seed complete!")
     return db
 
@@ -0,0 +1,228 @@
+"""Prebuilt seeded database images.
+
+Seeding replays every seed_*.py script one upsert at a time.  A SeedImage
+runs its seeder once into a database file under data/seed_images/ and
+hands out copies of it:
+
+  - :memory: databases are filled with the SQLite backup API;
+  - file databases are copied, as a copy-on-write clone on filesystems
+    that support it (see db.clone_file).
+
+An image is keyed by a hash of what decides its content: the seed modules
+(every src/database/seed_*.py, some of which the orchestrator imports by
+name at run time), the project modules they import, and the schema
+scripts.  Changing any of them makes the next clone rebuild the image.
+Package __init__ files are not followed.  Row timestamps (collected_at,
+created_at, ...) are those of the seeding run that built the image.
+
+Environment:
+    BLM_SEED_IMAGE=0        always seed from scratch
+    BLM_SEED_IMAGE_DIR      image directory (default data/seed_images)
+
+Usage:
+    from src.database.seed_image import seeded_database
+
+    db = seeded_database("all_markets")                 # :memory:
+    db = seeded_database("all_markets", "/tmp/group.db")
+"""
+
+import hashlib
+import importlib
+import os
+import re
+import sqlite3
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from src.database.db import TelecomDatabase
+
+# Bump when the way images are built changes
+SEED_IMAGE_FORMAT = 1
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+_DATABASE_DIR = Path(__file__).resolve().parent
+
+DEFAULT_IMAGE_DIR = _PROJECT_ROOT / "data" / "seed_images"
+
+# Schema scripts run by TelecomDatabase.init() and the orchestrator
+SCHEMA_FILES = [_DATABASE_DIR / "schema.sql", _DATABASE_DIR / "supabase_schema_v3.sql"]
+
+# Seeders with an image: name -> "module:function(db_path) -> TelecomDatabase"
+SEEDERS = {
+    "all_markets": "src.database.seed_orchestrator:seed_all_markets",
+    "germany": "src.database.seed_germany:seed_all",
+}
+
+
+def seeded_database(name: str = "all_markets", db_path: str = ":memory:") -> TelecomDatabase:
+    """Database ``db_path`` seeded by seeder ``name``, cloned from its image.
+
+    Seeds from scratch when images are disabled, or when ``db_path``
+    already exists (the seeders then add to what is there).
+    """
+    image = seed_image(name)
+    if (os.getenv("BLM_SEED_IMAGE", "1") == "0"
+            or (db_path != ":memory:" and Path(db_path).exists())):
+        return image.seed(db_path)
+    return image.clone(db_path)
+
+
+def seed_image(name: str, image_dir: Optional[str] = None) -> "SeedImage":
+    """SeedImage of seeder ``name`` (see SEEDERS).
+
+    ``image_dir`` defaults to BLM_SEED_IMAGE_DIR, then data/seed_images.
+    """
+    if name not in SEEDERS:
+        raise ValueError(f"Unknown seeder: {name} (available: {', '.join(SEEDERS)})")
+    module_name, function = SEEDERS[name].split(":")
+    module = importlib.import_module(module_name)
+    return SeedImage(
+        name, getattr(module, function),
+        sources=[Path(module.__file__)] + seed_sources(),
+        image_dir=image_dir or os.getenv("BLM_SEED_IMAGE_DIR") or None,
+    )
+
+
+def seed_sources() -> list:
+    """Every seed module and the schema scripts."""
+    return sorted(_DATABASE_DIR.glob("seed_*.py")) + SCHEMA_FILES
+
+
+def source_closure(paths: Iterable) -> list:
+    """``paths`` plus every project module their imports reach, sorted."""
+    seen = set()
+    pending = [Path(p).resolve() for p in paths]
+    while pending:
+        path = pending.pop()
+        if path not in seen:
+            seen.add(path)
+            pending.extend(_scan(path)[1])
+    return sorted(seen)
+
+
+# path -> (mtime_ns, size, content digest, imported project files)
+_scanned: dict = {}
+
+
+def _scan(path: Path) -> tuple:
+    """Content digest and imported project files of ``path``, memoized on its stat."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return b"missing", []
+    hit = _scanned.get(path)
+    if hit is not None and hit[:2] == (stat.st_mtime_ns, stat.st_size):
+        return hit[2:]
+    data = path.read_bytes()
+    imports = _imported_files(data.decode("utf-8", errors="replace")) if path.suffix == ".py" else []
+    digest = hashlib.blake2b(data, digest_size=16).digest()
+    _scanned[path] = (stat.st_mtime_ns, stat.st_size, digest, imports)
+    return digest, imports
+
+
+# "from src.x import a, b" / "import src.x" statements, lazy ones included.
+# A scan rather than a parse: the seed data modules are large, and a match
+# inside a string only adds a file to the key.
+_IMPORT = re.compile(
+    r"^[ \t]*(?:from[ \t]+(src[\w.]*)[ \t]+import[ \t]+(\([^)]*\)|[^\n]*)"
+    r"|import[ \t]+(src[^\n]*))",
+    re.MULTILINE,
+)
+
+
+def _imported_files(text: str) -> list:
+    """Project module files imported anywhere in source ``text``."""
+    names = []
+    for module, imported, plain in _IMPORT.findall(text):
+        if module:
+            names.append(module)
+            # "from src.database import seed_chile" imports a module too
+            for item in re.sub(r"#[^\n]*", "", imported).strip("()").split(","):
+                if item.split():
+                    names.append(f"{module}.{item.split()[0]}")
+        else:
+            names.extend(item.split()[0] for item in plain.split(",") if item.split())
+
+    files = []
+    for name in names:
+        parts = name.split(".")
+        if parts[0] == "src" and all(part.isidentifier() for part in parts):
+            module_file = _PROJECT_ROOT.joinpath(*parts).with_suffix(".py")
+            if module_file.is_file():
+                files.append(module_file)
+    return files
+
+
+class SeedImage:
+    """A seeder's database, built once per source version and cloned.
+
+    Args:
+        name: Image name, the prefix of its file name.
+        seed: Seeder; called with a database path, returns the seeded
+            TelecomDatabase.
+        sources: Files that, with the project modules they import, decide
+            the seeded content.
+        image_dir: Directory of the image files.
+    """
+
+    def __init__(self, name: str, seed: Callable[[str], TelecomDatabase],
+                 sources: Iterable, image_dir: Optional[str] = None):
+        self.name = name
+        self.seed = seed
+        self.sources = list(sources)
+        self.image_dir = Path(image_dir) if image_dir else DEFAULT_IMAGE_DIR
+        self.builds = 0
+
+    def key(self) -> str:
+        """Hash of the image's sources."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{SEED_IMAGE_FORMAT}|{self.name}".encode())
+        for path in source_closure(self.sources):
+            name = path.relative_to(_PROJECT_ROOT) if path.is_relative_to(_PROJECT_ROOT) else path
+            digest.update(f"\0{name.as_posix()}\0".encode())
+            digest.update(_scan(path)[0])
+        return digest.hexdigest()
+
+    def path(self) -> Path:
+        """Image file of the current sources (built or not)."""
+        return self.image_dir / f"{self.name}-{self.key()}.db"
+
+    def ensure(self) -> Path:
+        """Image file of the current sources, built if missing."""
+        path = self.path()
+        if not path.exists():
+            self.build(path)
+        return path
+
+    def build(self, path: Path) -> None:
+        """Run the seeder into image file ``path``; remove older images."""
+        self.image_dir.mkdir(parents=True, exist_ok=True)
+        staging = path.with_name(f"{path.name}.tmp{os.getpid()}")
+        _remove_database(staging)
+        try:
+            # Seeding commits row by row: much faster in memory
+            db = self.seed(":memory:")
+            try:
+                target = sqlite3.connect(str(staging))
+                try:
+                    db.conn.backup(target)
+                finally:
+                    target.close()
+            finally:
+                db.close()
+            os.replace(staging, path)
+        finally:
+            _remove_database(staging)
+        self.builds += 1
+        for old in self.image_dir.glob(f"{self.name}-*.db"):
+            if old != path and len(old.stem) == len(path.stem):
+                _remove_database(old)
+
+    def clone(self, db_path: str = ":memory:") -> TelecomDatabase:
+        """New TelecomDatabase at ``db_path`` (which must not exist) with the seeded data."""
+        return TelecomDatabase(db_path).init_from_image(str(self.ensure()))
+
+
+def _remove_database(path: Path) -> None:
+    for file in (path, Path(f"{path}-wal"), Path(f"{path}-shm"), Path(f"{path}-journal")):
+        file.unlink(missing_ok=True)
@@ -4,10 +4,30 @@ Used by cli_group_local.py and cli_push_all.py to prepare a complete
 local database with Germany, Chile, 10 LATAM Millicom markets,
 Netherlands, Belgium, France, Italy, Poland, Switzerland, Ireland,
 Ukraine, Cyprus, and Malta.
+
+Callers go through seed_image.seeded_database("all_markets"), which runs
+seed_all_markets() once per version of the seed modules and clones the
+result.
+
+With several workers (opt-in), each market is seeded into its own SQLite shard in
+a worker process.  The shards are merged into the target database with
+ATTACH and INSERT ... SELECT, in the serial seeding order and with the ids
+serial seeding would assign, so the result is the same either way.  The
+Millicom group step reads the merged LATAM operators and runs in the
+calling process, between the LATAM and European merges.
+
+Environment:
+    BLM_SEED_WORKERS        worker processes (default: 1, serial)
 """
 
+import contextlib
+import io
+import os
+import sqlite3
 import sys
+import tempfile
 from pathlib import Path
+from typing import Optional
 
 _project_root = Path(__file__).resolve().parent.parent.parent
 if str(_project_root) not in sys.path:
@@ -51,53 +71,213 @@ TIGO_OPERATORS = [
     ("tigo_uruguay", "uruguay"),
 ]
 
+# Seeding steps in order: one per market, plus the Millicom group
+# structure, which needs the LATAM operators
+SEED_STEPS = ["germany", "chile"] + LATAM_MARKETS + ["millicom"] + EUROPE_MARKETS
 
-def seed_all_markets(db_path: str = ":memory:") -> TelecomDatabase:
+
+def seed_all_markets(db_path: str = ":memory:",
+                     workers: Optional[int] = None) -> TelecomDatabase:
     """Seed all 22 markets into a single SQLite database.
 
     Args:
         db_path: Path to SQLite database. Use ":memory:" for in-memory.
+        workers: Worker processes seeding market shards (default
+            BLM_SEED_WORKERS, then 1: serial).  The pool is spawn-based:
+            scripts that ask for more need an ``if __name__ == "__main__":``
+            guard.
 
     Returns:
         Initialized TelecomDatabase with all market data.
     """
+    db = seed_steps(SEED_STEPS, db_path, workers)
+    print(f"\n{'='*60}")
+    print(f"  All 22 markets seeded successfully")
+    print(f"{'='*60}")
+    return db
+
+
+def seed_steps(steps: list, db_path: str = ":memory:",
+               workers: Optional[int] = None) -> TelecomDatabase:
+    """Run seeding ``steps`` (see SEED_STEPS) into one SQLite database.
+
+    Market steps are seeded into shards by ``workers`` processes and
+    merged in order; "millicom" runs in this process once the shards
+    before it are merged.
+    """
+    if workers is None:
+        workers = int(os.getenv("BLM_SEED_WORKERS") or 1)
+    shard_steps = [step for step in steps if step != "millicom"]
+    workers = min(workers, len(shard_steps))
+
     db = TelecomDatabase(db_path)
     db.init()
 
     # Apply v3 schema (operator_groups, group_subsidiaries, analysis_jobs)
     _apply_v3_schema(db)
 
-    # 1. Seed Germany (uses its own seed_all pattern)
-    print("\n[1/23] Seeding Germany...")
-    from src.database.seed_germany import seed_all as seed_germany
-    # seed_germany creates its own db, but we can call the individual steps
-    # Instead, we re-use the db by calling the step functions directly
-    _seed_germany_into(db)
+    if workers <= 1:
+        for i, step in enumerate(steps, 1):
+            print(f"\n[{i}/{len(steps)}] Seeding {_step_label(step)}...")
+            _seed_step(db, step)
+    else:
+        _seed_sharded(db, steps, shard_steps, workers)
 
-    # 2. Seed Chile (uses its own seed_all pattern)
-    print("\n[2/23] Seeding Chile...")
-    _seed_chile_into(db)
+    db.analyze()
+    return db
 
-    # 3-12. Seed 10 LATAM markets via shared helper
-    for i, market_id in enumerate(LATAM_MARKETS, 3):
-        print(f"\n[{i}/23] Seeding {market_id}...")
-        _seed_latam_market(db, market_id)
 
-    # 13. Seed Millicom group structure
-    print("\n[13/23] Seeding Millicom group structure...")
-    from src.database.seed_millicom import seed_all_millicom
-    seed_all_millicom(db)
+def _step_label(step: str) -> str:
+    if step == "millicom":
+        return "Millicom group structure"
+    if step in ("germany", "chile"):
+        return step.title()
+    return step
 
-    # 14-23. Seed European markets
-    for i, market_id in enumerate(EUROPE_MARKETS, 14):
-        print(f"\n[{i}/23] Seeding {market_id}...")
-        _seed_europe_market(db, market_id)
 
-    print(f"\n{'='*60}")
-    print(f"  All 22 markets seeded successfully")
-    print(f"{'='*60}")
+def _seed_step(db: TelecomDatabase, step: str):
+    """Run one seeding step into ``db``."""
+    if step == "germany":
+        # seed_germany.seed_all creates its own db; call its steps instead
+        _seed_germany_into(db)
+    elif step == "chile":
+        _seed_chile_into(db)
+    elif step == "millicom":
+        from src.database.seed_millicom import seed_all_millicom
+        seed_all_millicom(db)
+    elif step in LATAM_MARKETS:
+        _seed_latam_market(db, step)
+    elif step in EUROPE_MARKETS:
+        _seed_europe_market(db, step)
+    else:
+        raise ValueError(f"Unknown seeding step: {step}")
 
-    return db
+
+# =============================================================================
+# Sharded seeding
+# =============================================================================
+
+def _seed_sharded(db: TelecomDatabase, steps: list, shard_steps: list, workers: int):
+    """Seed market shards in worker processes, merging them in step order."""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    with tempfile.TemporaryDirectory(prefix="blm_seed_") as shard_dir:
+        # Spawn: safe whatever threads the caller has running
+        pool = ProcessPoolExecutor(max_workers=workers,
+                                   mp_context=multiprocessing.get_context("spawn"))
+        try:
+            futures = {
+                step: pool.submit(_seed_shard, step, os.path.join(shard_dir, f"{step}.db"))
+                for step in shard_steps
+            }
+            for i, step in enumerate(steps, 1):
+                print(f"\n[{i}/{len(steps)}] Seeding {_step_label(step)}...")
+                if step not in futures:
+                    _seed_step(db, step)
+                    continue
+                shard_path, log = futures[step].result()
+                print(log, end="")
+                merge_shard(db, shard_path)
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+
+def _seed_shard(step: str, shard_path: str) -> tuple:
+    """Seed one market into shard file ``shard_path``; returns (path, log).
+
+    Runs in a worker process.  Seeding commits row by row, so the shard is
+    seeded in memory and then written out in one go.
+    """
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        db = TelecomDatabase(":memory:")
+        db.init()
+        try:
+            _apply_v3_schema(db)
+            _seed_step(db, step)
+            db.conn.commit()
+            target = sqlite3.connect(shard_path)
+            try:
+                db.conn.backup(target)
+            finally:
+                target.close()
+        finally:
+            db.close()
+    return shard_path, log.getvalue()
+
+
+def merge_shard(db: TelecomDatabase, shard_path: str):
+    """Append the rows of shard database ``shard_path`` to ``db``.
+
+    Rows are copied table by table in the shard's insertion order.
+    AUTOINCREMENT ids are shifted past the ids already used in ``db``, as
+    if the shard had been seeded into ``db`` directly.  Change versions of
+    scopes present in both are added up.  Full-text indexes are filled by
+    ``db``'s own triggers.
+    """
+    conn = db.conn
+    conn.commit()
+    conn.execute("ATTACH DATABASE ? AS shard", [shard_path])
+    try:
+        # Checked at commit: the shard's tables need not come in FK order
+        conn.execute("PRAGMA defer_foreign_keys = ON")
+        for table in _shard_tables(conn):
+            _merge_table(conn, table)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.execute("DETACH DATABASE shard")
+
+
+def _shard_tables(conn) -> list:
+    """Data tables of the attached shard that also exist in main, in creation order."""
+    schema = conn.execute(
+        "SELECT name, sql FROM shard.sqlite_master WHERE type = 'table' "
+        "AND name NOT LIKE 'sqlite_%' ORDER BY rowid").fetchall()
+    virtual = [name for name, sql in schema
+               if (sql or "").upper().startswith("CREATE VIRTUAL TABLE")]
+    main_tables = {name for (name,) in conn.execute(
+        "SELECT name FROM main.sqlite_master WHERE type = 'table'")}
+    return [
+        name for name, _ in schema
+        if name in main_tables and name not in virtual
+        and not any(name.startswith(f"{v}_") for v in virtual)  # FTS shadow tables
+    ]
+
+
+def _merge_table(conn, table: str):
+    if conn.execute(f"SELECT 1 FROM shard.{table} LIMIT 1").fetchone() is None:
+        return
+    info = conn.execute(f"PRAGMA shard.table_info({table})").fetchall()
+    main_columns = {row[1] for row in conn.execute(f"PRAGMA main.table_info({table})")}
+    columns = [row[1] for row in info if row[1] in main_columns]
+    keys = [row for row in info if row[5]]
+    # Single INTEGER PRIMARY KEY: the rowid, shifted past main's ids
+    id_column = keys[0][1] if len(keys) == 1 and keys[0][2].upper() == "INTEGER" else None
+    offset = 0
+    if id_column:
+        row = conn.execute("SELECT seq FROM main.sqlite_sequence WHERE name = ?", [table]).fetchone()
+        offset = row[0] if row else conn.execute(
+            f"SELECT COALESCE(MAX({id_column}), 0) FROM main.{table}").fetchone()[0]
+
+    column_list = ", ".join(columns)
+    select_list = ", ".join(f"{c} + {offset}" if c == id_column else c for c in columns)
+    sql = (f"INSERT INTO main.{table} ({column_list}) "
+           f"SELECT {select_list} FROM shard.{table} WHERE true ORDER BY rowid")
+    if table == "data_changes":
+        sql += (" ON CONFLICT(table_name, scope) DO UPDATE SET"
+                " version = version + excluded.version, changed_at = excluded.changed_at")
+    conn.execute(sql)
+
+    if id_column:
+        # Ids the shard used up (deleted rows) stay used, as in serial seeding
+        row = conn.execute("SELECT seq FROM shard.sqlite_sequence WHERE name = ?", [table]).fetchone()
+        if row:
+            conn.execute("UPDATE main.sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?",
+                         [row[0] + offset, table])
 
 
 def _apply_v3_schema(db: TelecomDatabase):
@@ -0,0 +1,16 @@
+-- Analysis job checkpoints (resumable group jobs)
+-- Apply after supabase_schema_v4_feedback.sql
+
+CREATE TABLE IF NOT EXISTS analysis_job_checkpoints (
+    id BIGSERIAL PRIMARY KEY,
+    analysis_job_id INTEGER NOT NULL,
+    market TEXT NOT NULL,
+    operator_id TEXT,
+    analysis_period TEXT,
+    result_snapshot TEXT,
+    outputs TEXT DEFAULT '[]',
+    completed_at TIMESTAMPTZ DEFAULT NOW(),
+    UNIQUE(analysis_job_id, market)
+);
+
+CREATE INDEX IF NOT EXISTS idx_checkpoint_job ON analysis_job_checkpoints(analysis_job_id);
@@ -0,0 +1,9 @@
+-- Analysis job queue leases (python -m src.worker)
+-- Apply after supabase_schema_v5_checkpoints.sql
+
+ALTER TABLE analysis_jobs ADD COLUMN IF NOT EXISTS lease_owner TEXT;
+ALTER TABLE analysis_jobs ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ;
+ALTER TABLE analysis_jobs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMPTZ;
+ALTER TABLE analysis_jobs ADD COLUMN IF NOT EXISTS attempts INTEGER DEFAULT 0;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_lease ON analysis_jobs(status, lease_expires_at);
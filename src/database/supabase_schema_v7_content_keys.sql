@@ -0,0 +1,22 @@
+-- Content keys for the tables without a natural key (src/database/supabase_sync.py)
+-- Apply after supabase_schema_v6_job_queue.sql
+--
+-- BLMCloudSync upserts these tables on content_key, a hash of each row's
+-- identifying columns, so pushing the same rows again updates them instead
+-- of adding copies.  Rows inserted before this migration have no key and
+-- are never matched: delete them before the next push to avoid duplicates.
+
+ALTER TABLE intelligence_events ADD COLUMN IF NOT EXISTS content_key TEXT;
+ALTER TABLE earnings_call_highlights ADD COLUMN IF NOT EXISTS content_key TEXT;
+ALTER TABLE data_provenance ADD COLUMN IF NOT EXISTS content_key TEXT;
+
+-- Columns of the local data_provenance table that are part of its key
+ALTER TABLE data_provenance ADD COLUMN IF NOT EXISTS analysis_job_id BIGINT;
+ALTER TABLE data_provenance ADD COLUMN IF NOT EXISTS operator_id TEXT;
+ALTER TABLE data_provenance ADD COLUMN IF NOT EXISTS period TEXT;
+ALTER TABLE data_provenance ADD COLUMN IF NOT EXISTS value_text TEXT;
+ALTER TABLE data_provenance ADD COLUMN IF NOT EXISTS unit TEXT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_events_content_key ON intelligence_events(content_key);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_earnings_content_key ON earnings_call_highlights(content_key);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_provenance_content_key ON data_provenance(content_key);
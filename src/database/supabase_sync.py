@@ -2,17 +2,29 @@
 
 Usage:
     python3 -m src.database.supabase_sync init
-    python3 -m src.database.supabase_sync push --market germany
+    python3 -m src.database.supabase_sync push --market germany [--full]
     python3 -m src.database.supabase_sync pull --market germany
     python3 -m src.database.supabase_sync sync --market germany
     python3 -m src.database.supabase_sync push-outputs --market germany --operator vodafone_germany --period CQ4_2025
     python3 -m src.database.supabase_sync status
+
+Pushes send only the rows that are new or changed since the last successful
+push to the same Supabase project.  PushState keeps a hash of every pushed
+row in data/push_state.db (BLM_PUSH_STATE_DB overrides the path); --full
+sends every row regardless, e.g. after cloud tables were emptied.  Rows go
+out in chunks of PUSH_CHUNK_ROWS, PUSH_WORKERS requests at a time, each
+retried with exponential backoff.  Tables without a natural key are upserted
+on a content_key column (supabase_schema_v7_content_keys.sql).
 """
 
 import argparse
+import hashlib
 import json
 import os
+import sqlite3
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -25,7 +37,17 @@ from src.models.market_configs import get_market_config
 # Storage bucket name
 BUCKET = "blm-outputs"
 
-# Tables with their conflict columns and market filter column
+# Push: rows per upsert request, concurrent requests, attempts per request
+PUSH_CHUNK_ROWS = 500
+PUSH_WORKERS = 4
+PUSH_ATTEMPTS = 3
+PUSH_RETRY_DELAY = 1.0  # seconds, doubled after each failed attempt
+
+DEFAULT_PUSH_STATE_DB = Path(__file__).resolve().parent.parent.parent / "data" / "push_state.db"
+
+# Tables with their conflict columns and market filter column.  Tables
+# without conflict columns are upserted on content_key, a hash of the
+# "content_key" columns.
 TABLE_CONFIG = {
     "operators": {
         "conflict": "operator_id",
@@ -52,7 +74,8 @@ TABLE_CONFIG = {
         "market_col": "_operator",
     },
     "intelligence_events": {
-        "conflict": None,  # no unique constraint, use id
+        "conflict": None,  # no natural key
+        "content_key": ["operator_id", "market", "event_date", "category", "title"],
         "market_col": "market",
     },
     "executives": {
@@ -64,7 +87,8 @@ TABLE_CONFIG = {
         "market_col": "country",
     },
     "earnings_call_highlights": {
-        "conflict": None,  # no unique constraint
+        "conflict": None,  # no natural key
+        "content_key": ["operator_id", "calendar_quarter", "speaker", "content"],
         "market_col": "_operator",
     },
     "source_registry": {
@@ -73,6 +97,8 @@ TABLE_CONFIG = {
     },
     "data_provenance": {
         "conflict": None,
+        "content_key": ["entity_type", "entity_id", "field_name", "source_id",
+                        "operator_id", "period", "analysis_job_id", "value_text", "unit"],
         "market_col": None,
     },
     "operator_groups": {
@@ -104,6 +130,7 @@ class SyncReport:
     direction: str  # "push" / "pull" / "sync"
     market: str
     tables: dict = field(default_factory=dict)  # table_name → row_count
+    unchanged: dict = field(default_factory=dict)  # table_name → rows not re-pushed
     files: dict = field(default_factory=dict)   # file_name → size_bytes
     errors: list = field(default_factory=list)
     started_at: str = ""
@@ -116,7 +143,10 @@ class SyncReport:
         total_rows = sum(self.tables.values())
         lines.append(f"  Tables: {len(self.tables)}, Total rows: {total_rows}")
         for t, n in sorted(self.tables.items()):
-            lines.append(f"    {t}: {n} rows")
+            if self.unchanged.get(t):
+                lines.append(f"    {t}: {n} rows ({self.unchanged[t]} unchanged)")
+            else:
+                lines.append(f"    {t}: {n} rows")
         if self.files:
             lines.append(f"  Files: {len(self.files)}")
             for f, s in sorted(self.files.items()):
@@ -129,51 +159,142 @@ class SyncReport:
         return "\n".join(lines)
 
 
+def content_key(table: str, row: dict) -> str:
+    """Identity of a row of a table without conflict columns (see TABLE_CONFIG)."""
+    return _digest([row.get(c) for c in TABLE_CONFIG[table]["content_key"]])
+
+
+def row_hash(row: dict) -> str:
+    """Hash of a cleaned row, to tell whether it changed since its last push.
+
+    The *_at bookkeeping columns (collected_at, created_at, ...) are left
+    out: they default to CURRENT_TIMESTAMP, so re-seeding the same data
+    would otherwise change every row.  They are still pushed.
+    """
+    return _digest({k: v for k, v in row.items() if not k.endswith("_at")})
+
+
+def _digest(value) -> str:
+    text = json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+class PushState:
+    """Hashes of the rows last pushed to each Supabase project.
+
+    Kept apart from the local database, which cli_push_all seeds afresh on
+    every run.  ``path`` defaults to BLM_PUSH_STATE_DB, then
+    data/push_state.db; the file is only created by the first push.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = str(path or os.getenv("BLM_PUSH_STATE_DB") or DEFAULT_PUSH_STATE_DB)
+        self._conn = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS pushed_rows (
+                    target TEXT NOT NULL,
+                    table_name TEXT NOT NULL,
+                    row_key TEXT NOT NULL,
+                    row_hash TEXT NOT NULL,
+                    PRIMARY KEY (target, table_name, row_key)
+                ) WITHOUT ROWID
+            """)
+        return self._conn
+
+    def hashes(self, target: str, table: str) -> dict:
+        """row key → hash of the rows of ``table`` pushed to ``target``."""
+        rows = self._db().execute(
+            "SELECT row_key, row_hash FROM pushed_rows WHERE target = ? AND table_name = ?",
+            [target, table])
+        return dict(rows.fetchall())
+
+    def record(self, target: str, table: str, hashes: dict) -> None:
+        """Remember rows (row key → hash) as pushed to ``target``."""
+        with self._db() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO pushed_rows VALUES (?, ?, ?, ?)",
+                [(target, table, key, h) for key, h in hashes.items()])
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
 class BLMCloudSync:
-    """Bidirectional sync between local SQLite and Supabase cloud."""
+    """Bidirectional sync between local SQLite and Supabase cloud.
+
+    Args:
+        local_db: Local database (default TelecomDatabase()).
+        cloud: Supabase client (default BLMSupabaseClient()).
+        push_state: Hashes of pushed rows (default PushState()).
+        chunk_rows: Rows per upsert request.
+        workers: Concurrent upsert requests.
+        attempts: Attempts per request before its chunk is given up.
+        retry_delay: Seconds before the first retry, doubled after each.
+    """
 
     def __init__(self, local_db: TelecomDatabase = None,
-                 cloud: BLMSupabaseClient = None):
+                 cloud: BLMSupabaseClient = None,
+                 push_state: PushState = None,
+                 chunk_rows: int = PUSH_CHUNK_ROWS,
+                 workers: int = PUSH_WORKERS,
+                 attempts: int = PUSH_ATTEMPTS,
+                 retry_delay: float = PUSH_RETRY_DELAY):
         self.local = local_db or TelecomDatabase()
         self.cloud = cloud or BLMSupabaseClient()
-        self._operator_cache: dict[str, list[str]] = {}
+        self.push_state = push_state or PushState()
+        self.chunk_rows = max(1, chunk_rows)
+        self.workers = max(1, workers)
+        self.attempts = max(1, attempts)
+        self.retry_delay = retry_delay
 
     def _ensure_local(self):
         if self.local.conn is None:
             self.local.init()
 
-    def _get_market_operators(self, market: str) -> list[str]:
-        """Get operator_ids for a market (cached)."""
-        if market not in self._operator_cache:
-            self._ensure_local()
-            ops = self.local.get_operators_in_market(market)
-            self._operator_cache[market] = [o["operator_id"] for o in ops]
-        return self._operator_cache[market]
-
-    def _read_local_table(self, table: str) -> list[dict]:
-        """Read all rows from a local SQLite table."""
+    def _read_local_table(self, table: str, market: str = None) -> list[dict]:
+        """Read the rows of a local SQLite table, only a market's if given."""
         self._ensure_local()
-        rows = self.local.conn.execute(f"SELECT * FROM {table}").fetchall()
+        where, params = self._market_filter(table, market) if market else ("", [])
+        if where is None:
+            return []
+        rows = self.local.conn.execute(f"SELECT * FROM {table}{where}", params).fetchall()
         return [dict(r) for r in rows]
 
-    def _filter_by_market(self, rows: list[dict], table: str,
-                          market: str) -> list[dict]:
-        """Filter rows by market."""
-        cfg = TABLE_CONFIG.get(table, {})
-        market_col = cfg.get("market_col")
+    def _market_filter(self, table: str, market: str) -> tuple:
+        """WHERE clause and parameters selecting a market's rows of ``table``.
+
+        The clause is "" for tables without a market column, None if no
+        row can match.
+        """
+        market_col = TABLE_CONFIG.get(table, {}).get("market_col")
         if not market_col:
-            return rows  # no filter possible
+            return "", []  # no filter possible
 
         if market_col == "_operator":
-            op_ids = self._get_market_operators(market)
-            return [r for r in rows if r.get("operator_id") in op_ids]
+            return (" WHERE operator_id IN (SELECT operator_id FROM operators"
+                    " WHERE market = ? AND is_active = 1)", [market])
         elif market_col == "country":
-            # Map market_id to country name via operator directory
-            country = self._market_to_country(market)
-            return [r for r in rows
-                    if r.get("country", "").lower() == country.lower()]
+            # Country display names match case-insensitively (Unicode-aware,
+            # unlike SQLite's lower())
+            country = self._market_to_country(market).lower()
+            countries = [
+                c for (c,) in self.local.conn.execute(
+                    f"SELECT DISTINCT country FROM {table} WHERE country IS NOT NULL")
+                if c.lower() == country
+            ]
+            if not countries:
+                return None, []
+            return f" WHERE country IN ({', '.join('?' * len(countries))})", countries
         else:
-            return [r for r in rows if r.get(market_col) == market]
+            return f" WHERE {market_col} = ?", [market]
 
     @staticmethod
     def _market_to_country(market: str) -> str:
@@ -219,34 +340,87 @@ class BLMCloudSync:
     # Push (local → cloud)
     # =========================================================================
 
-    def push_table(self, table: str, market: str = None) -> int:
+    def push_table(self, table: str, market: str = None, full: bool = False) -> int:
         """Push a single table from local SQLite to Supabase.
 
+        Only rows new or changed since their last push to this Supabase
+        project are sent, unless ``full``.
+
         Returns number of rows pushed.
+
+        Raises:
+            RuntimeError: If chunks failed on every attempt.  The other
+                chunks are pushed and recorded, so pushing again sends
+                only the failed rows.
         """
-        rows = self._read_local_table(table)
-        if market:
-            rows = self._filter_by_market(rows, table, market)
+        return self._push_table(table, market, full)[0]
+
+    def _push_target(self) -> str:
+        """PushState key of the Supabase project."""
+        return getattr(self.cloud, "url", None) or "default"
+
+    def _push_table(self, table: str, market: str, full: bool) -> tuple:
+        """Push a table; returns (rows pushed, rows unchanged)."""
+        rows = self._read_local_table(table, market)
         if not rows:
-            return 0
+            return 0, 0
 
-        cleaned = [self._clean_row_for_push(r, table) for r in rows]
         cfg = TABLE_CONFIG.get(table, {})
-        conflict = cfg.get("conflict")
-
-        if conflict:
-            return self.cloud.upsert(table, cleaned, on_conflict=conflict)
-        else:
-            # No conflict key — insert one by one, skip duplicates
-            count = 0
-            for row in cleaned:
+        conflict = cfg.get("conflict") or "content_key"
+        key_columns = conflict.split(",")
+        pending = {}
+        for row in rows:
+            cleaned = self._clean_row_for_push(row, table)
+            if "content_key" in cfg:
+                cleaned["content_key"] = content_key(table, cleaned)
+            # One row per key: an upsert may not touch the same row twice
+            pending[_digest([cleaned.get(c) for c in key_columns])] = cleaned
+
+        hashes = {key: row_hash(row) for key, row in pending.items()}
+        target = self._push_target()
+        if not full:
+            pushed = self.push_state.hashes(target, table)
+            pending = {key: row for key, row in pending.items()
+                       if pushed.get(key) != hashes[key]}
+        unchanged = len(hashes) - len(pending)
+        if not pending:
+            return 0, unchanged
+
+        keys = list(pending)
+        chunks = [keys[i:i + self.chunk_rows] for i in range(0, len(keys), self.chunk_rows)]
+        count = 0
+        errors = []
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(chunks))) as pool:
+            futures = {
+                pool.submit(self._upsert_chunk, table, [pending[k] for k in chunk], conflict): chunk
+                for chunk in chunks
+            }
+            for future in as_completed(futures):
+                chunk = futures[future]
                 try:
-                    self.cloud.client.table(table).insert(row).execute()
-                    count += 1
-                except Exception:
-                    # Likely duplicate, skip
-                    count += 1
-            return count
+                    count += future.result()
+                except Exception as e:
+                    errors.append(e)
+                    continue
+                self.push_state.record(target, table, {k: hashes[k] for k in chunk})
+
+        if errors:
+            raise RuntimeError(f"{len(errors)} of {len(chunks)} chunks failed: {errors[0]}")
+        return count, unchanged
+
+    def _upsert_chunk(self, table: str, rows: list[dict], on_conflict: str) -> int:
+        """Upsert one chunk, retrying with exponential backoff."""
+        delay = self.retry_delay
+        for attempt in range(1, self.attempts + 1):
+            try:
+                return self.cloud.upsert(table, rows, on_conflict=on_conflict)
+            except Exception as e:
+                if attempt == self.attempts:
+                    raise
+                print(f"  [!] {table}: upsert of {len(rows)} rows failed ({e}), "
+                      f"retrying in {delay:g}s")
+                time.sleep(delay)
+                delay *= 2
 
     def push_market_config(self, market_id: str) -> None:
         """Push a MarketConfig to the cloud market_configs table."""
@@ -268,8 +442,11 @@ class BLMCloudSync:
         }
         self.cloud.upsert("market_configs", [row], on_conflict="market_id")
 
-    def push_all(self, market: str) -> SyncReport:
-        """Push all tables for a market from local → cloud."""
+    def push_all(self, market: str, full: bool = False) -> SyncReport:
+        """Push all tables for a market from local → cloud.
+
+        Only changed rows are sent, unless ``full`` (see push_table).
+        """
         report = SyncReport(direction="push", market=market,
                             started_at=datetime.utcnow().isoformat())
 
@@ -280,9 +457,13 @@ class BLMCloudSync:
 
         for table in ordered_tables:
             try:
-                n = self.push_table(table, market)
+                n, unchanged = self._push_table(table, market, full)
                 report.tables[table] = n
-                print(f"  ✓ {table}: {n} rows pushed")
+                if unchanged:
+                    report.unchanged[table] = unchanged
+                    print(f"  ✓ {table}: {n} rows pushed, {unchanged} unchanged")
+                else:
+                    print(f"  ✓ {table}: {n} rows pushed")
             except Exception as e:
                 report.errors.append(f"{table}: {e}")
                 print(f"  ✗ {table}: {e}")
@@ -483,10 +664,20 @@ class BLMCloudSync:
         local_cols = {row[1] for row in cursor.fetchall()}
 
         count = 0
+        scopes = set()
+        writes = []
         for row in rows:
             # Filter to only columns that exist locally
             filtered = {k: v for k, v in row.items() if k in local_cols}
 
+            # Change-tracking scope (see TelecomDatabase.get_change_versions)
+            if table == "macro_environment":
+                scopes.add(filtered.get("country"))
+            elif table == "intelligence_events":
+                scopes.add(filtered.get("market") or filtered.get("operator_id"))
+            else:
+                scopes.add(filtered.get("operator_id"))
+
             # Convert JSONB back to JSON strings for SQLite
             for json_col in ("technology_mix", "quality_scores"):
                 if json_col in filtered and isinstance(filtered[json_col], (dict, list)):
@@ -518,10 +709,13 @@ class BLMCloudSync:
             else:
                 sql = f"INSERT OR IGNORE INTO {table} ({columns}) VALUES ({placeholders})"
 
-            self.local.conn.execute(sql, list(filtered.values()))
+            writes.append((sql, list(filtered.values())))
             count += 1
 
-        self.local.conn.commit()
+        with self.local.writer() as conn:
+            for sql, params in writes:
+                conn.execute(sql, params)
+            self.local.mark_changed(table, scopes)
         return count
 
     def pull_market_config(self, market_id: str) -> MarketConfig:
@@ -680,6 +874,8 @@ def main():
     # push
     p_push = sub.add_parser("push", help="Push local data → cloud")
     p_push.add_argument("--market", required=True, help="Market ID (e.g., germany)")
+    p_push.add_argument("--full", action="store_true",
+                        help="Push every row, not only those changed since the last push")
 
     # pull
     p_pull = sub.add_parser("pull", help="Pull cloud data → local")
@@ -722,7 +918,7 @@ def main():
     try:
         if args.command == "push":
             print(f"Pushing {args.market} data to cloud...")
-            report = syncer.push_all(args.market)
+            report = syncer.push_all(args.market, full=args.full)
             print()
             print(report.summary())
 
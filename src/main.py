@@ -9,14 +9,17 @@ Usage:
 
 import sys
 from pathlib import Path
+from typing import Optional
 
 import click
 import pandas as pd
 
 from src.config import Config
 from src.data.loader import DataLoader, FinancialDataPreprocessor
+from src.data.parse_cache import ParseCache, default_parse_cache
 from src.data.export import DataExporter
 from src.analysis.financial import BudgetAnalyzer
+from src.analysis.streaming import StreamingBudgetAnalyzer
 from src.visualization.charts import FinancialChartGenerator
 from src.reports.generator import ReportGenerator
 from src.blm._legacy.cli import blm_cli
@@ -25,8 +28,16 @@ from src.blm._legacy.cli import blm_cli
 @click.group()
 @click.version_option(version="0.1.0", prog_name="blm-analyze")
 @click.option("--config", "config_path", default=None, type=click.Path(), help="Path to YAML config file.")
+@click.option(
+    "--no-parse-cache", is_flag=True,
+    help="Re-parse input files instead of reusing their cached preprocessed columns.",
+)
+@click.option(
+    "--workers", default=1, type=click.IntRange(min=1),
+    help="Processes for extracting tables from large PDFs (default 1: serial).",
+)
 @click.pass_context
-def cli(ctx, config_path):
+def cli(ctx, config_path, no_parse_cache, workers):
     """BLM Financial Report Analysis Tool.
 
     Analyze Bureau of Land Management financial reports with
@@ -35,16 +46,32 @@ def cli(ctx, config_path):
     """
     ctx.ensure_object(dict)
     ctx.obj["config"] = Config(config_path)
+    ctx.obj["workers"] = workers
+    ctx.obj["parse_cache"] = None if no_parse_cache else default_parse_cache(workers)
 
 
-def _load_data(file: str) -> pd.DataFrame:
-    """Load and preprocess a data file."""
-    loader = DataLoader()
+def _load_data(file: str, cache: Optional[ParseCache] = None,
+               workers: int = 1) -> pd.DataFrame:
+    """Load and preprocess a data file, through the parse cache if given."""
+    if cache is not None:
+        return cache.load(file)
+    loader = DataLoader(max_workers=workers)
     preprocessor = FinancialDataPreprocessor()
     df = loader.load(file)
     return preprocessor.preprocess(df)
 
 
+def _streaming_analyzer(file: str, chunk_size: int, **columns) -> StreamingBudgetAnalyzer:
+    """StreamingBudgetAnalyzer reading and preprocessing ``file`` in chunks."""
+    loader = DataLoader()
+    preprocessor = FinancialDataPreprocessor()
+    analyzer = StreamingBudgetAnalyzer(
+        lambda: preprocessor.preprocess_chunks(loader.iter_chunks(file, chunk_size)),
+        **columns,
+    )
+    return analyzer.load()
+
+
 @cli.command()
 @click.argument("file", type=click.Path(exists=True))
 @click.option("--output-dir", "-o", default=None, help="Output directory for reports and charts.")
@@ -61,9 +88,15 @@ def _load_data(file: str) -> pd.DataFrame:
 @click.option("--date-col", default="date", help="Column name for dates.")
 @click.option("--year-col", default="fiscal_year", help="Column name for fiscal year.")
 @click.option("--state-col", default="state", help="Column name for state/region.")
+@click.option(
+    "--chunk-size", default=0, type=int,
+    help="Stream CSV/Parquet files in chunks of N rows, with memory bounded "
+         "by the number of groups. Medians and per-row variance details are "
+         "then omitted. 0 loads the file whole.",
+)
 @click.pass_context
 def analyze(ctx, file, output_dir, report_format, amount_col, budget_col,
-            actual_col, category_col, date_col, year_col, state_col):
+            actual_col, category_col, date_col, year_col, state_col, chunk_size):
     """Run full financial analysis on a data file.
 
     Performs summary statistics, budget variance analysis, trend analysis,
@@ -72,66 +105,34 @@ def analyze(ctx, file, output_dir, report_format, amount_col, budget_col,
     """
     config = ctx.obj["config"]
     click.echo(f"Loading data from: {file}")
+    freq = config.get("analysis", "trend_frequency", default="YE")
 
     try:
-        df = _load_data(file)
+        if chunk_size > 0:
+            analyzer = _streaming_analyzer(
+                file, chunk_size,
+                amount_col=amount_col, budget_col=budget_col, actual_col=actual_col,
+                category_col=category_col, date_col=date_col, year_col=year_col,
+                state_col=state_col, freq=freq,
+            )
+            columns, n_records = analyzer.columns, analyzer.n_records
+        else:
+            df = _load_data(file, ctx.obj.get("parse_cache"), ctx.obj.get("workers", 1))
+            analyzer = BudgetAnalyzer(df)
+            columns, n_records = list(df.columns), len(df)
     except Exception as e:
         click.echo(f"Error loading file: {e}", err=True)
         sys.exit(1)
 
-    click.echo(f"Loaded {len(df)} records with {len(df.columns)} columns.")
-    click.echo(f"Columns: {', '.join(df.columns)}")
-
-    analyzer = BudgetAnalyzer(df)
-    results = []
-
-    # Summary statistics
-    if amount_col in df.columns:
-        click.echo("Running summary statistics...")
-        result = analyzer.summary_statistics(amount_col=amount_col, group_col=category_col)
-        results.append(result)
-
-    # Budget variance
-    if budget_col in df.columns and actual_col in df.columns:
-        click.echo("Running budget variance analysis...")
-        result = analyzer.budget_variance(
-            budget_col=budget_col, actual_col=actual_col, category_col=category_col,
-        )
-        results.append(result)
-
-    # Trend analysis
-    if amount_col in df.columns and date_col in df.columns:
-        click.echo("Running trend analysis...")
-        freq = config.get("analysis", "trend_frequency", default="YE")
-        result = analyzer.trend_analysis(amount_col=amount_col, date_col=date_col, freq=freq)
-        results.append(result)
-
-    # Anomaly detection
-    if amount_col in df.columns:
-        click.echo("Running anomaly detection...")
-        threshold = config.get("analysis", "anomaly_threshold", default=2.0)
-        result = analyzer.detect_anomalies(amount_col=amount_col, threshold=threshold)
-        results.append(result)
-
-    # Category breakdown
-    if amount_col in df.columns and category_col in df.columns:
-        click.echo("Running category breakdown...")
-        result = analyzer.category_breakdown(amount_col=amount_col, category_col=category_col)
-        results.append(result)
-
-    # Year-over-year comparison
-    if amount_col in df.columns and year_col in df.columns:
-        click.echo("Running year-over-year analysis...")
-        result = analyzer.year_over_year(
-            amount_col=amount_col, year_col=year_col, category_col=category_col,
-        )
-        results.append(result)
+    click.echo(f"Loaded {n_records} records with {len(columns)} columns.")
+    click.echo(f"Columns: {', '.join(columns)}")
 
-    # State comparison
-    if amount_col in df.columns and state_col in df.columns:
-        click.echo("Running state comparison...")
-        result = analyzer.state_comparison(amount_col=amount_col, state_col=state_col)
-        results.append(result)
+    threshold = config.get("analysis", "anomaly_threshold", default=2.0)
+    results = analyzer.run_all(
+        amount_col=amount_col, budget_col=budget_col, actual_col=actual_col,
+        category_col=category_col, date_col=date_col, year_col=year_col,
+        state_col=state_col, freq=freq, threshold=threshold, progress=click.echo,
+    )
 
     if not results:
         click.echo("No analyses could be performed. Check column names.", err=True)
@@ -192,7 +193,7 @@ def analyze(ctx, file, output_dir, report_format, amount_col, budget_col,
 def summary(ctx, file, amount_col, group_col):
     """Print summary statistics for a financial data file."""
     try:
-        df = _load_data(file)
+        df = _load_data(file, ctx.obj.get("parse_cache"), ctx.obj.get("workers", 1))
     except Exception as e:
         click.echo(f"Error loading file: {e}", err=True)
         sys.exit(1)
@@ -228,7 +229,7 @@ def export(ctx, file, output_dir, fmt, amount_col, category_col, year_col, state
     click.echo(f"Loading data from: {file}")
 
     try:
-        df = _load_data(file)
+        df = _load_data(file, ctx.obj.get("parse_cache"), ctx.obj.get("workers", 1))
     except Exception as e:
         click.echo(f"Error loading file: {e}", err=True)
         sys.exit(1)
@@ -269,8 +270,13 @@ def export(ctx, file, output_dir, fmt, amount_col, category_col, year_col, state
 @cli.command("generate-sample")
 @click.option("--output", "-o", default="data/raw/sample_blm_data.csv", help="Output file path.")
 @click.option("--records", "-n", default=200, type=int, help="Number of records to generate.")
-def generate_sample(output, records):
-    """Generate sample BLM financial data for testing."""
+@click.pass_context
+def generate_sample(ctx, output, records):
+    """Generate sample BLM financial data for testing.
+
+    The new file is also parsed into the parse cache, so the first
+    analyze/summary/export run on it starts from cached columns.
+    """
     from src.data.sample import generate_sample_data
 
     df = generate_sample_data(n_records=records)
@@ -279,6 +285,13 @@ def generate_sample(output, records):
     df.to_csv(output_path, index=False)
     click.echo(f"Sample data written to: {output_path} ({len(df)} records)")
 
+    cache = ctx.obj.get("parse_cache")
+    if cache is not None:
+        try:
+            cache.load(str(output_path.resolve()))
+        except Exception as e:
+            click.echo(f"Warning: Could not cache {output_path.name}: {e}")
+
 
 # Register BLM CLI as a subgroup
 cli.add_command(blm_cli)
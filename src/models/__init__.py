@@ -1,4 +1,15 @@
 """Data models for BLM Five Looks Analysis."""
+import os
+import sys
+
+# ``@dataclass(**SLOTS)``: slotted model classes on Python 3.10+.  Group runs
+# keep thousands of model instances alive, and a per-instance __dict__ is
+# most of their footprint.  BLM_MODEL_SLOTS=0 turns slots off, e.g. to
+# measure the difference (scripts/benchmark_model_memory.py).  Defined
+# before the submodule imports below, which use it.
+SLOTS = ({"slots": True}
+         if sys.version_info >= (3, 10) and os.getenv("BLM_MODEL_SLOTS", "1") != "0"
+         else {})
 
 from src.models.provenance import (
     SourceType, Confidence, FreshnessStatus,
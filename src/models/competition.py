@@ -3,8 +3,10 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Optional
 
+from src.models import SLOTS
 
-@dataclass
+
+@dataclass(**SLOTS)
 class CompetitorImplication:
     implication_type: str       # "opportunity" / "threat" / "learning" / "puzzling"
     description: str = ""
@@ -12,7 +14,7 @@ class CompetitorImplication:
     suggested_action: str = ""
 
 
-@dataclass
+@dataclass(**SLOTS)
 class PorterForce:
     force_name: str             # "existing_competitors" / "new_entrants" / "substitutes" / "supplier_power" / "buyer_power"
     force_level: str = "medium"  # "high" / "medium" / "low"
@@ -20,7 +22,7 @@ class PorterForce:
     implications: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**SLOTS)
 class CompetitorDeepDive:
     operator: str
     # Basic health check
@@ -47,7 +49,7 @@ class CompetitorDeepDive:
     implications: list[CompetitorImplication] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**SLOTS)
 class CompetitionInsight:
     """Complete output of Look 3: Competition."""
     five_forces: dict = field(default_factory=dict)  # {force_name: PorterForce}
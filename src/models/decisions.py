@@ -8,8 +8,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 
+from src.models import SLOTS
 
-@dataclass
+
+@dataclass(**SLOTS)
 class StrategicPillar:
     """One of 4 strategic pillars in the Strategy Decision."""
     name: str               # e.g., "Growth Strategy"
@@ -19,7 +21,7 @@ class StrategicPillar:
     kpis: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**SLOTS)
 class StrategyDecision:
     """Decision 1: Define Strategy (定策略)."""
     pillars: list[StrategicPillar] = field(default_factory=list)
@@ -27,7 +29,7 @@ class StrategyDecision:
     competitive_posture: str = ""   # Offensive / Defensive / Turnaround / Cautious
 
 
-@dataclass
+@dataclass(**SLOTS)
 class KeyTask:
     """A single critical task in the Key Tasks Decision."""
     name: str
@@ -39,14 +41,14 @@ class KeyTask:
     time_window: str = ""   # immediate / 1-2 years / 3-5 years
 
 
-@dataclass
+@dataclass(**SLOTS)
 class KeyTasksDecision:
     """Decision 2: Define Key Tasks (定重点工作)."""
     tasks: list[KeyTask] = field(default_factory=list)
     resource_implication: str = ""
 
 
-@dataclass
+@dataclass(**SLOTS)
 class Milestone:
     """A quarterly execution milestone."""
     quarter: str        # Q1 / Q2 / Q3 / Q4
@@ -55,7 +57,7 @@ class Milestone:
     priority: str = "P0"
 
 
-@dataclass
+@dataclass(**SLOTS)
 class GovernanceItem:
     """A governance mechanism for execution oversight."""
     mechanism: str      # e.g., "Monthly Progress Review"
@@ -63,7 +65,7 @@ class GovernanceItem:
     description: str = ""
 
 
-@dataclass
+@dataclass(**SLOTS)
 class ExecutionDecision:
     """Decision 3: Define Execution (定执行)."""
     milestones: list[Milestone] = field(default_factory=list)
@@ -72,7 +74,7 @@ class ExecutionDecision:
     traps_to_avoid: list[dict] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**SLOTS)
 class ThreeDecisions:
     """Container for all three BLM decisions."""
     strategy: StrategyDecision = field(default_factory=StrategyDecision)
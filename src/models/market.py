@@ -3,8 +3,10 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Optional
 
+from src.models import SLOTS
 
-@dataclass
+
+@dataclass(**SLOTS)
 class MarketChange:
     change_type: str            # "pricing" / "merger" / "technology" / "ott" / "new_entrant"
     description: str = ""
@@ -16,7 +18,7 @@ class MarketChange:
     evidence: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**SLOTS)
 class CustomerSegment:
     segment_name: str
     segment_type: str = "consumer"  # "consumer" / "enterprise" / "wholesale"
@@ -30,7 +32,7 @@ class CustomerSegment:
     opportunity: str = ""
 
 
-@dataclass
+@dataclass(**SLOTS)
 class APPEALSAssessment:
     """Assessment on one $APPEALS dimension."""
     dimension: str              # "$" / "A1" / "P1" / "P2" / "E" / "A2" / "L" / "S"
@@ -41,7 +43,7 @@ class APPEALSAssessment:
     gap_analysis: str = ""
 
 
-@dataclass
+@dataclass(**SLOTS)
 class MarketCustomerInsight:
     """Complete output of Look 2: Market/Customer."""
     market_snapshot: dict = field(default_factory=dict)  # {total_revenue, total_subscribers, ...}
@@ -3,8 +3,10 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Optional
 
+from src.models import SLOTS
 
-@dataclass
+
+@dataclass(**SLOTS)
 class SPANPosition:
     """Position on the SPAN (Strategy Positioning and Action Navigation) matrix."""
     opportunity_name: str
@@ -26,7 +28,7 @@ class SPANPosition:
     bubble_size: float = 1.0             # For bubble chart (proportional to market size)
 
 
-@dataclass
+@dataclass(**SLOTS)
 class OpportunityItem:
     name: str
     description: str = ""
@@ -40,7 +42,7 @@ class OpportunityItem:
     priority_rationale: str = ""
 
 
-@dataclass
+@dataclass(**SLOTS)
 class OpportunityInsight:
     """Complete output of Look 5: Opportunities."""
     # SPAN matrix positions
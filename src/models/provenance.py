@@ -7,9 +7,13 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from heapq import merge as _merge_sorted
 from typing import Any, Optional
+import threading
 import uuid
 
+from src.models import SLOTS
+
 
 class SourceType(Enum):
     FINANCIAL_REPORT_PDF = "financial_report_pdf"
@@ -42,7 +46,7 @@ class FreshnessStatus(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(**SLOTS)
 class SourceReference:
     source_type: SourceType
     source_id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
@@ -90,7 +94,7 @@ class SourceReference:
         return " ".join(parts) if parts else f"[{self.source_type.value}]"
 
 
-@dataclass
+@dataclass(**SLOTS)
 class TrackedValue:
     value: Any
     field_name: str
@@ -130,19 +134,77 @@ class TrackedValue:
         return "\n".join(lines)
 
 
+# Confidence level -> data_provenance.confidence score
+_CONFIDENCE_SCORES = {"high": 1.0, "medium": 0.7, "low": 0.4, "estimated": 0.2}
+
+
+def _confidence_from_score(score: float) -> Confidence:
+    if score >= 0.9:
+        return Confidence.HIGH
+    if score >= 0.6:
+        return Confidence.MEDIUM
+    if score >= 0.3:
+        return Confidence.LOW
+    return Confidence.ESTIMATED
+
+
 class ProvenanceStore:
-    """Global provenance database for an analysis session."""
+    """Global provenance database for an analysis session.
+
+    Recording (register_source / register_value / track / merge) is
+    thread-safe, so concurrently running Looks may share one store.
+
+    Values are kept in recording order in ``_values`` and indexed by
+    (operator, field_name, period) for get_values().  Equal sources are
+    interned per source_id, so values tracked from the same document share
+    one SourceReference.
+    """
 
     def __init__(self):
         self._sources: dict[str, SourceReference] = {}
         self._values: list[TrackedValue] = []
+        self._index: dict[tuple, list[int]] = {}
+        self._interned: dict[str, SourceReference] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        if "_index" not in state:
+            self._index = {}
+            self._interned = {}
+            values, self._values = self._values, []
+            for tv in values:
+                self._append(tv)
+
+    def _intern(self, source: Optional[SourceReference]) -> Optional[SourceReference]:
+        """Canonical instance of ``source``; caller holds the lock."""
+        if source is None:
+            return None
+        known = self._interned.setdefault(source.source_id, source)
+        return known if known is source or known == source else source
+
+    def _append(self, tv: TrackedValue) -> None:
+        """Record ``tv`` and index it; caller holds the lock."""
+        tv.primary_source = self._intern(tv.primary_source)
+        key = (tv.operator, tv.field_name, tv.period)
+        self._index.setdefault(key, []).append(len(self._values))
+        self._values.append(tv)
 
     def register_source(self, source: SourceReference) -> str:
-        self._sources[source.source_id] = source
+        with self._lock:
+            self._sources[source.source_id] = source
+            self._interned.setdefault(source.source_id, source)
         return source.source_id
 
     def register_value(self, tracked_value: TrackedValue) -> None:
-        self._values.append(tracked_value)
+        with self._lock:
+            self._append(tracked_value)
 
     def track(self, value: Any, field_name: str, operator: str = None,
               period: str = None, source: SourceReference = None,
@@ -155,19 +217,35 @@ class ProvenanceStore:
             primary_source=source,
             unit=unit,
         )
-        self._values.append(tv)
+        with self._lock:
+            self._append(tv)
         return tv
 
+    def merge(self, other: "ProvenanceStore") -> None:
+        """Append another store's sources and values, preserving their order."""
+        with self._lock:
+            for source in other._sources.values():
+                self._sources[source.source_id] = source
+                self._interned.setdefault(source.source_id, source)
+            for tv in other._values:
+                self._append(tv)
+
     def get_values(self, operator: str = None, field_name: str = None,
                    period: str = None) -> list[TrackedValue]:
-        results = self._values
-        if operator:
-            results = [v for v in results if v.operator == operator]
-        if field_name:
-            results = [v for v in results if v.field_name == field_name]
-        if period:
-            results = [v for v in results if v.period == period]
-        return results
+        """Tracked values matching every given filter, in recording order."""
+        if not (operator or field_name or period):
+            return self._values
+        if operator and field_name and period:
+            positions = self._index.get((operator, field_name, period), [])
+        else:
+            # Positions within each key are ascending; merge keeps the order
+            positions = _merge_sorted(*(
+                found for (op, name, per), found in self._index.items()
+                if (not operator or op == operator)
+                and (not field_name or name == field_name)
+                and (not period or per == period)
+            ))
+        return [self._values[i] for i in positions]
 
     def quality_report(self) -> dict:
         total = len(self._values)
@@ -201,6 +279,10 @@ class ProvenanceStore:
     def save_to_db(self, db, analysis_job_id: int = None) -> dict:
         """Persist all sources and tracked values to the database.
 
+        Both tables are written with executemany in a single transaction.
+        Each source is written once, whether registered or only referenced
+        by values (registered sources win on a source_id clash).
+
         Args:
             db: TelecomDatabase instance with open connection.
             analysis_job_id: Optional job ID to link provenance to.
@@ -208,107 +290,69 @@ class ProvenanceStore:
         Returns:
             {"sources_saved": N, "values_saved": M}
         """
-        conn = db.conn
+        sources = dict(self._sources)
+        for tv in self._values:
+            src = tv.primary_source
+            if src is not None and src.source_id not in sources:
+                sources[src.source_id] = src
+
+        source_rows = (
+            (
+                src.source_id,
+                src.source_type.value,
+                src.url,
+                src.document_name,
+                src.publisher,
+                src.publication_date.strftime("%Y-%m-%d")
+                if src.publication_date else None,
+                src.collected_at.strftime("%Y-%m-%d %H:%M:%S")
+                if src.collected_at else None,
+            )
+            for src in sources.values()
+        )
+        value_rows = (
+            (
+                "tracked_value",
+                0,
+                tv.field_name,
+                src.source_id if src else None,
+                _CONFIDENCE_SCORES.get(src.confidence.value, 0.5) if src else None,
+                src.extraction_method if src else None,
+                src.raw_text if src else None,
+                analysis_job_id,
+                tv.operator,
+                tv.period,
+                str(tv.value) if tv.value is not None else None,
+                tv.unit,
+            )
+            for tv, src in ((tv, tv.primary_source) for tv in self._values)
+        )
 
-        # 1. Upsert all SourceReference objects to source_registry
-        sources_saved = 0
-        for src in self._sources.values():
-            pub_date = None
-            if src.publication_date:
-                pub_date = src.publication_date.strftime("%Y-%m-%d")
-            collected = None
-            if src.collected_at:
-                collected = src.collected_at.strftime("%Y-%m-%d %H:%M:%S")
-
-            conn.execute(
+        with db.writer() as conn:
+            conn.executemany(
                 """INSERT OR REPLACE INTO source_registry
                    (source_id, source_type, url, document_name, publisher,
                     publication_date, collected_at)
                    VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    src.source_id,
-                    src.source_type.value,
-                    src.url,
-                    src.document_name,
-                    src.publisher,
-                    pub_date,
-                    collected,
-                ),
+                source_rows,
             )
-            sources_saved += 1
-
-        # 1b. Also upsert any sources referenced by values but not in _sources
-        for tv in self._values:
-            if tv.primary_source and tv.primary_source.source_id not in self._sources:
-                src = tv.primary_source
-                pub_date = None
-                if src.publication_date:
-                    pub_date = src.publication_date.strftime("%Y-%m-%d")
-                collected = None
-                if src.collected_at:
-                    collected = src.collected_at.strftime("%Y-%m-%d %H:%M:%S")
-                conn.execute(
-                    """INSERT OR REPLACE INTO source_registry
-                       (source_id, source_type, url, document_name, publisher,
-                        publication_date, collected_at)
-                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                    (
-                        src.source_id,
-                        src.source_type.value,
-                        src.url,
-                        src.document_name,
-                        src.publisher,
-                        pub_date,
-                        collected,
-                    ),
-                )
-                sources_saved += 1
-
-        # 2. Insert TrackedValue objects to data_provenance
-        values_saved = 0
-        for tv in self._values:
-            source_id = tv.primary_source.source_id if tv.primary_source else None
-            confidence_val = None
-            if tv.primary_source:
-                conf_map = {"high": 1.0, "medium": 0.7, "low": 0.4, "estimated": 0.2}
-                confidence_val = conf_map.get(tv.primary_source.confidence.value, 0.5)
-
-            extraction_method = None
-            if tv.primary_source:
-                extraction_method = tv.primary_source.extraction_method
-
-            value_str = str(tv.value) if tv.value is not None else None
-
-            conn.execute(
+            conn.executemany(
                 """INSERT INTO data_provenance
                    (entity_type, entity_id, field_name, source_id, confidence,
                     extraction_method, raw_text, analysis_job_id, operator_id,
                     period, value_text, unit)
                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    "tracked_value",
-                    0,
-                    tv.field_name,
-                    source_id,
-                    confidence_val,
-                    extraction_method,
-                    tv.primary_source.raw_text if tv.primary_source else None,
-                    analysis_job_id,
-                    tv.operator,
-                    tv.period,
-                    value_str,
-                    tv.unit,
-                ),
+                value_rows,
             )
-            values_saved += 1
-
-        conn.commit()
-        return {"sources_saved": sources_saved, "values_saved": values_saved}
+        return {"sources_saved": len(sources), "values_saved": len(self._values)}
 
     @classmethod
     def load_from_db(cls, db, analysis_job_id: int) -> "ProvenanceStore":
         """Load a ProvenanceStore from the database for a given job.
 
+        Sources are fetched in one query; value rows are streamed from the
+        cursor rather than fetched all at once.
+
         Args:
             db: TelecomDatabase instance with open connection.
             analysis_job_id: The job ID to load provenance for.
@@ -319,87 +363,67 @@ class ProvenanceStore:
         store = cls()
         conn = db.conn
 
-        # 1. Load data_provenance rows for this job
-        rows = conn.execute(
-            "SELECT * FROM data_provenance WHERE analysis_job_id = ?",
-            (analysis_job_id,),
-        ).fetchall()
-
-        # 2. Collect referenced source_ids
-        source_ids = set()
-        for row in rows:
-            sid = row["source_id"] if "source_id" in row.keys() else None
-            if sid:
-                source_ids.add(sid)
-
-        # 3. Load referenced source_registry rows
+        # 1. Sources referenced by this job's values
         source_map = {}
-        for sid in source_ids:
-            src_row = conn.execute(
-                "SELECT * FROM source_registry WHERE source_id = ?",
-                (sid,),
-            ).fetchone()
-            if src_row:
-                try:
-                    st = SourceType(src_row["source_type"])
-                except (ValueError, KeyError):
-                    st = SourceType.MANUAL
-
-                pub_date = None
-                if src_row["publication_date"]:
-                    try:
-                        pub_date = datetime.strptime(
-                            src_row["publication_date"], "%Y-%m-%d"
-                        )
-                    except (ValueError, TypeError):
-                        pass
-
-                collected = None
-                if src_row["collected_at"]:
-                    try:
-                        collected = datetime.strptime(
-                            src_row["collected_at"], "%Y-%m-%d %H:%M:%S"
-                        )
-                    except (ValueError, TypeError):
-                        pass
-
-                ref = SourceReference(
-                    source_type=st,
-                    source_id=src_row["source_id"],
-                    url=src_row["url"],
-                    document_name=src_row["document_name"],
-                    publisher=src_row["publisher"],
-                    publication_date=pub_date,
-                    collected_at=collected,
-                )
-                source_map[sid] = ref
-                store.register_source(ref)
-
-        # 4. Reconstruct TrackedValue objects
-        for row in rows:
-            sid = row["source_id"] if "source_id" in row.keys() else None
-            primary_source = source_map.get(sid) if sid else None
-
-            # Parse confidence back
+        for src_row in conn.execute(
+            """SELECT * FROM source_registry WHERE source_id IN (
+                   SELECT source_id FROM data_provenance
+                   WHERE analysis_job_id = ?)""",
+            (analysis_job_id,),
+        ):
+            ref = _source_from_row(src_row)
+            source_map[ref.source_id] = ref
+            store.register_source(ref)
+
+        # 2. Reconstruct TrackedValue objects
+        cursor = conn.execute(
+            """SELECT field_name, source_id, confidence, operator_id, period,
+                      value_text, unit
+               FROM data_provenance WHERE analysis_job_id = ? ORDER BY id""",
+            (analysis_job_id,),
+        )
+        for row in cursor:
+            primary_source = source_map.get(row["source_id"])
             if primary_source and row["confidence"] is not None:
-                conf_val = row["confidence"]
-                if conf_val >= 0.9:
-                    primary_source.confidence = Confidence.HIGH
-                elif conf_val >= 0.6:
-                    primary_source.confidence = Confidence.MEDIUM
-                elif conf_val >= 0.3:
-                    primary_source.confidence = Confidence.LOW
-                else:
-                    primary_source.confidence = Confidence.ESTIMATED
-
-            tv = TrackedValue(
+                primary_source.confidence = _confidence_from_score(row["confidence"])
+            store.register_value(TrackedValue(
                 value=row["value_text"],
                 field_name=row["field_name"],
                 operator=row["operator_id"],
                 period=row["period"],
                 primary_source=primary_source,
                 unit=row["unit"],
-            )
-            store.register_value(tv)
+            ))
 
         return store
+
+
+def _source_from_row(src_row) -> SourceReference:
+    try:
+        st = SourceType(src_row["source_type"])
+    except (ValueError, KeyError):
+        st = SourceType.MANUAL
+
+    pub_date = None
+    if src_row["publication_date"]:
+        try:
+            pub_date = datetime.strptime(src_row["publication_date"], "%Y-%m-%d")
+        except (ValueError, TypeError):
+            pass
+
+    collected = None
+    if src_row["collected_at"]:
+        try:
+            collected = datetime.strptime(src_row["collected_at"], "%Y-%m-%d %H:%M:%S")
+        except (ValueError, TypeError):
+            pass
+
+    return SourceReference(
+        source_type=st,
+        source_id=src_row["source_id"],
+        url=src_row["url"],
+        document_name=src_row["document_name"],
+        publisher=src_row["publisher"],
+        publication_date=pub_date,
+        collected_at=collected,
+    )
@@ -3,8 +3,10 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Any, Optional
 
+from src.models import SLOTS
 
-@dataclass
+
+@dataclass(**SLOTS)
 class SegmentChange:
     metric: str                 # "revenue" / "subscribers" / "arpu" / "churn" / "margin"
     current_value: Any = None
@@ -16,7 +18,7 @@ class SegmentChange:
     significance: str = "minor"  # "significant" / "moderate" / "minor"
 
 
-@dataclass
+@dataclass(**SLOTS)
 class ChangeAttribution:
     attribution_type: str       # "management_explanation" / "tariff_competition" / "customer_feedback" / "market_change" / "product_change"
     description: str = ""
@@ -25,7 +27,7 @@ class ChangeAttribution:
     source: str = ""            # "earnings_call" / "tariff_scraping" / "nps_survey"
 
 
-@dataclass
+@dataclass(**SLOTS)
 class SegmentAnalysis:
     segment_name: str           # "Mobile" / "Fixed Broadband" / "B2B" / "TV" / "Wholesale"
     segment_id: str = ""        # "mobile" / "fixed" / "b2b" / "tv" / "wholesale"
@@ -42,7 +44,7 @@ class SegmentAnalysis:
     action_required: str = ""
 
 
-@dataclass
+@dataclass(**SLOTS)
 class NetworkAnalysis:
     # Current state
     technology_mix: dict = field(default_factory=dict)  # {"cable": 70, "fiber": 5, ...}
@@ -60,7 +62,7 @@ class NetworkAnalysis:
     cost_impact: str = ""
 
 
-@dataclass
+@dataclass(**SLOTS)
 class ExposurePoint:
     trigger_action: str         # "1&1 migrating 11M users onto own network"
     side_effect: str = ""       # "Network load surges on Vodafone"
@@ -69,7 +71,7 @@ class ExposurePoint:
     evidence: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**SLOTS)
 class BMCCanvas:
     """Business Model Canvas - 9 building blocks."""
     key_partners: list[str] = field(default_factory=list)
@@ -83,7 +85,7 @@ class BMCCanvas:
     revenue_streams: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**SLOTS)
 class SelfInsight:
     """Complete output of Look 4: Self Analysis."""
     # Operating metrics
@@ -2,8 +2,10 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
 
+from src.models import SLOTS
 
-@dataclass
+
+@dataclass(**SLOTS)
 class SWOTAnalysis:
     """SWOT Matrix with four strategy quadrants."""
     strengths: list[str] = field(default_factory=list)
@@ -3,8 +3,10 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Optional
 
+from src.models import SLOTS
 
-@dataclass
+
+@dataclass(**SLOTS)
 class PESTFactor:
     """A single factor within one PEST dimension."""
     dimension: str              # "P" / "E" / "S" / "T"
@@ -23,7 +25,7 @@ class PESTFactor:
     data_source: str = ""
 
 
-@dataclass
+@dataclass(**SLOTS)
 class PESTAnalysis:
     """Complete PEST analysis across four dimensions."""
     political_factors: list[PESTFactor] = field(default_factory=list)
@@ -40,7 +42,7 @@ class PESTAnalysis:
     key_message: str = ""
 
 
-@dataclass
+@dataclass(**SLOTS)
 class TrendAnalysis:
     """Complete output of Look 1: Trends."""
     pest: PESTAnalysis = field(default_factory=PESTAnalysis)
@@ -122,3 +122,78 @@ class BLMJsonExporter:
             value = getattr(obj, f.name)
             result[f.name] = self._serialize(value)
         return result
+
+
+# ======================================================================
+# JSON → FiveLooksResult reconstruction
+# ======================================================================
+
+class _AttrDict:
+    """Lightweight attribute-access wrapper over a dict.
+
+    Recursively wraps nested dicts so that `obj.attr.nested` works,
+    matching the dataclass attribute access pattern used by generators.
+    """
+
+    def __init__(self, data: dict):
+        self._data = data or {}
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        val = self._data.get(name)
+        if isinstance(val, dict):
+            return _AttrDict(val)
+        if isinstance(val, list):
+            return [_AttrDict(v) if isinstance(v, dict) else v for v in val]
+        return val
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def items(self):
+        return self._data.items()
+
+    def keys(self):
+        return self._data.keys()
+
+    def values(self):
+        return self._data.values()
+
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    def __contains__(self, item):
+        return item in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def __bool__(self):
+        return bool(self._data)
+
+
+def result_from_json(json_data: dict):
+    """Reconstruct a FiveLooksResult-compatible object from JSON export data.
+
+    The generators only need attribute access (.trends, .market_customer, etc.)
+    and getattr/safe_get access on nested objects. _AttrDict provides this.
+    """
+    meta = json_data.get("meta", {})
+    five = json_data.get("five_looks", {})
+
+    result = _AttrDict({
+        "target_operator": meta.get("target_operator", ""),
+        "market": meta.get("market", ""),
+        "analysis_period": meta.get("analysis_period", ""),
+        "trends": five.get("trends"),
+        "market_customer": five.get("market_customer"),
+        "competition": five.get("competition"),
+        "self_analysis": five.get("self_analysis"),
+        "swot": five.get("swot"),
+        "opportunities": five.get("opportunities"),
+        "tariff_analysis": None,
+        "provenance": None,
+        "three_decisions": None,
+    })
+    return result
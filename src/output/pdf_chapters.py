@@ -0,0 +1,230 @@
+"""Chapter-by-chapter PDF rendering with a per-chapter cache.
+
+Laying out a long report with weasyprint in a single write_pdf() call
+redoes every page whenever any part of it changes.  ChapterPDFRenderer
+renders each chapter to its own PDF instead and keeps it in a cache keyed
+by a hash of the chapter's full HTML document (content and CSS), so
+regenerating a report after a change re-renders only the chapters that
+changed.  The final document is assembled from the chapter PDFs:
+
+  - the front matter (title, table of contents) is rendered last, once
+    the page on which each chapter starts is known;
+  - chapter PDFs are concatenated with pypdfium2 (installed with
+    pdfplumber);
+  - page numbers are rendered as a separate overlay document, one page
+    per output page, and stamped onto the pages.
+
+Every chapter starts on a new page.  Links between chapters and the PDF
+outline do not survive the concatenation; the table of contents gives
+page numbers instead.  Cache entries are never evicted: the directory can
+be deleted at any time.
+
+Environment:
+    BLM_PDF_CACHE=0         render every chapter
+    BLM_PDF_CACHE_DIR       cache directory (default data/processed/pdf_chapters)
+
+Usage:
+    from src.output.pdf_chapters import ChapterPDFRenderer, Chapter
+
+    renderer = ChapterPDFRenderer(css, footer_css)
+    renderer.render([Chapter("Overview", 2, "<h2>Overview</h2>...")], "report.pdf",
+                    front=lambda toc: "<h1>Report</h1>" + toc_table(toc))
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+# Bump when the cached chapter PDFs change for the same HTML
+PDF_CACHE_FORMAT = 1
+
+DEFAULT_CACHE_DIR = (
+    Path(__file__).resolve().parent.parent.parent / "data" / "processed" / "pdf_chapters"
+)
+
+# Front matter is re-rendered until its page count settles
+_FRONT_ATTEMPTS = 3
+
+
+@dataclass
+class Chapter:
+    """A chapter of a report: its heading, heading level and HTML body."""
+
+    title: str
+    level: int
+    html: str
+
+
+def split_markdown_chapters(md_content: str, levels: tuple = (2, 4)) -> tuple[str, list]:
+    """Split Markdown at the headings of ``levels``.
+
+    Returns (preamble, [(title, level, markdown)]): the preamble is the text
+    before the first such heading; each chapter runs from its heading to
+    the next one.  Headings inside fenced code blocks are ignored.
+    """
+    heading = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+    preamble, chapters, fenced = [], [], False
+    current = preamble
+    for line in md_content.split("\n"):
+        if line.lstrip().startswith(("```", "~~~")):
+            fenced = not fenced
+        match = None if fenced else heading.match(line)
+        if match and len(match.group(1)) in levels:
+            current = [line]
+            chapters.append((match.group(2), len(match.group(1)), current))
+        else:
+            current.append(line)
+    return "\n".join(preamble), [(t, lvl, "\n".join(lines)) for t, lvl, lines in chapters]
+
+
+def html_document(body: str, css: str) -> str:
+    """Standalone HTML document of ``body`` styled by ``css``."""
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<style>{css}</style>
+</head>
+<body>
+{body}
+</body>
+</html>"""
+
+
+def weasyprint_render(html: str) -> bytes:
+    """PDF bytes of an HTML document, laid out by weasyprint."""
+    from weasyprint import HTML
+
+    return HTML(string=html).write_pdf()
+
+
+def default_chapter_cache_dir() -> Optional[Path]:
+    """Chapter cache directory configured from the environment, or None if disabled."""
+    if os.getenv("BLM_PDF_CACHE", "1") == "0":
+        return None
+    return Path(os.getenv("BLM_PDF_CACHE_DIR") or DEFAULT_CACHE_DIR)
+
+
+class ChapterPDFRenderer:
+    """Render reports chapter by chapter, reusing unchanged chapters.
+
+    Args:
+        css: Stylesheet of the chapters and the front matter.  Its @page
+            rule should leave the page-number margin box empty.
+        footer_css: Stylesheet of the page-number overlay, e.g. an @page
+            rule of the same size and margins with
+            ``@bottom-center { content: counter(page) " / " counter(pages) }``.
+        cache_dir: Directory of the cached chapter PDFs (default:
+            BLM_PDF_CACHE_DIR, then data/processed/pdf_chapters; no cache
+            with BLM_PDF_CACHE=0).
+        render_html: HTML document -> PDF bytes (default: weasyprint).
+    """
+
+    def __init__(self, css: str, footer_css: str = "",
+                 cache_dir: Optional[str] = None,
+                 render_html: Optional[Callable[[str], bytes]] = None):
+        self.css = css
+        self.footer_css = footer_css
+        self.cache_dir = Path(cache_dir) if cache_dir else default_chapter_cache_dir()
+        self.render_html = render_html or weasyprint_render
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, chapters: list, output_path,
+               front: Optional[Callable[[list], str]] = None) -> int:
+        """Write the PDF of ``chapters`` to ``output_path``; returns its page count.
+
+        Args:
+            chapters: Chapters in document order.
+            output_path: PDF file to write.
+            front: Builds the HTML body of the front matter from the table
+                of contents, [(Chapter, first page number)].  Omitted: no
+                front matter.
+
+        Raises:
+            RuntimeError: If the page-number overlay does not lay out one
+                page per output page.
+        """
+        import pypdfium2 as pdfium
+
+        docs = [pdfium.PdfDocument(self._pdf(html_document(c.html, self.css)))
+                for c in chapters]
+
+        front_doc = None
+        if front is not None:
+            front_pages = 1
+            for _ in range(_FRONT_ATTEMPTS):
+                toc, page = [], front_pages + 1
+                for chapter, doc in zip(chapters, docs):
+                    toc.append((chapter, page))
+                    page += len(doc)
+                front_doc = pdfium.PdfDocument(
+                    self._pdf(html_document(front(toc), self.css)))
+                if len(front_doc) == front_pages:
+                    break
+                front_pages = len(front_doc)
+            else:
+                print("  [!] Front matter page count did not settle: "
+                      "table of contents page numbers may be off")
+
+        out = pdfium.PdfDocument.new()
+        for doc in ([front_doc] if front_doc is not None else []) + docs:
+            out.import_pages(doc)
+        n_pages = len(out)
+        if self.footer_css:
+            self._stamp_page_numbers(out, n_pages)
+
+        path = Path(output_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        out.save(str(path))
+        return n_pages
+
+    def _stamp_page_numbers(self, out, n_pages: int) -> None:
+        import pypdfium2 as pdfium
+
+        pages = '<div class="page">&nbsp;</div>' * n_pages
+        overlay = pdfium.PdfDocument(self._pdf(html_document(
+            pages, self.footer_css + "\n.page + .page { break-before: page; }")))
+        if len(overlay) != n_pages:
+            raise RuntimeError(
+                f"Page number overlay has {len(overlay)} pages for {n_pages}: "
+                "footer_css must lay out one page per output page")
+        for i in range(n_pages):
+            page = out[i]
+            page.insert_obj(overlay.page_as_xobject(i, out).as_pageobject())
+            page.gen_content()
+
+    def _pdf(self, html: str) -> bytes:
+        """PDF bytes of an HTML document, from the cache if rendered before."""
+        if self.cache_dir is None:
+            self.misses += 1
+            return self.render_html(html)
+
+        key = hashlib.blake2b(f"{PDF_CACHE_FORMAT}\0{html}".encode(), digest_size=20).hexdigest()
+        entry = self.cache_dir / f"{key}.pdf"
+        try:
+            data = entry.read_bytes()
+        except OSError:
+            pass
+        else:
+            self.hits += 1
+            return data
+
+        self.misses += 1
+        data = self.render_html(html)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            staging = entry.with_name(f"{entry.name}.tmp{os.getpid()}")
+            try:
+                staging.write_bytes(data)
+                os.replace(staging, entry)
+            finally:
+                staging.unlink(missing_ok=True)
+        except OSError as e:
+            print(f"  [!] PDF chapter cache not writable: {e}")
+        return data
@@ -7,7 +7,9 @@ from typing import Optional
 from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
 from pydantic import BaseModel
 
+from src.web.services.job_queue import get_job_store, uses_external_workers
 from src.web.services.supabase_data import get_data_service
+from src.web.services.warm_pool import get_warm_pool
 
 router = APIRouter(prefix="/api/analyze", tags=["analyze"])
 
@@ -60,11 +62,11 @@ def create_single_analysis(req: SingleMarketRequest,
     }
 
     try:
-        job = svc.create_analysis_job(job_data)
+        job = get_job_store(svc).create_analysis_job(job_data)
         job_id = job.get("id")
 
-        # Auto-trigger execution in background
-        background_tasks.add_task(_execute_single, job_id)
+        # Auto-trigger execution (in background, or via the worker queue)
+        _dispatch(job_id, "single_market", background_tasks)
 
         return {"job_id": job_id, "status": "pending"}
     except Exception as e:
@@ -105,11 +107,11 @@ def create_group_analysis(req: GroupAnalysisRequest,
     }
 
     try:
-        job = svc.create_analysis_job(job_data)
+        job = get_job_store(svc).create_analysis_job(job_data)
         job_id = job.get("id")
 
-        # Auto-trigger execution in background
-        background_tasks.add_task(_execute_group, job_id)
+        # Auto-trigger execution (in background, or via the worker queue)
+        _dispatch(job_id, "group_analysis", background_tasks)
 
         return {"job_id": job_id, "status": "pending", "markets": markets}
     except Exception as e:
@@ -119,8 +121,7 @@ def create_group_analysis(req: GroupAnalysisRequest,
 @router.get("/{job_id}")
 def get_analysis_status(job_id: int):
     """Query analysis job progress."""
-    svc = get_data_service()
-    job = svc.get_analysis_job(job_id)
+    job = get_job_store().get_analysis_job(job_id)
     if not job:
         raise HTTPException(404, f"Job #{job_id} not found")
 
@@ -146,7 +147,7 @@ def get_analysis_status(job_id: int):
 def get_analysis_results(job_id: int):
     """Get analysis results for a completed job."""
     svc = get_data_service()
-    job = svc.get_analysis_job(job_id)
+    job = get_job_store(svc).get_analysis_job(job_id)
     if not job:
         raise HTTPException(404, f"Job #{job_id} not found")
 
@@ -167,49 +168,77 @@ def get_analysis_results(job_id: int):
 
 
 @router.post("/{job_id}/execute")
-def execute_analysis(job_id: int, background_tasks: BackgroundTasks):
+def execute_analysis(job_id: int, background_tasks: BackgroundTasks,
+                     resume: bool = Query(False)):
     """Trigger analysis execution for a pending or failed job.
 
+    Group jobs resume from their per-market checkpoints: markets completed
+    by an earlier run are skipped. Pass ``resume=true`` to also restart a
+    job left 'running' or partially 'completed' by an interrupted process.
+
     On Vercel (hobby): will timeout after 10s — use CLI instead.
     On self-hosted / Vercel Pro: runs via BackgroundTasks.
     """
-    svc = get_data_service()
-    job = svc.get_analysis_job(job_id)
+    jobs = get_job_store()
+    job = jobs.get_analysis_job(job_id)
     if not job:
         raise HTTPException(404, f"Job #{job_id} not found")
 
-    if job.get("status") not in ("pending", "failed"):
+    allowed = ("pending", "failed")
+    if resume:
+        allowed += ("running", "completed")
+    if job.get("status") not in allowed:
         raise HTTPException(
             400,
-            f"Job #{job_id} is '{job.get('status')}' — can only execute pending or failed jobs",
+            f"Job #{job_id} is '{job.get('status')}' — can only execute pending or failed jobs "
+            f"(use resume=true to restart an interrupted job)",
         )
 
-    job_type = job.get("job_type", "single_market")
-    if job_type == "group_analysis":
-        background_tasks.add_task(_execute_group, job_id)
-    else:
-        background_tasks.add_task(_execute_single, job_id)
+    if uses_external_workers():
+        # Hand back to the queue; a worker claims it on its next poll
+        jobs.update_analysis_job(job_id, {
+            "status": "pending",
+            "lease_owner": None,
+            "lease_expires_at": None,
+        })
+        return {"job_id": job_id, "status": "queued"}
 
+    _dispatch(job_id, job.get("job_type", "single_market"), background_tasks)
     return {"job_id": job_id, "status": "executing"}
 
 
 @router.get("")
 def list_analysis_jobs(status: Optional[str] = Query(None)):
     """List all analysis jobs, optionally filtered by status."""
-    svc = get_data_service()
-    return svc.get_analysis_jobs(status=status)
+    return get_job_store().get_analysis_jobs(status=status)
 
 
 # ------------------------------------------------------------------
 # Background execution helpers
 # ------------------------------------------------------------------
 
+def _dispatch(job_id: int, job_type: str,
+              background_tasks: BackgroundTasks) -> None:
+    """Start a pending job in-process, unless external workers own the queue.
+
+    With BLM_JOB_QUEUE=worker the job is left 'pending' in analysis_jobs for
+    ``python -m src.worker`` to claim, keeping engine work out of the web process.
+    """
+    if uses_external_workers():
+        return
+    if job_type == "group_analysis":
+        background_tasks.add_task(_execute_group, job_id)
+    else:
+        background_tasks.add_task(_execute_single, job_id)
+
+
 def _execute_single(job_id: int) -> None:
     """Background task: run a single-market analysis."""
     try:
         from src.web.services.analysis_runner import AnalysisRunnerService
         svc = get_data_service()
-        runner = AnalysisRunnerService(svc)
+        runner = AnalysisRunnerService(svc, jobs=get_job_store(svc),
+                                       pool=get_warm_pool())
         runner.run_single(job_id)
     except Exception as e:
         print(f"[!] Background single analysis #{job_id} failed: {e}")
@@ -222,7 +251,8 @@ def _execute_group(job_id: int) -> None:
     try:
         from src.web.services.analysis_runner import AnalysisRunnerService
         svc = get_data_service()
-        runner = AnalysisRunnerService(svc)
+        runner = AnalysisRunnerService(svc, jobs=get_job_store(svc),
+                                       pool=get_warm_pool())
         runner.run_group(job_id)
     except Exception as e:
         print(f"[!] Background group analysis #{job_id} failed: {e}")
@@ -9,6 +9,7 @@ from pathlib import Path
 
 from fastapi import APIRouter, BackgroundTasks, HTTPException
 
+from src.output.json_exporter import result_from_json
 from src.web.services.supabase_data import get_data_service
 from src.web.services.finding_extractor import (
     FindingExtractor,
@@ -176,7 +177,7 @@ def _run_finalization(svc, job_id: int, job: dict):
         json_data = json.loads(raw)
 
         # 3. Reconstruct FiveLooksResult from JSON
-        result = _json_to_result(json_data)
+        result = result_from_json(json_data)
 
         tmp_dir = tempfile.mkdtemp(prefix="blm_final_")
         output_dir = Path(tmp_dir)
@@ -268,78 +269,3 @@ def _run_finalization(svc, job_id: int, job: dict):
     except Exception as e:
         print(f"  [!] Finalization failed for job #{job_id}: {e}")
         traceback.print_exc()
-
-
-# ======================================================================
-# JSON → FiveLooksResult reconstruction
-# ======================================================================
-
-class _AttrDict:
-    """Lightweight attribute-access wrapper over a dict.
-
-    Recursively wraps nested dicts so that `obj.attr.nested` works,
-    matching the dataclass attribute access pattern used by generators.
-    """
-
-    def __init__(self, data: dict):
-        self._data = data or {}
-
-    def __getattr__(self, name):
-        if name.startswith('_'):
-            raise AttributeError(name)
-        val = self._data.get(name)
-        if isinstance(val, dict):
-            return _AttrDict(val)
-        if isinstance(val, list):
-            return [_AttrDict(v) if isinstance(v, dict) else v for v in val]
-        return val
-
-    def __iter__(self):
-        return iter(self._data)
-
-    def items(self):
-        return self._data.items()
-
-    def keys(self):
-        return self._data.keys()
-
-    def values(self):
-        return self._data.values()
-
-    def get(self, key, default=None):
-        return self._data.get(key, default)
-
-    def __contains__(self, item):
-        return item in self._data
-
-    def __len__(self):
-        return len(self._data)
-
-    def __bool__(self):
-        return bool(self._data)
-
-
-def _json_to_result(json_data: dict):
-    """Reconstruct a FiveLooksResult-compatible object from JSON export data.
-
-    The generators only need attribute access (.trends, .market_customer, etc.)
-    and getattr/safe_get access on nested objects. _AttrDict provides this.
-    """
-    meta = json_data.get("meta", {})
-    five = json_data.get("five_looks", {})
-
-    result = _AttrDict({
-        "target_operator": meta.get("target_operator", ""),
-        "market": meta.get("market", ""),
-        "analysis_period": meta.get("analysis_period", ""),
-        "trends": five.get("trends"),
-        "market_customer": five.get("market_customer"),
-        "competition": five.get("competition"),
-        "self_analysis": five.get("self_analysis"),
-        "swot": five.get("swot"),
-        "opportunities": five.get("opportunities"),
-        "tariff_analysis": None,
-        "provenance": None,
-        "three_decisions": None,
-    })
-    return result
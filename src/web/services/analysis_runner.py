@@ -23,10 +23,25 @@ BUCKET = "blm-outputs"
 
 
 class AnalysisRunnerService:
-    """Orchestrates single-market and group analysis jobs end-to-end."""
-
-    def __init__(self, svc: SupabaseDataService):
+    """Orchestrates single-market and group analysis jobs end-to-end.
+
+    Args:
+        svc: Supabase data service (jobs, storage, output registry).
+        checkpoints: Store for per-market group job checkpoints — anything
+            exposing upsert_job_checkpoint/get_job_checkpoints, e.g. a local
+            TelecomDatabase. Defaults to ``svc`` (Supabase).
+        jobs: Store holding the analysis_jobs rows (get/update_analysis_job),
+            e.g. a local SQLiteJobQueue. Defaults to ``svc`` (Supabase).
+        pool: Optional WarmWorkerPool. When given, the engine run and output
+            generation execute on its pre-imported workers instead of here.
+    """
+
+    def __init__(self, svc: SupabaseDataService, checkpoints=None, jobs=None,
+                 pool=None):
         self.svc = svc
+        self.checkpoints = checkpoints if checkpoints is not None else svc
+        self.jobs = jobs if jobs is not None else svc
+        self.pool = pool
 
     # ==================================================================
     # Single-market analysis
@@ -37,7 +52,7 @@ class AnalysisRunnerService:
 
         Returns dict with status, output_count, and any error message.
         """
-        job = self.svc.get_analysis_job(job_id)
+        job = self.jobs.get_analysis_job(job_id)
         if not job:
             return {"status": "failed", "error": f"Job #{job_id} not found"}
 
@@ -111,9 +126,13 @@ class AnalysisRunnerService:
     def run_group(self, job_id: int) -> dict:
         """Execute a group analysis job — iterate markets + generate group summary.
 
+        Each completed market is checkpointed (result snapshot + uploaded
+        outputs). Re-running the same job skips checkpointed markets and
+        rebuilds their results from the snapshots for the group summary.
+
         Returns dict with status, per-market results, and output counts.
         """
-        job = self.svc.get_analysis_job(job_id)
+        job = self.jobs.get_analysis_job(job_id)
         if not job:
             return {"status": "failed", "error": f"Job #{job_id} not found"}
 
@@ -126,7 +145,11 @@ class AnalysisRunnerService:
         n_quarters = job.get("n_quarters", 8)
         selected_markets = config.get("selected_markets", [])
 
-        progress = {m: "pending" for m in selected_markets}
+        checkpoints = self._load_checkpoints(job_id)
+        progress = {
+            m: "completed" if m in checkpoints else "pending"
+            for m in selected_markets
+        }
         self._update_job(job_id, {
             "status": "running",
             "progress": json.dumps(progress),
@@ -142,6 +165,14 @@ class AnalysisRunnerService:
 
         # Run each market
         for market in selected_markets:
+            if market in checkpoints:
+                from src.output.json_exporter import result_from_json
+                cp = checkpoints[market]
+                market_results[market] = result_from_json(cp["snapshot"])
+                total_outputs += len(cp["outputs"])
+                print(f"  Market {market} restored from checkpoint")
+                continue
+
             operator = market_operator_map.get(market, "")
             if not operator:
                 progress[market] = "failed"
@@ -168,10 +199,19 @@ class AnalysisRunnerService:
                 self._update_job(job_id, {"progress": json.dumps(progress)})
 
                 output_files = self._generate_outputs(result, market, operator, period, tmp_dir)
-                self._upload_outputs(output_files, market, operator, period)
-                total_outputs += len(output_files)
-
-                progress[market] = "completed"
+                uploaded = self._upload_outputs(output_files, market, operator, period)
+                total_outputs += len(uploaded)
+
+                if len(uploaded) < len(output_files):
+                    # No checkpoint: resuming the job re-runs the market
+                    # and uploads its outputs again
+                    progress[market] = "failed"
+                    print(f"  [!] Market {market}: {len(output_files) - len(uploaded)} "
+                          f"of {len(output_files)} outputs not uploaded")
+                else:
+                    self._save_checkpoint(job_id, market, operator, period,
+                                          result, uploaded)
+                    progress[market] = "completed"
                 self._update_job(job_id, {"progress": json.dumps(progress)})
 
                 db.close()
@@ -245,7 +285,7 @@ class AnalysisRunnerService:
             feedback_to_key_message_overrides,
         )
 
-        job = self.svc.get_analysis_job(job_id)
+        job = self.jobs.get_analysis_job(job_id)
         if not job:
             return []
 
@@ -322,10 +362,10 @@ class AnalysisRunnerService:
 
         Returns an initialized TelecomDatabase instance.
         """
-        from src.database.db import TelecomDatabase
+        from src.database.db import DEFAULT_POOL_SIZE, TelecomDatabase
         from src.database.supabase_sync import BLMCloudSync
 
-        db = TelecomDatabase(db_path)
+        db = TelecomDatabase(db_path, pool_size=DEFAULT_POOL_SIZE)
         db.init()
 
         syncer = BLMCloudSync(local_db=db)
@@ -348,16 +388,23 @@ class AnalysisRunnerService:
                     job_id: int = None):
         """Instantiate and run BLMAnalysisEngine. Returns FiveLooksResult."""
         from src.blm.engine import BLMAnalysisEngine
+        from src.blm.result_cache import get_result_cache
 
         print(f"  Running BLM Five Looks: {operator} in {market} ({period})")
-        engine = BLMAnalysisEngine(
-            db=db,
-            target_operator=operator,
-            market=market,
-            target_period=period,
-            n_quarters=n_quarters,
-        )
-        result = engine.run_five_looks()
+        if self.pool is not None:
+            result = self.pool.run_engine(db.db_path, operator, market,
+                                          period, n_quarters)
+        else:
+            engine = BLMAnalysisEngine(
+                db=db,
+                target_operator=operator,
+                market=market,
+                target_period=period,
+                n_quarters=n_quarters,
+                parallel=True,
+                cache=get_result_cache(),
+            )
+            result = engine.run_five_looks()
         print(f"  Engine complete: {result.analysis_period}")
 
         # Persist provenance data if available
@@ -381,6 +428,10 @@ class AnalysisRunnerService:
 
         Each dict: {type, file_name, file_path, content_type, size_bytes}
         """
+        if self.pool is not None:
+            return self.pool.generate_outputs(result, market, operator,
+                                              period, tmp_dir)
+
         outputs = []
         output_dir = Path(tmp_dir) / "output"
         output_dir.mkdir(exist_ok=True)
@@ -576,10 +627,15 @@ class AnalysisRunnerService:
     # ==================================================================
 
     def _upload_outputs(self, output_files: list[dict], market: str,
-                        operator: str, period: str) -> None:
-        """Upload generated files to Supabase Storage + register in analysis_outputs."""
+                        operator: str, period: str) -> list[dict]:
+        """Upload generated files to Supabase Storage + register in analysis_outputs.
+
+        Returns the list of successfully uploaded outputs
+        ({type, file_name, storage_path, size_bytes}).
+        """
         self.svc.ensure_bucket(BUCKET)
         storage_prefix = f"{market}/{operator}/{period}"
+        uploaded = []
 
         for out in output_files:
             try:
@@ -603,10 +659,18 @@ class AnalysisRunnerService:
                     "file_size_bytes": out["size_bytes"],
                     "updated_at": datetime.utcnow().isoformat(),
                 })
+                uploaded.append({
+                    "type": out["type"],
+                    "file_name": out["file_name"],
+                    "storage_path": storage_path,
+                    "size_bytes": out["size_bytes"],
+                })
                 print(f"    Uploaded: {storage_path}")
             except Exception as e:
                 print(f"    [!] Upload failed for {out['file_name']}: {e}")
 
+        return uploaded
+
     def _upload_group_summary(self, output_files: list[dict],
                                group_id: str, period: str) -> None:
         """Upload group summary outputs."""
@@ -637,13 +701,67 @@ class AnalysisRunnerService:
             except Exception as e:
                 print(f"    [!] Group summary upload failed: {e}")
 
+    # ==================================================================
+    # Internal: group job checkpoints
+    # ==================================================================
+
+    def _save_checkpoint(self, job_id: int, market: str, operator: str,
+                         period: str, result, uploaded: list[dict]) -> None:
+        """Persist a completed market's result snapshot and uploaded outputs."""
+        try:
+            from src.output.json_exporter import BLMJsonExporter
+            snapshot = BLMJsonExporter().export(
+                result, include_provenance=False, indent=None,
+            )
+            self.checkpoints.upsert_job_checkpoint({
+                "analysis_job_id": job_id,
+                "market": market,
+                "operator_id": operator,
+                "analysis_period": period,
+                "result_snapshot": snapshot,
+                "outputs": json.dumps(uploaded),
+                "completed_at": datetime.utcnow().isoformat(),
+            })
+        except Exception as e:
+            print(f"  [!] Checkpoint save failed for {market}: {e}")
+
+    def _load_checkpoints(self, job_id: int) -> dict:
+        """Load completed-market checkpoints for a job.
+
+        Returns {market: {"snapshot": dict, "outputs": list[dict]}}.
+        Unreadable checkpoints are skipped so the market is re-run.
+        """
+        try:
+            rows = self.checkpoints.get_job_checkpoints(job_id)
+        except Exception as e:
+            print(f"  [!] Checkpoint load failed for job #{job_id}: {e}")
+            return {}
+
+        checkpoints = {}
+        for row in rows:
+            try:
+                snapshot = row.get("result_snapshot")
+                if isinstance(snapshot, str):
+                    snapshot = json.loads(snapshot)
+                outputs = row.get("outputs") or []
+                if isinstance(outputs, str):
+                    outputs = json.loads(outputs)
+            except (TypeError, json.JSONDecodeError):
+                continue
+            if snapshot:
+                checkpoints[row["market"]] = {
+                    "snapshot": snapshot,
+                    "outputs": outputs,
+                }
+        return checkpoints
+
     # ==================================================================
     # Internal: job update + cleanup
     # ==================================================================
 
     def _update_job(self, job_id: int, updates: dict) -> None:
         """Update analysis_jobs row."""
-        self.svc.update_analysis_job(job_id, updates)
+        self.jobs.update_analysis_job(job_id, updates)
 
     @staticmethod
     def _cleanup_temp(tmp_dir: Optional[str]) -> None:
@@ -173,7 +173,13 @@ class GroupSummaryGenerator:
             if comp:
                 forces = comp.five_forces if hasattr(comp, "five_forces") else {}
                 for force_name, force in forces.items():
-                    level = force.force_level if hasattr(force, "force_level") else str(force)
+                    if hasattr(force, "force_level"):
+                        level = force.force_level
+                    elif isinstance(force, dict):
+                        # Restored from a checkpoint snapshot
+                        level = force.get("force_level")
+                    else:
+                        level = str(force)
                     if level == "high":
                         all_threats.append(self._normalize_theme(f"High {force_name}"))
 
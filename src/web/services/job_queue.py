@@ -0,0 +1,289 @@
+"""Persistent analysis job queue with claim/lease semantics.
+
+Jobs live in the ``analysis_jobs`` table. Workers (``python -m src.worker``)
+claim a job by atomically moving it from 'pending' to 'running' and stamping
+a lease (owner + expiry). While a job runs, the worker heartbeats to extend
+the lease. If a worker dies, its lease expires and the job becomes visible
+to other workers again (the visibility timeout) until ``max_attempts`` is
+reached, after which it is marked failed.
+
+Two interchangeable stores expose the same job methods:
+  - SupabaseDataService (production, Supabase ``analysis_jobs``)
+  - SQLiteJobQueue (local stand-in, ``BLM_JOB_QUEUE_DB=data/job_queue.db``)
+
+``attempts`` doubles as the optimistic-concurrency token: a claim only
+succeeds if the row still has the attempts value the claimer read.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+
+# Default lease / visibility timeout for a claimed job (seconds)
+DEFAULT_LEASE_SECONDS = 300
+# Claims per job before an expired lease marks it failed
+DEFAULT_MAX_ATTEMPTS = 3
+
+_QUEUE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analysis_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_type TEXT NOT NULL,
+    group_id TEXT,
+    market TEXT,
+    target_operator TEXT,
+    analysis_period TEXT NOT NULL,
+    n_quarters INTEGER DEFAULT 8,
+    status TEXT DEFAULT 'pending',
+    progress TEXT DEFAULT '{}',
+    config TEXT DEFAULT '{}',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    completed_at TIMESTAMP,
+    error_message TEXT,
+    lease_owner TEXT,
+    lease_expires_at TIMESTAMP,
+    heartbeat_at TIMESTAMP,
+    attempts INTEGER DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON analysis_jobs(status);
+CREATE INDEX IF NOT EXISTS idx_jobs_lease ON analysis_jobs(status, lease_expires_at);
+"""
+
+_JOB_COLUMNS = (
+    "job_type", "group_id", "market", "target_operator", "analysis_period",
+    "n_quarters", "status", "progress", "config", "created_at", "started_at",
+    "completed_at", "error_message", "lease_owner", "lease_expires_at",
+    "heartbeat_at", "attempts",
+)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _iso(ts: datetime) -> str:
+    """Fixed-width ISO timestamp so SQLite string comparison orders correctly."""
+    return ts.isoformat(timespec="microseconds")
+
+
+def lease_fields(worker_id: str, lease_seconds: int, attempts: int) -> dict:
+    """Column updates that grant ``worker_id`` a fresh lease on a job."""
+    now = _utcnow()
+    return {
+        "status": "running",
+        "lease_owner": worker_id,
+        "lease_expires_at": _iso(now + timedelta(seconds=lease_seconds)),
+        "heartbeat_at": _iso(now),
+        "attempts": attempts + 1,
+    }
+
+
+def _locked(method):
+    """Run a SQLiteJobQueue method under the queue's connection lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class SQLiteJobQueue:
+    """Local SQLite stand-in for the Supabase ``analysis_jobs`` queue.
+
+    Claims run inside ``BEGIN IMMEDIATE`` so concurrent worker processes
+    sharing the file never receive the same job.  One instance may be
+    shared by the threads of a process (see get_job_store()): its
+    connection is used under a lock.
+
+    Args:
+        db_path: Path to the queue database. Use ":memory:" for testing.
+    """
+
+    def __init__(self, db_path: str = "data/job_queue.db"):
+        self.db_path = db_path
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode: transactions are opened explicitly for claims
+        self.conn = sqlite3.connect(db_path, isolation_level=None, timeout=30,
+                                    check_same_thread=False)
+        self._lock = threading.RLock()
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(_QUEUE_SCHEMA)
+
+    @_locked
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+    # ------------------------------------------------------------------
+    # Job CRUD (same signatures as SupabaseDataService)
+    # ------------------------------------------------------------------
+
+    @_locked
+    def create_analysis_job(self, job_data: dict) -> dict:
+        fields = {k: v for k, v in job_data.items() if k in _JOB_COLUMNS}
+        fields.setdefault("created_at", _iso(_utcnow()))
+        columns = ", ".join(fields.keys())
+        placeholders = ", ".join(["?"] * len(fields))
+        cursor = self.conn.execute(
+            f"INSERT INTO analysis_jobs ({columns}) VALUES ({placeholders})",
+            list(fields.values()),
+        )
+        return self.get_analysis_job(cursor.lastrowid) or {}
+
+    @_locked
+    def get_analysis_job(self, job_id: int) -> dict | None:
+        row = self.conn.execute(
+            "SELECT * FROM analysis_jobs WHERE id = ?", [job_id]
+        ).fetchone()
+        return dict(row) if row else None
+
+    @_locked
+    def update_analysis_job(self, job_id: int, updates: dict) -> dict | None:
+        fields = {k: v for k, v in updates.items() if k in _JOB_COLUMNS}
+        if fields:
+            assignments = ", ".join(f"{k} = ?" for k in fields)
+            self.conn.execute(
+                f"UPDATE analysis_jobs SET {assignments} WHERE id = ?",
+                list(fields.values()) + [job_id],
+            )
+        return self.get_analysis_job(job_id)
+
+    @_locked
+    def get_analysis_jobs(self, status: str | None = None) -> list[dict]:
+        if status:
+            rows = self.conn.execute(
+                "SELECT * FROM analysis_jobs WHERE status = ? ORDER BY created_at",
+                [status],
+            ).fetchall()
+        else:
+            rows = self.conn.execute(
+                "SELECT * FROM analysis_jobs ORDER BY created_at"
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    # ------------------------------------------------------------------
+    # Claim / lease
+    # ------------------------------------------------------------------
+
+    @_locked
+    def claim_analysis_job(self, worker_id: str,
+                           lease_seconds: int = DEFAULT_LEASE_SECONDS,
+                           max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> dict | None:
+        """Atomically claim the oldest pending or lease-expired job.
+
+        Returns the claimed job row, or None if the queue is empty.
+        """
+        now = _iso(_utcnow())
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Expired leases that have used up their attempts are failed
+            self.conn.execute(
+                """
+                UPDATE analysis_jobs
+                SET status = 'failed', lease_owner = NULL, completed_at = ?,
+                    error_message = 'Lease expired after ' || attempts || ' attempt(s)'
+                WHERE status = 'running' AND lease_owner IS NOT NULL
+                  AND lease_expires_at < ? AND attempts >= ?
+                """,
+                [now, now, max_attempts],
+            )
+            row = self.conn.execute(
+                """
+                SELECT id, attempts FROM analysis_jobs
+                WHERE status = 'pending'
+                   OR (status = 'running' AND lease_owner IS NOT NULL
+                       AND lease_expires_at < ?)
+                ORDER BY created_at ASC, id ASC
+                LIMIT 1
+                """,
+                [now],
+            ).fetchone()
+            if row is None:
+                self.conn.execute("COMMIT")
+                return None
+
+            fields = lease_fields(worker_id, lease_seconds, row["attempts"] or 0)
+            assignments = ", ".join(f"{k} = ?" for k in fields)
+            self.conn.execute(
+                f"UPDATE analysis_jobs SET {assignments} WHERE id = ?",
+                list(fields.values()) + [row["id"]],
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return self.get_analysis_job(row["id"])
+
+    @_locked
+    def heartbeat_analysis_job(self, job_id: int, worker_id: str,
+                               lease_seconds: int = DEFAULT_LEASE_SECONDS) -> bool:
+        """Extend the lease on a job. Returns False if the lease was lost."""
+        now = _utcnow()
+        cursor = self.conn.execute(
+            """
+            UPDATE analysis_jobs
+            SET lease_expires_at = ?, heartbeat_at = ?
+            WHERE id = ? AND lease_owner = ?
+            """,
+            [_iso(now + timedelta(seconds=lease_seconds)), _iso(now),
+             job_id, worker_id],
+        )
+        return cursor.rowcount > 0
+
+    @_locked
+    def release_analysis_job(self, job_id: int, worker_id: str) -> bool:
+        """Drop the lease once the worker has finished with a job.
+
+        A job still 'running' at release (runner crashed without setting a
+        final status) is marked failed so it is not retried indefinitely.
+        """
+        cursor = self.conn.execute(
+            """
+            UPDATE analysis_jobs
+            SET lease_owner = NULL, lease_expires_at = NULL,
+                status = CASE WHEN status = 'running' THEN 'failed' ELSE status END
+            WHERE id = ? AND lease_owner = ?
+            """,
+            [job_id, worker_id],
+        )
+        return cursor.rowcount > 0
+
+
+_queues: dict[str, SQLiteJobQueue] = {}
+_queues_lock = threading.Lock()
+
+
+def get_job_store(svc=None):
+    """Return the analysis job store.
+
+    Uses the local SQLite queue when BLM_JOB_QUEUE_DB is set (one
+    SQLiteJobQueue per path, cached for the process), otherwise the
+    Supabase data service (``svc`` or the default singleton).
+    """
+    queue_db = os.getenv("BLM_JOB_QUEUE_DB")
+    if queue_db:
+        with _queues_lock:
+            queue = _queues.get(queue_db)
+            if queue is None or queue.conn is None:
+                queue = _queues[queue_db] = SQLiteJobQueue(queue_db)
+        return queue
+    if svc is None:
+        from src.web.services.supabase_data import get_data_service
+        svc = get_data_service()
+    return svc
+
+
+def uses_external_workers() -> bool:
+    """True when jobs are executed by ``python -m src.worker`` processes
+    rather than in-process BackgroundTasks (BLM_JOB_QUEUE=worker)."""
+    return os.getenv("BLM_JOB_QUEUE", "inline").lower() == "worker"
+
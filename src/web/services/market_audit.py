@@ -399,10 +399,10 @@ class MarketAuditService:
 
     def _pull_market(self, market: str, db_path: str):
         """Reuse BLMCloudSync.pull_all() pattern from AnalysisRunnerService."""
-        from src.database.db import TelecomDatabase
+        from src.database.db import DEFAULT_POOL_SIZE, TelecomDatabase
         from src.database.supabase_sync import BLMCloudSync
 
-        db = TelecomDatabase(db_path)
+        db = TelecomDatabase(db_path, pool_size=DEFAULT_POOL_SIZE)
         db.init()
 
         syncer = BLMCloudSync(local_db=db)
@@ -513,6 +513,7 @@ class MarketAuditService:
         """Run BLMAnalysisEngine.run_five_looks(), return None on failure."""
         try:
             from src.blm.engine import BLMAnalysisEngine
+            from src.blm.result_cache import get_result_cache
 
             engine = BLMAnalysisEngine(
                 db=db,
@@ -520,6 +521,8 @@ class MarketAuditService:
                 market=market,
                 target_period=period,
                 n_quarters=n_quarters,
+                parallel=True,
+                cache=get_result_cache(),
             )
             return engine.run_five_looks()
         except Exception as e:
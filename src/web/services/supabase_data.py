@@ -380,6 +380,112 @@ class SupabaseDataService:
             filters["status"] = status
         return self._select("analysis_jobs", filters=filters, order="created_at")
 
+    def claim_analysis_job(self, worker_id: str,
+                           lease_seconds: int = 300,
+                           max_attempts: int = 3) -> dict | None:
+        """Claim the oldest pending or lease-expired job (see job_queue).
+
+        Compare-and-swap on (id, status, attempts): the conditional update
+        only matches if no other worker claimed the row in between.
+        """
+        from src.web.services.job_queue import _iso, _utcnow, lease_fields
+
+        now = _iso(_utcnow())
+        def table():
+            return self._client.table("analysis_jobs")
+
+        pending = (table().select("*").eq("status", "pending")
+                   .order("created_at").limit(10).execute().data or [])
+        expired = (table().select("*").eq("status", "running")
+                   .not_.is_("lease_owner", "null")
+                   .lt("lease_expires_at", now)
+                   .order("created_at").limit(10).execute().data or [])
+
+        for job in expired + pending:
+            attempts = job.get("attempts") or 0
+            if job["status"] == "running" and attempts >= max_attempts:
+                (table().update({
+                    "status": "failed",
+                    "lease_owner": None,
+                    "completed_at": now,
+                    "error_message": f"Lease expired after {attempts} attempt(s)",
+                }).eq("id", job["id"]).eq("attempts", attempts).execute())
+                continue
+            resp = (table().update(lease_fields(worker_id, lease_seconds, attempts))
+                    .eq("id", job["id"])
+                    .eq("status", job["status"])
+                    .eq("attempts", attempts)
+                    .execute())
+            if resp.data:
+                return resp.data[0]
+        return None
+
+    def heartbeat_analysis_job(self, job_id: int, worker_id: str,
+                               lease_seconds: int = 300) -> bool:
+        """Extend a job lease. Returns False if the lease was lost."""
+        from datetime import timedelta
+        from src.web.services.job_queue import _iso, _utcnow
+
+        now = _utcnow()
+        resp = (
+            self._client.table("analysis_jobs")
+            .update({
+                "lease_expires_at": _iso(now + timedelta(seconds=lease_seconds)),
+                "heartbeat_at": _iso(now),
+            })
+            .eq("id", job_id)
+            .eq("lease_owner", worker_id)
+            .execute()
+        )
+        return bool(resp.data)
+
+    def release_analysis_job(self, job_id: int, worker_id: str) -> bool:
+        """Drop a worker's lease; a job still 'running' is marked failed."""
+        job = self.get_analysis_job(job_id)
+        if not job or job.get("lease_owner") != worker_id:
+            return False
+        updates = {"lease_owner": None, "lease_expires_at": None}
+        if job.get("status") == "running":
+            updates["status"] = "failed"
+        resp = (
+            self._client.table("analysis_jobs")
+            .update(updates)
+            .eq("id", job_id)
+            .eq("lease_owner", worker_id)
+            .execute()
+        )
+        return bool(resp.data)
+
+    # ------------------------------------------------------------------
+    # Analysis Job Checkpoints
+    # ------------------------------------------------------------------
+
+    def upsert_job_checkpoint(self, checkpoint: dict) -> dict:
+        """Upsert a per-market job checkpoint. Conflict: analysis_job_id,market."""
+        resp = (
+            self._client.table("analysis_job_checkpoints")
+            .upsert(checkpoint, on_conflict="analysis_job_id,market")
+            .execute()
+        )
+        return resp.data[0] if resp.data else {}
+
+    def get_job_checkpoints(self, analysis_job_id: int) -> list[dict]:
+        return self._select(
+            "analysis_job_checkpoints",
+            filters={"analysis_job_id": analysis_job_id},
+            order="completed_at",
+        )
+
+    def clear_job_checkpoints(self, analysis_job_id: int) -> int:
+        """Delete all checkpoints for a job. Returns deleted count."""
+        resp = (
+            self._client.table("analysis_job_checkpoints")
+            .delete()
+            .eq("analysis_job_id", analysis_job_id)
+            .execute()
+        )
+        return len(resp.data) if resp.data else 0
+
     # ------------------------------------------------------------------
     # Extraction Jobs
     # ------------------------------------------------------------------
@@ -0,0 +1,231 @@
+"""Warm worker pool for analysis jobs.
+
+A cold process pays for importing the 22 MarketConfig modules, matplotlib,
+python-pptx, the operator directory and the PPT style tables before it can
+run a single Look. The pool keeps a few worker processes around that have
+already done that work, so each job only pays for the engine itself.
+
+Workers are forked from a ``forkserver`` that preloads ``WARM_MODULES``;
+each worker then runs ``warm_up()`` once (matplotlib font cache,
+operator style lookups). Jobs and results travel over the executor's pipes, which
+is why jobs take a SQLite *path* rather than an open TelecomDatabase.
+
+Workers are recycled after ``max_jobs_per_worker`` jobs to cap memory
+growth from matplotlib/pptx; replacements fork from the already-warm
+forkserver, so recycling stays cheap.
+
+Used by:
+  - cli_group_local.py ``--workers N``
+  - cli_analyze.py ``single/group --pool-workers N``
+  - the web runner when BLM_WARM_POOL_WORKERS is set
+"""
+
+from __future__ import annotations
+
+import importlib
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional
+
+
+# Default number of jobs a worker runs before it is replaced
+DEFAULT_MAX_JOBS_PER_WORKER = 50
+
+# Imported once in the forkserver; every worker inherits them
+WARM_MODULES = (
+    "src.models.market_configs",
+    "src.database.db",
+    "src.database.operator_directory",
+    "src.blm.engine",
+    "src.blm.look_at_trends",
+    "src.blm.look_at_market_customer",
+    "src.blm.look_at_competition",
+    "src.blm.look_at_self",
+    "src.blm.look_at_opportunities",
+    "src.blm.swot_synthesis",
+    "src.blm.analyze_tariffs",
+    "src.output.json_exporter",
+    "src.output.txt_formatter",
+    "src.output.html_generator",
+    "src.output.md_generator",
+    "src.output.ppt_styles",
+    "src.output.ppt_charts",
+    "src.output.ppt_generator",
+    "src.web.services.analysis_runner",
+    "matplotlib",
+    "matplotlib.pyplot",
+    "pptx",
+)
+
+
+def warm_up(modules: tuple = WARM_MODULES) -> dict:
+    """Import and prime everything a job needs. Runs once per worker.
+
+    Missing optional packages (pptx, matplotlib) are skipped, matching the
+    output generators which degrade without them.
+
+    Returns:
+        {module_name: seconds} for the modules that loaded.
+    """
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    timings = {}
+    for name in modules:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            continue
+        timings[name] = round(time.perf_counter() - start, 4)
+
+    # Resolve every operator's style once so first-job lookups are warm
+    try:
+        from src.database.operator_directory import OPERATOR_DIRECTORY
+        from src.output.ppt_styles import get_style
+        for operator_id in OPERATOR_DIRECTORY:
+            get_style(operator_id)
+    except ImportError:
+        pass
+
+    # First figure builds matplotlib's font cache
+    if "matplotlib.pyplot" in sys.modules:
+        plt = sys.modules["matplotlib.pyplot"]
+        plt.close(plt.figure())
+
+    return timings
+
+
+# ----------------------------------------------------------------------
+# Job functions (module-level so they can be pickled to workers)
+# ----------------------------------------------------------------------
+
+def run_engine_job(db_path: str, operator: str, market: str,
+                   period: str, n_quarters: int = 8):
+    """Run BLM Five Looks against the SQLite DB at ``db_path``."""
+    from src.blm.engine import BLMAnalysisEngine
+    from src.blm.result_cache import get_result_cache
+    from src.database.db import DEFAULT_POOL_SIZE, TelecomDatabase
+
+    db = TelecomDatabase(db_path, pool_size=DEFAULT_POOL_SIZE)
+    db.init()
+    try:
+        engine = BLMAnalysisEngine(
+            db=db,
+            target_operator=operator,
+            market=market,
+            target_period=period,
+            n_quarters=n_quarters,
+            parallel=True,
+            cache=get_result_cache(),
+        )
+        return engine.run_five_looks()
+    finally:
+        db.close()
+
+
+def generate_outputs_job(result, market: str, operator: str,
+                         period: str, tmp_dir: str) -> list[dict]:
+    """Render JSON/TXT/HTML/PPT/MD for ``result`` into ``tmp_dir``."""
+    from src.web.services.analysis_runner import AnalysisRunnerService
+    return AnalysisRunnerService(None)._generate_outputs(
+        result, market, operator, period, tmp_dir
+    )
+
+
+# ----------------------------------------------------------------------
+# Pool
+# ----------------------------------------------------------------------
+
+def _pool_context():
+    """forkserver where available (preloaded, fork-safe); spawn elsewhere."""
+    methods = multiprocessing.get_all_start_methods()
+    if "forkserver" in methods:
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(list(WARM_MODULES))
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+class WarmWorkerPool:
+    """Pre-started, pre-imported process pool for engine and output jobs.
+
+    Args:
+        workers: Number of worker processes.
+        max_jobs_per_worker: Jobs a worker runs before it is replaced.
+            0 or None keeps workers for the pool's lifetime.
+    """
+
+    def __init__(self, workers: int = 2,
+                 max_jobs_per_worker: Optional[int] = DEFAULT_MAX_JOBS_PER_WORKER):
+        self.workers = max(1, workers)
+        self.max_jobs_per_worker = max_jobs_per_worker or None
+        kwargs = {
+            "max_workers": self.workers,
+            "mp_context": _pool_context(),
+            "initializer": warm_up,
+        }
+        if self.max_jobs_per_worker and sys.version_info >= (3, 11):
+            kwargs["max_tasks_per_child"] = self.max_jobs_per_worker
+        elif self.max_jobs_per_worker:
+            print("  [i] Worker recycling needs Python 3.11+; "
+                  "workers will live for the pool's lifetime")
+        self._executor = ProcessPoolExecutor(**kwargs)
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """Schedule a picklable callable on a warm worker."""
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def prestart(self, wait: bool = True) -> None:
+        """Start every worker and warm it up.
+
+        With ``wait=False`` the workers warm up in the background while the
+        caller carries on (e.g. seeding the database they will read).
+        """
+        futures = [self._executor.submit(os.getpid) for _ in range(self.workers)]
+        if wait:
+            for f in futures:
+                f.result()
+
+    def run_engine(self, db_path: str, operator: str, market: str,
+                   period: str, n_quarters: int = 8):
+        """Run Five Looks on a warm worker and return the FiveLooksResult."""
+        return self.submit(run_engine_job, db_path, operator, market,
+                           period, n_quarters).result()
+
+    def generate_outputs(self, result, market: str, operator: str,
+                         period: str, tmp_dir: str) -> list[dict]:
+        """Render all output files on a warm worker."""
+        return self.submit(generate_outputs_job, result, market, operator,
+                           period, tmp_dir).result()
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        return False
+
+
+_pool: Optional[WarmWorkerPool] = None
+
+
+def get_warm_pool() -> Optional[WarmWorkerPool]:
+    """Process-wide pool for the web runner, or None if disabled.
+
+    Enabled by BLM_WARM_POOL_WORKERS=N (N > 0); recycling is tuned with
+    BLM_WARM_POOL_MAX_JOBS (default: 50, 0 = never recycle).
+    """
+    global _pool
+    workers = int(os.getenv("BLM_WARM_POOL_WORKERS", "0") or 0)
+    if workers <= 0:
+        return None
+    if _pool is None:
+        max_jobs = int(os.getenv("BLM_WARM_POOL_MAX_JOBS",
+                                 str(DEFAULT_MAX_JOBS_PER_WORKER)))
+        _pool = WarmWorkerPool(workers=workers, max_jobs_per_worker=max_jobs)
+    return _pool
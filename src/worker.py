@@ -0,0 +1,276 @@
+"""Standalone analysis job worker.
+
+Claims analysis jobs from the persistent ``analysis_jobs`` queue and runs
+them outside the web process, so engine + PPT work never competes with
+request handling. Claimed jobs carry a lease that the worker extends with
+heartbeats; if a worker dies, the lease expires and another worker retries
+the job (group jobs resume from their per-market checkpoints).  A worker
+that loses its lease (e.g. stalled past the visibility timeout) abandons
+the job at its next status update, leaving it to the worker that
+reclaimed it.
+
+The web app hands jobs to workers when started with BLM_JOB_QUEUE=worker.
+
+Usage:
+    python3 -m src.worker                                   # 1 worker, Supabase queue
+    python3 -m src.worker --concurrency 4                   # 4 worker processes
+    python3 -m src.worker --queue-db data/job_queue.db      # local SQLite queue
+    python3 -m src.worker --once                            # drain the queue, then exit
+    python3 -m src.worker --lease-seconds 600 --heartbeat-seconds 120
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import threading
+import traceback
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+_project_root = Path(__file__).resolve().parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from src.web.services.job_queue import (
+    DEFAULT_LEASE_SECONDS,
+    DEFAULT_MAX_ATTEMPTS,
+    SQLiteJobQueue,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Set by SIGTERM/SIGINT: finish the current job, then exit
+_shutdown = threading.Event()
+
+
+@dataclass
+class WorkerOptions:
+    """Tuning knobs shared by every worker slot."""
+    lease_seconds: int = DEFAULT_LEASE_SECONDS      # visibility timeout
+    heartbeat_seconds: int = 60
+    poll_seconds: float = 5.0
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    queue_db: Optional[str] = None                  # None = Supabase analysis_jobs
+    once: bool = False                              # exit when the queue is empty
+
+
+class LeaseLost(RuntimeError):
+    """The worker no longer holds the lease on the job it is running."""
+
+
+class _Heartbeat(threading.Thread):
+    """Extends a job lease every ``heartbeat_seconds`` until stopped.
+
+    Sets ``lease_lost`` when the lease has passed to another worker.
+    """
+
+    def __init__(self, jobs_factory, job_id: int, worker_id: str,
+                 opts: WorkerOptions):
+        super().__init__(daemon=True, name=f"heartbeat-{job_id}")
+        self._jobs_factory = jobs_factory
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.opts = opts
+        self._stop_event = threading.Event()
+        self.lease_lost = threading.Event()
+
+    def run(self):
+        # The heartbeat has its own store, so it never waits on the runner's
+        jobs = self._jobs_factory()
+        try:
+            while not self._stop_event.wait(self.opts.heartbeat_seconds):
+                try:
+                    alive = jobs.heartbeat_analysis_job(
+                        self.job_id, self.worker_id, self.opts.lease_seconds
+                    )
+                except Exception as e:
+                    logger.warning("Heartbeat failed for job #%s: %s", self.job_id, e)
+                    continue
+                if not alive:
+                    logger.warning("Lease lost for job #%s: abandoning it", self.job_id)
+                    self.lease_lost.set()
+                    return
+        finally:
+            if isinstance(jobs, SQLiteJobQueue):
+                jobs.close()
+
+    def stop(self):
+        self._stop_event.set()
+        self.join(timeout=5)
+
+
+class _LeasedJobs:
+    """Job store of a running job that refuses job updates once its lease is lost.
+
+    The runner reports progress and the final status through
+    update_analysis_job, so a job whose lease was reclaimed stops at its
+    next update and never writes a completion over the new owner's run.
+    """
+
+    def __init__(self, jobs, lease_lost: threading.Event):
+        self._jobs = jobs
+        self._lease_lost = lease_lost
+
+    def update_analysis_job(self, job_id: int, updates: dict):
+        if self._lease_lost.is_set():
+            raise LeaseLost(f"Lease on job #{job_id} was lost")
+        return self._jobs.update_analysis_job(job_id, updates)
+
+    def __getattr__(self, name):
+        return getattr(self._jobs, name)
+
+
+def _open_job_store(opts: WorkerOptions, svc):
+    """Job store for this process: local SQLite queue or the Supabase service."""
+    if opts.queue_db:
+        return SQLiteJobQueue(opts.queue_db)
+    return svc
+
+
+def process_job(job: dict, worker_id: str, jobs, svc,
+                opts: WorkerOptions) -> dict:
+    """Run one claimed job under a heartbeat, then release its lease."""
+    from src.web.services.analysis_runner import AnalysisRunnerService
+    from src.web.services.warm_pool import get_warm_pool
+
+    job_id = job["id"]
+    heartbeat = _Heartbeat(lambda: _open_job_store(opts, svc),
+                           job_id, worker_id, opts)
+    heartbeat.start()
+    try:
+        runner = AnalysisRunnerService(svc, jobs=_LeasedJobs(jobs, heartbeat.lease_lost),
+                                       pool=get_warm_pool())
+        if job.get("job_type") == "group_analysis":
+            result = runner.run_group(job_id)
+        else:
+            result = runner.run_single(job_id)
+    except LeaseLost as e:
+        logger.warning("Job #%s abandoned: %s", job_id, e)
+        result = {"status": "lease_lost", "error": str(e)}
+    except Exception as e:
+        traceback.print_exc()
+        result = {"status": "failed", "error": f"{type(e).__name__}: {e}"}
+    finally:
+        heartbeat.stop()
+        jobs.release_analysis_job(job_id, worker_id)
+    return result
+
+
+def run_worker(slot: int, opts: WorkerOptions, svc=None, jobs=None) -> int:
+    """Claim-and-run loop for one worker slot. Returns jobs processed."""
+    if svc is None:
+        from src.cli_analyze import _get_service
+        svc = _get_service()
+    if jobs is None:
+        jobs = _open_job_store(opts, svc)
+
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{slot}"
+    print(f"[worker {worker_id}] started "
+          f"(lease={opts.lease_seconds}s, heartbeat={opts.heartbeat_seconds}s)")
+
+    processed = 0
+    while not _shutdown.is_set():
+        try:
+            job = jobs.claim_analysis_job(
+                worker_id, opts.lease_seconds, opts.max_attempts
+            )
+        except Exception as e:
+            print(f"[worker {worker_id}] claim failed: {e}")
+            job = None
+
+        if job is None:
+            if opts.once:
+                break
+            _shutdown.wait(opts.poll_seconds)
+            continue
+
+        print(f"[worker {worker_id}] job #{job['id']} "
+              f"({job.get('job_type')}, attempt {job.get('attempts')})")
+        result = process_job(job, worker_id, jobs, svc, opts)
+        print(f"[worker {worker_id}] job #{job['id']} -> {result.get('status')}")
+        processed += 1
+
+    print(f"[worker {worker_id}] stopped after {processed} job(s)")
+    return processed
+
+
+def _request_shutdown(signum, frame):
+    _shutdown.set()
+
+
+def _worker_process(slot: int, opts: WorkerOptions) -> None:
+    signal.signal(signal.SIGTERM, _request_shutdown)
+    signal.signal(signal.SIGINT, _request_shutdown)
+    run_worker(slot, opts)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="BLM analysis job worker — runs queued analysis jobs"
+    )
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Number of worker processes (default: 1)")
+    parser.add_argument("--lease-seconds", type=int, default=DEFAULT_LEASE_SECONDS,
+                        help=f"Visibility timeout before a silent job is retried "
+                             f"(default: {DEFAULT_LEASE_SECONDS})")
+    parser.add_argument("--heartbeat-seconds", type=int, default=60,
+                        help="Lease renewal interval (default: 60)")
+    parser.add_argument("--poll-seconds", type=float, default=5.0,
+                        help="Idle wait between queue polls (default: 5)")
+    parser.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS,
+                        help=f"Claims per job before it is failed "
+                             f"(default: {DEFAULT_MAX_ATTEMPTS})")
+    parser.add_argument("--queue-db", default=os.getenv("BLM_JOB_QUEUE_DB"),
+                        help="Local SQLite queue path (default: Supabase analysis_jobs)")
+    parser.add_argument("--once", action="store_true",
+                        help="Exit once the queue is empty")
+    args = parser.parse_args()
+
+    if args.heartbeat_seconds >= args.lease_seconds:
+        print("ERROR: --heartbeat-seconds must be shorter than --lease-seconds")
+        sys.exit(1)
+
+    opts = WorkerOptions(
+        lease_seconds=args.lease_seconds,
+        heartbeat_seconds=args.heartbeat_seconds,
+        poll_seconds=args.poll_seconds,
+        max_attempts=args.max_attempts,
+        queue_db=args.queue_db,
+        once=args.once,
+    )
+
+    if args.concurrency <= 1:
+        signal.signal(signal.SIGTERM, _request_shutdown)
+        signal.signal(signal.SIGINT, _request_shutdown)
+        run_worker(0, opts)
+        return
+
+    procs = [
+        multiprocessing.Process(target=_worker_process, args=(slot, opts),
+                                name=f"blm-worker-{slot}")
+        for slot in range(args.concurrency)
+    ]
+    for p in procs:
+        p.start()
+
+    def _forward(signum, frame):
+        for p in procs:
+            if p.is_alive():
+                os.kill(p.pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, _forward)
+    signal.signal(signal.SIGINT, _forward)
+    for p in procs:
+        p.join()
+
+
+if __name__ == "__main__":
+    main()
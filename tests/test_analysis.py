@@ -116,6 +116,17 @@ class TestBudgetAnalyzer:
         assert "yoy_change" in result.details.columns
         assert "yoy_change_pct" in result.details.columns
 
+    def test_year_over_year_totals_match_row_sums(self):
+        from src.data.sample import generate_sample_data
+
+        df = generate_sample_data(n_records=2000, seed=1)
+        summary = BudgetAnalyzer(df).year_over_year().summary
+        years = sorted(df["fiscal_year"].unique())
+        assert summary["first_year_total"] == float(
+            df[df["fiscal_year"] == years[0]]["amount"].sum())
+        assert summary["last_year_total"] == float(
+            df[df["fiscal_year"] == years[-1]]["amount"].sum())
+
     def test_year_over_year_with_category(self, analyzer):
         result = analyzer.year_over_year(
             amount_col="amount", year_col="fiscal_year", category_col="category"
@@ -139,3 +150,96 @@ class TestBudgetAnalyzer:
     def test_state_comparison_missing_column(self, analyzer):
         with pytest.raises(ValueError, match="not found"):
             analyzer.state_comparison(amount_col="amount", state_col="nonexistent")
+
+
+@pytest.fixture
+def ledger():
+    """Unsorted ledger with missing amounts, dates and categories."""
+    rng = np.random.default_rng(7)
+    n = 2000
+    df = pd.DataFrame({
+        "category": rng.choice(["Wildlife", "Forestry", "Mining", None], n),
+        "amount": rng.normal(1000, 300, n).round(2),
+        "budget": rng.integers(0, 2000, n).astype(float),
+        "actual": rng.normal(1000, 300, n).round(2),
+        "date": pd.Timestamp("2019-01-01") + pd.to_timedelta(rng.integers(0, 1800, n), unit="D"),
+        "fiscal_year": rng.integers(2019, 2024, n),
+        "state": rng.choice(["Nevada", "Colorado", "Montana"], n),
+    })
+    df.loc[rng.random(n) < 0.05, "amount"] = np.nan
+    df.loc[rng.random(n) < 0.02, "date"] = pd.NaT
+    # A gap: no entries at all in mid-2020
+    return df[~df["date"].between("2020-04-01", "2020-09-30")].reset_index(drop=True)
+
+
+def _assert_same_result(left, right):
+    assert left.name == right.name
+    assert left.summary == right.summary
+    pd.testing.assert_frame_equal(left.details, right.details, check_exact=True)
+
+
+class TestRunAll:
+    @pytest.mark.parametrize("freq", ["YE", "QE", "ME"])
+    def test_matches_separate_calls(self, ledger, freq):
+        separate = BudgetAnalyzer(ledger)
+        expected = [
+            separate.summary_statistics(amount_col="amount", group_col="category"),
+            separate.budget_variance(category_col="category"),
+            separate.trend_analysis(freq=freq),
+            separate.detect_anomalies(threshold=1.5),
+            separate.category_breakdown(),
+            separate.year_over_year(category_col="category"),
+            separate.state_comparison(),
+        ]
+        fused = BudgetAnalyzer(ledger).run_all(freq=freq, threshold=1.5)
+        assert len(fused) == len(expected)
+        for left, right in zip(expected, fused):
+            _assert_same_result(left, right)
+
+    @pytest.mark.parametrize("freq", ["YE", "QE", "QE-MAR", "ME", "2QE", "W"])
+    def test_trend_matches_resample(self, ledger, freq):
+        clean = ledger.dropna(subset=["date", "amount"]).set_index("date")
+        expected = clean["amount"].resample(freq).agg(["sum", "mean", "count"]).reset_index()
+        result = BudgetAnalyzer(ledger).trend_analysis(freq=freq)
+        details = result.details[["date", "total", "average", "count"]]
+        expected.columns = details.columns
+        pd.testing.assert_frame_equal(details, expected, check_exact=True)
+
+    @pytest.mark.parametrize("keys", ["text", "categorical", "mixed"])
+    def test_grouping_matches_groupby(self, ledger, keys):
+        df = ledger.copy()
+        if keys == "categorical":
+            df["category"] = df["category"].astype("category")
+        elif keys == "mixed":
+            df["category"] = np.where(df.index % 2, df["category"], df.index % 3).astype(object)
+        funcs = ["count", "sum", "mean", "median", "std", "min", "max"]
+        expected = df.groupby("category")["amount"].agg(funcs).reset_index()
+        result = BudgetAnalyzer(df).summary_statistics(amount_col="amount", group_col="category")
+        pd.testing.assert_frame_equal(result.details, expected, check_exact=True)
+
+    def test_keys_factorized_once(self, ledger, monkeypatch):
+        from src.analysis import financial
+
+        seen = []
+        original = financial._GroupKey.__init__
+
+        def counting(self, values):
+            seen.append(values.name)
+            original(self, values)
+
+        monkeypatch.setattr(financial._GroupKey, "__init__", counting)
+        analyzer = BudgetAnalyzer(ledger)
+        analyzer.run_all()
+        assert sorted(seen) == ["category", "fiscal_year", "state"]
+        assert analyzer._shared is None
+
+    def test_progress_and_missing_columns(self, ledger):
+        messages = []
+        results = BudgetAnalyzer(ledger.drop(columns=["date", "state"])).run_all(
+            progress=messages.append)
+        assert [r.name for r in results] == [
+            "summary_statistics", "budget_variance", "anomaly_detection",
+            "category_breakdown", "year_over_year",
+        ]
+        assert messages[0] == "Running summary statistics..."
+        assert len(messages) == len(results)
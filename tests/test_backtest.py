@@ -0,0 +1,178 @@
+"""Tests for the rolling multi-period back-test.
+
+Covers:
+- period_range and HistoryDatabase window slicing
+- RollingTrendStats matches trend_analyzer on every window, gaps included
+- Back-test results match separate per-period engine runs
+- Period-over-period diffs of key messages, health ratings, SPAN quadrants
+"""
+import contextlib
+import copy
+import io
+import json
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.blm.backtest import (
+    HistoryDatabase, RollingTrendStats, diff_results, period_range, run_backtest,
+)
+from src.blm.engine import BLMAnalysisEngine
+from src.blm.trend_analyzer import compute_trend_slope, compute_volatility
+from src.database.seed_germany import seed_all
+from src.output.json_exporter import BLMJsonExporter
+
+
+@pytest.fixture(scope="module")
+def germany_db():
+    with contextlib.redirect_stdout(io.StringIO()):
+        db = seed_all(":memory:")
+    yield db
+    db.close()
+
+
+@pytest.fixture(scope="module")
+def backtest(germany_db):
+    return run_backtest(germany_db, "vodafone_germany", "germany",
+                        "CQ2_2025", "CQ4_2025", n_quarters=4)
+
+
+def _snapshot(result) -> dict:
+    data = json.loads(BLMJsonExporter().export(result, include_provenance=False))
+    data["meta"].pop("generated_at")
+    return data
+
+
+# =====================================================================
+# History
+# =====================================================================
+
+class TestHistory:
+    def test_period_range(self):
+        assert period_range("CQ3_2024", "CQ2_2025") == [
+            "CQ3_2024", "CQ4_2024", "CQ1_2025", "CQ2_2025"]
+        with pytest.raises(ValueError):
+            period_range("CQ1_2026", "CQ4_2025")
+
+    def test_windows_match_database(self, germany_db):
+        history = HistoryDatabase(germany_db, period_range("CQ1_2024", "CQ4_2025"))
+        for end_cq in ("CQ2_2025", "CQ4_2025"):
+            assert (history.get_financial_timeseries("vodafone_germany", 4, end_cq)
+                    == germany_db.get_financial_timeseries("vodafone_germany", 4, end_cq))
+            assert (history.get_market_timeseries("germany", 3, end_cq)
+                    == germany_db.get_market_timeseries("germany", 3, end_cq))
+            assert (history.get_market_subscriber_timeseries("germany", 2, end_cq)
+                    == germany_db.get_market_subscriber_timeseries("germany", 2, end_cq))
+
+    def test_history_loaded_once(self, germany_db, monkeypatch):
+        calls = []
+        real = germany_db.get_financial_timeseries
+        monkeypatch.setattr(germany_db, "get_financial_timeseries",
+                            lambda *a, **kw: calls.append(a) or real(*a, **kw))
+        history = HistoryDatabase(germany_db, period_range("CQ1_2024", "CQ4_2025"))
+        for end_cq in period_range("CQ4_2024", "CQ4_2025"):
+            history.get_financial_timeseries("vodafone_germany", 4, end_cq)
+        assert len(calls) == 1
+        # Outside the loaded range: straight to the database
+        history.get_financial_timeseries("vodafone_germany", 4, "CQ1_2026")
+        assert len(calls) == 2
+
+
+# =====================================================================
+# Rolling statistics
+# =====================================================================
+
+class TestRollingTrendStats:
+    def test_matches_trend_analyzer(self):
+        rng = random.Random(7)
+        values = [rng.uniform(500, 5000) for _ in range(40)]
+        values[12] = values[13] = None
+        rolling = RollingTrendStats(8)
+        for i, value in enumerate(values):
+            rolling.push(value)
+            window = [v for v in values[max(0, i - 7):i + 1] if v is not None]
+            stats = rolling.stats()
+            assert stats["n"] == len(window)
+            if len(window) < 2:
+                continue
+            assert stats["slope"] == pytest.approx(compute_trend_slope(window))
+            assert stats["volatility"] == pytest.approx(compute_volatility(window))
+            assert stats["mean"] == pytest.approx(sum(window) / len(window))
+
+    def test_short_window(self):
+        rolling = RollingTrendStats(4)
+        rolling.push(10)
+        assert rolling.stats() == {"n": 1, "mean": 10.0, "slope": None,
+                                   "volatility": None}
+
+
+# =====================================================================
+# Back-test
+# =====================================================================
+
+class TestBacktest:
+    def test_one_result_per_period(self, backtest):
+        assert [s.period for s in backtest.periods] == [
+            "CQ2_2025", "CQ3_2025", "CQ4_2025"]
+        assert backtest.periods[0].changes is None
+        assert all(s.changes is not None for s in backtest.periods[1:])
+
+    def test_matches_separate_runs(self, germany_db, backtest):
+        for step in backtest.periods:
+            alone = BLMAnalysisEngine(germany_db, "vodafone_germany", "germany",
+                                      target_period=step.period,
+                                      n_quarters=4).run_five_looks()
+            assert _snapshot(step.result) == _snapshot(alone), step.period
+
+    def test_trend_stats_follow_window(self, germany_db, backtest):
+        step = backtest.by_period()["CQ3_2025"]
+        revenue = [r["total_revenue"] for r in germany_db.get_financial_timeseries(
+            "vodafone_germany", n_quarters=4, end_cq="CQ3_2025")]
+        assert step.trend_stats["total_revenue"]["slope"] == pytest.approx(
+            compute_trend_slope(revenue))
+
+    def test_failed_period_skipped(self, germany_db, monkeypatch):
+        real_run = BLMAnalysisEngine.run_five_looks
+
+        def flaky(self):
+            if self.target_period == "CQ3_2025":
+                raise RuntimeError("boom")
+            return real_run(self)
+
+        monkeypatch.setattr(BLMAnalysisEngine, "run_five_looks", flaky)
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            bt = run_backtest(germany_db, "vodafone_germany", "germany",
+                              "CQ2_2025", "CQ4_2025", n_quarters=4)
+        assert [s.period for s in bt.periods] == ["CQ2_2025", "CQ4_2025"]
+        assert "Back-test run failed for CQ3_2025" in out.getvalue()
+
+
+# =====================================================================
+# Diff
+# =====================================================================
+
+class TestDiff:
+    def test_identical_results_have_no_changes(self, backtest):
+        result = backtest.periods[-1].result
+        assert diff_results(result, result) == {
+            "key_messages": {}, "health_ratings": {}, "span_quadrants": {}}
+
+    def test_reports_changed_fields(self, backtest):
+        before = backtest.periods[-1].result
+        after = copy.deepcopy(before)
+        after.self_analysis.health_rating = "critical"
+        after.swot.key_message = "changed"
+        moved = after.opportunities.span_positions[0]
+        moved.quadrant = "avoid_exit" if moved.quadrant != "avoid_exit" else "harvest"
+
+        changes = diff_results(before, after)
+        assert changes["health_ratings"] == {
+            "vodafone_germany": [before.self_analysis.health_rating, "critical"]}
+        assert changes["key_messages"] == {
+            "swot": [before.swot.key_message, "changed"]}
+        assert list(changes["span_quadrants"]) == [moved.opportunity_name]
@@ -1,6 +1,10 @@
 """Tests for TelecomDatabase and seed data integrity."""
 
+import gc
+import sqlite3
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from pathlib import Path
 
@@ -352,6 +356,191 @@ class TestContextManager:
             assert len(ops) == 1
 
 
+# ============================================================================
+# Pooled Mode
+# ============================================================================
+
+class TestPooledMode:
+
+    @pytest.fixture
+    def pooled_db(self, tmp_path):
+        with TelecomDatabase(str(tmp_path / "pool.db"), pool_size=2,
+                             cache_size_kib=1024, mmap_size=1 << 20) as db:
+            db.upsert_operator("op1", display_name="Op1", country="DE", market="de")
+            yield db
+
+    def test_reader_is_read_only_and_tuned(self, pooled_db):
+        with pooled_db.reader() as conn:
+            assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -1024
+            assert conn.execute("PRAGMA mmap_size").fetchone()[0] == 1 << 20
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM operators")
+
+    def test_readers_are_reused_and_bounded(self, pooled_db):
+        with pooled_db.reader() as first:
+            pass
+        with pooled_db.reader() as again, pooled_db.reader() as other:
+            assert again is first
+            assert other is not first
+            # Both slots taken: a third checkout would block
+            assert not pooled_db._reader_slots.acquire(blocking=False)
+        assert len(pooled_db._idle) == 2
+
+    def test_writer_from_other_thread(self, pooled_db):
+        def write():
+            with pooled_db.writer() as conn:
+                conn.execute("UPDATE operators SET display_name = 'Renamed'")
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pool.submit(write).result()
+        with pooled_db.reader() as conn:
+            name = conn.execute("SELECT display_name FROM operators").fetchone()[0]
+        assert name == "Renamed"
+
+    def test_upserts_from_other_threads(self, pooled_db):
+        def upsert(i):
+            pooled_db.upsert_operator(f"op{i}", display_name=f"Op{i}",
+                                      country="DE", market="de")
+            pooled_db.upsert_competitive_scores(f"op{i}", "CQ4_2025", {"Brand": i})
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(upsert, range(2, 18)))
+        assert len(pooled_db.get_operators_in_market("de")) == 17
+        versions = pooled_db.get_change_versions("de")
+        assert versions[("operators", "op17")] == 1
+        assert versions[("competitive_scores", "op2")] == 1
+
+    def test_writer_rolls_back_on_error(self, pooled_db):
+        with pytest.raises(RuntimeError):
+            with pooled_db.writer() as conn:
+                conn.execute("DELETE FROM operators")
+                raise RuntimeError("abort")
+        assert len(pooled_db.get_operators_in_market("de")) == 1
+
+    def test_thread_reads_go_through_pool(self, pooled_db):
+        def read():
+            try:
+                return len(pooled_db.get_operators_in_market("de"))
+            finally:
+                pooled_db.release_thread_connection()
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            counts = list(pool.map(lambda _: read(), range(8)))
+        assert counts == [1] * 8
+        assert len(pooled_db._readers) <= 2
+
+    @pytest.mark.parametrize("pool_size", [0, 2])
+    def test_thread_readers_given_back_when_threads_end(self, tmp_path, pool_size):
+        with TelecomDatabase(str(tmp_path / "threads.db"), pool_size=pool_size) as db:
+            db.upsert_operator("op1", display_name="Op1", country="DE", market="de")
+            counts = []
+            for _ in range(10):
+                thread = threading.Thread(
+                    target=lambda: counts.append(len(db.get_operators_in_market("de"))),
+                    daemon=True)
+                thread.start()
+                # A reader that is never given back blocks the next pooled checkout
+                thread.join(timeout=5)
+                assert not thread.is_alive()
+            gc.collect()
+            assert counts == [1] * 10
+            assert len(db._readers) == (1 if pool_size else 0)
+            assert len(db._idle) == len(db._readers)
+
+    def test_memory_reader_uses_main_connection(self):
+        with TelecomDatabase(":memory:", pool_size=2) as db:
+            with db.reader() as conn:
+                assert conn is db.conn
+
+
+# ============================================================================
+# Intelligence Event Search
+# ============================================================================
+
+class TestIntelligenceSearch:
+
+    @pytest.fixture
+    def events_db(self, db):
+        db.upsert_operator("op1", display_name="Op1", country="DE", market="de")
+        for event_date, category, title, description in [
+            ("2025-12-01", "competitive", "Op1 ACQUIRES regional fibre player", None),
+            ("2025-11-15", "competitive", "Op1 signs JV with tower co", "network"),
+            ("2025-10-01", "regulatory", "Spectrum auction results", "Op1 buys 5G blocks"),
+            ("2024-01-01", "competitive", "Op1 acquisition of cable assets", None),
+            ("2026-02-01", "competitive", "Op1 acquires MVNO", None),
+        ]:
+            db.upsert_intelligence({
+                "operator_id": "op1", "market": "de", "event_date": event_date,
+                "category": category, "title": title, "description": description,
+            })
+        return db
+
+    def _titles(self, events):
+        return [e["title"] for e in events]
+
+    def test_fts_index_available(self, db):
+        assert db.has_event_fts
+
+    def test_as_of_window_is_deterministic(self, events_db):
+        events = events_db.get_intelligence_events(
+            market="de", days_back=365, as_of=date(2026, 1, 1))
+        assert self._titles(events) == [
+            "Op1 ACQUIRES regional fibre player",
+            "Op1 signs JV with tower co",
+            "Spectrum auction results",
+        ]
+
+    def test_keywords_match_case_insensitive_substrings(self, events_db):
+        events = events_db.search_intelligence_events(
+            market="de", keywords={"acqui", "jv "}, days_back=365,
+            as_of=date(2026, 1, 1))
+        assert self._titles(events) == [
+            "Op1 ACQUIRES regional fibre player", "Op1 signs JV with tower co"]
+
+    def test_description_and_category_filters(self, events_db):
+        as_of = date(2026, 1, 1)
+        assert events_db.search_intelligence_events(
+            keywords={"buys "}, days_back=365, as_of=as_of) == []
+        ids = events_db.search_intelligence_events(
+            keywords={"buys "}, columns=("title", "description"),
+            days_back=365, as_of=as_of, ids_only=True)
+        assert len(ids) == 1
+        events = events_db.search_intelligence_events(
+            categories=["regulatory"], days_back=365, as_of=as_of)
+        assert self._titles(events) == ["Spectrum auction results"]
+
+    def test_short_keywords_fall_back(self, events_db):
+        events = events_db.search_intelligence_events(
+            keywords={"jv"}, days_back=365, as_of=date(2026, 1, 1))
+        assert self._titles(events) == ["Op1 signs JV with tower co"]
+
+    def test_index_follows_updates_and_deletes(self, events_db):
+        conn = events_db.conn
+        conn.execute("UPDATE intelligence_events SET title = 'Op1 merger talks' "
+                     "WHERE title LIKE 'Spectrum%'")
+        conn.execute("DELETE FROM intelligence_events WHERE title LIKE '%MVNO%'")
+        found = events_db.search_intelligence_events(
+            keywords={"merger", "mvno", "spectrum"}, days_back=3650)
+        assert self._titles(found) == ["Op1 merger talks"]
+
+    def test_existing_events_indexed_on_init(self, tmp_path):
+        path = str(tmp_path / "events.db")
+        with TelecomDatabase(path) as db:
+            # A database created before the FTS index existed
+            for suffix in ("_ai", "_ad", "_au"):
+                db.conn.execute(f"DROP TRIGGER intelligence_events_fts{suffix}")
+            db.conn.execute("DROP TABLE intelligence_events_fts")
+            db.conn.execute(
+                "INSERT INTO intelligence_events (market, event_date, category, title) "
+                "VALUES ('de', '2025-12-01', 'ott', 'Streaming alliance')")
+            db.conn.commit()
+        with TelecomDatabase(path) as db:
+            found = db.search_intelligence_events(
+                keywords={"alliance"}, days_back=3650, ids_only=True)
+            assert len(found) == 1
+
+
 # ============================================================================
 # Seed Data Integrity
 # ============================================================================
@@ -455,6 +644,15 @@ class TestSeedDataIntegrity:
         # DT should be first (highest revenue)
         assert comparison[0]["operator_id"] == "deutsche_telekom"
 
+    def test_seed_market_subscriber_timeseries(self, seeded_db):
+        """One query returns every operator's subscriber rows, keyed by operator."""
+        by_op = seeded_db.get_market_subscriber_timeseries("germany", n_quarters=4,
+                                                            end_cq="CQ4_2025")
+        assert len(by_op) == 4
+        vf = seeded_db.get_subscriber_timeseries("vodafone_germany", n_quarters=4,
+                                                 end_cq="CQ4_2025")
+        assert by_op["vodafone_germany"] == vf
+
     def test_seed_calendar_quarter_alignment(self, seeded_db):
         """Verify that Vodafone and DT data aligns on calendar quarters."""
         vf = seeded_db.get_financial_timeseries(
@@ -0,0 +1,196 @@
+"""Tests for concurrent Look execution in BLMAnalysisEngine.
+
+Covers:
+- TelecomDatabase per-thread read-only connections on file databases,
+  closed when their thread ends
+- Thread-safe ProvenanceStore recording, merge and pickling
+- Parallel run_five_looks is identical to the serial run
+- :memory: databases fall back to serial execution
+"""
+import contextlib
+import io
+import json
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.blm.engine import STAGE_DEPENDENCIES, BLMAnalysisEngine
+from src.database.db import TelecomDatabase
+from src.models.provenance import ProvenanceStore
+from src.output.json_exporter import BLMJsonExporter
+
+
+@pytest.fixture(scope="module")
+def germany_db(tmp_path_factory):
+    from src.database.seed_image import seed_image
+    image = seed_image("germany", image_dir=str(tmp_path_factory.mktemp("seed_images")))
+    path = str(tmp_path_factory.mktemp("engine_parallel") / "germany.db")
+    with contextlib.redirect_stdout(io.StringIO()):
+        image.clone(path).close()
+    db = TelecomDatabase(path)
+    db.init()
+    yield db
+    db.close()
+
+
+def _run(db, parallel):
+    engine = BLMAnalysisEngine(db, "vodafone_germany", "germany",
+                               parallel=parallel)
+    return engine.run_five_looks()
+
+
+def _snapshot(result) -> dict:
+    data = json.loads(BLMJsonExporter().export(result, include_provenance=False))
+    data["meta"].pop("generated_at")
+    return data
+
+
+def _in_thread(fn):
+    box = {}
+    t = threading.Thread(target=lambda: box.update(value=fn()))
+    t.start()
+    t.join()
+    return box["value"]
+
+
+# =====================================================================
+# TelecomDatabase thread connections
+# =====================================================================
+
+class TestThreadConnections:
+    def test_other_thread_gets_read_only_connection(self, tmp_path):
+        db = TelecomDatabase(str(tmp_path / "t.db")).init()
+        try:
+            db.upsert_operator("op1", display_name="Op 1", market="m")
+            main_conn = db.conn
+
+            def read():
+                conn = db.conn
+                name = conn.execute(
+                    "SELECT display_name FROM operators").fetchone()[0]
+                with pytest.raises(sqlite3.OperationalError):
+                    conn.execute("DELETE FROM operators")
+                db.release_thread_connection()
+                return conn is main_conn, name
+
+            assert _in_thread(read) == (False, "Op 1")
+            assert db.conn is main_conn
+        finally:
+            db.close()
+
+    def test_reader_closed_when_thread_ends(self, tmp_path):
+        db = TelecomDatabase(str(tmp_path / "t.db")).init()
+        try:
+            reader = _in_thread(lambda: db.conn)
+            assert db._readers == []
+            with pytest.raises(sqlite3.ProgrammingError):
+                reader.execute("SELECT 1")
+        finally:
+            db.close()
+
+    def test_close_closes_unreleased_readers(self, tmp_path):
+        db = TelecomDatabase(str(tmp_path / "t.db")).init()
+        opened, done = threading.Event(), threading.Event()
+
+        def hold():
+            db.conn
+            opened.set()
+            done.wait(5)
+
+        t = threading.Thread(target=hold)
+        t.start()
+        try:
+            opened.wait(5)
+            assert len(db._readers) == 1
+            db.close()
+            assert db._readers == []
+            assert db.conn is None
+        finally:
+            done.set()
+            t.join()
+
+    def test_memory_db_is_single_connection(self):
+        db = TelecomDatabase(":memory:").init()
+        try:
+            assert not db.supports_concurrent_reads
+            assert _in_thread(lambda: db.conn) is db.conn
+        finally:
+            db.close()
+
+
+# =====================================================================
+# ProvenanceStore
+# =====================================================================
+
+class TestProvenanceThreadSafety:
+    def test_concurrent_track(self):
+        store = ProvenanceStore()
+        threads = [
+            threading.Thread(target=lambda: [store.track(i, "f") for i in range(500)])
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(store.get_values(field_name="f")) == 4000
+
+    def test_merge_preserves_order(self):
+        a, b = ProvenanceStore(), ProvenanceStore()
+        a.track(1, "x")
+        b.track(2, "y")
+        b.track(3, "z")
+        a.merge(b)
+        assert [v.value for v in a._values] == [1, 2, 3]
+
+    def test_pickle_round_trip(self):
+        store = ProvenanceStore()
+        store.track(1, "x")
+        clone = pickle.loads(pickle.dumps(store))
+        clone.track(2, "y")
+        assert [v.value for v in clone._values] == [1, 2]
+
+
+# =====================================================================
+# Engine
+# =====================================================================
+
+class TestParallelEngine:
+    def test_dependencies_reference_earlier_stages(self):
+        seen = set()
+        for stage, deps in STAGE_DEPENDENCIES.items():
+            assert set(deps) <= seen
+            seen.add(stage)
+
+    def test_parallel_matches_serial(self, germany_db):
+        serial = _run(germany_db, parallel=False)
+        parallel = _run(germany_db, parallel=True)
+        assert _snapshot(parallel) == _snapshot(serial)
+
+    def test_provenance_order_matches_serial(self, germany_db):
+        def values(result):
+            return [(v.field_name, v.operator, v.period, v.value)
+                    for v in result.provenance._values]
+
+        serial = _run(germany_db, parallel=False)
+        parallel = _run(germany_db, parallel=True)
+        assert values(parallel) == values(serial)
+        assert germany_db._readers == []
+
+    def test_memory_db_runs_serially(self, monkeypatch):
+        db = TelecomDatabase(":memory:").init()
+        engine = BLMAnalysisEngine(db, "vodafone_germany", "germany",
+                                   parallel=True)
+        monkeypatch.setattr(engine, "_run_stages_parallel",
+                            lambda: pytest.fail("parallel path used"))
+        try:
+            result = engine.run_five_looks()
+        finally:
+            db.close()
+        assert result.market == "germany"
@@ -0,0 +1,153 @@
+"""Tests for incremental per-stage recomputation.
+
+Covers:
+- upsert_* change tracking and get_change_versions scoping
+- RecordingDatabase dependency manifests
+- Incremental runs reuse unchanged stages and match a full run
+"""
+import contextlib
+import io
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.blm.engine import STAGE_DEPENDENCIES, BLMAnalysisEngine
+from src.blm.incremental import ALL_SCOPES, RecordingDatabase
+from src.database.seed_germany import seed_all
+from src.output.json_exporter import BLMJsonExporter
+
+
+@pytest.fixture
+def germany_db():
+    with contextlib.redirect_stdout(io.StringIO()):
+        db = seed_all(":memory:")
+    yield db
+    db.close()
+
+
+def _run(db, incremental=True):
+    engine = BLMAnalysisEngine(db, "vodafone_germany", "germany",
+                               target_period="CQ4_2025", incremental=incremental)
+    return engine, engine.run_five_looks()
+
+
+def _snapshot(result) -> dict:
+    data = json.loads(BLMJsonExporter().export(result, include_provenance=False))
+    data["meta"].pop("generated_at")
+    return data
+
+
+def _provenance(result) -> list:
+    return [(v.field_name, v.operator, v.period, v.value,
+             v.primary_source.confidence if v.primary_source else None)
+            for v in result.provenance._values]
+
+
+# =====================================================================
+# Change tracking
+# =====================================================================
+
+class TestChangeTracking:
+    def test_upsert_bumps_version(self, germany_db):
+        before = germany_db.get_change_versions("germany")[("tariffs", "vodafone_germany")]
+        germany_db.upsert_tariff("vodafone_germany", "New", "mobile_postpaid",
+                                 "H1_2026", {"monthly_price": 9.0})
+        after = germany_db.get_change_versions("germany")
+        assert after[("tariffs", "vodafone_germany")] == before + 1
+
+    def test_versions_scoped_to_market(self, germany_db):
+        germany_db.upsert_operator("other_op", country="Austria", market="austria")
+        germany_db.upsert_macro("Austria", "CQ4_2025", {"gdp_growth_pct": 1.0})
+        germany = germany_db.get_change_versions("germany")
+        assert ("macro_environment", "Germany") in germany
+        assert not any(scope in ("other_op", "Austria") for _, scope in germany)
+
+    def test_mark_changed_for_bulk_writes(self, germany_db):
+        germany_db.mark_changed("tariffs", ["one_and_one", None, "one_and_one"])
+        germany_db.conn.commit()
+        versions = germany_db.get_change_versions("germany")
+        assert versions[("tariffs", "one_and_one")] >= 2
+
+
+# =====================================================================
+# Manifests
+# =====================================================================
+
+class TestRecordingDatabase:
+    def test_records_operator_and_market_scopes(self, germany_db):
+        rec = RecordingDatabase(germany_db)
+        rec.get_financial_timeseries("vodafone_germany", n_quarters=4)
+        rec.get_tariffs(market="germany")
+        rec.get_macro_data(country="Germany")
+        assert rec.manifest() == {
+            "financial_quarterly": ["vodafone_germany"],
+            "macro_environment": ["Germany"],
+            "operators": [ALL_SCOPES],
+            "tariffs": [ALL_SCOPES],
+        }
+
+    def test_raw_connection_reads_everything(self, germany_db):
+        rec = RecordingDatabase(germany_db)
+        rec.conn.execute("SELECT 1")
+        manifest = rec.manifest()
+        assert manifest["tariffs"] == [ALL_SCOPES]
+        assert manifest["macro_environment"] == [ALL_SCOPES]
+
+
+# =====================================================================
+# Engine
+# =====================================================================
+
+class TestIncrementalEngine:
+    def test_first_run_computes_everything(self, germany_db):
+        engine, _ = _run(germany_db)
+        assert engine.stage_stats["recomputed"] == list(STAGE_DEPENDENCIES)
+
+    def test_unchanged_rerun_reuses_everything(self, germany_db):
+        _run(germany_db)
+        engine, result = _run(germany_db)
+        assert engine.stage_stats["reused"] == list(STAGE_DEPENDENCIES)
+        _, full = _run(germany_db, incremental=False)
+        assert _snapshot(result) == _snapshot(full)
+        assert _provenance(result) == _provenance(full)
+
+    def test_tariff_load_recomputes_only_dependants(self, germany_db):
+        _run(germany_db)
+        germany_db.upsert_tariff("vodafone_germany", "GigaMobil XS", "mobile_postpaid",
+                                 "H1_2026", {"monthly_price": 7.99,
+                                             "data_allowance": "5GB"})
+        engine, result = _run(germany_db)
+
+        # No Look reads tariffs for a fixed period; SWOT/Opportunities
+        # do not consume the tariff analysis
+        assert engine.stage_stats["recomputed"] == ["tariff_analysis"]
+
+        _, full = _run(germany_db, incremental=False)
+        assert _snapshot(result) == _snapshot(full)
+        assert _provenance(result) == _provenance(full)
+
+    def test_financial_edit_recomputes_downstream(self, germany_db):
+        _run(germany_db)
+        germany_db.upsert_financial("vodafone_germany", "Q3 FY26",
+                                    {"total_revenue": 1.0, "ebitda": 0.5})
+        engine, result = _run(germany_db)
+
+        recomputed = engine.stage_stats["recomputed"]
+        assert {"self_analysis", "swot", "opportunities"} <= set(recomputed)
+        assert "tariff_analysis" in engine.stage_stats["reused"]
+
+        _, full = _run(germany_db, incremental=False)
+        assert _snapshot(result) == _snapshot(full)
+        assert _provenance(result) == _provenance(full)
+
+    def test_unreadable_stage_output_recomputed(self, germany_db):
+        _run(germany_db)
+        germany_db.conn.execute(
+            "UPDATE engine_stage_outputs SET payload = x'00' WHERE stage = 'trends'")
+        with contextlib.redirect_stdout(io.StringIO()):
+            engine, _ = _run(germany_db)
+        assert engine.stage_stats["recomputed"] == ["trends"]
@@ -0,0 +1,211 @@
+"""Tests for resumable, checkpointed group analysis jobs.
+
+Covers:
+- SQLite analysis_job_checkpoints table (upsert, query, clear)
+- AnalysisRunnerService.run_group checkpoints each completed market
+- Re-running a job skips checkpointed markets and rebuilds the summary
+- Markets with failed uploads are not checkpointed and re-run on resume
+- JSON snapshot → result reconstruction used for the group summary
+"""
+import json
+import sys
+import os
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.blm.engine import FiveLooksResult
+from src.database.db import TelecomDatabase
+from src.models.competition import CompetitionInsight, PorterForce
+from src.models.self_analysis import SelfInsight
+from src.output.json_exporter import BLMJsonExporter, result_from_json
+from src.web.services.analysis_runner import AnalysisRunnerService
+from src.web.services.group_summary import GroupSummaryGenerator
+
+
+MARKETS = ["guatemala", "honduras", "panama"]
+
+
+@pytest.fixture
+def db():
+    database = TelecomDatabase(":memory:")
+    database.init()
+    yield database
+    database.close()
+
+
+def _make_result(market: str) -> FiveLooksResult:
+    return FiveLooksResult(
+        target_operator=f"tigo_{market}",
+        market=market,
+        analysis_period="CQ4_2025",
+        self_analysis=SelfInsight(
+            financial_health={"total_revenue": 100.0, "revenue_yoy_pct": 2.5},
+            health_rating="healthy",
+        ),
+        competition=CompetitionInsight(
+            five_forces={"buyer_power": PorterForce("buyer_power", "high")},
+            overall_competition_intensity="high",
+        ),
+    )
+
+
+def _make_service(job: dict) -> MagicMock:
+    svc = MagicMock()
+    svc.get_analysis_job.return_value = job
+    svc.get_group_subsidiaries.return_value = [
+        {"market": m, "operator_id": f"tigo_{m}"} for m in MARKETS
+    ]
+    svc.get_operator_group.return_value = {"group_id": "millicom"}
+    return svc
+
+
+def _make_runner(svc, db, fail_market=None):
+    runner = AnalysisRunnerService(svc, checkpoints=db)
+    runner.engine_calls = []
+
+    def run_engine(_db, operator, market, period, n_quarters, job_id=None):
+        runner.engine_calls.append(market)
+        if market == fail_market:
+            raise RuntimeError("process killed")
+        return _make_result(market)
+
+    runner._pull_market_data = MagicMock(return_value=MagicMock())
+    runner._run_engine = run_engine
+    runner._generate_outputs = MagicMock(return_value=[{
+        "type": "json", "file_name": "out.json", "file_path": __file__,
+        "content_type": "application/json", "size_bytes": 10,
+    }])
+    runner._generate_group_summary_outputs = MagicMock(return_value=[])
+    return runner
+
+
+@pytest.fixture
+def group_job():
+    return {
+        "id": 7,
+        "job_type": "group_analysis",
+        "group_id": "millicom",
+        "analysis_period": "CQ4_2025",
+        "n_quarters": 8,
+        "config": json.dumps({"selected_markets": MARKETS}),
+    }
+
+
+# =====================================================================
+# SQLite checkpoint table
+# =====================================================================
+
+class TestCheckpointTable:
+    def test_upsert_and_get(self, db):
+        db.upsert_job_checkpoint({
+            "analysis_job_id": 1, "market": "panama",
+            "result_snapshot": "{}", "outputs": "[]",
+        })
+        rows = db.get_job_checkpoints(1)
+        assert len(rows) == 1
+        assert rows[0]["market"] == "panama"
+
+    def test_upsert_replaces_same_market(self, db):
+        for snap in ('{"v": 1}', '{"v": 2}'):
+            db.upsert_job_checkpoint({
+                "analysis_job_id": 1, "market": "panama",
+                "result_snapshot": snap,
+            })
+        rows = db.get_job_checkpoints(1)
+        assert len(rows) == 1
+        assert rows[0]["result_snapshot"] == '{"v": 2}'
+
+    def test_clear_isolated_by_job(self, db):
+        db.upsert_job_checkpoint({"analysis_job_id": 1, "market": "panama"})
+        db.upsert_job_checkpoint({"analysis_job_id": 2, "market": "panama"})
+        assert db.clear_job_checkpoints(1) == 1
+        assert db.get_job_checkpoints(1) == []
+        assert len(db.get_job_checkpoints(2)) == 1
+
+
+# =====================================================================
+# Runner resume behaviour
+# =====================================================================
+
+class TestRunGroupResume:
+    def test_completed_markets_are_checkpointed(self, db, group_job):
+        runner = _make_runner(_make_service(group_job), db, fail_market="honduras")
+        out = runner.run_group(7)
+
+        assert out["markets"]["honduras"] == "failed"
+        markets = {cp["market"] for cp in db.get_job_checkpoints(7)}
+        assert markets == {"guatemala", "panama"}
+        outputs = json.loads(db.get_job_checkpoints(7)[0]["outputs"])
+        assert outputs[0]["storage_path"].endswith("out.json")
+
+    def test_rerun_skips_checkpointed_markets(self, db, group_job):
+        svc = _make_service(group_job)
+        _make_runner(svc, db, fail_market="honduras").run_group(7)
+
+        runner = _make_runner(svc, db)
+        out = runner.run_group(7)
+
+        assert runner.engine_calls == ["honduras"]
+        assert all(v == "completed" for v in out["markets"].values())
+        assert out["output_count"] == len(MARKETS)
+
+    def test_failed_upload_retried_on_resume(self, db, group_job):
+        svc = _make_service(group_job)
+        uploads = []
+
+        def upload(bucket, path, data, content_type):
+            uploads.append(path)
+            if path.startswith("panama/") and uploads.count(path) == 1:
+                raise ConnectionError("storage unavailable")
+
+        svc.upload_output_file.side_effect = upload
+        out = _make_runner(svc, db).run_group(7)
+        assert out["markets"]["panama"] == "failed"
+        assert out["output_count"] == len(MARKETS) - 1
+        assert {cp["market"] for cp in db.get_job_checkpoints(7)} == {"guatemala", "honduras"}
+
+        runner = _make_runner(svc, db)
+        out = runner.run_group(7)
+        assert runner.engine_calls == ["panama"]
+        assert uploads.count("panama/tigo_panama/CQ4_2025/out.json") == 2
+        assert all(v == "completed" for v in out["markets"].values())
+        assert out["output_count"] == len(MARKETS)
+
+    def test_summary_rebuilt_from_checkpoints(self, db, group_job):
+        svc = _make_service(group_job)
+        _make_runner(svc, db, fail_market="honduras").run_group(7)
+
+        captured = {}
+        original = GroupSummaryGenerator.generate
+
+        def spy(self, market_results, group_info):
+            captured["summary"] = original(self, market_results, group_info)
+            return captured["summary"]
+
+        runner = _make_runner(svc, db)
+        GroupSummaryGenerator.generate = spy
+        try:
+            runner.run_group(7)
+        finally:
+            GroupSummaryGenerator.generate = original
+
+        summary = captured["summary"]
+        assert summary["markets"] == MARKETS
+        assert summary["health_ratings"] == {m: "healthy" for m in MARKETS}
+        assert summary["revenue_comparison"]["guatemala"]["total_revenue"] == 100.0
+
+
+class TestResultFromJson:
+    def test_snapshot_matches_live_summary(self):
+        live = {m: _make_result(m) for m in MARKETS}
+        restored = {
+            m: result_from_json(json.loads(
+                BLMJsonExporter().export(r, include_provenance=False)
+            ))
+            for m, r in live.items()
+        }
+        gen = GroupSummaryGenerator()
+        assert gen.generate(restored, {}) == gen.generate(live, {})
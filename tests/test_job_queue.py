@@ -0,0 +1,253 @@
+"""Tests for the persistent analysis job queue and the src.worker runner.
+
+Covers:
+- SQLiteJobQueue CRUD (create, get, update, list)
+- Atomic claim: oldest first, no double claims, empty queue
+- Leases: heartbeat extension, expiry makes a job visible again, max attempts
+- Release after a run, including crashed runners
+- get_job_store(): one shared queue per path, usable from any thread
+- run_worker drains the queue through AnalysisRunnerService
+- A job whose lease is lost is abandoned without a completion write
+"""
+import json
+import os
+import sys
+import threading
+import time
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.web.services import job_queue
+from src.web.services.job_queue import SQLiteJobQueue, get_job_store
+from src.worker import WorkerOptions, process_job, run_worker
+
+
+@pytest.fixture
+def queue(tmp_path):
+    q = SQLiteJobQueue(str(tmp_path / "queue.db"))
+    yield q
+    q.close()
+
+
+def _job(market="panama", job_type="single_market"):
+    return {
+        "job_type": job_type,
+        "market": market,
+        "target_operator": f"tigo_{market}",
+        "analysis_period": "CQ4_2025",
+        "status": "pending",
+        "progress": json.dumps({market: "pending"}),
+    }
+
+
+def _advance_clock(monkeypatch, seconds):
+    now = job_queue._utcnow() + timedelta(seconds=seconds)
+    monkeypatch.setattr(job_queue, "_utcnow", lambda: now)
+
+
+# =====================================================================
+# CRUD
+# =====================================================================
+
+class TestQueueCrud:
+    def test_create_assigns_id_and_defaults(self, queue):
+        job = queue.create_analysis_job(_job())
+        assert job["id"] == 1
+        assert job["status"] == "pending"
+        assert job["attempts"] == 0
+
+    def test_update_ignores_unknown_columns(self, queue):
+        job = queue.create_analysis_job(_job())
+        updated = queue.update_analysis_job(job["id"], {"status": "running", "bogus": 1})
+        assert updated["status"] == "running"
+
+    def test_list_by_status(self, queue):
+        queue.create_analysis_job(_job("panama"))
+        second = queue.create_analysis_job(_job("honduras"))
+        queue.update_analysis_job(second["id"], {"status": "completed"})
+        assert [j["market"] for j in queue.get_analysis_jobs(status="pending")] == ["panama"]
+        assert len(queue.get_analysis_jobs()) == 2
+
+
+# =====================================================================
+# Claim / lease
+# =====================================================================
+
+class TestClaim:
+    def test_empty_queue_returns_none(self, queue):
+        assert queue.claim_analysis_job("w1") is None
+
+    def test_claims_oldest_first_without_duplicates(self, queue):
+        queue.create_analysis_job(_job("panama"))
+        queue.create_analysis_job(_job("honduras"))
+        first = queue.claim_analysis_job("w1")
+        second = queue.claim_analysis_job("w2")
+        assert first["market"] == "panama"
+        assert second["market"] == "honduras"
+        assert queue.claim_analysis_job("w3") is None
+
+    def test_claim_sets_lease(self, queue):
+        queue.create_analysis_job(_job())
+        job = queue.claim_analysis_job("w1", lease_seconds=60)
+        assert job["status"] == "running"
+        assert job["lease_owner"] == "w1"
+        assert job["attempts"] == 1
+        assert job["lease_expires_at"] > job["heartbeat_at"]
+
+    def test_claim_across_connections(self, tmp_path):
+        path = str(tmp_path / "shared.db")
+        a, b = SQLiteJobQueue(path), SQLiteJobQueue(path)
+        a.create_analysis_job(_job())
+        assert a.claim_analysis_job("w1") is not None
+        assert b.claim_analysis_job("w2") is None
+
+    def test_expired_lease_is_reclaimed(self, queue, monkeypatch):
+        queue.create_analysis_job(_job())
+        queue.claim_analysis_job("w1", lease_seconds=30)
+        assert queue.claim_analysis_job("w2") is None
+
+        _advance_clock(monkeypatch, 31)
+        job = queue.claim_analysis_job("w2", lease_seconds=30)
+        assert job["lease_owner"] == "w2"
+        assert job["attempts"] == 2
+
+    def test_heartbeat_extends_lease(self, queue, monkeypatch):
+        job = queue.create_analysis_job(_job())
+        queue.claim_analysis_job("w1", lease_seconds=30)
+        _advance_clock(monkeypatch, 20)
+        assert queue.heartbeat_analysis_job(job["id"], "w1", lease_seconds=30)
+        # 40s after the claim: past the original lease, inside the renewed one
+        _advance_clock(monkeypatch, 20)
+        assert queue.claim_analysis_job("w2") is None
+
+    def test_heartbeat_rejected_for_other_worker(self, queue):
+        job = queue.create_analysis_job(_job())
+        queue.claim_analysis_job("w1")
+        assert not queue.heartbeat_analysis_job(job["id"], "w2")
+
+    def test_max_attempts_marks_failed(self, queue, monkeypatch):
+        job = queue.create_analysis_job(_job())
+        queue.claim_analysis_job("w1", lease_seconds=10, max_attempts=1)
+        _advance_clock(monkeypatch, 11)
+        assert queue.claim_analysis_job("w2", max_attempts=1) is None
+        row = queue.get_analysis_job(job["id"])
+        assert row["status"] == "failed"
+        assert "Lease expired" in row["error_message"]
+
+    def test_inline_running_jobs_not_reclaimed(self, queue):
+        job = queue.create_analysis_job(_job())
+        queue.update_analysis_job(job["id"], {"status": "running"})
+        assert queue.claim_analysis_job("w1") is None
+
+
+class TestRelease:
+    def test_release_keeps_final_status(self, queue):
+        job = queue.create_analysis_job(_job())
+        queue.claim_analysis_job("w1")
+        queue.update_analysis_job(job["id"], {"status": "completed"})
+        assert queue.release_analysis_job(job["id"], "w1")
+        row = queue.get_analysis_job(job["id"])
+        assert row["status"] == "completed"
+        assert row["lease_owner"] is None
+
+    def test_release_fails_crashed_job(self, queue):
+        job = queue.create_analysis_job(_job())
+        queue.claim_analysis_job("w1")
+        queue.release_analysis_job(job["id"], "w1")
+        assert queue.get_analysis_job(job["id"])["status"] == "failed"
+
+
+class TestGetJobStore:
+    def test_one_queue_per_path(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("BLM_JOB_QUEUE_DB", str(tmp_path / "store.db"))
+        store = get_job_store()
+        assert get_job_store() is store
+        monkeypatch.setenv("BLM_JOB_QUEUE_DB", str(tmp_path / "other.db"))
+        assert get_job_store() is not store
+        store.close()
+        monkeypatch.setenv("BLM_JOB_QUEUE_DB", str(tmp_path / "store.db"))
+        assert get_job_store() is not store
+
+    def test_shared_across_threads(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("BLM_JOB_QUEUE_DB", str(tmp_path / "store.db"))
+        errors = []
+
+        def create():
+            try:
+                for _ in range(20):
+                    get_job_store().create_analysis_job(_job())
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=create) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == []
+        assert len(get_job_store().get_analysis_jobs()) == 80
+
+
+# =====================================================================
+# Worker loop
+# =====================================================================
+
+class TestRunWorker:
+    def test_drains_queue_once(self, queue):
+        queue.create_analysis_job(_job("panama"))
+        queue.create_analysis_job(_job("millicom", job_type="group_analysis"))
+
+        def finish(self, job_id):
+            self.jobs.update_analysis_job(job_id, {"status": "completed"})
+            return {"status": "completed"}
+
+        opts = WorkerOptions(once=True, heartbeat_seconds=1)
+        with patch("src.web.services.analysis_runner.AnalysisRunnerService.run_single",
+                   finish), \
+             patch("src.web.services.analysis_runner.AnalysisRunnerService.run_group",
+                   finish):
+            processed = run_worker(0, opts, svc=MagicMock(), jobs=queue)
+
+        assert processed == 2
+        statuses = {j["status"] for j in queue.get_analysis_jobs()}
+        assert statuses == {"completed"}
+
+    def test_runner_exception_releases_as_failed(self, queue):
+        job = queue.create_analysis_job(_job())
+
+        def boom(self, job_id):
+            raise RuntimeError("engine crashed")
+
+        opts = WorkerOptions(once=True, heartbeat_seconds=1)
+        with patch("src.web.services.analysis_runner.AnalysisRunnerService.run_single",
+                   boom):
+            run_worker(0, opts, svc=MagicMock(), jobs=queue)
+
+        row = queue.get_analysis_job(job["id"])
+        assert row["status"] == "failed"
+        assert row["lease_owner"] is None
+
+    def test_lost_lease_skips_completion(self, queue):
+        queue.create_analysis_job(_job())
+        job = queue.claim_analysis_job("me:1:0")
+
+        def stalled(self, job_id):
+            # Another worker reclaims the job while this one is stalled
+            queue.update_analysis_job(job_id, {"lease_owner": "other:1:0"})
+            time.sleep(0.5)
+            self.jobs.update_analysis_job(job_id, {"status": "completed"})
+            return {"status": "completed"}
+
+        opts = WorkerOptions(heartbeat_seconds=0.05, queue_db=queue.db_path)
+        with patch("src.web.services.analysis_runner.AnalysisRunnerService.run_single",
+                   stalled):
+            result = process_job(job, "me:1:0", queue, MagicMock(), opts)
+
+        assert result["status"] == "lease_lost"
+        row = queue.get_analysis_job(job["id"])
+        assert row["status"] == "running"
+        assert row["lease_owner"] == "other:1:0"
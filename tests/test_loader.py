@@ -104,3 +104,57 @@ class TestFinancialDataPreprocessor:
         preprocessor = FinancialDataPreprocessor()
         result = preprocessor.preprocess(df)
         assert pd.api.types.is_datetime64_any_dtype(result["date"])
+
+    def test_typed_numeric_columns_kept(self):
+        df = pd.DataFrame({"amount": [0.1 + 0.2, 1e-300 / 3], "fee": [1, 2]})
+        preprocessor = FinancialDataPreprocessor()
+        result = preprocessor.preprocess(df)
+        pd.testing.assert_frame_equal(result, df)
+        assert preprocessor.detected == {"amount": "numeric", "fee": "numeric"}
+
+    def test_numeric_text_with_currency_values(self):
+        df = pd.DataFrame({"amount": ["12", "7.5", "40", "$1,000", "(3)", None, "n/a"] * 3})
+        preprocessor = FinancialDataPreprocessor()
+        result = preprocessor.preprocess(df)
+        assert preprocessor.detected["amount"] == "numeric text"
+        assert result["amount"].tolist()[:5] == [12.0, 7.5, 40.0, 1000.0, -3.0]
+        assert len(result) == 18  # all-missing rows dropped
+        assert result["amount"].isna().sum() == 3
+
+    @pytest.mark.parametrize("sample_size", [1, 1000])
+    def test_string_paths_agree(self, monkeypatch, sample_size):
+        monkeypatch.setattr(FinancialDataPreprocessor, "SAMPLE_SIZE", sample_size)
+        df = pd.DataFrame({
+            "name": [" a ", "b", None, "a "] * 5,
+            "note": [" x", "nan", "", None] * 5,
+        })
+        result = FinancialDataPreprocessor().preprocess(df)
+        # "str" on pandas 3, object before
+        assert result["name"].dtype == df["name"].astype(str).dtype
+        assert result["name"].tolist()[:3] == ["a", "b", result["name"][2]]
+        assert result["name"].isna().sum() == 5
+        # Blanks become None (object dtype); missing values stay NaN
+        assert result["note"].dtype == object
+        assert result["note"].tolist()[:3] == ["x", None, None]
+        assert result["note"].isna().sum() == 15
+
+    def test_timings_per_column(self, monkeypatch, capsys):
+        df = pd.DataFrame({"amount": ["$5"], "date": ["2023-01-15"], "state": ["NV"]})
+        preprocessor = FinancialDataPreprocessor()
+        preprocessor.preprocess(df)
+        assert set(preprocessor.timings) == {"amount", "date", "state"}
+        assert set(preprocessor.timings["date"]) == {"clean", "date"}
+        assert preprocessor.detected["date"] == "date text"
+        assert capsys.readouterr().out == ""
+
+        monkeypatch.setenv("BLM_PREPROCESS_TIMINGS", "1")
+        FinancialDataPreprocessor().preprocess(df)
+        out = capsys.readouterr().out
+        assert "Preprocessing:" in out and "amount" in out and "currency text" in out
+
+    def test_chunk_timings_add_up(self):
+        chunks = [pd.DataFrame({"amount": ["$1", "$2"]}), pd.DataFrame({"amount": ["$3"]})]
+        preprocessor = FinancialDataPreprocessor()
+        result = pd.concat(preprocessor.preprocess_chunks(chunks))
+        assert result["amount"].tolist() == [1, 2, 3]
+        assert list(preprocessor.timings) == ["amount"]
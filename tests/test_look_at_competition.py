@@ -5,6 +5,7 @@ and edge cases including empty database handling.
 """
 
 import sys
+from datetime import date
 from pathlib import Path
 
 import pytest
@@ -508,6 +509,52 @@ class TestDifferentTargets:
         assert len(result.competitor_analyses) >= 3
 
 
+# ============================================================================
+# Intelligence Event Keyword Search
+# ============================================================================
+
+
+class TestEventKeywordSearch:
+
+    @pytest.fixture
+    def events_db(self, seeded_db):
+        for event_date, title in [
+            ("2025-11-20", "O2 Telefonica ACQUIRES regional fibre player"),
+            ("2025-10-05", "O2 forms alliance with streaming partner"),
+            ("2025-09-01", "O2 Telefonica sells tower stake"),
+            ("2026-03-01", "O2 merger talks with cable operator"),
+        ]:
+            seeded_db.upsert_intelligence({
+                "operator_id": "telefonica_o2", "market": "germany",
+                "event_date": event_date, "category": "competitive",
+                "title": title,
+            })
+        return seeded_db
+
+    def _o2(self, db, as_of):
+        result = analyze_competition(
+            db, market="germany", target_operator="vodafone_germany",
+            target_period="CQ4_2025", as_of=as_of,
+        )
+        return result.competitor_analyses["telefonica_o2"]
+
+    def test_sql_matching_equals_title_scan(self, events_db, monkeypatch):
+        as_of = date(2026, 1, 1)
+        in_sql = self._o2(events_db, as_of)
+        monkeypatch.setattr(events_db, "search_intelligence_events",
+                            lambda **kw: (_ for _ in ()).throw(RuntimeError()))
+        scanned = self._o2(events_db, as_of)
+        assert in_sql.ma_activity == scanned.ma_activity
+        assert in_sql.ecosystem_partners == scanned.ecosystem_partners
+        assert "O2 Telefonica ACQUIRES regional fibre player" in in_sql.ma_activity
+
+    def test_as_of_excludes_later_events(self, events_db):
+        early = self._o2(events_db, date(2026, 1, 1))
+        late = self._o2(events_db, date(2026, 6, 1))
+        assert "O2 merger talks with cable operator" not in early.ma_activity
+        assert "O2 merger talks with cable operator" in late.ma_activity
+
+
 # ============================================================================
 # Return Type Validation
 # ============================================================================
@@ -10,6 +10,14 @@ from src.data.sample import generate_sample_data
 from src.main import cli
 
 
+@pytest.fixture(autouse=True)
+def parse_cache_dir(tmp_path, monkeypatch):
+    """Keep the parse cache out of the repository's data/processed."""
+    cache_dir = tmp_path / "parse_cache"
+    monkeypatch.setenv("BLM_PARSE_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
 @pytest.fixture
 def runner():
     return CliRunner()
@@ -79,6 +87,19 @@ class TestAnalyzeCommand:
         assert Path(output_dir, "report.txt").exists()
         assert Path(output_dir, "report.json").exists()
 
+    def test_analyze_chunked(self, runner, sample_csv, tmp_path):
+        output_dir = str(tmp_path / "output")
+        result = runner.invoke(cli, [
+            "analyze", sample_csv,
+            "--output-dir", output_dir,
+            "--format", "json",
+            "--chunk-size", "7",
+        ])
+        assert result.exit_code == 0
+        assert "Loaded 50 records" in result.output
+        assert "Running state comparison..." in result.output
+        assert Path(output_dir, "report.json").exists()
+
     def test_analyze_json(self, runner, sample_csv, tmp_path):
         output_dir = str(tmp_path / "output")
         result = runner.invoke(cli, [
@@ -169,3 +190,31 @@ class TestGenerateSampleCommand:
         assert "50 records" in result.output
         df = pd.read_csv(output_path)
         assert len(df) == 50
+
+
+class TestParseCacheCLI:
+    def test_generate_sample_primes_cache(self, runner, tmp_path, parse_cache_dir):
+        output_path = str(tmp_path / "generated.csv")
+        result = runner.invoke(cli, ["generate-sample", "--output", output_path, "--records", "30"])
+        assert result.exit_code == 0
+        assert len(list(parse_cache_dir.glob("*/meta.json"))) == 1
+
+        result = runner.invoke(cli, ["summary", output_path, "--group-col", "category"])
+        assert result.exit_code == 0
+        assert len(list(parse_cache_dir.iterdir())) == 1
+
+    def test_cached_and_uncached_output_match(self, runner, sample_csv):
+        args = ["summary", sample_csv, "--group-col", "state"]
+        uncached = runner.invoke(cli, ["--no-parse-cache", *args])
+        first = runner.invoke(cli, args)
+        cached = runner.invoke(cli, args)
+        assert uncached.exit_code == first.exit_code == cached.exit_code == 0
+        assert uncached.output == first.output == cached.output
+
+    def test_workers_option(self, runner, sample_csv):
+        args = ["summary", sample_csv, "--group-col", "state"]
+        serial = runner.invoke(cli, ["--no-parse-cache", *args])
+        parallel = runner.invoke(cli, ["--no-parse-cache", "--workers", "2", *args])
+        assert serial.exit_code == parallel.exit_code == 0
+        assert serial.output == parallel.output
+        assert runner.invoke(cli, ["--workers", "0", *args]).exit_code != 0
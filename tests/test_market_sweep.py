@@ -0,0 +1,144 @@
+"""Tests for the market-wide sweep (every operator as target).
+
+Covers:
+- Sweep results match separate per-operator engine runs
+- Target-independent work is computed once and shared
+- SweepMemo hit/miss counters stay exact under concurrent lookups
+- shared() is a plain call outside a sweep
+- A failing operator is reported and skipped
+"""
+import contextlib
+import io
+import json
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.blm.engine import BLMAnalysisEngine
+from src.blm.market_sweep import SweepDatabase, SweepMemo, run_market_sweep, shared
+from src.database.seed_germany import seed_all
+from src.output.json_exporter import BLMJsonExporter
+
+
+@pytest.fixture(scope="module")
+def germany_db():
+    with contextlib.redirect_stdout(io.StringIO()):
+        db = seed_all(":memory:")
+    yield db
+    db.close()
+
+
+def _snapshot(result) -> dict:
+    data = json.loads(BLMJsonExporter().export(result, include_provenance=False))
+    data["meta"].pop("generated_at")
+    return data
+
+
+def _provenance(result) -> list:
+    return [(v.field_name, v.operator, v.period, v.value,
+             v.primary_source.confidence if v.primary_source else None)
+            for v in result.provenance._values]
+
+
+# =====================================================================
+# Equivalence
+# =====================================================================
+
+class TestSweepEquivalence:
+    def test_matches_separate_runs(self, germany_db):
+        results = run_market_sweep(germany_db, "germany", target_period="CQ4_2025")
+        operators = [op["operator_id"]
+                     for op in germany_db.get_operators_in_market("germany")]
+        assert list(results) == operators
+
+        for operator_id, result in results.items():
+            alone = BLMAnalysisEngine(germany_db, operator_id, "germany",
+                                      target_period="CQ4_2025").run_five_looks()
+            assert _snapshot(result) == _snapshot(alone), operator_id
+            assert _provenance(result) == _provenance(alone), operator_id
+
+    def test_parallel_engines_match(self, germany_db):
+        serial = run_market_sweep(germany_db, "germany", target_period="CQ4_2025",
+                                  operators=["vodafone_germany"])
+        parallel = run_market_sweep(germany_db, "germany", target_period="CQ4_2025",
+                                    operators=["vodafone_germany"], parallel=True)
+        assert (_snapshot(parallel["vodafone_germany"])
+                == _snapshot(serial["vodafone_germany"]))
+
+
+# =====================================================================
+# Sharing
+# =====================================================================
+
+class TestSharing:
+    def test_market_work_shared_across_targets(self, germany_db, monkeypatch):
+        memos = []
+        original = SweepDatabase.__init__
+
+        def capture(self, db):
+            original(self, db)
+            memos.append(self.sweep_memo)
+
+        monkeypatch.setattr(SweepDatabase, "__init__", capture)
+        run_market_sweep(germany_db, "germany", target_period="CQ4_2025")
+
+        memo = memos[0]
+        keys = {key[0] for key in memo._values}
+        assert {"tariff_index", "share_matrices", "competitor_profile",
+                "comparison_table", "db"} <= keys
+        assert memo.hits > memo.misses
+
+    def test_shared_outside_sweep_just_computes(self, germany_db):
+        calls = []
+        for _ in range(2):
+            shared(germany_db, ("k",), lambda: calls.append(1) or len(calls))
+        assert calls == [1, 1]
+
+    def test_hits_are_private_copies(self, germany_db):
+        sweep_db = SweepDatabase(germany_db)
+        first = shared(sweep_db, ("k",), lambda: {"items": []})
+        first["items"].append("mutated")
+        assert shared(sweep_db, ("k",), lambda: None) == {"items": []}
+
+    def test_counters_exact_under_threads(self):
+        memo = SweepMemo()
+
+        def lookups():
+            for i in range(2000):
+                memo.get_or_compute(i % 10, lambda: i, deep_copy=False)
+
+        threads = [threading.Thread(target=lookups) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert memo.hits + memo.misses == 16000
+        assert len(memo._values) == 10
+
+
+# =====================================================================
+# Failures
+# =====================================================================
+
+class TestSweepFailures:
+    def test_failed_operator_skipped(self, germany_db, monkeypatch):
+        import src.blm.engine as engine_module
+
+        real_run = engine_module.BLMAnalysisEngine.run_five_looks
+
+        def flaky(self):
+            if self.target_operator == "one_and_one":
+                raise RuntimeError("boom")
+            return real_run(self)
+
+        monkeypatch.setattr(engine_module.BLMAnalysisEngine, "run_five_looks", flaky)
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            results = run_market_sweep(germany_db, "germany", target_period="CQ4_2025")
+        assert "one_and_one" not in results
+        assert len(results) == 3
+        assert "Sweep run failed for one_and_one" in out.getvalue()
@@ -1,12 +1,14 @@
 """Comprehensive tests for BLM Five Looks data models."""
 import sys
 import os
+import pickle
 import pytest
 from datetime import datetime, timedelta
 
 # Ensure project root is on sys.path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
+from src.models import SLOTS
 from src.models.provenance import (
     SourceType, Confidence, FreshnessStatus,
     SourceReference, TrackedValue, ProvenanceStore,
@@ -320,6 +322,45 @@ class TestProvenanceStore:
         assert len(results) == 1
         assert results[0].value == 100
 
+    def test_get_values_keeps_recording_order(self):
+        store = ProvenanceStore()
+        for i, (op, period) in enumerate([("VF", "Q1"), ("DT", "Q1"), ("VF", "Q2"),
+                                          ("VF", "Q1"), ("DT", "Q2")]):
+            store.track(value=i, field_name="revenue", operator=op, period=period)
+        assert [v.value for v in store.get_values(operator="VF")] == [0, 2, 3]
+        assert [v.value for v in store.get_values(period="Q1")] == [0, 1, 3]
+        assert [v.value for v in store.get_values("VF", "revenue", "Q1")] == [0, 3]
+        assert store.get_values("XX", "revenue", "Q1") == []
+
+    def test_index_survives_merge_and_pickle(self):
+        store, other = ProvenanceStore(), ProvenanceStore()
+        store.track(value=1, field_name="revenue", operator="VF")
+        other.track(value=2, field_name="revenue", operator="VF")
+        store.merge(other)
+        restored = pickle.loads(pickle.dumps(store))
+        assert [v.value for v in restored.get_values(operator="VF")] == [1, 2]
+        restored.track(value=3, field_name="revenue", operator="VF")
+        assert len(restored.get_values(field_name="revenue")) == 3
+
+    def test_equal_sources_interned(self):
+        store = ProvenanceStore()
+        when = datetime(2025, 1, 1)
+        a = SourceReference(source_type=SourceType.MANUAL, source_id="s", collected_at=when)
+        b = SourceReference(source_type=SourceType.MANUAL, source_id="s", collected_at=when)
+        c = SourceReference(source_type=SourceType.NEWS_ARTICLE, source_id="s",
+                            collected_at=when)
+        assert store.track(1, "f", source=a).primary_source is a
+        assert store.track(2, "f", source=b).primary_source is a
+        # Same id but different content is kept as is
+        assert store.track(3, "f", source=c).primary_source is c
+
+    @pytest.mark.skipif(not SLOTS, reason="slots off (BLM_MODEL_SLOTS=0 or Python < 3.10)")
+    def test_tracked_values_are_slotted(self):
+        tv = TrackedValue(value=1, field_name="f")
+        assert not hasattr(tv, "__dict__")
+        with pytest.raises(AttributeError):
+            tv.extra = 1
+
     def test_quality_report(self):
         store = ProvenanceStore()
         src_high = SourceReference(
@@ -982,6 +1023,48 @@ class TestModuleImports:
         assert len(src.models.__all__) >= 24
 
 
+# =====================================================================
+# Slotted Models
+# =====================================================================
+
+class TestSlottedModels:
+    def _insight(self):
+        return SelfInsight(
+            segment_analyses=[SegmentAnalysis(segment_id="mobile",
+                                              segment_name="Mobile")],
+            strategic_review="Largest cable footprint",
+            key_message="Stable",
+        )
+
+    @pytest.mark.skipif(not SLOTS, reason="slots off (BLM_MODEL_SLOTS=0 or Python < 3.10)")
+    def test_instances_have_no_dict(self):
+        insight = self._insight()
+        assert not hasattr(insight, "__dict__")
+        assert not hasattr(insight.segment_analyses[0], "__dict__")
+        with pytest.raises(AttributeError):
+            insight.undeclared_field = 1
+
+    def test_list_fields_stay_mutable_and_unshared(self):
+        a, b = SWOTAnalysis(), SWOTAnalysis()
+        a.strengths.append("Brand")
+        assert b.strengths == []
+
+    def test_pickle_round_trip(self):
+        insight = self._insight()
+        restored = pickle.loads(pickle.dumps(insight))
+        assert restored == insight
+
+    def test_json_export_and_attrdict_read_back(self):
+        import json
+        from src.output.json_exporter import _BLMEncoder, _AttrDict
+
+        data = json.loads(json.dumps(self._insight(), cls=_BLMEncoder))
+        assert data["segment_analyses"][0]["segment_name"] == "Mobile"
+        view = _AttrDict(data)
+        assert view.strategic_review == "Largest cable footprint"
+        assert view.segment_analyses[0].segment_id == "mobile"
+
+
 # =====================================================================
 # Integration Tests
 # =====================================================================
@@ -0,0 +1,145 @@
+"""Tests for the staged Xavier Niel group report pipeline.
+
+Covers:
+- StageTimer records and reports each stage
+- Per-operator analysis on a warm pool matches the in-process run
+- PDF and PPTX renders run concurrently and fail independently
+- --workers 1 runs without a pool
+"""
+import contextlib
+import io
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import generate_niel_group_report as report
+from src.database.seed_orchestrator import seed_steps
+from src.output.json_exporter import BLMJsonExporter
+from src.web.services.warm_pool import WarmWorkerPool
+
+OPERATORS = [op for op in report.ALL_OPERATORS if op[1] in ("guatemala", "switzerland")]
+
+
+@pytest.fixture(scope="module")
+def db(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("niel") / "markets.db")
+    with contextlib.redirect_stdout(io.StringIO()):
+        db = seed_steps(["guatemala", "millicom", "switzerland"], path, workers=1)
+    yield db
+    db.close()
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with WarmWorkerPool(workers=2) as p:
+        yield p
+
+
+@pytest.fixture(scope="module")
+def analysis(db):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return report.analyze_operators(db, OPERATORS)
+
+
+def _snapshot(result) -> dict:
+    data = json.loads(BLMJsonExporter().export(result, include_provenance=False))
+    data["meta"].pop("generated_at")
+    return data
+
+
+# =====================================================================
+# Stage timing
+# =====================================================================
+
+class TestStageTimer:
+    def test_stages_reported(self):
+        timer = report.StageTimer()
+        with timer.stage("seed"):
+            pass
+        timer.add("  PPTX", 1.25)
+        assert [name for name, _ in timer.stages] == ["seed", "  PPTX"]
+        text = timer.report()
+        assert "seed" in text and "1.25s" in text and "total (wall)" in text
+
+    def test_failed_stage_still_timed(self):
+        timer = report.StageTimer()
+        with pytest.raises(RuntimeError):
+            with timer.stage("analysis"):
+                raise RuntimeError("boom")
+        assert timer.stages[0][0] == "analysis"
+
+
+# =====================================================================
+# Analysis
+# =====================================================================
+
+class TestAnalyzeOperators:
+    def test_pool_matches_in_process(self, db, pool, analysis):
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            results, diagnoses = report.analyze_operators(db, OPERATORS, pool)
+        serial_results, serial_diagnoses = analysis
+        assert list(results) == list(serial_results) == [op[0] for op in OPERATORS]
+        for op_id in results:
+            assert _snapshot(results[op_id]) == _snapshot(serial_results[op_id])
+        assert set(diagnoses) == set(serial_diagnoses)
+        assert out.getvalue().count("OK") == len(OPERATORS)
+
+    def test_failed_operator_skipped(self, db, pool):
+        operators = OPERATORS + [("tigo_atlantis", "atlantis", "Tigo Atlantis", "Atlantis")]
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            results, _ = report.analyze_operators(db, operators, pool)
+        assert "tigo_atlantis" not in results
+        assert len(results) == len(OPERATORS)
+        assert "FAILED" in out.getvalue()
+
+
+# =====================================================================
+# Rendering
+# =====================================================================
+
+class TestRenderOutputs:
+    def test_failures_independent(self, analysis, tmp_path, monkeypatch, capsys):
+        monkeypatch.setattr(report, "OUTPUT_DIR", tmp_path)
+
+        def failing_pdf(md_content, output_path, chinese=True):
+            raise RuntimeError("no fonts" if chinese else "no renderer")
+
+        def pptx(all_results, all_diagnoses, group_summaries, output_path):
+            output_path.write_bytes(b"deck")
+            return 7
+
+        monkeypatch.setattr(report, "generate_pdf", failing_pdf)
+        monkeypatch.setattr(report, "generate_ppt", pptx)
+        timer = report.StageTimer()
+        written = report.render_outputs("# Report", *analysis, {}, timer=timer)
+
+        out = capsys.readouterr().out
+        assert "PDF (zh) generation failed: no fonts" in out
+        assert "PDF generation failed: no renderer" in out
+        assert "7 slides" in out
+        assert list(written) == ["PPTX"]
+        assert [name for name, _ in timer.stages] == ["render", "  PPTX"]
+
+    def test_concurrent_on_pool(self, analysis, pool, tmp_path, monkeypatch, capsys):
+        monkeypatch.setattr(report, "OUTPUT_DIR", tmp_path)
+        results, diagnoses = analysis
+        written = report.render_outputs("# Report", results, diagnoses, {}, pool)
+
+        out = capsys.readouterr().out
+        try:
+            import markdown, weasyprint  # noqa: F401
+        except ImportError:
+            # The PDFs fail without their renderer; the deck is still written
+            assert "PDF (zh) generation failed" in out
+        assert written["PPTX"] == tmp_path / "blm_niel_group_consolidated_cq4_2025.pptx"
+        assert written["PPTX"].stat().st_size > 0
+
+
+class TestWorkers:
+    def test_single_worker_runs_in_process(self):
+        assert report.parse_args(["--workers", "1"]).workers == 1
+        assert report.start_pool(1) is None
@@ -0,0 +1,153 @@
+"""Tests for the columnar parse cache of preprocessed data files.
+
+Covers:
+- Cached loads equal a fresh load + preprocess, columns memory-mapped
+- Invalidation: content change, preprocessor token; touch keeps the entry
+- Text, object and pickled column round trips
+- Unreadable entries are re-parsed; BLM_PARSE_CACHE=0 disables the cache
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.data.loader import DataLoader, FinancialDataPreprocessor
+from src.data.parse_cache import ParseCache, default_parse_cache
+from src.data.sample import generate_sample_data
+
+
+@pytest.fixture
+def sample_csv(tmp_path):
+    df = generate_sample_data(n_records=120, seed=3)
+    df.loc[::17, "state"] = None
+    path = tmp_path / "ledger.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ParseCache(str(tmp_path / "cache"))
+
+
+def _fresh(path) -> pd.DataFrame:
+    return FinancialDataPreprocessor().preprocess(DataLoader().load(str(path)))
+
+
+class _FixedPreprocessor(FinancialDataPreprocessor):
+    """Returns a fixed frame, to exercise the column encodings."""
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    def preprocess(self, df):
+        return self.frame.copy()
+
+
+# =====================================================================
+# Hits and misses
+# =====================================================================
+
+class TestParseCacheHits:
+    def test_cached_load_equals_fresh_parse(self, cache, sample_csv):
+        first = cache.load(str(sample_csv))
+        second = cache.load(str(sample_csv))
+        assert (cache.misses, cache.hits) == (1, 1)
+        pd.testing.assert_frame_equal(first, _fresh(sample_csv))
+        pd.testing.assert_frame_equal(second, _fresh(sample_csv))
+
+    def test_numeric_columns_memory_mapped(self, cache, sample_csv):
+        cache.load(str(sample_csv))
+        df = cache.load(str(sample_csv))
+        base = df["amount"].to_numpy()
+        while base is not None and not isinstance(base, np.memmap):
+            base = base.base
+        assert isinstance(base, np.memmap)
+        # Writes go to a private copy, never the cache file
+        df.loc[0, "amount"] = -1.0
+        assert cache.load(str(sample_csv)).loc[0, "amount"] != -1.0
+
+    def test_content_change_invalidates(self, cache, sample_csv):
+        cache.load(str(sample_csv))
+        df = pd.read_csv(sample_csv)
+        df.loc[0, "amount"] = 123456.0
+        df.to_csv(sample_csv, index=False)
+        assert cache.load(str(sample_csv)).loc[0, "amount"] == 123456.0
+        assert cache.misses == 2
+
+    def test_touch_revalidated_by_content_hash(self, cache, sample_csv):
+        cache.load(str(sample_csv))
+        stat = sample_csv.stat()
+        os.utime(sample_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        cache.load(str(sample_csv))
+        assert (cache.misses, cache.hits) == (1, 1)
+
+    def test_preprocessor_version_invalidates(self, tmp_path, sample_csv):
+        ParseCache(str(tmp_path / "cache")).load(str(sample_csv))
+
+        class Bumped(FinancialDataPreprocessor):
+            VERSION = FinancialDataPreprocessor.VERSION + 1
+
+        bumped = ParseCache(str(tmp_path / "cache"), preprocessor=Bumped())
+        bumped.load(str(sample_csv))
+        assert bumped.misses == 1
+
+    def test_unreadable_entry_reparsed(self, cache, sample_csv, capsys):
+        cache.load(str(sample_csv))
+        entry = cache.entry_dir(sample_csv.resolve())
+        for npy in entry.glob("*.npy"):
+            npy.write_bytes(b"garbage")
+        df = cache.load(str(sample_csv))
+        assert "unreadable" in capsys.readouterr().out
+        pd.testing.assert_frame_equal(df, _fresh(sample_csv))
+        assert cache.load(str(sample_csv)) is not None
+        assert cache.hits == 1
+
+
+# =====================================================================
+# Column encodings
+# =====================================================================
+
+class TestColumnEncodings:
+    def test_round_trips(self, tmp_path, sample_csv):
+        frame = pd.DataFrame({
+            "text": pd.array(["a", None, "b", "a"], dtype="str"),
+            "object_text": pd.Series(["x", None, "y", "x"], dtype=object),
+            "mixed": pd.Series([1, "two", None, 3.5], dtype=object),
+            "nullable": pd.array([1, None, 3, 4], dtype="Int64"),
+            "flag": [True, False, True, True],
+            "when": pd.to_datetime(["2021-01-01", None, "2022-06-30", "2023-12-31"]),
+            "amount": [1.5, np.nan, 3.0, -2.0],
+        })
+        cache = ParseCache(str(tmp_path / "cache"), preprocessor=_FixedPreprocessor(frame))
+        cache.load(str(sample_csv))
+        cached = cache.load(str(sample_csv))
+        assert cache.hits == 1
+        pd.testing.assert_frame_equal(cached, frame)
+        assert cached["object_text"][1] is None
+
+    def test_non_default_index_kept(self, tmp_path, sample_csv):
+        frame = pd.DataFrame({"amount": [1.0, 2.0]}, index=pd.Index([10, 20], name="row"))
+        cache = ParseCache(str(tmp_path / "cache"), preprocessor=_FixedPreprocessor(frame))
+        cache.load(str(sample_csv))
+        pd.testing.assert_frame_equal(cache.load(str(sample_csv)), frame)
+
+
+class TestConfiguration:
+    def test_disabled_by_environment(self, monkeypatch):
+        monkeypatch.setenv("BLM_PARSE_CACHE", "0")
+        assert default_parse_cache() is None
+
+    def test_directory_from_environment(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("BLM_PARSE_CACHE_DIR", str(tmp_path))
+        assert default_parse_cache().cache_dir == tmp_path
+
+    def test_clear(self, cache, sample_csv):
+        cache.load(str(sample_csv))
+        assert cache.clear() == 1
+        cache.load(str(sample_csv))
+        assert cache.misses == 2
@@ -0,0 +1,186 @@
+"""Tests for chapter-by-chapter PDF rendering.
+
+Covers:
+- split_markdown_chapters: preamble, chapter levels, fenced code
+- Assembly: front matter table of contents, page counts, page numbers stamped,
+  overlay page count checked
+- Cache: unchanged chapters reused, edited chapter re-rendered, CSS in the key
+- BLM_PDF_CACHE=0 and BLM_PDF_CACHE_DIR
+"""
+import io
+import os
+import sys
+
+import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.output.pdf_chapters import Chapter, ChapterPDFRenderer, split_markdown_chapters
+
+FOOTER_CSS = "@page { size: A4; @bottom-center { content: counter(page) } }"
+
+
+class FakeRenderer:
+    """HTML -> PDF with one page per <p> (or overlay page), each holding a rectangle."""
+
+    def __init__(self):
+        self.rendered = []
+
+    def __call__(self, html: str) -> bytes:
+        self.rendered.append(html)
+        doc = pdfium.PdfDocument.new()
+        for _ in range(max(1, html.count("<p>") + html.count('class="page"'))):
+            page = doc.new_page(595, 842)
+            rect = pdfium_c.FPDFPageObj_CreateNewRect(10, 10, 50, 20)
+            pdfium_c.FPDFPath_SetDrawMode(rect, pdfium_c.FPDF_FILLMODE_ALTERNATE, False)
+            page.insert_obj(pdfium.PdfObject(rect))
+            page.gen_content()
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        return buffer.getvalue()
+
+
+def _chapters():
+    return [
+        Chapter("Overview", 2, "<h2>Overview</h2><p>a</p><p>b</p>"),
+        Chapter("Salt", 4, "<h4>Salt</h4><p>c</p>"),
+        Chapter("Free", 4, "<h4>Free</h4><p>d</p><p>e</p><p>f</p>"),
+    ]
+
+
+def _front(toc):
+    entries = "".join(f"<li>{chapter.title} {page}</li>" for chapter, page in toc)
+    return f"<h1>Report</h1><ul>{entries}</ul>"
+
+
+@pytest.fixture
+def fake():
+    return FakeRenderer()
+
+
+def _renderer(tmp_path, fake, css="body { color: #333; }"):
+    return ChapterPDFRenderer(css, FOOTER_CSS, cache_dir=str(tmp_path / "cache"), render_html=fake)
+
+
+# =====================================================================
+# Splitting
+# =====================================================================
+
+class TestSplitMarkdown:
+    def test_chapters_at_levels(self):
+        md = "# Title\n\nintro\n## Part 1\n### Sub\ntext\n#### Op A\nx\n#### Op B\ny\n## Part 2\nz"
+        preamble, chapters = split_markdown_chapters(md)
+        assert preamble == "# Title\n\nintro"
+        assert [(t, lvl) for t, lvl, _ in chapters] == [
+            ("Part 1", 2), ("Op A", 4), ("Op B", 4), ("Part 2", 2)]
+        assert chapters[0][2] == "## Part 1\n### Sub\ntext"
+        assert "\n".join([preamble] + [c[2] for c in chapters]) == md
+
+    def test_fenced_headings_ignored(self):
+        _, chapters = split_markdown_chapters("## A\n```\n## not a chapter\n```\n## B")
+        assert [t for t, _, _ in chapters] == ["A", "B"]
+
+
+# =====================================================================
+# Assembly
+# =====================================================================
+
+class TestRender:
+    def test_pages_and_toc(self, tmp_path, fake):
+        out = tmp_path / "report.pdf"
+        assert _renderer(tmp_path, fake).render(_chapters(), out, front=_front) == 7
+        doc = pdfium.PdfDocument(str(out))
+        assert len(doc) == 7
+        front_html = next(h for h in fake.rendered if "<h1>Report" in h)
+        assert "<li>Overview 2</li><li>Salt 4</li><li>Free 5</li>" in front_html
+
+    def test_toc_settles_on_front_page_count(self, tmp_path, fake):
+        def long_front(toc):
+            return _front(toc) + "<p>1</p><p>2</p>"
+
+        out = tmp_path / "report.pdf"
+        assert _renderer(tmp_path, fake).render(_chapters(), out, front=long_front) == 8
+        front_html = [h for h in fake.rendered if "<h1>Report" in h]
+        assert len(front_html) == 2
+        assert "<li>Overview 3</li><li>Salt 5</li><li>Free 6</li>" in front_html[-1]
+
+    def test_page_numbers_stamped(self, tmp_path, fake):
+        out = tmp_path / "report.pdf"
+        _renderer(tmp_path, fake).render(_chapters(), out)
+        doc = pdfium.PdfDocument(str(out))
+        assert len(doc) == 6
+        for page in doc:
+            kinds = [obj.type for obj in page.get_objects(max_depth=0)]
+            assert pdfium_c.FPDF_PAGEOBJ_FORM in kinds
+        overlay = next(h for h in fake.rendered if 'class="page"' in h)
+        assert overlay.count('class="page"') == 6 and FOOTER_CSS in overlay
+
+    def test_overlay_page_count_checked(self, tmp_path, fake):
+        def short_overlay(html):
+            return fake(html.replace('<div class="page">&nbsp;</div>', "", 1))
+
+        renderer = ChapterPDFRenderer("", FOOTER_CSS, cache_dir=str(tmp_path),
+                                      render_html=short_overlay)
+        with pytest.raises(RuntimeError, match="5 pages for 6"):
+            renderer.render(_chapters(), tmp_path / "report.pdf")
+
+    def test_no_footer(self, tmp_path, fake):
+        out = tmp_path / "report.pdf"
+        ChapterPDFRenderer("", cache_dir=str(tmp_path), render_html=fake).render(_chapters(), out)
+        assert not any('class="page"' in h for h in fake.rendered)
+
+
+# =====================================================================
+# Cache
+# =====================================================================
+
+class TestCache:
+    def test_unchanged_report_not_rendered(self, tmp_path, fake):
+        _renderer(tmp_path, fake).render(_chapters(), tmp_path / "a.pdf", front=_front)
+        fake.rendered.clear()
+        renderer = _renderer(tmp_path, fake)
+        renderer.render(_chapters(), tmp_path / "b.pdf", front=_front)
+        assert fake.rendered == []
+        assert renderer.misses == 0 and renderer.hits == 5
+        assert len(pdfium.PdfDocument(str(tmp_path / "b.pdf"))) == 7
+
+    def test_only_edited_chapter_rendered(self, tmp_path, fake):
+        _renderer(tmp_path, fake).render(_chapters(), tmp_path / "a.pdf", front=_front)
+        fake.rendered.clear()
+        chapters = _chapters()
+        chapters[1].html = "<h4>Salt</h4><p>revised</p>"
+        _renderer(tmp_path, fake).render(chapters, tmp_path / "b.pdf", front=_front)
+        assert len(fake.rendered) == 1 and "revised" in fake.rendered[0]
+
+    def test_page_count_change_rerenders_front(self, tmp_path, fake):
+        _renderer(tmp_path, fake).render(_chapters(), tmp_path / "a.pdf", front=_front)
+        fake.rendered.clear()
+        chapters = _chapters()
+        chapters[0].html += "<p>more</p>"
+        assert _renderer(tmp_path, fake).render(chapters, tmp_path / "b.pdf", front=_front) == 8
+        # The edited chapter, the front matter (new page numbers), the overlay
+        assert len(fake.rendered) == 3
+        assert "<li>Salt 5</li>" in fake.rendered[1]
+
+    def test_css_in_key(self, tmp_path, fake):
+        _renderer(tmp_path, fake).render(_chapters(), tmp_path / "a.pdf")
+        fake.rendered.clear()
+        _renderer(tmp_path, fake, css="body { color: #000; }").render(_chapters(), tmp_path / "b.pdf")
+        assert len(fake.rendered) == 3
+
+
+class TestEnvironment:
+    def test_disabled(self, tmp_path, fake, monkeypatch):
+        monkeypatch.setenv("BLM_PDF_CACHE", "0")
+        renderer = ChapterPDFRenderer("", FOOTER_CSS, render_html=fake)
+        assert renderer.cache_dir is None
+        renderer.render(_chapters(), tmp_path / "a.pdf")
+        renderer.render(_chapters(), tmp_path / "b.pdf")
+        assert len(fake.rendered) == 8
+
+    def test_cache_dir(self, tmp_path, fake, monkeypatch):
+        monkeypatch.setenv("BLM_PDF_CACHE_DIR", str(tmp_path / "chapters"))
+        ChapterPDFRenderer("", FOOTER_CSS, render_html=fake).render(_chapters(), tmp_path / "a.pdf")
+        assert len(list((tmp_path / "chapters").glob("*.pdf"))) == 4
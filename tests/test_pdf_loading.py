@@ -0,0 +1,117 @@
+"""Tests for parallel and cached PDF table extraction in DataLoader.
+
+Covers:
+- Serial by default; page-range sharding across processes gives the serial DataFrame
+- PageTableCache: unchanged pages reused, changed pages re-extracted
+- Parallel load_directory matches the serial one, failures reported,
+  page cache shared with its workers
+"""
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.data import loader as loader_module
+from src.data.loader import DataLoader, PageTableCache
+
+pytest.importorskip("pdfplumber")
+
+
+def _write_pdf(path, pages):
+    """One table page per entry of ``pages`` (a list of row lists)."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    with PdfPages(path) as pdf:
+        for rows in pages:
+            fig, ax = plt.subplots(figsize=(8.5, 11))
+            ax.axis("off")
+            ax.table(cellText=rows, colLabels=["Program", "State", "Amount"], loc="center")
+            pdf.savefig(fig)
+            plt.close(fig)
+
+
+def _page(n):
+    return [[f"Program {n}-{i}", "NV", f"${1000 * n + i:,}"] for i in range(4)]
+
+
+@pytest.fixture
+def report_pdf(tmp_path):
+    path = tmp_path / "report.pdf"
+    _write_pdf(path, [_page(n) for n in range(4)])
+    return path
+
+
+class TestParallelPdf:
+    def test_serial_by_default(self):
+        assert DataLoader().max_workers == 1
+
+    def test_sharded_matches_serial(self, tmp_path, report_pdf, monkeypatch):
+        serial = DataLoader(str(tmp_path), max_workers=1).load(str(report_pdf))
+        assert len(serial) == 16
+        assert serial["program"].iloc[-1] == "Program 3-3"
+
+        monkeypatch.setattr(loader_module, "PDF_PARALLEL_MIN_PAGES", 2)
+        calls = []
+        original = loader_module._process_pool
+
+        def counting_pool(workers):
+            calls.append(workers)
+            return original(workers)
+
+        monkeypatch.setattr(loader_module, "_process_pool", counting_pool)
+        parallel = DataLoader(str(tmp_path), max_workers=2).load(str(report_pdf))
+        assert calls == [2]
+        pd.testing.assert_frame_equal(parallel, serial)
+
+
+class TestPageTableCache:
+    def test_unchanged_pages_reused(self, tmp_path, report_pdf):
+        cache = PageTableCache(str(tmp_path / "pages"))
+        loader = DataLoader(str(tmp_path), max_workers=1, page_cache=cache)
+        first = loader.load(str(report_pdf))
+        assert (cache.hits, cache.misses) == (0, 4)
+
+        # Page 2 changes, the rest of the document does not.  Its rows are
+        # reordered rather than new, so the embedded font subset (shared by
+        # every page, and part of each page key) stays the same.
+        _write_pdf(report_pdf, [_page(0), _page(1), _page(2)[::-1], _page(3)])
+        cache.hits = cache.misses = 0
+        changed = loader.load(str(report_pdf))
+        assert (cache.hits, cache.misses) == (3, 1)
+        assert changed["program"].iloc[8] == "Program 2-3"
+        pd.testing.assert_frame_equal(changed.iloc[:8], first.iloc[:8])
+        pd.testing.assert_frame_equal(
+            changed, DataLoader(str(tmp_path), max_workers=1).load(str(report_pdf)))
+
+
+class TestParallelDirectory:
+    def test_matches_serial(self, tmp_path, monkeypatch, capsys):
+        for i in range(3):
+            pd.DataFrame({"Amount": [i, i + 1], "State": ["NV", "UT"]}).to_csv(
+                tmp_path / f"ledger_{i}.csv", index=False)
+        (tmp_path / "broken.xlsx").write_text("not a workbook")
+
+        serial = DataLoader(str(tmp_path), max_workers=1).load_directory()
+        serial_out = capsys.readouterr().out
+        monkeypatch.setattr(loader_module, "PARALLEL_MIN_BYTES", 0)
+        parallel = DataLoader(str(tmp_path), max_workers=2).load_directory()
+
+        assert list(parallel) == list(serial)
+        assert sorted(parallel) == ["ledger_0.csv", "ledger_1.csv", "ledger_2.csv"]
+        for name in serial:
+            pd.testing.assert_frame_equal(parallel[name], serial[name])
+        assert "Failed to load broken.xlsx" in serial_out
+        assert "Failed to load broken.xlsx" in capsys.readouterr().out
+
+    def test_workers_use_page_cache(self, tmp_path, report_pdf, monkeypatch):
+        _write_pdf(tmp_path / "other.pdf", [_page(4)])
+        monkeypatch.setattr(loader_module, "PARALLEL_MIN_BYTES", 0)
+        cache = PageTableCache(str(tmp_path / "pages"))
+        DataLoader(str(tmp_path), max_workers=2, page_cache=cache).load_directory()
+        assert len(list((tmp_path / "pages").glob("*/*.json"))) == 5
@@ -311,3 +311,46 @@ def test_engine_provenance_saves(db):
     # Load back and verify
     loaded = ProvenanceStore.load_from_db(db, analysis_job_id=1)
     assert loaded.quality_report()["total_data_points"] == stats["values_saved"]
+
+
+# ==================================================================
+# Test: bulk save
+# ==================================================================
+
+def test_value_referenced_source_saved_once(db):
+    """A source only referenced by values is written once, however often used."""
+    store = ProvenanceStore()
+    src = _make_source("shared")
+    for i in range(50):
+        store.track(value=i, field_name=f"f{i}", source=src)
+
+    result = store.save_to_db(db, analysis_job_id=5)
+    assert result == {"sources_saved": 1, "values_saved": 50}
+    count = db.conn.execute("SELECT COUNT(*) FROM source_registry").fetchone()[0]
+    assert count == 1
+
+
+def test_failed_save_writes_nothing(db):
+    """Values are written in one transaction: a failing row rolls back all."""
+    store = ProvenanceStore()
+    store.track(value=1, field_name="ok")
+    store.track(value=2, field_name=None)  # violates NOT NULL
+
+    with pytest.raises(Exception):
+        store.save_to_db(db, analysis_job_id=6)
+    count = db.conn.execute("SELECT COUNT(*) FROM data_provenance").fetchone()[0]
+    assert count == 0
+
+
+def test_roundtrip_preserves_order(db):
+    """Loaded values come back in the order they were tracked."""
+    store = ProvenanceStore()
+    src = _make_source("s1")
+    names = [f"field_{i:03d}" for i in range(1200)]
+    for name in reversed(names):
+        store.track(value=1, field_name=name, operator="op", source=src)
+    store.save_to_db(db, analysis_job_id=7)
+
+    loaded = ProvenanceStore.load_from_db(db, analysis_job_id=7)
+    assert [v.field_name for v in loaded._values] == list(reversed(names))
+    assert len(loaded.get_values(operator="op", field_name="field_010")) == 1
@@ -0,0 +1,123 @@
+"""Tests for the EXPLAIN QUERY PLAN audit of TelecomDatabase queries.
+
+Covers:
+- explain() flags full scans and temp B-trees
+- Every audited method runs index-driven on the seeded schema
+- Before/after state: audit indexes dropped and restored
+- Synthetic N-times dataset and ANALYZE statistics
+"""
+import contextlib
+import io
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.database.query_audit import (
+    AUDITED_METHODS, audit_queries, build_synthetic_db, drop_audit_indexes,
+    explain, format_audit, restore_audit_indexes,
+)
+from src.database.seed_germany import seed_all
+
+
+@pytest.fixture
+def germany_db():
+    with contextlib.redirect_stdout(io.StringIO()):
+        db = seed_all(":memory:")
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def synthetic_db():
+    # Five markets: with one, the planner rightly prefers scanning operators
+    with contextlib.redirect_stdout(io.StringIO()):
+        db = build_synthetic_db(scale=5, markets=["germany"])
+    yield db
+    db.close()
+
+
+# =====================================================================
+# explain()
+# =====================================================================
+
+class TestExplain:
+    def test_flags_scan_and_sort(self):
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE t (a INTEGER, b TEXT)")
+        plan = explain(conn, "SELECT * FROM t WHERE b = ? ORDER BY a", ["x"])
+        assert plan.scans == ["t"]
+        assert plan.temp_btrees == ["ORDER BY"]
+
+    def test_index_search_is_clean(self):
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE t (a INTEGER, b TEXT)")
+        conn.execute("CREATE INDEX t_b_a ON t(b, a)")
+        plan = explain(conn, "SELECT * FROM t WHERE b = ? ORDER BY a", ["x"])
+        assert plan.scans == [] and plan.temp_btrees == []
+        assert any("t_b_a" in detail for detail in plan.plan)
+
+
+# =====================================================================
+# Audit
+# =====================================================================
+
+class TestAuditQueries:
+    def test_all_methods_index_driven(self, synthetic_db):
+        audits = audit_queries(synthetic_db)
+        assert [a.method for a in audits] == list(AUDITED_METHODS)
+        assert all(a.statements for a in audits)
+        assert [a.method for a in audits if a.flagged] == []
+
+    def test_market_queries_use_operator_market_index(self, synthetic_db):
+        audit, = audit_queries(synthetic_db, methods=["get_operators_in_market"])
+        assert "idx_operators_market" in audit.statements[0].plan[0]
+
+    def test_before_state_flags_scans(self, synthetic_db):
+        drop_audit_indexes(synthetic_db)
+        before = {a.method: a for a in audit_queries(synthetic_db)}
+        assert before["get_operators_in_market"].statements[0].scans == ["operators"]
+        assert before["get_market_comparison"].flagged
+
+        restore_audit_indexes(synthetic_db)
+        assert not any(a.flagged for a in audit_queries(synthetic_db))
+        assert synthetic_db.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'idx_competitive_operator_cq'"
+        ).fetchone() is None
+
+    def test_format_audit(self, synthetic_db):
+        report = format_audit(audit_queries(synthetic_db))
+        assert "15 query methods audited, 0 flagged" in report
+        assert "accepted:" in report
+
+
+# =====================================================================
+# Synthetic data / statistics
+# =====================================================================
+
+class TestSyntheticData:
+    def test_scaled_copies(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            db = build_synthetic_db(scale=3, markets=["germany"])
+        try:
+            conn = db.conn
+            assert conn.execute("SELECT COUNT(*) FROM operators").fetchone()[0] == 12
+            assert db.get_operators_in_market("germany_x2")[0]["operator_id"].endswith("_x2")
+            by_market = conn.execute("""
+                SELECT o.market, COUNT(*) FROM financial_quarterly f
+                JOIN operators o ON f.operator_id = o.operator_id GROUP BY o.market
+            """).fetchall()
+            assert len({n for _, n in by_market}) == 1
+            # Statistics gathered for the planner
+            assert conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+        finally:
+            db.close()
+
+    def test_seed_runs_analyze(self, germany_db):
+        stats = germany_db.conn.execute(
+            "SELECT COUNT(*) FROM sqlite_stat1 WHERE idx = 'idx_operators_market'"
+        ).fetchone()[0]
+        assert stats == 1
@@ -0,0 +1,155 @@
+"""Tests for the input-fingerprint engine result cache.
+
+Covers:
+- Fingerprints are stable over unchanged data and scoped per market
+- Data edits, code changes and the date move the fingerprint
+- BLMAnalysisEngine returns the stored result on a hit
+- ResultCache replaces stale entries and invalidates by market
+"""
+import contextlib
+import io
+import json
+import os
+import sys
+from datetime import date
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.blm import result_cache
+from src.blm.engine import BLMAnalysisEngine
+from src.blm.result_cache import (
+    ResultCache, get_result_cache, run_fingerprint, table_fingerprints,
+)
+from src.database.seed_germany import seed_all
+from src.output.json_exporter import BLMJsonExporter
+
+
+@pytest.fixture
+def germany_db():
+    with contextlib.redirect_stdout(io.StringIO()):
+        db = seed_all(":memory:")
+    db.upsert_operator("other_op", display_name="Other", country="Austria",
+                       market="austria")
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def cache():
+    c = ResultCache(":memory:")
+    yield c
+    c.close()
+
+
+def _fingerprint(db, market="germany", operator="vodafone_germany"):
+    return run_fingerprint(db, market, operator, "CQ4_2025", 8,
+                           as_of=date(2026, 1, 15))
+
+
+def _snapshot(result) -> dict:
+    data = json.loads(BLMJsonExporter().export(result, include_provenance=False))
+    data["meta"].pop("generated_at")
+    return data
+
+
+# =====================================================================
+# Fingerprints
+# =====================================================================
+
+class TestFingerprint:
+    def test_stable_over_unchanged_data(self, germany_db):
+        assert _fingerprint(germany_db) == _fingerprint(germany_db)
+
+    def test_edit_changes_only_affected_market(self, germany_db):
+        germany_before = table_fingerprints(germany_db, "germany")
+        austria_before = table_fingerprints(germany_db, "austria")
+
+        germany_db.upsert_tariff("other_op", "Basic", "mobile_postpaid", "H1_2026",
+                                 {"monthly_price": 9.99})
+
+        assert table_fingerprints(germany_db, "germany") == germany_before
+        austria_after = table_fingerprints(germany_db, "austria")
+        changed = {t for t in austria_after if austria_after[t] != austria_before[t]}
+        assert changed == {"tariffs"}
+
+    def test_value_edit_changes_fingerprint(self, germany_db):
+        before = _fingerprint(germany_db)
+        germany_db.conn.execute(
+            "UPDATE financial_quarterly SET total_revenue = total_revenue + 1 "
+            "WHERE operator_id = 'deutsche_telekom'")
+        assert _fingerprint(germany_db) != before
+
+    def test_run_parameters_code_and_date_are_keyed(self, germany_db, monkeypatch):
+        base = _fingerprint(germany_db)
+        assert _fingerprint(germany_db, operator="deutsche_telekom") != base
+        assert run_fingerprint(germany_db, "germany", "vodafone_germany",
+                               "CQ4_2025", 8, as_of=date(2026, 1, 16)) != base
+        monkeypatch.setattr(result_cache, "engine_code_version", lambda: "changed")
+        assert _fingerprint(germany_db) != base
+
+
+# =====================================================================
+# Engine integration
+# =====================================================================
+
+class TestEngineCache:
+    def _engine(self, db, cache):
+        return BLMAnalysisEngine(db, "vodafone_germany", "germany",
+                                 target_period="CQ4_2025", cache=cache)
+
+    def test_hit_returns_stored_result(self, germany_db, cache, monkeypatch):
+        first = self._engine(germany_db, cache).run_five_looks()
+        assert (cache.hits, cache.misses) == (0, 1)
+
+        engine = self._engine(germany_db, cache)
+        monkeypatch.setattr(engine, "_run_stages_serial",
+                            lambda: pytest.fail("cache hit recomputed"))
+        second = engine.run_five_looks()
+
+        assert cache.hits == 1
+        assert _snapshot(second) == _snapshot(first)
+        assert engine.provenance is second.provenance
+
+    def test_data_edit_forces_recompute(self, germany_db, cache):
+        self._engine(germany_db, cache).run_five_looks()
+        germany_db.upsert_tariff("vodafone_germany", "New Plan", "mobile_postpaid",
+                                 "H1_2026", {"monthly_price": 19.99})
+        self._engine(germany_db, cache).run_five_looks()
+        assert (cache.hits, cache.misses) == (0, 2)
+        # Stale entry for the same run was replaced
+        assert cache.count() == 1
+
+
+# =====================================================================
+# Store
+# =====================================================================
+
+class TestResultCacheStore:
+    def test_invalidate_by_market(self, germany_db, cache):
+        result = BLMAnalysisEngine(germany_db, "vodafone_germany", "germany",
+                                   cache=cache).run_five_looks()
+        cache.put("other-market-key", type(result)("x_op", "austria", "CQ4_2025"),
+                  "CQ4_2025", 8)
+        assert cache.count() == 2
+        assert cache.invalidate("germany") == 1
+        assert cache.count() == 1
+
+    def test_unreadable_payload_is_a_miss(self, cache):
+        cache.conn.execute(
+            "INSERT INTO engine_result_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ["bad", "m", "op", None, 8, "2026-01-01", b"not a pickle"])
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert cache.get("bad") is None
+        assert cache.misses == 1
+
+    def test_get_result_cache_from_env(self, monkeypatch, tmp_path):
+        monkeypatch.delenv("BLM_RESULT_CACHE_DB", raising=False)
+        assert get_result_cache() is None
+        monkeypatch.setattr(result_cache, "_cache", None)
+        monkeypatch.setenv("BLM_RESULT_CACHE_DB", str(tmp_path / "cache.db"))
+        try:
+            assert get_result_cache() is get_result_cache()
+        finally:
+            result_cache._cache.close()
@@ -0,0 +1,149 @@
+"""Tests for prebuilt seeded database images.
+
+Covers:
+- Clones (:memory: and file) hold the same data as seeding from scratch
+- Images are built once, rebuilt when a source changes, old ones removed
+- source_closure follows the seed modules' project imports
+- seeded_database(): existing targets and BLM_SEED_IMAGE=0 seed directly
+"""
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.database.db import TelecomDatabase
+from src.database.seed_image import (
+    SeedImage, seed_image, seed_sources, seeded_database, source_closure,
+)
+from src.database.seed_germany import seed_all
+
+
+def _quiet(fn, *args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args)
+
+
+def _dump(db: TelecomDatabase) -> dict:
+    """Rows of every table, without the *_at timestamps of the seeding run."""
+    tables = [row[0] for row in db.conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' "
+        "AND name NOT LIKE 'sqlite_%' AND name NOT LIKE '%_fts%' ORDER BY name")]
+    dump = {}
+    for table in tables:
+        columns = [row[1] for row in db.conn.execute(f"PRAGMA table_info({table})")
+                   if not row[1].endswith("_at")]
+        rows = db.conn.execute(f"SELECT {', '.join(columns)} FROM {table}")
+        dump[table] = sorted(map(tuple, rows), key=repr)
+    return dump
+
+
+@pytest.fixture
+def image(tmp_path):
+    return seed_image("germany", image_dir=str(tmp_path / "images"))
+
+
+def _tiny_seeder(db_path):
+    db = TelecomDatabase(db_path).init()
+    db.upsert_operator("op_a", display_name="A", market="germany", country="Germany")
+    return db
+
+
+# =====================================================================
+# Cloning
+# =====================================================================
+
+class TestClone:
+    def test_memory_clone_matches_seeding(self, image):
+        clone = _quiet(image.clone)
+        assert _dump(clone) == _dump(_quiet(seed_all, ":memory:"))
+        assert clone.conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        assert clone.get_operators_in_market("germany")
+
+    def test_file_clone(self, image, tmp_path):
+        path = tmp_path / "db" / "germany.db"
+        clone = _quiet(image.clone, str(path))
+        assert clone.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert _dump(clone) == _dump(_quiet(image.clone))
+        clone.close()
+        with pytest.raises(FileExistsError):
+            image.clone(str(path))
+
+    def test_event_search_available(self, image):
+        clone = _quiet(image.clone)
+        assert clone.has_event_fts == _quiet(seed_all, ":memory:").has_event_fts
+        assert (clone.search_intelligence_events(market="germany", keywords=["5G"])
+                == _quiet(seed_all, ":memory:").search_intelligence_events(
+                    market="germany", keywords=["5G"]))
+
+
+# =====================================================================
+# Building and invalidation
+# =====================================================================
+
+class TestBuild:
+    def test_built_once(self, image):
+        _quiet(image.clone)
+        image.clone()
+        assert image.builds == 1
+        assert [p.name for p in image.image_dir.iterdir()] == [image.path().name]
+
+    def test_source_change_rebuilds(self, tmp_path):
+        source = tmp_path / "seed_tiny.py"
+        source.write_text("OPERATORS = ['op_a']\n")
+        image = SeedImage("tiny", _tiny_seeder, [source], str(tmp_path / "images"))
+        first = image.ensure()
+        image.clone()
+        assert image.builds == 1
+
+        source.write_text("OPERATORS = ['op_a', 'op_b']\n")
+        second = image.ensure()
+        assert image.builds == 2
+        assert second != first and not first.exists()
+
+    def test_failed_build_leaves_nothing(self, tmp_path):
+        def broken(db_path):
+            raise RuntimeError("seed failed")
+
+        image = SeedImage("broken", broken, [], str(tmp_path / "images"))
+        with pytest.raises(RuntimeError):
+            image.clone()
+        assert list(image.image_dir.iterdir()) == []
+
+    def test_closure_follows_imports(self):
+        names = {p.name for p in source_closure(seed_sources())}
+        # Lazy, in-function imports of seed_germany and seed_orchestrator
+        assert {"germany_market_comprehensive_data.py", "seed_millicom.py",
+                "db.py", "period_utils.py", "schema.sql"} <= names
+        # Package __init__ files are not followed
+        assert "__init__.py" not in names
+
+    def test_unknown_seeder(self):
+        with pytest.raises(ValueError, match="Unknown seeder"):
+            seed_image("atlantis")
+
+
+class TestSeededDatabase:
+    def test_existing_target_seeded_in_place(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("BLM_SEED_IMAGE_DIR", str(tmp_path / "images"))
+        path = tmp_path / "existing.db"
+        TelecomDatabase(str(path)).init().close()
+        db = _quiet(seeded_database, "germany", str(path))
+        assert db.get_operators_in_market("germany")
+        assert not (tmp_path / "images").exists()
+
+    def test_disabled_by_environment(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("BLM_SEED_IMAGE_DIR", str(tmp_path / "images"))
+        monkeypatch.setenv("BLM_SEED_IMAGE", "0")
+        db = _quiet(seeded_database, "germany")
+        assert db.get_operators_in_market("germany")
+        assert not (tmp_path / "images").exists()
+
+    def test_clones_from_image_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("BLM_SEED_IMAGE_DIR", str(tmp_path / "images"))
+        db = _quiet(seeded_database, "germany")
+        assert db.get_operators_in_market("germany")
+        assert len(list((tmp_path / "images").glob("germany-*.db"))) == 1
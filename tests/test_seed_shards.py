@@ -0,0 +1,135 @@
+"""Tests for sharded multi-market seeding.
+
+Covers:
+- Sharded seeding gives the serial database: rows, ids, log, event search
+- merge_shard: id offsets, used-up ids, summed change versions, FTS
+- Failing steps raise; serial by default, BLM_SEED_WORKERS opts in to shards
+"""
+import contextlib
+import io
+import os
+import sys
+from datetime import date
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.database import seed_orchestrator
+from src.database.db import TelecomDatabase
+from src.database.seed_orchestrator import merge_shard, seed_steps
+
+STEPS = ["germany", "chile", "guatemala", "millicom", "netherlands"]
+
+
+def _seed(steps, workers):
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        db = seed_steps(steps, workers=workers)
+    return db, log.getvalue()
+
+
+def _dump(db: TelecomDatabase) -> dict:
+    """Rows of every table with their ids, without *_at timestamps.
+
+    FTS shadow tables are left out: their segment layout depends on how
+    rows were batched, not on the content.
+    """
+    tables = [row[0] for row in db.conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' "
+        "AND name NOT LIKE 'sqlite_stat%' AND name NOT LIKE '%_fts_%' ORDER BY name")]
+    dump = {}
+    for table in tables:
+        columns = [row[1] for row in db.conn.execute(f"PRAGMA table_info({table})")
+                   if not row[1].endswith("_at")]
+        rows = db.conn.execute(f"SELECT {', '.join(columns)} FROM {table}")
+        dump[table] = sorted(map(tuple, rows), key=repr)
+    return dump
+
+
+def _shard(path, operator_id, market, events=1, drop_last=False):
+    db = TelecomDatabase(str(path)).init()
+    db.upsert_operator(operator_id, display_name=operator_id, market=market, country=market.title())
+    for i in range(events):
+        db.upsert_intelligence({"operator_id": operator_id, "market": market,
+                                "event_date": "2025-10-01", "category": "network",
+                                "title": f"{market} fibre rollout {i}"})
+    if drop_last:
+        db.conn.execute("DELETE FROM intelligence_events WHERE id = (SELECT MAX(id) FROM intelligence_events)")
+        db.conn.commit()
+    db.close()
+    return str(path)
+
+
+# =====================================================================
+# Sharded seeding
+# =====================================================================
+
+class TestShardedSeeding:
+    def test_matches_serial(self):
+        serial, serial_log = _seed(STEPS, workers=1)
+        sharded, sharded_log = _seed(STEPS, workers=2)
+        assert _dump(sharded) == _dump(serial)
+        assert sharded_log == serial_log
+        assert "[4/5] Seeding Millicom group structure..." in sharded_log
+        assert (sharded.search_intelligence_events(market="germany", keywords=["5G"])
+                == serial.search_intelligence_events(market="germany", keywords=["5G"]))
+        assert sharded.conn.execute("PRAGMA foreign_key_check").fetchall() == []
+
+    def test_failing_step_raises(self):
+        with pytest.raises(ValueError, match="Unknown seeding step: atlantis"):
+            _seed(["chile", "atlantis"], workers=2)
+
+    def test_serial_by_default(self, monkeypatch):
+        monkeypatch.delenv("BLM_SEED_WORKERS", raising=False)
+
+        def no_shards(*args):
+            raise AssertionError("seeded in shards")
+
+        monkeypatch.setattr(seed_orchestrator, "_seed_sharded", no_shards)
+        db, _ = _seed(["chile", "guatemala"], workers=None)
+        assert db.get_operators_in_market("guatemala")
+
+    def test_workers_from_environment(self, monkeypatch):
+        monkeypatch.setenv("BLM_SEED_WORKERS", "2")
+        calls = []
+        monkeypatch.setattr(seed_orchestrator, "_seed_sharded",
+                            lambda db, steps, shard_steps, workers: calls.append(workers))
+        _seed(["chile", "guatemala"], workers=None)
+        assert calls == [2]
+
+
+# =====================================================================
+# Merging
+# =====================================================================
+
+class TestMergeShard:
+    def test_ids_follow_main(self, tmp_path):
+        db = TelecomDatabase(":memory:").init()
+        merge_shard(db, _shard(tmp_path / "a.db", "op_a", "austria", events=3, drop_last=True))
+        merge_shard(db, _shard(tmp_path / "b.db", "op_b", "belgium", events=2))
+
+        rows = db.conn.execute("SELECT id, market FROM intelligence_events ORDER BY id").fetchall()
+        # Id 3 was used up in shard a, as it would have been in main
+        assert [tuple(r) for r in rows] == [
+            (1, "austria"), (2, "austria"), (4, "belgium"), (5, "belgium")]
+        assert db.conn.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'intelligence_events'").fetchone()[0] == 5
+        assert [e["market"] for e in db.search_intelligence_events(
+            market="belgium", keywords=["fibre"], as_of=date(2025, 12, 31))] == ["belgium", "belgium"]
+
+    def test_change_versions_summed(self, tmp_path):
+        db = TelecomDatabase(":memory:").init()
+        db.mark_changed("macro_environment", ["Austria"])
+        db.conn.commit()
+        shard = TelecomDatabase(str(tmp_path / "a.db")).init()
+        for _ in range(2):
+            shard.mark_changed("macro_environment", ["Austria"])
+        shard.mark_changed("macro_environment", ["Belgium"])
+        shard.conn.commit()
+        shard.close()
+
+        merge_shard(db, str(tmp_path / "a.db"))
+        versions = {(r["scope"]): r["version"] for r in db.conn.execute(
+            "SELECT scope, version FROM data_changes WHERE table_name = 'macro_environment'")}
+        assert versions == {"Austria": 3, "Belgium": 1}
@@ -1,22 +1,26 @@
 """Tests for src.blm.share_analyzer — Multi-Quarter Market Share Analysis."""
 from __future__ import annotations
 
+import numpy as np
 import pytest
 
 from src.blm.share_analyzer import (
     OperatorShareSeries,
     MarketConcentration,
     ShareAnalysis,
-    _extract_revenue_shares,
-    _extract_subscriber_shares,
-    _build_operator_series,
-    _compute_hhi,
+    ShareMatrix,
+    _hhi_tensor,
+    _series_from_matrix,
     _classify_hhi,
     _compute_ranks,
     _identify_share_movements,
     _generate_key_message,
     _classify_direction,
+    ALL_SHARE_METRICS,
+    compute_all_share_analyses,
+    compute_market_concentration_batch,
     compute_share_analysis,
+    compute_share_matrices,
 )
 
 
@@ -81,14 +85,36 @@ def _make_sub_data_4q():
     return data
 
 
+def _revenue_shares(market_ts, quarters):
+    """{operator_id: {quarter: revenue share %}} from the share matrix."""
+    matrices = compute_share_matrices(market_ts, {}, quarters, metrics=("revenue",))
+    return matrices["revenue"].share_dict()
+
+
+def _subscriber_shares(sub_data_by_op, quarters, metric="mobile_subscribers"):
+    """{operator_id: {quarter: subscriber share %}} from the share matrix."""
+    matrices = compute_share_matrices([], sub_data_by_op, quarters, metrics=(metric,))
+    return matrices[metric].share_dict()
+
+
+def _series(shares, ranks, quarters=QUARTERS_4):
+    """OperatorShareSeries of one operator's shares (None = missing) and ranks."""
+    matrix = ShareMatrix(
+        operator_ids=["op"], quarters=list(quarters),
+        shares=np.array([[np.nan if v is None else v for v in shares]]),
+        ranks=np.array([ranks]),
+    )
+    return _series_from_matrix(matrix, {"op": "Op"})[0]
+
+
 # ============================================================================
-# TestExtractRevenueShares
+# TestRevenueShares
 # ============================================================================
 
-class TestExtractRevenueShares:
+class TestRevenueShares:
     def test_normal_4_operators(self):
         ts = _make_market_ts_4q()
-        result = _extract_revenue_shares(ts, QUARTERS_4)
+        result = _revenue_shares(ts, QUARTERS_4)
         assert len(result) == 4
         # Q1: DT=3000, Voda=2000, O2=1300, 1&1=700; total=7000
         assert result["dt_germany"]["CQ1_2025"] == pytest.approx(3000 / 7000 * 100, rel=1e-3)
@@ -102,32 +128,32 @@ class TestExtractRevenueShares:
             _make_fin_row("op_a", "CQ2_2025", 120),
             _make_fin_row("op_b", "CQ2_2025", 180),
         ]
-        result = _extract_revenue_shares(ts, QUARTERS_4)
+        result = _revenue_shares(ts, QUARTERS_4)
         # Q3, Q4 should be None for both
         assert result["op_a"]["CQ3_2025"] is None
         assert result["op_b"]["CQ4_2025"] is None
 
     def test_single_operator(self):
         ts = [_make_fin_row("solo", cq, 1000) for cq in QUARTERS_4]
-        result = _extract_revenue_shares(ts, QUARTERS_4)
+        result = _revenue_shares(ts, QUARTERS_4)
         assert len(result) == 1
         # Solo operator should have 100% share each quarter
         for cq in QUARTERS_4:
             assert result["solo"][cq] == pytest.approx(100.0)
 
     def test_empty_timeseries(self):
-        result = _extract_revenue_shares([], QUARTERS_4)
+        result = _revenue_shares([], QUARTERS_4)
         assert result == {}
 
 
 # ============================================================================
-# TestExtractSubscriberShares
+# TestSubscriberShares
 # ============================================================================
 
-class TestExtractSubscriberShares:
+class TestSubscriberShares:
     def test_normal_mobile(self):
         sub_data = _make_sub_data_4q()
-        result = _extract_subscriber_shares(sub_data, QUARTERS_4, "mobile_total_k")
+        result = _subscriber_shares(sub_data, QUARTERS_4)
         assert len(result) == 4
         # Q1 total: 50000+30000+25000+10000 = 115000
         assert result["dt_germany"]["CQ1_2025"] == pytest.approx(50000 / 115000 * 100, rel=1e-3)
@@ -137,24 +163,22 @@ class TestExtractSubscriberShares:
             "op_a": [{"operator_id": "op_a", "calendar_quarter": "CQ1_2025", "mobile_total_k": 1000}],
             "op_b": [{"operator_id": "op_b", "calendar_quarter": "CQ1_2025"}],  # No mobile_total_k
         }
-        result = _extract_subscriber_shares(sub_data, ["CQ1_2025"], "mobile_total_k")
+        result = _subscriber_shares(sub_data, ["CQ1_2025"])
         assert result["op_a"]["CQ1_2025"] == pytest.approx(100.0)
         assert result["op_b"]["CQ1_2025"] is None
 
     def test_empty_sub_data(self):
-        result = _extract_subscriber_shares({}, QUARTERS_4, "mobile_total_k")
+        result = _subscriber_shares({}, QUARTERS_4)
         assert result == {}
 
 
 # ============================================================================
-# TestBuildOperatorSeries
+# TestSeriesFromMatrix
 # ============================================================================
 
-class TestBuildOperatorSeries:
+class TestSeriesFromMatrix:
     def test_gaining_operator(self):
-        shares = {"CQ1_2025": 40.0, "CQ2_2025": 41.0, "CQ3_2025": 42.0, "CQ4_2025": 43.0}
-        ranks = {"CQ1_2025": 1, "CQ2_2025": 1, "CQ3_2025": 1, "CQ4_2025": 1}
-        s = _build_operator_series("dt", "Deutsche Telekom", shares, QUARTERS_4, ranks)
+        s = _series([40.0, 41.0, 42.0, 43.0], [1, 1, 1, 1])
         assert s.direction == "gaining"
         assert s.share_change_pp == pytest.approx(3.0)
         assert s.avg_quarterly_change_pp == pytest.approx(1.0)
@@ -162,53 +186,48 @@ class TestBuildOperatorSeries:
         assert s.rank_change == 0
 
     def test_losing_operator(self):
-        shares = {"CQ1_2025": 30.0, "CQ2_2025": 29.0, "CQ3_2025": 28.0, "CQ4_2025": 27.0}
-        ranks = {"CQ1_2025": 2, "CQ2_2025": 2, "CQ3_2025": 3, "CQ4_2025": 3}
-        s = _build_operator_series("voda", "Vodafone", shares, QUARTERS_4, ranks)
+        s = _series([30.0, 29.0, 28.0, 27.0], [2, 2, 3, 3])
         assert s.direction == "losing"
         assert s.share_change_pp == pytest.approx(-3.0)
         assert s.rank_change == -1  # Dropped from 2 to 3
 
     def test_stable_operator(self):
-        shares = {"CQ1_2025": 20.0, "CQ2_2025": 20.1, "CQ3_2025": 19.9, "CQ4_2025": 20.0}
-        ranks = {"CQ1_2025": 3, "CQ2_2025": 3, "CQ3_2025": 3, "CQ4_2025": 3}
-        s = _build_operator_series("o2", "O2", shares, QUARTERS_4, ranks)
+        s = _series([20.0, 20.1, 19.9, 20.0], [3, 3, 3, 3])
         assert s.direction == "stable"
 
     def test_insufficient_data(self):
-        shares = {"CQ1_2025": None, "CQ2_2025": None, "CQ3_2025": None, "CQ4_2025": 25.0}
-        ranks = {"CQ4_2025": 2}
-        s = _build_operator_series("op", "Op", shares, QUARTERS_4, ranks)
+        s = _series([None, None, None, 25.0], [2, 2, 2, 2])
         assert s.latest_share_pct == 25.0
         assert s.share_change_pp is None  # Only 1 valid point
         assert s.direction == "stable"
+        assert s.share_pct == [0.0, 0.0, 0.0, 25.0]
+
+    def test_gap_averaged_over_quarters(self):
+        s = _series([30.0, None, None, 33.0], [1, 1, 1, 1])
+        assert s.avg_quarterly_change_pp == pytest.approx(1.0)
 
 
 # ============================================================================
-# TestComputeHHI
+# TestHHITensor
 # ============================================================================
 
-class TestComputeHHI:
+class TestHHITensor:
     def test_monopoly(self):
-        shares = {"CQ1": [100.0]}
-        result = _compute_hhi(shares)
-        assert result == [10000.0]
+        assert _hhi_tensor(np.array([[100.0]])).tolist() == [10000.0]
 
     def test_duopoly(self):
-        shares = {"CQ1": [50.0, 50.0]}
-        result = _compute_hhi(shares)
-        assert result[0] == pytest.approx(5000.0)
+        assert _hhi_tensor(np.array([[50.0], [50.0]]))[0] == pytest.approx(5000.0)
 
     def test_competitive(self):
         # 4 equal operators at 25% each
-        shares = {"CQ1": [25.0, 25.0, 25.0, 25.0]}
-        result = _compute_hhi(shares)
-        assert result[0] == pytest.approx(2500.0)
+        assert _hhi_tensor(np.full((4, 1), 25.0))[0] == pytest.approx(2500.0)
+
+    def test_missing_shares_ignored(self):
+        assert _hhi_tensor(np.array([[60.0, np.nan], [40.0, np.nan]])).tolist() == \
+            pytest.approx([5200.0, 0.0])
 
     def test_empty(self):
-        shares = {"CQ1": []}
-        result = _compute_hhi(shares)
-        assert result == [0.0]
+        assert _hhi_tensor(np.empty((0, 1))).tolist() == [0.0]
 
 
 # ============================================================================
@@ -426,7 +445,7 @@ class TestEdgeCases:
             _make_fin_row("op_a", "CQ2_2025", 100),
             _make_fin_row("op_b", "CQ2_2025", 200),
         ]
-        result = _extract_revenue_shares(ts, ["CQ1_2025", "CQ2_2025"])
+        result = _revenue_shares(ts, ["CQ1_2025", "CQ2_2025"])
         # Q1 has zero total → shares should be None
         assert result["op_a"]["CQ1_2025"] is None
         assert result["op_b"]["CQ1_2025"] is None
@@ -454,7 +473,7 @@ class TestEdgeCases:
             _make_fin_row("new", "CQ3_2025", 100),
             _make_fin_row("new", "CQ4_2025", 200),
         ]
-        result = _extract_revenue_shares(ts, QUARTERS_4)
+        result = _revenue_shares(ts, QUARTERS_4)
         assert result["new"]["CQ1_2025"] is None
         assert result["new"]["CQ2_2025"] is None
         assert result["new"]["CQ3_2025"] is not None
@@ -479,3 +498,120 @@ class TestClassifyDirection:
         assert _classify_direction(0.5) == "stable"
         assert _classify_direction(-0.5) == "stable"
         assert _classify_direction(None) == "stable"
+
+
+# ============================================================================
+# TestShareMatrices
+# ============================================================================
+
+class TestShareMatrices:
+    def test_all_metrics_one_pass(self):
+        ts = _make_market_ts_4q()
+        for row in ts:
+            row["b2b_revenue"] = row["total_revenue"] / 4
+        sub = _make_sub_data_4q()
+        matrices = compute_share_matrices(ts, sub, QUARTERS_4)
+        assert tuple(matrices) == ALL_SHARE_METRICS
+        rev = matrices["revenue"]
+        assert rev.shares.shape == (4, 4)
+        assert rev.shares[:, 0].sum() == pytest.approx(100.0)
+        # b2b_revenue is proportional to total revenue -> same shares
+        assert matrices["b2b_revenue"].shares == pytest.approx(rev.shares)
+        # No fiber data reported -> all NaN, HHI 0
+        assert matrices["fiber_subscribers"].hhi.tolist() == [0.0] * 4
+
+    def test_ranks_and_hhi_match_helpers(self):
+        ts = _make_market_ts_4q()
+        rev = compute_share_matrices(ts, {}, QUARTERS_4, metrics=("revenue",))["revenue"]
+        shares = rev.share_dict()
+        assert rev.rank_dict() == _compute_ranks(shares, QUARTERS_4)
+        by_q = [sum(shares[op][cq] ** 2 for op in shares) for cq in QUARTERS_4]
+        assert rev.hhi.tolist() == pytest.approx(by_q)
+
+    def test_unknown_metric_skipped(self):
+        assert compute_share_matrices([], {}, QUARTERS_4, metrics=("bogus",)) == {}
+
+
+class TestComputeAllShareAnalyses:
+    def test_matches_single_metric_calls(self):
+        ts = _make_market_ts_4q()
+        sub = _make_sub_data_4q()
+        batch = compute_all_share_analyses(ts, sub, QUARTERS_4, "o2_germany")
+        for metric in ("revenue", "mobile_subscribers", "broadband_subscribers"):
+            single = compute_share_analysis(ts, sub, QUARTERS_4, "o2_germany", metric)
+            assert batch[metric].to_dict() == single.to_dict()
+
+    def test_new_metrics_available(self):
+        sub = _make_sub_data_4q()
+        for op_id, rows in sub.items():
+            for row in rows:
+                row["tv_total_k"] = 1000 if op_id == "dt_germany" else 500
+        sa = compute_share_analysis([], sub, QUARTERS_4, "dt_germany", "tv_subscribers")
+        assert sa.target_series.latest_share_pct == pytest.approx(40.0)
+        assert sa.share_leader_id == "dt_germany"
+
+    def test_empty_quarters(self):
+        out = compute_all_share_analyses([], {}, [], "a", metrics=("revenue",))
+        assert out["revenue"].operator_series == []
+
+
+class TestConcentrationBatch:
+    def test_matches_per_market_analysis(self):
+        markets = {
+            "germany": (_make_market_ts_4q(), _make_sub_data_4q()),
+            "duopoly": (
+                [_make_fin_row(op, cq, rev) for cq in QUARTERS_4
+                 for op, rev in (("a", 600), ("b", 400))],
+                {},
+            ),
+        }
+        batch = compute_market_concentration_batch(
+            markets, QUARTERS_4, metrics=("revenue", "mobile_subscribers"))
+
+        for market, (ts, sub) in markets.items():
+            for metric in ("revenue", "mobile_subscribers"):
+                single = compute_share_analysis(ts, sub, QUARTERS_4, "x", metric)
+                if single.operator_series:
+                    assert batch[market][metric].to_dict() == \
+                        single.concentration.to_dict()
+
+        assert batch["duopoly"]["revenue"].hhi == pytest.approx(5200.0)
+        assert batch["duopoly"]["mobile_subscribers"].hhi == 0.0
+
+    def test_empty_inputs(self):
+        assert compute_market_concentration_batch({}, QUARTERS_4) == {}
+
+
+class TestDuplicateRows:
+    """An operator reported twice for a quarter: the share takes the last
+    row's value, the revenue market total counts both rows."""
+
+    def _ts(self):
+        return [
+            _make_fin_row("op_a", "CQ1_2025", 100.0),
+            _make_fin_row("op_b", "CQ1_2025", 150.0),
+            _make_fin_row("op_a", "CQ1_2025", 50.0),
+        ]
+
+    def test_revenue_total_counts_every_row(self):
+        shares = _revenue_shares(self._ts(), ["CQ1_2025"])
+        assert shares["op_a"]["CQ1_2025"] == pytest.approx(50.0 / 300.0 * 100)
+        assert shares["op_b"]["CQ1_2025"] == pytest.approx(150.0 / 300.0 * 100)
+
+    def test_matrices_and_batch_agree(self):
+        ts = self._ts()
+        rev = compute_share_matrices(ts, {}, ["CQ1_2025"], metrics=("revenue",))["revenue"]
+        assert rev.shares[:, 0].tolist() == pytest.approx([50.0 / 3, 50.0])
+        batch = compute_market_concentration_batch({"m": (ts, {})}, ["CQ1_2025"],
+                                                   metrics=("revenue",))
+        assert batch["m"]["revenue"].hhi == pytest.approx(round((50.0 / 3) ** 2 + 50.0 ** 2, 2))
+
+    def test_subscriber_total_counts_kept_value(self):
+        sub = {
+            "op_a": [{"calendar_quarter": "CQ1_2025", "mobile_total_k": 100.0},
+                     {"calendar_quarter": "CQ1_2025", "mobile_total_k": 300.0}],
+            "op_b": [{"calendar_quarter": "CQ1_2025", "mobile_total_k": 100.0}],
+        }
+        shares = _subscriber_shares(sub, ["CQ1_2025"])
+        assert shares["op_a"]["CQ1_2025"] == pytest.approx(75.0)
+        assert shares["op_b"]["CQ1_2025"] == pytest.approx(25.0)
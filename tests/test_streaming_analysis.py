@@ -0,0 +1,174 @@
+"""Tests for the chunked StreamingBudgetAnalyzer.
+
+Covers:
+- group_moments / merge_moments match whole-data statistics
+- Every analysis matches BudgetAnalyzer on the same file
+- DataLoader.iter_chunks / preprocess_chunks row labels
+- Configured-column checks
+- run_all() runs the same analyses as BudgetAnalyzer.run_all()
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.financial import BudgetAnalyzer
+from src.analysis.streaming import StreamingBudgetAnalyzer, group_moments, merge_moments
+from src.data.loader import DataLoader, FinancialDataPreprocessor
+from src.data.sample import generate_sample_data
+
+
+@pytest.fixture
+def sample_csv(tmp_path):
+    df = generate_sample_data(n_records=600, seed=7)
+    df.loc[::41, "amount"] = np.nan
+    path = tmp_path / "ledger.csv"
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def analyzers(sample_csv):
+    loader = DataLoader()
+    preprocessor = FinancialDataPreprocessor()
+    full = BudgetAnalyzer(preprocessor.preprocess(loader.load(sample_csv)))
+    streaming = StreamingBudgetAnalyzer(
+        lambda: preprocessor.preprocess_chunks(loader.iter_chunks(sample_csv, chunksize=53)))
+    return full, streaming
+
+
+def _assert_same(expected, actual, drop=()):
+    assert expected.name == actual.name
+    assert expected.summary.keys() == actual.summary.keys()
+    for key, value in expected.summary.items():
+        if isinstance(value, float):
+            assert actual.summary[key] == pytest.approx(value, rel=1e-9, nan_ok=True)
+        else:
+            assert actual.summary[key] == value
+    pd.testing.assert_frame_equal(
+        expected.details.drop(columns=list(drop)),
+        actual.details.drop(columns=list(drop)),
+        check_dtype=False, rtol=1e-9,
+    )
+
+
+# =====================================================================
+# Moments
+# =====================================================================
+
+class TestMoments:
+    def test_merge_matches_whole(self):
+        rng = np.random.default_rng(3)
+        values = pd.Series(rng.normal(100, 15, 1000))
+        keys = pd.Series(rng.choice(["a", "b", "c"], 1000))
+        merged = None
+        for start in range(0, 1000, 137):
+            part = slice(start, start + 137)
+            merged = merge_moments(merged, group_moments(values[part], keys[part]))
+
+        grouped = values.groupby(keys)
+        assert merged["count"].tolist() == grouped.count().tolist()
+        np.testing.assert_allclose(merged["sum"], grouped.sum())
+        np.testing.assert_allclose(np.sqrt(merged["m2"] / (merged["count"] - 1)),
+                                   grouped.std())
+        np.testing.assert_allclose(merged["min"], grouped.min())
+
+    def test_empty_group_keeps_zero_count(self):
+        values = pd.Series([np.nan, 1.0, 2.0])
+        keys = pd.Series(["x", "y", "y"])
+        merged = merge_moments(group_moments(values, keys), group_moments(values, keys))
+        assert merged.loc["x", "count"] == 0
+        assert merged.loc["y", "count"] == 4
+        assert merged.loc["y", "m2"] == pytest.approx(1.0)
+
+
+# =====================================================================
+# Analyses
+# =====================================================================
+
+class TestStreamingMatchesBudgetAnalyzer:
+    def test_summary_statistics(self, analyzers):
+        full, streaming = analyzers
+        _assert_same(full.summary_statistics(group_col="category"),
+                     streaming.summary_statistics(group_col="category"), drop=["median"])
+        result = streaming.summary_statistics()
+        assert result.summary == pytest.approx(full.summary_statistics().summary)
+        assert result.metadata["omitted"] == ["median"]
+
+    def test_budget_variance(self, analyzers):
+        full, streaming = analyzers
+        _assert_same(full.budget_variance(category_col="category"),
+                     streaming.budget_variance(category_col="category"))
+        ungrouped = streaming.budget_variance()
+        assert ungrouped.summary == pytest.approx(full.budget_variance().summary)
+        assert ungrouped.details.empty
+
+    def test_trend_analysis(self, analyzers):
+        full, streaming = analyzers
+        _assert_same(full.trend_analysis(), streaming.trend_analysis())
+
+    def test_detect_anomalies(self, analyzers):
+        full, streaming = analyzers
+        expected = full.detect_anomalies()
+        assert expected.summary["anomalies_found"] > 0
+        _assert_same(expected, streaming.detect_anomalies())
+
+    def test_group_analyses(self, analyzers):
+        full, streaming = analyzers
+        _assert_same(full.category_breakdown(), streaming.category_breakdown())
+        _assert_same(full.state_comparison(), streaming.state_comparison())
+        _assert_same(full.year_over_year(), streaming.year_over_year())
+        _assert_same(full.year_over_year(category_col="category"),
+                     streaming.year_over_year(category_col="category"))
+
+    def test_run_all_matches_budget_analyzer(self, analyzers):
+        full, streaming = analyzers
+        expected = full.run_all()
+        results = streaming.run_all()
+        assert [r.name for r in results] == [r.name for r in expected]
+        for exp, act in zip(expected, results):
+            if exp.name == "category_breakdown":
+                _assert_same(exp, act)
+
+    def test_single_pass_for_aggregates(self, analyzers):
+        _, streaming = analyzers
+        streaming.category_breakdown()
+        streaming.state_comparison()
+        assert streaming.n_chunks == 12
+        assert streaming.n_records == 600
+
+
+class TestStreamingChecks:
+    def test_unconfigured_column_rejected(self, analyzers):
+        _, streaming = analyzers
+        with pytest.raises(ValueError, match="not aggregated"):
+            streaming.state_comparison(state_col="program")
+
+    def test_run_all_rejects_unconfigured_column(self, analyzers):
+        _, streaming = analyzers
+        with pytest.raises(ValueError, match="not aggregated"):
+            streaming.run_all(state_col="program")
+
+    def test_missing_column(self, tmp_path):
+        path = tmp_path / "small.csv"
+        pd.DataFrame({"amount": [1.0, 2.0]}).to_csv(path, index=False)
+        loader = DataLoader()
+        streaming = StreamingBudgetAnalyzer(lambda: loader.iter_chunks(str(path)))
+        with pytest.raises(ValueError, match="category"):
+            streaming.category_breakdown()
+
+
+class TestChunkedLoading:
+    def test_chunks_relabelled_like_whole_file(self, sample_csv):
+        loader = DataLoader()
+        preprocessor = FinancialDataPreprocessor()
+        chunks = list(preprocessor.preprocess_chunks(loader.iter_chunks(sample_csv, 100)))
+        assert [len(c) for c in chunks] == [100] * 6
+        assert chunks[-1].index[-1] == 599
+        assert list(chunks[0].columns) == list(loader.load(sample_csv).columns)
+
+    def test_non_streamable_format_is_one_chunk(self, tmp_path):
+        path = tmp_path / "ledger.xlsx"
+        pd.DataFrame({"Amount": [1, 2, 3]}).to_excel(path, index=False)
+        chunks = list(DataLoader().iter_chunks(str(path), chunksize=1))
+        assert len(chunks) == 1 and list(chunks[0].columns) == ["amount"]
@@ -0,0 +1,281 @@
+"""Tests for pushing local tables to Supabase with BLMCloudSync.
+
+Covers:
+- Market filtering in SQL (operator, country and market columns)
+- Change-only pushes: unchanged rows skipped, per project, --full resends;
+  re-seeded data with new timestamps not resent
+- Bounded chunks uploaded concurrently, retried, failed chunks re-sent
+- Content keys make re-pushes of key-less tables idempotent
+"""
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.database.seed_image import seed_image
+from src.database.supabase_sync import (
+    BLMCloudSync, PushState, TABLE_CONFIG, content_key, row_hash,
+)
+
+
+class FakeSupabaseClient:
+    """In-memory BLMSupabaseClient: rows stored by their conflict columns."""
+
+    def __init__(self, url="https://fake.supabase.co"):
+        self.url = url
+        self.tables = {}        # table -> {conflict values: row}
+        self.calls = []         # (table, rows, on_conflict) per upsert
+        self.failures = 0       # next upserts that fail
+        self.reject = None      # row predicate; matching chunks always fail
+        self.delay = 0.0
+        self.peak = 0
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def upsert(self, table, data, on_conflict):
+        with self._lock:
+            self.calls.append((table, len(data), on_conflict))
+            self._active += 1
+            self.peak = max(self.peak, self._active)
+        try:
+            time.sleep(self.delay)
+            with self._lock:
+                if self.failures:
+                    self.failures -= 1
+                    raise ConnectionError("503 Service Unavailable")
+                if self.reject and any(self.reject(row) for row in data):
+                    raise ValueError("violates check constraint")
+                columns = on_conflict.split(",")
+                keys = [tuple(row[c] for c in columns) for row in data]
+                if len(set(keys)) != len(keys):
+                    raise ValueError("ON CONFLICT DO UPDATE command cannot affect row a second time")
+                rows = self.tables.setdefault(table, {})
+                for key, row in zip(keys, data):
+                    rows[key] = dict(row)
+            return len(data)
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def select(self, table, filters=None, limit=10000):
+        rows = list(self.tables.get(table, {}).values())
+        return [r for r in rows if all(r.get(k) == v for k, v in (filters or {}).items())]
+
+    def count(self, table, filters=None):
+        return len(self.select(table, filters))
+
+    def sent(self, table):
+        return sum(n for t, n, _ in self.calls if t == table)
+
+
+@pytest.fixture(scope="module")
+def germany_image(tmp_path_factory):
+    return seed_image("germany", image_dir=str(tmp_path_factory.mktemp("images")))
+
+
+@pytest.fixture
+def local(germany_image):
+    with contextlib.redirect_stdout(io.StringIO()):
+        db = germany_image.clone()
+    db.upsert_operator("a1_austria", display_name="A1", market="austria",
+                       country="Austria", operator_type="incumbent")
+    db.upsert_financial("a1_austria", "Q4 2025", {"total_revenue": 700.0})
+    db.upsert_macro("Austria", "CQ4_2025", {"gdp_growth_pct": 0.8})
+    db.upsert_intelligence({"market": "austria", "event_date": "2025-11-01",
+                            "category": "regulatory", "title": "Spectrum auction"})
+    return db
+
+
+@pytest.fixture
+def cloud():
+    return FakeSupabaseClient()
+
+
+def _sync(local, cloud, state=None, **options):
+    options = {"chunk_rows": 10, "retry_delay": 0, **options}
+    return BLMCloudSync(local_db=local, cloud=cloud,
+                        push_state=state or PushState(":memory:"), **options)
+
+
+def _count(db, sql, params=()):
+    return db.conn.execute(sql, params).fetchone()[0]
+
+
+# =====================================================================
+# Market filtering
+# =====================================================================
+
+class TestMarketFilter:
+    def test_operator_tables(self, local, cloud):
+        germany_ops = {o["operator_id"] for o in local.get_operators_in_market("germany")}
+        expected = sum(1 for (op,) in local.conn.execute(
+            "SELECT operator_id FROM financial_quarterly") if op in germany_ops)
+
+        assert _sync(local, cloud).push_table("financial_quarterly", "germany") == expected
+        assert {row["operator_id"] for row in cloud.select("financial_quarterly")} == germany_ops
+
+    def test_country_and_market_columns(self, local, cloud):
+        sync = _sync(local, cloud)
+        assert sync.push_table("macro_environment", "austria") == 1
+        assert sync.push_table("intelligence_events", "austria") == 1
+        assert sync.push_table("operators", "austria") == 1
+        assert sync.push_table("macro_environment", "atlantis") == 0
+        assert cloud.select("macro_environment")[0]["country"] == "Austria"
+
+    def test_unfiltered_table(self, local, cloud):
+        n = _count(local, "SELECT COUNT(*) FROM source_registry")
+        assert _sync(local, cloud).push_table("source_registry", "austria") == n
+
+
+# =====================================================================
+# Change-only pushes
+# =====================================================================
+
+class TestChangeOnly:
+    def test_unchanged_rows_skipped(self, local, cloud):
+        sync = _sync(local, cloud)
+        first = sync.push_table("tariffs", "germany")
+        assert first == _count(local, "SELECT COUNT(*) FROM tariffs")
+        calls = len(cloud.calls)
+        assert sync.push_table("tariffs", "germany") == 0
+        assert len(cloud.calls) == calls
+
+    def test_changed_row_resent(self, local, cloud):
+        sync = _sync(local, cloud)
+        sync.push_table("financial_quarterly", "germany")
+        local.conn.execute(
+            "UPDATE financial_quarterly SET total_revenue = 1.5 "
+            "WHERE id = (SELECT MIN(id) FROM financial_quarterly)")
+        cloud.calls.clear()
+        assert sync.push_table("financial_quarterly", "germany") == 1
+        assert cloud.calls == [("financial_quarterly", 1, "operator_id,calendar_quarter")]
+        assert 1.5 in {row["total_revenue"] for row in cloud.select("financial_quarterly")}
+
+    def test_full_resends_everything(self, local, cloud):
+        sync = _sync(local, cloud)
+        n = sync.push_table("executives", "germany")
+        assert sync.push_table("executives", "germany", full=True) == n
+
+    def test_state_kept_per_project(self, local, cloud):
+        state = PushState(":memory:")
+        n = _sync(local, cloud, state).push_table("executives", "germany")
+        other = FakeSupabaseClient(url="https://other.supabase.co")
+        assert _sync(local, other, state).push_table("executives", "germany") == n
+
+    def test_state_file_from_environment(self, local, cloud, tmp_path, monkeypatch):
+        monkeypatch.setenv("BLM_PUSH_STATE_DB", str(tmp_path / "state" / "push.db"))
+        _sync(local, cloud, PushState()).push_table("executives", "germany")
+        assert (tmp_path / "state" / "push.db").exists()
+        assert _sync(local, cloud, PushState()).push_table("executives", "germany") == 0
+
+    def test_reseeded_data_not_resent(self, germany_image, cloud, tmp_path):
+        state = PushState(":memory:")
+        with contextlib.redirect_stdout(io.StringIO()):
+            first = germany_image.clone()
+            _sync(first, cloud, state).push_all("germany")
+            time.sleep(1.1)  # CURRENT_TIMESTAMP has one-second resolution
+            reseeded = seed_image("germany", image_dir=str(tmp_path)).clone()
+            cloud.calls.clear()
+            report = _sync(reseeded, cloud, state).push_all("germany")
+        sql = "SELECT MAX(collected_at) FROM financial_quarterly"
+        assert _count(reseeded, sql) != _count(first, sql)
+        # market_configs is pushed on every run
+        assert all(report.tables.get(table, 0) == 0 for table in TABLE_CONFIG)
+        assert [call for call in cloud.calls if call[0] in TABLE_CONFIG] == []
+        assert all(row["collected_at"] for row in cloud.select("financial_quarterly"))
+
+    def test_push_all_report(self, local, cloud):
+        sync = _sync(local, cloud)
+        with contextlib.redirect_stdout(io.StringIO()):
+            sync.push_all("germany")
+            report = sync.push_all("germany")
+        assert report.tables["tariffs"] == 0
+        assert report.unchanged["tariffs"] == _count(local, "SELECT COUNT(*) FROM tariffs")
+        assert "unchanged" in report.summary()
+
+
+# =====================================================================
+# Chunks, concurrency and retries
+# =====================================================================
+
+class TestChunks:
+    def test_bounded_concurrent_chunks(self, local, cloud):
+        cloud.delay = 0.01
+        n = _sync(local, cloud, workers=4).push_table("tariffs", "germany")
+        assert {size for _, size, _ in cloud.calls} <= set(range(1, 11))
+        assert cloud.sent("tariffs") == n == len(cloud.select("tariffs"))
+        assert 1 < cloud.peak <= 4
+
+    def test_transient_failures_retried(self, local, cloud, capsys):
+        cloud.failures = 2
+        n = _sync(local, cloud, attempts=3).push_table("executives", "germany")
+        assert n == _count(local, "SELECT COUNT(*) FROM executives") == len(cloud.select("executives"))
+        assert "retrying" in capsys.readouterr().out
+
+    def test_failed_chunk_resent_next_push(self, local, cloud):
+        bad = local.conn.execute("SELECT MIN(plan_name) FROM tariffs").fetchone()[0]
+        cloud.reject = lambda row: row["plan_name"] == bad
+        sync = _sync(local, cloud, attempts=2)
+        with pytest.raises(RuntimeError, match="chunks failed"):
+            sync.push_table("tariffs", "germany")
+        stored = len(cloud.select("tariffs"))
+        assert 0 < stored < _count(local, "SELECT COUNT(*) FROM tariffs")
+
+        cloud.reject = None
+        cloud.calls.clear()
+        resent = sync.push_table("tariffs", "germany")
+        assert resent == _count(local, "SELECT COUNT(*) FROM tariffs") - stored
+        assert len(cloud.select("tariffs")) == stored + resent
+
+
+# =====================================================================
+# Content keys
+# =====================================================================
+
+class TestContentKeys:
+    def test_repush_idempotent(self, local, cloud):
+        sync = _sync(local, cloud)
+        n = sync.push_table("earnings_call_highlights", "germany")
+        sync.push_table("earnings_call_highlights", "germany", full=True)
+        rows = cloud.select("earnings_call_highlights")
+        assert len(rows) == n == _count(local, "SELECT COUNT(*) FROM earnings_call_highlights")
+        assert all(row["content_key"] for row in rows)
+        assert cloud.calls[-1][2] == "content_key"
+
+    def test_local_duplicates_collapse(self, local, cloud):
+        event = {"market": "austria", "event_date": "2025-11-01",
+                 "category": "regulatory", "title": "Spectrum auction",
+                 "description": "Updated"}
+        local.upsert_intelligence(event)
+        assert _sync(local, cloud).push_table("intelligence_events", "austria") == 1
+        assert cloud.select("intelligence_events")[0]["description"] == "Updated"
+
+    def test_provenance_rows_kept_apart(self, local, cloud):
+        from src.models.provenance import ProvenanceStore
+
+        for job in (1, 2):
+            store = ProvenanceStore()
+            for operator in ("a1_austria", "magenta_austria"):
+                for period in ("Q3 2025", "Q4 2025"):
+                    store.track(700.0, "total_revenue", operator=operator,
+                                period=period, unit="EUR m")
+            store.save_to_db(local, analysis_job_id=job)
+        sync = _sync(local, cloud)
+        assert sync.push_table("data_provenance") == 8
+        assert len(cloud.select("data_provenance")) == 8
+        sync.push_table("data_provenance", full=True)
+        assert len(cloud.select("data_provenance")) == 8
+
+    def test_key_ignores_non_identity_columns(self):
+        row = {"operator_id": "op", "market": "m", "event_date": "2025-01-01",
+               "category": "c", "title": "t", "description": "a"}
+        edited = {**row, "description": "b"}
+        assert content_key("intelligence_events", row) == content_key("intelligence_events", edited)
+        assert row_hash(row) != row_hash(edited)
+        assert all("content_key" in cfg for cfg in TABLE_CONFIG.values() if not cfg["conflict"])
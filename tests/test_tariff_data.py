@@ -218,3 +218,71 @@ class TestSeedTariffs:
         assert len(comparison) >= 12  # 4 operators × 3-4 tiers each
         operators = {c["operator_id"] for c in comparison}
         assert len(operators) == 4
+
+
+# ============================================================================
+# Tariff Index
+# ============================================================================
+
+class TestTariffIndex:
+
+    def test_parse_data_gb(self):
+        from src.blm.tariff_index import parse_data_gb
+        assert parse_data_gb("20 GB") == 20
+        assert parse_data_gb("1TB") == 1024
+        assert parse_data_gb("512 MB") == 0.5
+        assert parse_data_gb("Unlimited") is None
+        assert parse_data_gb(None) is None
+
+    def test_typed_columns(self, db):
+        from src.blm.tariff_index import TariffIndex
+        db.upsert_tariff("test_op", "Plan M", "mobile_postpaid", "H1_2026", {
+            "plan_tier": "m", "monthly_price": 30.0,
+            "data_allowance": "20 GB", "includes_5g": 1,
+        })
+        [t] = TariffIndex.build(db, "germany").comparison("mobile_postpaid", "H1_2026")
+        assert t.data_gb == 20
+        assert t.eur_per_gb == 1.5
+        assert t.includes_5g is True
+
+    def test_comparison_matches_sql(self, seeded_db):
+        from src.blm.tariff_index import TariffIndex
+        index = TariffIndex.build(seeded_db, "germany")
+        for plan_type in ("mobile_postpaid", "fixed_fiber", "fmc_bundle"):
+            for snap in index.snapshots:
+                sql = seeded_db.get_tariff_comparison("germany", plan_type, snap)
+                indexed = index.comparison(plan_type, snap)
+                assert [(r["operator_id"], r["plan_name"]) for r in sql] == \
+                    [(t.operator_id, t.plan_name) for t in indexed]
+
+    def test_history_matches_sql(self, seeded_db):
+        from src.blm.tariff_index import TariffIndex
+        index = TariffIndex.build(seeded_db, "germany")
+        sql = seeded_db.get_tariffs(market="germany", plan_type="mobile_postpaid")
+        assert [r["id"] for r in sql] == \
+            [t.tariff_id for t in index.history("mobile_postpaid")]
+
+    def test_missing_tier_and_allowance_stay_none(self, db):
+        from src.blm.analyze_tariffs import analyze_tariffs
+        for plan_type in ("mobile_postpaid", "fixed_fiber", "fmc_bundle"):
+            db.upsert_tariff("test_op", f"Plan {plan_type}", plan_type, "H1_2026",
+                             {"monthly_price": 40.0})
+        result = analyze_tariffs(db, "germany", "test_op")
+        assert result["fixed_comparison"]["fixed_fiber"][0]["tier"] is None
+        assert result["fmc_comparison"][0]["tier"] is None
+        assert result["price_evolution"]["test_op"] == [{"snapshot": "H1_2026", None: 40.0}]
+
+    def test_analyze_tariffs_reuses_index(self, seeded_db):
+        from unittest.mock import MagicMock
+        from src.blm.analyze_tariffs import analyze_tariffs
+        from src.blm.tariff_index import TariffIndex
+
+        index = TariffIndex.build(seeded_db, "germany")
+        expected = analyze_tariffs(seeded_db, "germany", "vodafone_germany")
+
+        no_queries = MagicMock()
+        no_queries.get_tariffs.side_effect = AssertionError("unexpected query")
+        no_queries.get_tariff_comparison.side_effect = AssertionError("unexpected query")
+        result = analyze_tariffs(no_queries, "germany", "vodafone_germany", index=index)
+        assert result == expected
+        assert result["value_per_gb"]
@@ -0,0 +1,124 @@
+"""Tests for the warm worker pool.
+
+Covers:
+- warm_up() imports the heavy modules and tolerates missing packages
+- Engine jobs on the pool match an in-process run
+- Workers are recycled after max_jobs_per_worker jobs
+- AnalysisRunnerService delegates engine + outputs to the pool
+- get_warm_pool() is off unless BLM_WARM_POOL_WORKERS is set
+"""
+import contextlib
+import io
+import json
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.output.json_exporter import BLMJsonExporter
+from src.web.services import warm_pool
+from src.web.services.analysis_runner import AnalysisRunnerService
+from src.web.services.warm_pool import WarmWorkerPool, run_engine_job, warm_up
+
+
+@pytest.fixture(scope="module")
+def germany_db_path(tmp_path_factory):
+    from src.database.seed_image import seed_image
+    image = seed_image("germany", image_dir=str(tmp_path_factory.mktemp("seed_images")))
+    path = str(tmp_path_factory.mktemp("warm_pool") / "germany.db")
+    with contextlib.redirect_stdout(io.StringIO()):
+        image.clone(path).close()
+    return path
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with WarmWorkerPool(workers=2, max_jobs_per_worker=2) as p:
+        yield p
+
+
+def _snapshot(result) -> dict:
+    data = json.loads(BLMJsonExporter().export(result, include_provenance=False))
+    data["meta"].pop("generated_at")
+    return data
+
+
+# =====================================================================
+# warm_up
+# =====================================================================
+
+class TestWarmUp:
+    def test_loads_heavy_modules(self):
+        timings = warm_up()
+        assert "src.models.market_configs" in timings
+        assert "src.output.ppt_styles" in timings
+        assert "src.models.market_configs" in sys.modules
+
+    def test_missing_module_skipped(self):
+        timings = warm_up(("json", "no_such_package_xyz"))
+        assert list(timings) == ["json"]
+
+
+# =====================================================================
+# Pool execution
+# =====================================================================
+
+class TestWarmWorkerPool:
+    def test_engine_job_matches_in_process(self, pool, germany_db_path):
+        pooled = pool.run_engine(germany_db_path, "vodafone_germany", "germany",
+                                 "CQ4_2025", 8)
+        with contextlib.redirect_stdout(io.StringIO()):
+            local = run_engine_job(germany_db_path, "vodafone_germany", "germany",
+                                   "CQ4_2025", 8)
+        assert pooled.target_operator == "vodafone_germany"
+        assert _snapshot(pooled) == _snapshot(local)
+
+    def test_workers_recycled(self, pool):
+        pids = {pool.submit(os.getpid).result() for _ in range(8)}
+        # 2 workers x 2 jobs each before replacement -> more than 2 pids
+        assert len(pids) > 2
+
+    def test_job_exception_propagates(self, pool, tmp_path):
+        with pytest.raises(Exception):
+            pool.run_engine(str(tmp_path / "missing" / "x.db"), "x", "y",
+                            "CQ4_2025", 8)
+
+
+# =====================================================================
+# Runner integration
+# =====================================================================
+
+class TestRunnerDelegation:
+    def test_engine_and_outputs_go_to_pool(self):
+        fake_pool = MagicMock()
+        fake_pool.run_engine.return_value = MagicMock(
+            analysis_period="CQ4_2025", provenance=None)
+        fake_pool.generate_outputs.return_value = [{"type": "json"}]
+        runner = AnalysisRunnerService(MagicMock(), pool=fake_pool)
+
+        db = MagicMock(db_path="/tmp/analysis.db")
+        result = runner._run_engine(db, "tigo_panama", "panama", "CQ4_2025", 8)
+        outputs = runner._generate_outputs(result, "panama", "tigo_panama",
+                                           "CQ4_2025", "/tmp")
+
+        fake_pool.run_engine.assert_called_once_with(
+            "/tmp/analysis.db", "tigo_panama", "panama", "CQ4_2025", 8)
+        assert outputs == [{"type": "json"}]
+
+
+class TestGetWarmPool:
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("BLM_WARM_POOL_WORKERS", raising=False)
+        assert warm_pool.get_warm_pool() is None
+
+    def test_singleton_when_enabled(self, monkeypatch):
+        monkeypatch.setenv("BLM_WARM_POOL_WORKERS", "1")
+        monkeypatch.setattr(warm_pool, "_pool", None)
+        try:
+            first = warm_pool.get_warm_pool()
+            assert first is warm_pool.get_warm_pool()
+        finally:
+            first.shutdown()